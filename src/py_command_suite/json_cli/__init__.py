@@ -8,13 +8,23 @@ from .exceptions import (
     JSONValidationError,
     SchemaError,
     FileAccessError,
+    ConfigError,
+    PatchError,
+    GitError,
 )
 from .validator import (
+    FileVerdict,
+    Validator,
     load_json_file,
     load_schema_file,
+    validate_buffer,
+    validate_bytes,
     validate_json_against_schema,
     validate_json_file,
 )
+from .cache import ValidationCache
+from .incremental import apply_patch, validate_patch
+from .multi import SchemaVerdict, validate_against_schemas, validate_json_file_against_schemas
 from .main import validate_json, cli
 
 __all__ = [
@@ -24,11 +34,24 @@ __all__ = [
     "JSONValidationError",
     "SchemaError",
     "FileAccessError",
+    "ConfigError",
+    "PatchError",
+    "GitError",
     # Validator functions
     "load_json_file",
     "load_schema_file",
     "validate_json_against_schema",
     "validate_json_file",
+    "validate_bytes",
+    "validate_buffer",
+    "Validator",
+    "FileVerdict",
+    "ValidationCache",
+    "apply_patch",
+    "validate_patch",
+    "SchemaVerdict",
+    "validate_against_schemas",
+    "validate_json_file_against_schemas",
     # CLI commands
     "validate_json",
     "cli",
@@ -0,0 +1,588 @@
+"""Static cost analysis and equivalence-preserving rewrites of schemas.
+
+The cost model counts approximate keyword evaluations for one instance:
+``oneOf``/``anyOf`` pay for every branch, ``items``/``contains`` scale
+with an expected array length, ``patternProperties`` pays a regex match
+per property per pattern, and ``$ref`` costs whatever it points at.
+Costs are inclusive (a keyword's cost includes its subschemas) and only
+meant for ranking hot spots, not as a prediction of wall time.
+
+``optimize_schema`` rewrites a schema without changing which instances
+it accepts:
+
+* combinators and conditionals with constant (``true``/``false``)
+  branches are collapsed;
+* a ``oneOf``/``anyOf`` whose branches are all objects requiring one
+  property pinned to distinct values (a tagged union) becomes ``if``/
+  ``then`` dispatch on that property, so only one branch is evaluated;
+* a one-value ``enum`` becomes ``const``;
+* subschemas repeated inline are moved into ``definitions`` and replaced
+  with ``$ref``.
+
+Rewrites that introduce a keyword are skipped for drafts that lack it
+(``if`` before Draft 7, ``const`` in Draft 4). Nothing is moved out from
+under a ``$ref`` that points into it. ``check_equivalence`` compares verdicts of the two schemas on a
+generated corpus that mixes conforming and mutated instances.
+"""
+
+import copy
+import json
+from collections import Counter
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .dispatch import (
+    SCHEMA_KEYWORDS,
+    SCHEMA_LIST_KEYWORDS,
+    SCHEMA_MAP_KEYWORDS,
+    _pinned_values,
+    _walk,
+    discriminator,
+    draft_for,
+    parse_pointer,
+    resolve_ref,
+    subschemas,
+)
+from .generator import generate_instances
+from .patterns import find_ambiguity
+
+EST_ITEMS = 10
+EST_PROPERTIES = 8
+REGEX_COST = 5.0
+FORMAT_COST = 3.0
+FANOUT_THRESHOLD = 8
+PATTERN_THRESHOLD = 3
+HOT_SHARE = 0.2
+MIN_SHARED_SIZE = 40  # characters of canonical JSON
+
+# Keywords whose cost multiplies with the instance, flagged when they dominate
+_COSTLY = ("oneOf", "anyOf", "patternProperties", "propertyNames", "contains")
+
+_FREE_KEYWORDS = (
+    "$schema", "$id", "$comment", "title", "description", "default", "examples",
+    "readOnly", "writeOnly", "contentMediaType", "contentEncoding", "definitions",
+    # Costed together with "items" and "if"
+    "additionalItems", "then", "else",
+)
+_EDGE_CASES = (None, True, 0, 1.5, "", [], {})
+
+SchemaPath = Tuple[Any, ...]
+
+
+class KeywordCost(NamedTuple):
+    """Inclusive estimated cost of one keyword."""
+
+    pointer: str
+    keyword: str
+    cost: float
+
+
+class HotSpot(NamedTuple):
+    """A keyword worth optimizing, with why."""
+
+    pointer: str
+    keyword: str
+    cost: float
+    reason: str
+
+
+class SchemaAnalysis(NamedTuple):
+    """Estimated cost of a schema and where it goes."""
+
+    total: float
+    costs: List[KeywordCost]
+    hot_spots: List[HotSpot]
+
+
+class Equivalence(NamedTuple):
+    """Outcome of comparing two schemas on a sample corpus."""
+
+    samples: int
+    mismatches: List[Any]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every sample got the same verdict from both schemas."""
+        return not self.mismatches
+
+
+def _pointer(path: SchemaPath) -> str:
+    return "#" + "".join(
+        "/" + str(t).replace("~", "~0").replace("/", "~1") for t in path
+    )
+
+
+# -- cost model -------------------------------------------------------------
+
+
+class _CostModel:
+    def __init__(self, root: Any) -> None:
+        self.root = root
+        self.costs: List[KeywordCost] = []
+        self._refs: Dict[str, float] = {}
+        self._active: Set[str] = set()
+        # id(schema) -> number of sibling if/then entries pinning one property
+        self._selectivity: Dict[int, int] = {}
+
+    def cost(self, schema: Any, path: SchemaPath) -> float:
+        if not isinstance(schema, dict):
+            return 0.0
+        if "$ref" in schema:
+            cost = self._ref(schema["$ref"])
+            self.costs.append(KeywordCost(_pointer(path), "$ref", cost))
+            return cost
+        total = 0.0
+        for keyword, value in schema.items():
+            if keyword in _FREE_KEYWORDS:
+                continue
+            cost = self._keyword(schema, keyword, value, path)
+            self.costs.append(KeywordCost(_pointer(path), keyword, cost))
+            total += cost
+        return total
+
+    def _ref(self, ref: str) -> float:
+        if ref in self._refs:
+            return self._refs[ref]
+        if ref in self._active or not ref.startswith("#"):
+            # Recursive or remote: count the lookup only
+            return 1.0
+        self._active.add(ref)
+        try:
+            tokens = tuple(
+                int(t) if t.isdigit() else t for t in parse_pointer(ref[1:])
+            )
+            target = resolve_ref({"$ref": ref}, self.root)
+            cost = 1.0 + self.cost(target, tokens)
+        except ValueError:
+            cost = 1.0
+        finally:
+            self._active.discard(ref)
+        self._refs[ref] = cost
+        return cost
+
+    def _keyword(self, schema: Dict[str, Any], keyword: str, value: Any, path: SchemaPath) -> float:
+        def sub(child: Any, *tail: Any) -> float:
+            return self.cost(child, path + (keyword,) + tail)
+
+        if keyword == "properties":
+            return sum(sub(child, name) for name, child in value.items())
+        if keyword == "patternProperties":
+            matching = EST_PROPERTIES * len(value) * REGEX_COST
+            return matching + sum(sub(child, name) for name, child in value.items())
+        if keyword == "additionalProperties":
+            patterns = len(schema.get("patternProperties", {}))
+            return EST_PROPERTIES * (1 + patterns * REGEX_COST) + sub(value)
+        if keyword == "propertyNames":
+            return EST_PROPERTIES * sub(value)
+        if keyword == "dependencies":
+            return len(value) + sum(
+                sub(child, name) for name, child in value.items() if not isinstance(child, list)
+            )
+        if keyword == "items":
+            if isinstance(value, list):
+                cost = sum(sub(child, index) for index, child in enumerate(value))
+                additional = schema.get("additionalItems")
+                if additional is not None:
+                    cost += self.cost(additional, path + ("additionalItems",))
+                return cost
+            return _expected_items(schema) * sub(value)
+        if keyword == "contains":
+            return _expected_items(schema) * sub(value)
+        if keyword == "uniqueItems":
+            return float(_expected_items(schema)) if value else 0.0
+        if keyword == "allOf":
+            pins = Counter(_dispatch_pin(branch) for branch in value)
+            for branch in value:
+                pin = _dispatch_pin(branch)
+                if pin is not None and pins[pin] > 1:
+                    self._selectivity[id(branch)] = pins[pin]
+            return sum(sub(child, index) for index, child in enumerate(value))
+        if keyword in ("anyOf", "oneOf"):
+            return sum(sub(child, index) for index, child in enumerate(value))
+        if keyword == "not":
+            return sub(value)
+        if keyword == "if":
+            then = self.cost(schema.get("then"), path + ("then",))
+            otherwise = self.cost(schema.get("else"), path + ("else",))
+            share = self._selectivity.get(id(schema))
+            if share:
+                # One of ``share`` sibling dispatch entries applies
+                return sub(value) + (then + otherwise * (share - 1)) / share
+            return sub(value) + max(then, otherwise)
+        if keyword == "pattern":
+            return REGEX_COST
+        if keyword == "format":
+            return FORMAT_COST
+        if keyword == "enum" and isinstance(value, list):
+            return 1.0 + len(value) / 8
+        return 1.0
+
+
+def _expected_items(schema: Dict[str, Any]) -> int:
+    count = max(EST_ITEMS, schema.get("minItems", 0))
+    return min(count, schema.get("maxItems", count))
+
+
+def _dispatch_pin(schema: Any) -> Optional[str]:
+    """Property an ``if``/``then`` entry dispatches on, if it looks like one."""
+    if not isinstance(schema, dict) or "then" not in schema:
+        return None
+    clause = schema.get("if")
+    if not isinstance(clause, dict) or set(clause) - {"required", "properties"}:
+        return None
+    properties = clause.get("properties", {})
+    if len(properties) != 1:
+        return None
+    name, pin = next(iter(properties.items()))
+    return name if _pinned_values(pin) is not None else None
+
+
+def analyze_schema(schema: Any) -> SchemaAnalysis:
+    """Estimate the per-instance cost of a schema and flag hot spots.
+
+    Args:
+        schema: Parsed JSON schema
+
+    Returns:
+        Total cost, inclusive cost per keyword (most expensive first) and
+        hot spots (most expensive first)
+    """
+    model = _CostModel(schema)
+    total = model.cost(schema, ())
+    costs: Dict[Tuple[str, str], KeywordCost] = {}
+    for entry in model.costs:
+        costs.setdefault((entry.pointer, entry.keyword), entry)
+
+    reasons: Dict[Tuple[str, str], List[str]] = {}
+
+    def flag(pointer: str, keyword: str, reason: str) -> None:
+        reasons.setdefault((pointer, keyword), []).append(reason)
+
+    for path, node, fanout in _walk_fanout(schema):
+        if not isinstance(node, dict):
+            continue
+        where = _pointer(path)
+        for keyword in ("oneOf", "anyOf"):
+            branches = node.get(keyword)
+            if not isinstance(branches, list):
+                continue
+            if len(branches) >= FANOUT_THRESHOLD:
+                flag(where, keyword, f"{len(branches)}-way {keyword} tries every branch")
+            if fanout > 1 and fanout * len(branches) >= FANOUT_THRESHOLD:
+                flag(where, keyword, f"nested fan-out of {fanout * len(branches)} combinations")
+            tag = discriminator(branches, schema, node.get("type") == "object")
+            if tag is not None:
+                flag(where, keyword, f"branches are tagged by '{tag[0]}'; dispatch on it")
+        patterns = node.get("patternProperties")
+        if isinstance(patterns, dict) and len(patterns) >= PATTERN_THRESHOLD:
+            flag(
+                where,
+                "patternProperties",
+                f"{len(patterns)} patterns matched against every property name",
+            )
+        regexes = [("pattern", node["pattern"])] if isinstance(node.get("pattern"), str) else []
+        if isinstance(patterns, dict):
+            regexes += [("patternProperties", pattern) for pattern in patterns]
+        for keyword, pattern in regexes:
+            ambiguity = find_ambiguity(pattern)
+            if ambiguity is not None:
+                flag(where, keyword, f"{pattern!r} may backtrack catastrophically: {ambiguity}")
+
+    for key, entry in costs.items():
+        if total and entry.keyword in _COSTLY and entry.cost >= HOT_SHARE * total:
+            flag(*key, f"{entry.cost / total:.0%} of the estimated cost")
+
+    hot_spots = [
+        HotSpot(pointer, keyword, costs[(pointer, keyword)].cost if (pointer, keyword) in costs else 0.0, "; ".join(why))
+        for (pointer, keyword), why in reasons.items()
+    ]
+    for paths in _duplicates(schema).values():
+        # Each copy is validated separately; sharing them is about size and upkeep
+        pointer = _pointer(paths[0])
+        cost = sum(entry.cost for (where, _), entry in costs.items() if where == pointer)
+        copies = ", ".join(_pointer(path) for path in paths[1:])
+        hot_spots.append(
+            HotSpot(pointer, "(subschema)", cost, f"repeated inline at {copies}")
+        )
+    hot_spots.sort(key=lambda spot: -spot.cost)
+    ranked = sorted(costs.values(), key=lambda entry: -entry.cost)
+    return SchemaAnalysis(total, ranked, hot_spots)
+
+
+def _walk_fanout(
+    schema: Any, path: SchemaPath = (), fanout: int = 1
+) -> Iterator[Tuple[SchemaPath, Any, int]]:
+    yield path, schema, fanout
+    for relative, sub in subschemas(schema):
+        width = len(schema[relative[0]]) if relative[0] in ("oneOf", "anyOf") else 1
+        yield from _walk_fanout(sub, path + relative, fanout * width)
+
+
+def _shareable(schema: Any) -> Optional[str]:
+    """Canonical text of a schema worth sharing, else None."""
+    if not isinstance(schema, dict) or "$ref" in schema:
+        return None
+    text = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    if len(text) < MIN_SHARED_SIZE or '"$id"' in text:
+        return None
+    return text
+
+
+def _duplicates(schema: Any) -> Dict[str, List[SchemaPath]]:
+    """Paths of subschemas that occur more than once, by canonical text."""
+    groups: Dict[str, List[SchemaPath]] = {}
+    for path, node in _walk(schema):
+        text = _shareable(node) if path else None
+        if text is not None:
+            groups.setdefault(text, []).append(path)
+    return {text: paths for text, paths in groups.items() if len(paths) > 1}
+
+
+# -- rewriting --------------------------------------------------------------
+
+
+def _is_true(schema: Any) -> bool:
+    return schema is True or schema == {}
+
+
+class _Optimizer:
+    def __init__(self, root: Any) -> None:
+        self.root = root
+        # Keywords the schema's draft defines
+        self.keywords = frozenset(draft_for(root).VALIDATORS)
+        self.changes: List[str] = []
+        self.targets: Set[Tuple[str, ...]] = set()
+        for _, node in _walk(root):
+            if isinstance(node, dict) and str(node.get("$ref", "")).startswith("#"):
+                try:
+                    self.targets.add(tuple(parse_pointer(node["$ref"][1:])))
+                except ValueError:
+                    pass
+
+    def pinned(self, path: SchemaPath) -> bool:
+        """Whether a $ref points strictly inside ``path``."""
+        prefix = tuple(str(t) for t in path)
+        n = len(prefix)
+        return any(len(t) > n and t[:n] == prefix for t in self.targets)
+
+    def rewrite(self, schema: Any, path: SchemaPath) -> Any:
+        if not isinstance(schema, dict):
+            return schema
+        result: Dict[str, Any] = {}
+        for keyword, value in schema.items():
+            if keyword in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                result[keyword] = {
+                    name: self.rewrite(sub, path + (keyword, name))
+                    if isinstance(sub, (dict, bool)) else copy.deepcopy(sub)
+                    for name, sub in value.items()
+                }
+            elif keyword in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                result[keyword] = [
+                    self.rewrite(sub, path + (keyword, index)) for index, sub in enumerate(value)
+                ]
+            elif keyword in SCHEMA_KEYWORDS:
+                result[keyword] = self.rewrite(value, path + (keyword,))
+            else:
+                result[keyword] = copy.deepcopy(value)
+        if "$ref" in result or self.pinned(path):
+            return result
+        collapsed = self._collapse(result, path)
+        if isinstance(collapsed, dict):
+            self._dispatch(collapsed, path)
+        return collapsed
+
+    def _collapse(self, schema: Dict[str, Any], path: SchemaPath) -> Any:
+        where = _pointer(path)
+        if "allOf" in schema:
+            branches = [b for b in schema["allOf"] if not _is_true(b)]
+            if any(b is False for b in branches):
+                self.changes.append(f"{where}: allOf with a false branch is false")
+                return False
+            if len(branches) < len(schema["allOf"]):
+                self.changes.append(f"{where}: dropped always-true allOf branches")
+            schema["allOf"] = branches
+        for keyword in ("anyOf", "oneOf"):
+            if keyword not in schema:
+                continue
+            branches = schema[keyword]
+            if keyword == "anyOf" and any(_is_true(b) for b in branches):
+                self.changes.append(f"{where}: anyOf with a true branch always passes")
+                del schema[keyword]
+                continue
+            kept = [b for b in branches if b is not False]
+            if not kept:
+                self.changes.append(f"{where}: {keyword} of false branches is false")
+                return False
+            if len(kept) == 1:
+                self.changes.append(f"{where}: single-branch {keyword} merged into allOf")
+                schema.setdefault("allOf", []).append(kept[0])
+                del schema[keyword]
+            elif len(kept) < len(branches):
+                self.changes.append(f"{where}: dropped false {keyword} branches")
+                schema[keyword] = kept
+        if "not" in schema:
+            if schema["not"] is False:
+                self.changes.append(f"{where}: dropped 'not' of a false schema")
+                del schema["not"]
+            elif _is_true(schema["not"]):
+                self.changes.append(f"{where}: 'not' of a true schema is false")
+                return False
+        conditional = "if" in self.keywords and "if" in schema
+        if conditional and (_is_true(schema["if"]) or schema["if"] is False):
+            branch = schema.get("then" if schema["if"] is not False else "else")
+            self.changes.append(f"{where}: constant 'if' replaced by its branch")
+            for keyword in ("if", "then", "else"):
+                schema.pop(keyword, None)
+            if branch is not None and not _is_true(branch):
+                schema.setdefault("allOf", []).append(branch)
+        if conditional and "if" in schema and "then" not in schema and "else" not in schema:
+            del schema["if"]
+        if (
+            "const" in self.keywords
+            and isinstance(schema.get("enum"), list)
+            and len(schema["enum"]) == 1
+        ):
+            schema["const"] = schema.pop("enum")[0]
+        if "allOf" in schema and not schema["allOf"]:
+            del schema["allOf"]
+        if list(schema) == ["allOf"] and len(schema["allOf"]) == 1:
+            return schema["allOf"][0]
+        return schema
+
+    def _dispatch(self, schema: Dict[str, Any], path: SchemaPath) -> None:
+        if "if" not in self.keywords:
+            return
+        object_only = schema.get("type") in ("object", ["object"])
+        for keyword in ("oneOf", "anyOf"):
+            branches = schema.get(keyword)
+            if not isinstance(branches, list):
+                continue
+            tag = discriminator(branches, self.root, object_only)
+            if tag is None:
+                continue
+            name, values = tag
+            head: Dict[str, Any] = {
+                "required": [name],
+                "properties": {name: {"enum": [v for vs in values for v in vs]}},
+            }
+            if not object_only:
+                head["type"] = "object"
+            entries = [
+                {
+                    "if": {"required": [name], "properties": {name: _pin(vs)}},
+                    "then": branch,
+                }
+                for branch, vs in zip(branches, values)
+            ]
+            schema.setdefault("allOf", []).extend([head] + entries)
+            del schema[keyword]
+            self.changes.append(
+                f"{_pointer(path)}: {keyword} of {len(branches)} branches "
+                f"dispatched on '{name}'"
+            )
+
+    def deduplicate(self, schema: Any) -> Any:
+        if not isinstance(schema, dict):
+            return schema
+        while True:
+            best = None
+            for text, paths in _duplicates(schema).items():
+                inline = [p for p in paths if not _is_definition(p) and not self.pinned(p)]
+                # Worth it when a definition already exists, or two copies merge
+                if len(inline) < (1 if any(map(_is_definition, paths)) else 2):
+                    continue
+                if best is None or len(text) > len(best[0]):
+                    best = (text, paths, inline)
+            if best is None:
+                return schema
+
+            text, paths, inline = best
+            definitions = schema.setdefault("definitions", {})
+            existing = [p for p in paths if _is_definition(p)]
+            if existing:
+                name = existing[0][1]
+            else:
+                name = _unique_name(inline[0], definitions)
+                definitions[name] = json.loads(text)
+            ref = _pointer(("definitions", name))
+            for path in inline:
+                _set_at(schema, path, {"$ref": ref})
+            self.changes.append(
+                f"{_pointer(inline[0])}: {len(inline)} inline copies shared as {ref}"
+            )
+
+
+def _is_definition(path: SchemaPath) -> bool:
+    return len(path) == 2 and path[0] == "definitions"
+
+
+def _pin(values: List[Any]) -> Dict[str, Any]:
+    return {"const": values[0]} if len(values) == 1 else {"enum": values}
+
+
+def _unique_name(path: SchemaPath, definitions: Dict[str, Any]) -> str:
+    base = next(
+        (
+            str(t) for t in reversed(path)
+            if isinstance(t, str) and t not in SCHEMA_KEYWORDS + SCHEMA_LIST_KEYWORDS
+            + SCHEMA_MAP_KEYWORDS
+        ),
+        "shared",
+    )
+    name, suffix = base, 2
+    while name in definitions:
+        name, suffix = f"{base}_{suffix}", suffix + 1
+    return name
+
+
+def _set_at(schema: Any, path: SchemaPath, value: Any) -> None:
+    for token in path[:-1]:
+        schema = schema[token]
+    schema[path[-1]] = value
+
+
+def optimize_schema(schema: Any) -> Tuple[Any, List[str]]:
+    """Rewrite a schema into a cheaper one that accepts the same instances.
+
+    Args:
+        schema: Parsed JSON schema (not modified)
+
+    Returns:
+        The optimized schema and a description of each rewrite
+    """
+    optimizer = _Optimizer(schema)
+    optimized = optimizer.rewrite(schema, ())
+    optimized = optimizer.deduplicate(optimized)
+    return optimized, optimizer.changes
+
+
+def check_equivalence(
+    original: Any, optimized: Any, samples: int = 1000, seed: int = 0
+) -> Equivalence:
+    """Compare verdicts of two schemas on a generated corpus.
+
+    Instances are generated from ``original`` with half of them mutated
+    to be invalid, plus a few values of every JSON type. Both schemas are
+    read with the draft ``original`` declares.
+
+    Args:
+        original: The schema instances are generated from
+        optimized: The schema to compare against it
+        samples: Number of generated instances
+        seed: Random seed for generation
+
+    Returns:
+        Sample count and the instances on which the verdicts differ
+
+    Raises:
+        SchemaError: If instances cannot be generated from ``original``
+    """
+    draft = draft_for(original)
+    before = draft(original)
+    after = draft(optimized)
+    instances = list(_EDGE_CASES) + [
+        value for value, _ in generate_instances(original, samples, seed, mutation_rate=0.5)
+    ]
+    mismatches = [
+        value for value in instances if before.is_valid(value) != after.is_valid(value)
+    ]
+    return Equivalence(len(instances), mismatches)
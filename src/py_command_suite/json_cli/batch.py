@@ -0,0 +1,150 @@
+"""Multi-file validation with per-file results."""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .exceptions import JSONValidationError, SchemaError
+from .metrics import record_schema_cache, track_file
+from .positions import attach_source_positions
+from .validator import load_json_file, load_schema_file, validate_json_against_schema
+
+
+class FileResult(NamedTuple):
+    """Outcome of validating a single file.
+
+    Plain data only, so results can cross process boundaries.
+    """
+
+    path: str
+    schema: Optional[str]
+    ok: bool
+    error_type: Optional[str] = None
+    message: Optional[str] = None
+    validation_errors: Tuple[str, ...] = ()
+    # Metrics collected by a worker process (``metrics.take_worker_metrics``)
+    worker_metrics: Optional[Dict[str, Any]] = None
+
+
+class SchemaStore:
+    """Loads each schema file once per batch run; safe to share between threads."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._schemas: Dict[Path, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, schema_path: Path) -> Dict[str, Any]:
+        """Return the parsed schema, loading it on first use.
+
+        Args:
+            schema_path: Path to the JSON schema file
+
+        Returns:
+            Parsed schema as dictionary
+
+        Raises:
+            SchemaError: If the schema cannot be loaded (also cached)
+        """
+        cached = self._schemas.get(schema_path)
+        record_schema_cache(cached is not None)
+        if cached is None:
+            with self._lock:
+                # Another thread may have loaded it while this one waited
+                cached = self._schemas.get(schema_path)
+                if cached is None:
+                    try:
+                        cached = load_schema_file(schema_path)
+                    except SchemaError as e:
+                        cached = e
+                    self._schemas[schema_path] = cached
+        if isinstance(cached, SchemaError):
+            raise cached
+        return cached
+
+
+def validate_one(
+    json_path: Path,
+    schema_path: Optional[Path],
+    schemas: SchemaStore,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+    check_formats: bool = False,
+) -> FileResult:
+    """Validate one file, capturing failures as a result instead of raising.
+
+    Args:
+        json_path: Path to the JSON file
+        schema_path: Optional schema to validate against
+        schemas: Schema store shared across the batch
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        The file's result
+    """
+    schema_name = str(schema_path) if schema_path else None
+    try:
+        with track_file(json_path):
+            json_data = load_json_file(json_path, validate_size, max_size_mb)
+            if schema_path is not None:
+                schema = schemas.get(schema_path)
+                try:
+                    validate_json_against_schema(
+                        json_data, schema, str(json_path), check_formats
+                    )
+                except JSONValidationError as e:
+                    attach_source_positions(e, json_path)
+                    raise
+    except Exception as e:
+        return failed_result(json_path, schema_path, e)
+    return FileResult(str(json_path), schema_name, True)
+
+
+def failed_result(
+    json_path: Path, schema_path: Optional[Path], error: Exception
+) -> FileResult:
+    """Describe a failure as a result.
+
+    Args:
+        json_path: Path to the JSON file
+        schema_path: Schema it was validated against, if any
+        error: What went wrong
+
+    Returns:
+        A failed result carrying the error's class, message and details
+    """
+    details = error.validation_errors if isinstance(error, JSONValidationError) else ()
+    return FileResult(
+        str(json_path),
+        str(schema_path) if schema_path else None,
+        False,
+        type(error).__name__,
+        str(error),
+        tuple(details),
+    )
+
+
+def validate_many(
+    jobs: Iterable[Tuple[Path, Optional[Path]]],
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+    check_formats: bool = False,
+) -> Iterator[FileResult]:
+    """Validate a stream of (document, schema) pairs.
+
+    Args:
+        jobs: Pairs of document path and optional schema path
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
+        check_formats: Whether to enforce ``format``
+
+    Yields:
+        One result per job, in order
+    """
+    schemas = SchemaStore()
+    for json_path, schema_path in jobs:
+        yield validate_one(
+            json_path, schema_path, schemas, validate_size, max_size_mb, check_formats
+        )
@@ -0,0 +1,219 @@
+"""Opt-in LRU cache of validation verdicts for repeated payloads.
+
+Entries are keyed by a BLAKE2b digest of the payload bytes plus a
+fingerprint of the schema, so a repeated payload is answered without
+parsing or validating it again. Failures are cached too and re-raised as
+fresh exception objects, so callers never share mutable error state.
+
+Schemas are fingerprinted from their canonical JSON the first time they
+are seen and treated as immutable afterwards; pass ``schema_key`` to
+supply an identity instead.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .exceptions import JSONCliError, JSONParseError, JSONValidationError
+from .validator import Payload, _validate_payload
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 256
+_SCHEMA_MEMO_SIZE = 64
+
+
+class CacheStats(NamedTuple):
+    """Counters for a ValidationCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry(NamedTuple):
+    error: Optional[JSONCliError]
+    size: int
+    expires: float
+
+
+class ValidationCache:
+    """Thread-safe, byte-bounded LRU of validation results."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached results
+            ttl: Seconds an entry stays valid (None for no expiry)
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[bytes, bytes], _Entry]" = OrderedDict()
+        self._schema_keys: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def validate(
+        self,
+        payload: Payload,
+        schema: Optional[Dict[str, Any]] = None,
+        source: Optional[str] = None,
+        schema_key: Optional[str] = None,
+    ) -> bool:
+        """Validate a payload, answering repeats from the cache.
+
+        Args:
+            payload: JSON text or UTF-8/16/32 bytes
+            schema: Schema to validate against (None for syntax only)
+            source: Optional name for the payload in error messages
+            schema_key: Stable identity for ``schema``; computed if omitted
+
+        Returns:
+            True if the payload is valid
+
+        Raises:
+            JSONParseError: If the payload is not valid JSON
+            JSONValidationError: If the payload does not match the schema
+        """
+        # Buffers are hashed and decoded in place
+        data: Any = (
+            payload.encode("utf-8", "surrogatepass") if isinstance(payload, str) else payload
+        )
+        key = (self._digest(data, source), self._schema_key(schema, schema_key))
+
+        entry = self._get(key)
+        if entry is not None:
+            if entry.error is not None:
+                raise _copy_error(entry.error)
+            return True
+
+        try:
+            _validate_payload(payload, schema, source)
+        except (JSONParseError, JSONValidationError) as e:
+            # Store a copy: the raised one will carry this frame's traceback
+            self._put(key, _copy_error(e))
+            raise
+        self._put(key, None)
+        return True
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self._bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @staticmethod
+    def _digest(data: Any, source: Optional[str]) -> bytes:
+        digest = hashlib.blake2b(data, digest_size=16)
+        if source:
+            # Messages embed the source name, so it is part of the result
+            digest.update(b"\0" + source.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def _schema_key(self, schema: Optional[Dict[str, Any]], schema_key: Optional[str]) -> bytes:
+        if schema_key is not None:
+            return b"k" + schema_key.encode()
+        if schema is None:
+            return b""
+        with self._lock:
+            memo = self._schema_keys.get(id(schema))
+            # Holding the schema keeps its id from being reused
+            if memo is not None and memo[0] is schema:
+                self._schema_keys.move_to_end(id(schema))
+                return memo[1]
+        canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+        fingerprint = b"s" + hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+        with self._lock:
+            self._schema_keys[id(schema)] = (schema, fingerprint)
+            if len(self._schema_keys) > _SCHEMA_MEMO_SIZE:
+                self._schema_keys.popitem(last=False)
+        return fingerprint
+
+    def _get(self, key: Tuple[bytes, bytes]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires <= self._clock():
+                self._remove(key, entry)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def _put(self, key: Tuple[bytes, bytes], error: Optional[JSONCliError]) -> None:
+        size = ENTRY_OVERHEAD + _error_size(error)
+        if size > self.max_bytes:
+            return
+        expires = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = _Entry(error, size, expires)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest, entry = next(iter(self._entries.items()))
+                self._remove(oldest, entry)
+                self._evictions += 1
+
+    def _remove(self, key: Tuple[bytes, bytes], entry: _Entry) -> None:
+        del self._entries[key]
+        self._bytes -= entry.size
+
+
+def _error_size(error: Optional[JSONCliError]) -> int:
+    if error is None:
+        return 0
+    size = len(str(error))
+    if isinstance(error, JSONValidationError):
+        size += sum(len(entry) + 64 for entry in error.validation_errors)
+    return size
+
+
+def _copy_error(error: JSONCliError) -> JSONCliError:
+    """Return an independent copy of a cached error, ready to raise."""
+    if isinstance(error, JSONValidationError):
+        return JSONValidationError(
+            str(error),
+            error.file_path,
+            list(error.validation_errors),
+            list(error.error_paths),
+            list(error.error_positions),
+        )
+    return type(error)(str(error), error.file_path)
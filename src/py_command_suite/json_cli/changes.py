@@ -0,0 +1,156 @@
+"""Selection of the documents affected by a git diff.
+
+``git diff --name-status`` lists what changed (renames included, via
+``-M``); each changed document is mapped to its schema through the usual
+``SchemaConfig``. A changed schema brings back every document mapped to
+it, and a changed configuration file brings back everything, since the
+mapping itself may differ. Otherwise the directory is never crawled, so
+the cost follows the size of the diff rather than of the repository.
+
+Only the selection comes from git: the documents are read from the
+working tree, so with ``staged`` a file with unstaged edits is validated
+as it is on disk, not as it is in the index.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .crawler import SchemaConfig, crawl
+from .exceptions import GitError
+
+
+class Change(NamedTuple):
+    """One entry of ``git diff --name-status``."""
+
+    status: str
+    path: Path
+    old_path: Optional[Path] = None
+
+
+def _git(root: Path, *args: str) -> str:
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=root, capture_output=True, check=True
+        )
+    except FileNotFoundError:
+        raise GitError("git is not installed or not on PATH")
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", "replace").strip() or f"exit status {e.returncode}"
+        raise GitError(f"git {' '.join(args)} failed: {message}", str(root))
+    return os.fsdecode(completed.stdout)
+
+
+def git_changes(root: Path, since: Optional[str] = None, staged: bool = False) -> List[Change]:
+    """List the files changed in the repository containing ``root``.
+
+    Args:
+        root: Any directory inside the repository
+        since: Compare the working tree with this commit (any ``git diff``
+            revision, e.g. ``origin/main`` or ``main...HEAD``)
+        staged: Compare the index with ``HEAD`` instead (or with ``since``)
+
+    Returns:
+        Changes with absolute paths; a rename or copy also carries the old path
+
+    Raises:
+        GitError: If git is unavailable, ``root`` is not in a repository, or
+            the revision is unknown
+    """
+    top = Path(_git(root, "rev-parse", "--show-toplevel").strip())
+    args = ["diff", "--name-status", "-z", "-M", "--no-ext-diff"]
+    if staged:
+        args.append("--cached")
+    if since is not None:
+        args.append(since)
+    fields = _git(root, *args, "--").split("\0")
+
+    changes: List[Change] = []
+    i = 0
+    while i + 1 < len(fields):
+        status = fields[i]
+        if status[:1] in ("R", "C"):
+            changes.append(Change(status[0], top / fields[i + 2], top / fields[i + 1]))
+            i += 3
+        else:
+            changes.append(Change(status[:1], top / fields[i + 1]))
+            i += 2
+    return changes
+
+
+def _relative(path: Path, root: Path) -> Optional[str]:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return None
+
+
+def _is_candidate(path: Path, rel_path: str, config: SchemaConfig) -> bool:
+    """Apply the crawl's ignore and include rules to a single path."""
+    parts = rel_path.split("/")
+    for depth in range(1, len(parts)):
+        if config.is_ignored("/".join(parts[:depth]), parts[depth - 1], True):
+            return False
+    name = parts[-1]
+    return (
+        not config.is_ignored(rel_path, name, False)
+        and config.is_selected(rel_path, name)
+        and not config.is_own_file(os.fspath(path), name)
+    )
+
+
+def changed_jobs(
+    root: Path,
+    config: SchemaConfig,
+    since: Optional[str] = None,
+    staged: bool = False,
+) -> Iterator[Tuple[Path, Optional[Path]]]:
+    """Yield the documents below ``root`` affected by a diff, with their schemas.
+
+    Args:
+        root: Directory being validated (inside a git repository)
+        config: Schema mapping and include/ignore rules
+        since: Revision to compare the working tree (or index) with
+        staged: Use the staged changes (the documents are still read
+            from the working tree)
+
+    Yields:
+        Tuples of (document path, schema path or None), each document once
+
+    Raises:
+        GitError: If the changes cannot be listed
+    """
+    root = root.resolve()
+    changes = git_changes(root, since, staged)
+    touched = {change.path.resolve() for change in changes}
+    touched.update(change.old_path.resolve() for change in changes if change.old_path)
+
+    if config.config_path is not None and config.config_path.resolve() in touched:
+        yield from crawl(root, config)
+        return
+
+    schemas = set(config.schema_paths)
+    if config.default_schema is not None:
+        schemas.add(config.default_schema.resolve())
+    changed_schemas = schemas & touched
+
+    seen: Set[Path] = set()
+    for change in changes:
+        if change.status == "D":
+            continue
+        rel_path = _relative(change.path.resolve(), root)
+        if rel_path is None or not _is_candidate(change.path, rel_path, config):
+            continue
+        if not change.path.is_file():
+            continue
+        seen.add(change.path.resolve())
+        yield change.path, config.schema_for(rel_path)
+
+    if changed_schemas:
+        # Dependents are only known by mapping every document
+        for path, schema in crawl(root, config):
+            if schema is not None and schema.resolve() in changed_schemas:
+                if path.resolve() not in seen:
+                    seen.add(path.resolve())
+                    yield path, schema
@@ -0,0 +1,319 @@
+"""Columnar fast path for arrays of flat, simply-constrained records.
+
+Schemas of the form ``{"type": "array", "items": {"type": "object",
+"properties": {...}, "required": [...]}}`` whose properties only use
+``type``, ``enum``, ``minimum``, ``maximum`` and ``maxLength`` are checked a
+batch at a time: records are turned into columns and each constraint is
+evaluated over a whole column (with NumPy when installed). The column
+checks may over-report but never miss a failing row; flagged rows are then
+re-validated with ``jsonschema`` so error messages are identical to the
+regular path.
+"""
+
+import math
+import operator
+from itertools import repeat
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import jsonschema
+from jsonschema import ValidationError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_ANNOTATIONS = frozenset(
+    {"title", "description", "default", "examples", "$comment", "$id", "$schema"}
+)
+_FIELD_KEYWORDS = frozenset({"type", "enum", "minimum", "maximum", "maxLength"})
+_ITEM_KEYWORDS = frozenset({"type", "properties", "required", "additionalProperties"})
+_ARRAY_KEYWORDS = frozenset({"type", "items"})
+_LEGACY_DRAFTS = ("draft-03", "draft-04")
+# Integers beyond this do not all survive conversion to float64
+_FLOAT_EXACT = 2**53
+
+_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+def _float_exact(bound: Any) -> bool:
+    """Return True if a bound compares the same once converted to float64."""
+    return bound is None or type(bound) is float or abs(bound) <= _FLOAT_EXACT
+
+
+class _Missing:
+    """Placeholder for absent keys in a column."""
+
+
+_MISSING = _Missing()
+
+
+class FieldPlan:
+    """Column checks for one record property."""
+
+    def __init__(self, name: str, schema: Dict[str, Any]) -> None:
+        """Extract the supported constraints from a property subschema.
+
+        Args:
+            name: Property name
+            schema: Property subschema (already known to be supported)
+        """
+        self.name = name
+        self.getter = operator.methodcaller("get", name, _MISSING)
+
+        types = schema.get("type")
+        self.types: Optional[Set[type]] = None
+        self.integral_floats = False
+        if types is not None:
+            names = [types] if isinstance(types, str) else list(types)
+            self.types = {_Missing}
+            for type_name in names:
+                self.types.update(_JSON_TYPES[type_name])
+            # Draft 6+ treats 1.0 as an integer
+            self.integral_floats = "integer" in names and "number" not in names
+
+        self.enum: Optional[List[Any]] = schema.get("enum")
+        self.enum_keys: Optional[Set[Any]] = None
+        if self.enum is not None:
+            try:
+                self.enum_keys = {_enum_key(v) for v in self.enum}
+            except TypeError:
+                self.enum_keys = None
+
+        self.minimum = schema.get("minimum")
+        self.maximum = schema.get("maximum")
+        self.max_length = schema.get("maxLength")
+
+    def failing_rows(self, column: List[Any]) -> Set[int]:
+        """Return a superset of the row indices violating this field's constraints."""
+        failing: Set[int] = set()
+        present_types = set(map(type, column))
+
+        if self.types is not None:
+            bad = present_types - self.types
+            if self.integral_floats and float in present_types:
+                failing.update(
+                    i
+                    for i, v in enumerate(column)
+                    if type(v) is float and not v.is_integer()
+                )
+            if bad:
+                failing.update(i for i, v in enumerate(column) if type(v) in bad)
+
+        if self.enum is not None:
+            failing.update(self._enum_failures(column))
+
+        if self.minimum is not None or self.maximum is not None:
+            failing.update(self._range_failures(column, present_types))
+
+        if self.max_length is not None and str in present_types:
+            failing.update(self._length_failures(column, present_types))
+
+        return failing
+
+    def _enum_failures(self, column: List[Any]) -> Iterator[int]:
+        if self.enum_keys is not None:
+            try:
+                distinct = set(map(_enum_key, column))
+            except TypeError:
+                distinct = None
+            if distinct is not None:
+                distinct.discard(_enum_key(_MISSING))
+                if distinct <= self.enum_keys:
+                    return iter(())
+                bad = distinct - self.enum_keys
+                return (
+                    i
+                    for i, v in enumerate(column)
+                    if v is not _MISSING and _enum_key(v) in bad
+                )
+        return (
+            i
+            for i, v in enumerate(column)
+            if v is not _MISSING and not _in_enum(v, self.enum or [])
+        )
+
+    def _range_failures(self, column: List[Any], present_types: Set[type]) -> Iterator[int]:
+        lo, hi = self.minimum, self.maximum
+        # One type per column: NumPy would widen mixed ints to float64
+        kind = None
+        if present_types == {int}:
+            kind = "i"
+        elif present_types == {float} and _float_exact(lo) and _float_exact(hi):
+            kind = "f"
+
+        if kind is not None and np is not None:
+            arr = np.asarray(column)
+            # Ints beyond int64 come back as uint64, float64 or objects
+            if arr.dtype.kind == kind:
+                if kind == "i":
+                    lo = None if lo is None else math.ceil(lo)
+                    hi = None if hi is None else math.floor(hi)
+                mask = np.zeros(arr.shape, dtype=bool)
+                if lo is not None:
+                    mask |= arr < lo
+                if hi is not None:
+                    mask |= arr > hi
+                return iter(np.flatnonzero(mask).tolist())
+
+        values = [v for v in column if type(v) is int or type(v) is float]
+        if not values:
+            return iter(())
+        if (lo is None or min(values) >= lo) and (hi is None or max(values) <= hi):
+            return iter(())
+        return (
+            i
+            for i, v in enumerate(column)
+            if (type(v) is int or type(v) is float)
+            and ((lo is not None and v < lo) or (hi is not None and v > hi))
+        )
+
+    def _length_failures(self, column: List[Any], present_types: Set[type]) -> Iterator[int]:
+        limit = self.max_length
+        if present_types == {str}:
+            if np is not None:
+                lengths = np.fromiter(map(len, column), dtype=np.int64, count=len(column))
+                return iter(np.flatnonzero(lengths > limit).tolist())
+            if max(map(len, column)) <= limit:
+                return iter(())
+        return (i for i, v in enumerate(column) if type(v) is str and len(v) > limit)
+
+
+def _enum_key(value: Any) -> Tuple[bool, Any]:
+    """Hashable key giving enum membership JSON semantics (True != 1)."""
+    return (type(value) is bool, value)
+
+
+def _in_enum(value: Any, enum: Sequence[Any]) -> bool:
+    if isinstance(value, (dict, list)):
+        # Nested True/1 equality differs from Python's; let jsonschema decide
+        return False
+    return any(
+        (type(value) is bool) == (type(e) is bool) and value == e for e in enum
+    )
+
+
+class RecordPlan:
+    """Compiled columnar validator for an array-of-records schema."""
+
+    def __init__(self, schema: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Build column checks from a schema accepted by ``compile_record_plan``.
+
+        Args:
+            schema: The array schema
+            batch_size: Records converted to columns at a time
+        """
+        self.item_schema: Dict[str, Any] = schema["items"]
+        self.batch_size = batch_size
+        self.required = frozenset(self.item_schema.get("required", ()))
+        self.fields = [
+            FieldPlan(name, subschema)
+            for name, subschema in self.item_schema.get("properties", {}).items()
+        ]
+        self._item_validator = jsonschema.Draft7Validator(self.item_schema)
+
+    def failing_rows(self, records: Sequence[Any]) -> List[int]:
+        """Return a superset of the indices of invalid records, in order."""
+        failing: Set[int] = set()
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start : start + self.batch_size]
+            if set(map(type, batch)) != {dict}:
+                # Non-objects are rare; leave them to jsonschema
+                failing.update(
+                    start + i for i, r in enumerate(batch) if type(r) is not dict
+                )
+                batch = [r if type(r) is dict else {} for r in batch]
+
+            if self.required and not all(
+                map(operator.ge, map(dict.keys, batch), repeat(self.required))
+            ):
+                failing.update(
+                    start + i
+                    for i, r in enumerate(batch)
+                    if not r.keys() >= self.required
+                )
+
+            for field in self.fields:
+                column = list(map(field.getter, batch))
+                failing.update(start + i for i in field.failing_rows(column))
+        return sorted(failing)
+
+    def iter_errors(self, records: Sequence[Any]) -> Iterator[ValidationError]:
+        """Yield jsonschema errors for the records, with row-prefixed paths."""
+        for index in self.failing_rows(records):
+            for error in self._item_validator.iter_errors(records[index]):
+                error.path.appendleft(index)
+                error.schema_path.appendleft("items")
+                yield error
+
+
+def _is_simple_field(schema: Any) -> bool:
+    if not isinstance(schema, dict):
+        return False
+    if not set(schema) <= _FIELD_KEYWORDS | _ANNOTATIONS:
+        return False
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else types
+        if not isinstance(names, list) or not all(n in _JSON_TYPES for n in names):
+            return False
+    if "enum" in schema and not isinstance(schema["enum"], list):
+        return False
+    for key in ("minimum", "maximum"):
+        value = schema.get(key)
+        if value is not None and (type(value) not in (int, float)):
+            return False
+    max_length = schema.get("maxLength")
+    if max_length is not None and type(max_length) is not int:
+        return False
+    return True
+
+
+def compile_record_plan(
+    schema: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Optional[RecordPlan]:
+    """Return a columnar plan if the schema qualifies for the fast path.
+
+    Args:
+        schema: The JSON schema to inspect
+        batch_size: Records converted to columns at a time
+
+    Returns:
+        A RecordPlan, or None if the schema needs the general validator
+    """
+    if not isinstance(schema, dict):
+        return None
+    if any(d in str(schema.get("$schema", "")) for d in _LEGACY_DRAFTS):
+        return None
+    if not set(schema) <= _ARRAY_KEYWORDS | _ANNOTATIONS:
+        return None
+    if schema.get("type", "array") != "array":
+        return None
+
+    items = schema.get("items")
+    if not isinstance(items, dict) or not set(items) <= _ITEM_KEYWORDS | _ANNOTATIONS:
+        return None
+    if items.get("type", "object") != "object":
+        return None
+    if items.get("additionalProperties", True) is not True:
+        return None
+    required = items.get("required", [])
+    if not isinstance(required, list) or not all(isinstance(r, str) for r in required):
+        return None
+    properties = items.get("properties", {})
+    if not isinstance(properties, dict):
+        return None
+    if not all(_is_simple_field(sub) for sub in properties.values()):
+        return None
+
+    return RecordPlan(schema, batch_size)
@@ -0,0 +1,365 @@
+"""Recursive directory crawling with glob-to-schema mapping."""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .exceptions import ConfigError
+
+DEFAULT_CONFIG_NAME = ".json-validate.json"
+DEFAULT_INCLUDE = ("*.json",)
+DEFAULT_IGNORE = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+)
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regular expression.
+
+    ``*`` and ``?`` never cross a ``/``, ``**`` spans directories, and a
+    pattern without a slash matches a basename at any depth.
+
+    Args:
+        pattern: Glob pattern using ``/`` as separator
+
+    Returns:
+        Regex source suitable for ``fullmatch`` against a relative POSIX path
+    """
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    regex = "".join(out)
+    return regex if anchored else f"(?:.*/)?{regex}"
+
+
+class PatternMatcher:
+    """Ordered set of globs compiled into a single lookup structure.
+
+    Literal paths and ``*.suffix`` patterns are resolved with dictionary
+    lookups; every other glob is folded into one alternation regex, so a
+    lookup costs a couple of hash probes plus a single regex call no
+    matter how many patterns are configured. The lowest-indexed matching
+    pattern wins.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        """Compile the patterns.
+
+        Args:
+            patterns: Glob patterns in priority order
+        """
+        self.patterns = list(patterns)
+        self._literals: Dict[str, int] = {}
+        self._basenames: Dict[str, int] = {}
+        self._suffixes: Dict[str, int] = {}
+        alternatives: List[str] = []
+
+        for index, pattern in enumerate(self.patterns):
+            body = pattern.strip("/")
+            anchored = "/" in pattern.rstrip("/")
+            if not _WILDCARD_CHARS.intersection(body):
+                table = self._literals if anchored else self._basenames
+                table.setdefault(body, index)
+            elif (
+                not anchored
+                and body.startswith("*")
+                and (body == "*" or body.startswith("*."))
+                and not _WILDCARD_CHARS.intersection(body[1:])
+            ):
+                self._suffixes.setdefault(body[1:], index)
+            else:
+                alternatives.append(f"(?P<p{index}>{glob_to_regex(pattern)})")
+
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, rel_path: str, name: Optional[str] = None) -> Optional[int]:
+        """Return the index of the first pattern matching a path.
+
+        Args:
+            rel_path: Path relative to the crawl root, ``/``-separated
+            name: Basename of ``rel_path`` if the caller already has it
+
+        Returns:
+            Index into ``patterns`` or None if nothing matches
+        """
+        if name is None:
+            name = rel_path.rpartition("/")[2]
+        best: Optional[int] = None
+
+        hit = self._literals.get(rel_path)
+        if hit is not None:
+            best = hit
+        hit = self._basenames.get(name)
+        if hit is not None and (best is None or hit < best):
+            best = hit
+        if self._suffixes:
+            dot = name.find(".")
+            while dot != -1:
+                hit = self._suffixes.get(name[dot:])
+                if hit is not None and (best is None or hit < best):
+                    best = hit
+                dot = name.find(".", dot + 1)
+            hit = self._suffixes.get("")
+            if hit is not None and (best is None or hit < best):
+                best = hit
+
+        if self._regex is not None and (best is None or best > 0):
+            m = self._regex.fullmatch(rel_path)
+            if m is not None:
+                hit = int(m.lastgroup[1:])  # type: ignore[index]
+                if best is None or hit < best:
+                    best = hit
+        return best
+
+
+class SchemaConfig:
+    """Mapping of glob patterns to schema files plus include/ignore rules.
+
+    The configuration file is JSON::
+
+        {
+          "schemas": {"config/**/*.json": "schemas/config.schema.json"},
+          "include": ["*.json"],
+          "ignore": ["node_modules", "build/"]
+        }
+
+    Schema paths are resolved relative to the configuration file. Ignore
+    patterns ending in ``/`` only apply to directories.
+    """
+
+    def __init__(
+        self,
+        schemas: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = DEFAULT_INCLUDE,
+        ignore: Sequence[str] = DEFAULT_IGNORE,
+        base_dir: Optional[Path] = None,
+        default_schema: Optional[Path] = None,
+        config_path: Optional[Path] = None,
+    ) -> None:
+        """Build the matchers.
+
+        Args:
+            schemas: Ordered mapping of glob pattern to schema path
+            include: Globs selecting candidate documents
+            ignore: Names or globs pruned from the crawl
+            base_dir: Directory relative schema paths are resolved against
+            default_schema: Schema for selected files no pattern maps
+            config_path: File the configuration was loaded from, if any
+        """
+        self.config_path = config_path
+        base_dir = base_dir or Path.cwd()
+        schemas = schemas or {}
+        self.schema_paths: List[Path] = [
+            (base_dir / str(target)).resolve() for target in schemas.values()
+        ]
+        self.default_schema = default_schema
+        # The config and schema files are inputs, never documents to validate
+        self._own_files: Dict[str, set] = {}
+        for own in (config_path, default_schema, *self.schema_paths):
+            if own is not None:
+                own = Path(own).resolve()
+                self._own_files.setdefault(own.name, set()).add(os.fspath(own))
+        self._schema_matcher = PatternMatcher(list(schemas))
+        self._include_matcher = PatternMatcher(list(include))
+
+        ignore_globs: List[str] = []
+        dir_globs: List[str] = []
+        self._ignore_names: set = set()
+        self._ignore_dir_names: set = set()
+        for pattern in ignore:
+            dir_only = pattern.endswith("/")
+            body = pattern.strip("/")
+            if "/" not in pattern.rstrip("/") and not _WILDCARD_CHARS.intersection(body):
+                (self._ignore_dir_names if dir_only else self._ignore_names).add(body)
+            else:
+                (dir_globs if dir_only else ignore_globs).append(pattern)
+        self._ignore_matcher = PatternMatcher(ignore_globs)
+        self._ignore_dir_matcher = PatternMatcher(dir_globs)
+
+    @classmethod
+    def from_file(
+        cls, config_path: Path, default_schema: Optional[Path] = None
+    ) -> "SchemaConfig":
+        """Load a configuration file.
+
+        Args:
+            config_path: Path to the JSON configuration file
+            default_schema: Schema for selected files no pattern maps
+
+        Returns:
+            Parsed configuration
+
+        Raises:
+            ConfigError: If the file cannot be read or is malformed
+        """
+        try:
+            with config_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ConfigError(f"Failed to load config {config_path}: {e}", str(config_path))
+
+        if not isinstance(data, dict):
+            raise ConfigError(
+                f"Config {config_path} must be a JSON object", str(config_path)
+            )
+        schemas = data.get("schemas", {})
+        include = data.get("include", list(DEFAULT_INCLUDE))
+        ignore = data.get("ignore", list(DEFAULT_IGNORE))
+        if not isinstance(schemas, dict) or not all(
+            isinstance(v, str) for v in schemas.values()
+        ):
+            raise ConfigError(
+                f"'schemas' in {config_path} must map glob patterns to schema paths",
+                str(config_path),
+            )
+        for key, value in (("include", include), ("ignore", ignore)):
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ConfigError(
+                    f"'{key}' in {config_path} must be a list of glob patterns",
+                    str(config_path),
+                )
+
+        return cls(
+            schemas,
+            include=include,
+            ignore=ignore,
+            base_dir=config_path.parent,
+            default_schema=default_schema,
+            config_path=config_path,
+        )
+
+    def schema_for(self, rel_path: str, name: Optional[str] = None) -> Optional[Path]:
+        """Return the schema mapped to a relative path, if any."""
+        index = self._schema_matcher.match(rel_path, name)
+        if index is None:
+            return self.default_schema
+        return self.schema_paths[index]
+
+    def is_selected(self, rel_path: str, name: Optional[str] = None) -> bool:
+        """Return True if a file should be validated."""
+        return (
+            self._include_matcher.match(rel_path, name) is not None
+            or self._schema_matcher.match(rel_path, name) is not None
+        )
+
+    def is_own_file(self, path: str, name: str) -> bool:
+        """Return True if a file is the configuration or one of its schemas."""
+        own = self._own_files.get(name)
+        return own is not None and os.path.realpath(path) in own
+
+    def is_ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        """Return True if an entry (and, for directories, its subtree) is skipped."""
+        if name in self._ignore_names:
+            return True
+        if is_dir and name in self._ignore_dir_names:
+            return True
+        if self._ignore_matcher.match(rel_path, name) is not None:
+            return True
+        return is_dir and self._ignore_dir_matcher.match(rel_path, name) is not None
+
+
+def crawl(root: Path, config: SchemaConfig) -> Iterator[Tuple[Path, Optional[Path]]]:
+    """Walk a directory tree yielding documents and their schemas.
+
+    Uses ``os.scandir`` with an explicit stack; ignored directories are
+    pruned before they are opened and symlinked directories are not
+    followed. The configuration file and the schemas it references are
+    never yielded as documents.
+
+    Args:
+        root: Directory to crawl
+        config: Schema mapping and include/ignore rules
+
+    Yields:
+        Tuples of (document path, schema path or None)
+    """
+    root_str = os.fspath(root)
+    stack: List[Tuple[str, str]] = [(root_str, "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs: List[Tuple[str, str]] = []
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}{name}"
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if config.is_ignored(rel_path, name, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel_path + "/"))
+            elif config.is_selected(rel_path, name) and not config.is_own_file(
+                entry.path, name
+            ):
+                yield Path(entry.path), config.schema_for(rel_path, name)
+        stack.extend(reversed(subdirs))
+
+
+def load_config(
+    root: Path, config_path: Optional[Path] = None, default_schema: Optional[Path] = None
+) -> SchemaConfig:
+    """Resolve the configuration for a crawl root.
+
+    Args:
+        root: Directory being validated
+        config_path: Explicit configuration file, if given
+        default_schema: Schema for selected files no pattern maps
+
+    Returns:
+        The explicit config, ``root/.json-validate.json`` if present, or
+        defaults
+    """
+    if config_path is None:
+        candidate = root / DEFAULT_CONFIG_NAME
+        if candidate.is_file():
+            config_path = candidate
+    if config_path is not None:
+        return SchemaConfig.from_file(config_path, default_schema)
+    return SchemaConfig(default_schema=default_schema)
@@ -0,0 +1,315 @@
+"""Discriminator-indexed dispatch for tagged-union ``oneOf``/``anyOf``.
+
+A union whose branches all require one property and pin it to distinct
+values with ``const`` or ``enum`` can only ever match the branch named by
+that property. ``index_unions`` finds such unions once per schema and
+records a table from tag value to branch; ``DispatchValidator`` then
+validates an object against that single branch instead of trying each.
+
+Verdicts are unchanged. Non-object instances, and unions that are not
+indexed, go through the standard keyword implementation. An object with
+a missing or unknown tag fails with a message naming the tag rather
+than listing every branch.
+
+Regex keywords go through ``patterns`` (precompiled, ReDoS-guarded) and
+``uniqueItems`` through ``unique`` (hash-based, linear). The schema
+traversal and JSON Pointer helpers here are shared with the analyzer and
+the incremental validator.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import jsonschema
+from jsonschema import ValidationError
+
+from .patterns import PATTERN_KEYWORDS
+from .unique import _canonical, unique_items
+
+SCHEMA_KEYWORDS = (
+    "additionalItems", "additionalProperties", "contains", "else", "if",
+    "items", "not", "propertyNames", "then", "unevaluatedItems",
+    "unevaluatedProperties",
+)
+SCHEMA_LIST_KEYWORDS = ("allOf", "anyOf", "oneOf", "items", "prefixItems")
+SCHEMA_MAP_KEYWORDS = (
+    "$defs", "definitions", "dependencies", "dependentSchemas", "patternProperties",
+    "properties",
+)
+
+MAX_INDEXED = 4096
+# Drafts in which "$ref" overrides its sibling keywords
+_REF_ALONE_DRAFTS = (
+    jsonschema.Draft4Validator, jsonschema.Draft6Validator, jsonschema.Draft7Validator
+)
+# Tag values listed in an "unknown" message before eliding the rest
+_SHOWN_VALUES = 10
+
+SchemaPath = Tuple[Any, ...]
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens.
+
+    Raises:
+        ValueError: If the pointer is not empty and does not start with "/"
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"JSON Pointer '{pointer}' must start with '/'")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def subschemas(schema: Any) -> Iterator[Tuple[SchemaPath, Any]]:
+    """Yield ``(relative path, subschema)`` for each schema-valued keyword."""
+    if not isinstance(schema, dict):
+        return
+    for keyword, value in schema.items():
+        if keyword in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            for name, sub in value.items():
+                if isinstance(sub, (dict, bool)):
+                    yield (keyword, name), sub
+        elif keyword in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            for index, sub in enumerate(value):
+                yield (keyword, index), sub
+        elif keyword in SCHEMA_KEYWORDS and isinstance(value, (dict, bool)):
+            yield (keyword,), value
+
+
+def _walk(schema: Any, path: SchemaPath = ()) -> Iterator[Tuple[SchemaPath, Any]]:
+    yield path, schema
+    for relative, sub in subschemas(schema):
+        yield from _walk(sub, path + relative)
+
+
+def resolve_ref(schema: Any, root: Any) -> Any:
+    """Follow local ``$ref`` chains; None if a reference cannot be resolved."""
+    for _ in range(32):
+        if not isinstance(schema, dict) or "$ref" not in schema:
+            return schema
+        ref = schema["$ref"]
+        if not ref.startswith("#"):
+            return None
+        schema = root
+        try:
+            for token in parse_pointer(ref[1:]):
+                schema = schema[int(token)] if isinstance(schema, list) else schema[token]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+    return None
+
+
+def _pinned_values(schema: Any, draft: Any = jsonschema.Draft7Validator) -> Optional[List[Any]]:
+    if not isinstance(schema, dict):
+        return None
+    # Beside "$ref", up to Draft 7, "const" and "enum" are ignored
+    if "$ref" in schema and draft in _REF_ALONE_DRAFTS:
+        return None
+    # Draft 4 has no "const"; there it constrains nothing
+    if "const" in schema and "const" in draft.VALIDATORS:
+        return [schema["const"]]
+    if isinstance(schema.get("enum"), list) and schema["enum"]:
+        return list(schema["enum"])
+    return None
+
+
+def discriminator(
+    branches: List[Any], root: Any, object_only: bool = False, draft: Any = None
+) -> Optional[Tuple[str, List[List[Any]]]]:
+    """Find the property that tags a union of object schemas.
+
+    Every branch (after following local ``$ref``) must be an object
+    schema that requires the property and pins it with ``const`` or
+    ``enum``, and no value may appear in two branches.
+
+    Args:
+        branches: The ``oneOf``/``anyOf`` branches
+        root: Root schema for resolving references
+        object_only: Whether the enclosing schema already requires an
+            object, so branches need not say so themselves
+        draft: ``jsonschema`` validator class whose keywords apply
+            (default: ``draft_for(root)``)
+
+    Returns:
+        The property name and each branch's allowed values, or None
+    """
+    if len(branches) < 2:
+        return None
+    if draft is None:
+        draft = draft_for(root)
+    resolved = [resolve_ref(branch, root) for branch in branches]
+    if not all(isinstance(branch, dict) for branch in resolved):
+        return None
+    if not object_only and not all(
+        branch.get("type") in ("object", ["object"]) for branch in resolved
+    ):
+        return None
+
+    candidates: Optional[Set[str]] = None
+    for branch in resolved:
+        properties = branch.get("properties", {})
+        pinned = {
+            name
+            for name in branch.get("required", [])
+            if _pinned_values(properties.get(name), draft) is not None
+        }
+        candidates = pinned if candidates is None else candidates & pinned
+
+    for name in sorted(candidates or ()):
+        values = [_pinned_values(branch["properties"][name], draft) for branch in resolved]
+        keys = [_canonical(value) for branch_values in values for value in branch_values]
+        if len(keys) == len(set(keys)):
+            return name, values
+    return None
+
+
+class TaggedUnion(NamedTuple):
+    """Lookup table for one union."""
+
+    name: str
+    table: Dict[Any, int]
+    values: List[Any]
+
+
+_lock = threading.Lock()
+# Keyed by id; holding the object itself keeps the id from being reused
+_unions: "OrderedDict[int, Tuple[list, TaggedUnion]]" = OrderedDict()
+_roots: "OrderedDict[int, Tuple[Any, int]]" = OrderedDict()
+
+
+def _remember(memo: "OrderedDict[int, Any]", key: int, value: Any) -> None:
+    memo[key] = value
+    memo.move_to_end(key)
+    if len(memo) > MAX_INDEXED:
+        memo.popitem(last=False)
+
+
+def index_unions(schema: Any, draft: Any = None) -> int:
+    """Find the tagged unions in a schema and build their lookup tables.
+
+    Indexing the same schema object again is free.
+
+    Args:
+        schema: Root schema (used to resolve local ``$ref`` branches)
+        draft: ``jsonschema`` validator class whose keywords apply
+            (default: ``draft_for(schema)``)
+
+    Returns:
+        Number of tagged unions in the schema
+    """
+    with _lock:
+        memo = _roots.get(id(schema))
+        if memo is not None and memo[0] is schema:
+            _roots.move_to_end(id(schema))
+            return memo[1]
+    if draft is None:
+        draft = draft_for(schema)
+    found = []
+    for _, node in _walk(schema):
+        if not isinstance(node, dict):
+            continue
+        for keyword in ("oneOf", "anyOf"):
+            branches = node.get(keyword)
+            if not isinstance(branches, list):
+                continue
+            # Non-objects never reach the table, so branches need not be typed
+            tag = discriminator(branches, schema, object_only=True, draft=draft)
+            if tag is None:
+                continue
+            name, values = tag
+            table = {
+                _canonical(value): index
+                for index, branch_values in enumerate(values)
+                for value in branch_values
+            }
+            union = TaggedUnion(name, table, [v for vs in values for v in vs])
+            found.append((branches, union))
+    with _lock:
+        for branches, union in found:
+            _remember(_unions, id(branches), (branches, union))
+        _remember(_roots, id(schema), (schema, len(found)))
+    return len(found)
+
+
+def tagged_union(branches: Any) -> Optional[TaggedUnion]:
+    """Return the table for an indexed union, or None."""
+    entry = _unions.get(id(branches))
+    if entry is None or entry[0] is not branches:
+        return None
+    return entry[1]
+
+
+def _unknown(union: TaggedUnion, value: Any) -> str:
+    shown = ", ".join(repr(v) for v in union.values[:_SHOWN_VALUES])
+    if len(union.values) > _SHOWN_VALUES:
+        shown += f", ... ({len(union.values)} in total)"
+    return f"unknown {union.name} {value!r}; expected one of {shown}"
+
+
+def _dispatching(base: Any, keyword: str) -> Callable[..., Iterator[ValidationError]]:
+    fallback = base.VALIDATORS[keyword]
+
+    def check(validator: Any, branches: Any, instance: Any, schema: Any) -> Iterator[ValidationError]:
+        union = tagged_union(branches)
+        if union is None or not validator.is_type(instance, "object"):
+            yield from fallback(validator, branches, instance, schema)
+            return
+        if union.name not in instance:
+            yield ValidationError(f"{union.name!r} is a required property")
+            return
+        value = instance[union.name]
+        index = union.table.get(_canonical(value))
+        if index is None:
+            yield ValidationError(_unknown(union, value), path=[union.name])
+            return
+        yield from validator.descend(instance, branches[index], schema_path=index)
+
+    return check
+
+
+# Drafts selected by "$schema"; anything else (or none) is validated as Draft 7
+DRAFTS = (
+    jsonschema.Draft4Validator,
+    jsonschema.Draft6Validator,
+    jsonschema.Draft7Validator,
+    jsonschema.Draft201909Validator,
+    jsonschema.Draft202012Validator,
+)
+_DISPATCHING = {
+    base: jsonschema.validators.extend(
+        base,
+        {
+            "oneOf": _dispatching(base, "oneOf"),
+            "anyOf": _dispatching(base, "anyOf"),
+            "uniqueItems": unique_items,
+            **PATTERN_KEYWORDS,
+        },
+    )
+    for base in DRAFTS
+}
+DispatchValidator = _DISPATCHING[jsonschema.Draft7Validator]
+
+
+def draft_for(schema: Any) -> Any:
+    """Return the ``jsonschema`` validator class for a schema's ``$schema``.
+
+    Drafts 4, 6, 7, 2019-09 and 2020-12 are recognised; schemas naming
+    none of them are treated as Draft 7.
+    """
+    base = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    return base if base in _DISPATCHING else jsonschema.Draft7Validator
+
+
+def dispatching_validator(schema: Any, format_checker: Any = None) -> Any:
+    """Return a validator for ``schema`` (of its draft) that dispatches tagged unions.
+
+    Args:
+        schema: Root schema
+        format_checker: ``jsonschema.FormatChecker`` to enforce ``format``
+            with, or None to treat it as an annotation
+    """
+    draft = draft_for(schema)
+    index_unions(schema, draft)
+    return _DISPATCHING[draft](schema, format_checker=format_checker)
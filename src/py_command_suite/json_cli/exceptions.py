@@ -31,6 +31,8 @@ class JSONValidationError(JSONCliError):
         message: str,
         file_path: Optional[str] = None,
         validation_errors: Optional[list[str]] = None,
+        error_paths: Optional[list[tuple]] = None,
+        error_positions: Optional[list[Optional[tuple[int, int]]]] = None,
     ) -> None:
         """Initialize with validation details.
 
@@ -38,8 +40,12 @@ class JSONValidationError(JSONCliError):
             message: The error message
             file_path: Optional file path where validation failed
             validation_errors: List of specific validation errors
+            error_paths: Instance path of each entry in validation_errors
+            error_positions: Source (line, column) of each entry, if known
         """
         self.validation_errors = validation_errors or []
+        self.error_paths = error_paths or []
+        self.error_positions = error_positions or []
         super().__init__(message, file_path)
 
 
@@ -79,3 +85,32 @@ class FileSizeError(JSONCliError):
         self.file_size = file_size
         self.limit = limit
         super().__init__(message, file_path)
+
+
+class ConfigError(JSONCliError):
+    """Raised when a schema-mapping configuration file is invalid."""
+
+    pass
+
+
+class PatchError(JSONCliError):
+    """Raised when a JSON Patch is malformed or cannot be applied."""
+
+    def __init__(
+        self, message: str, file_path: Optional[str] = None, op_index: Optional[int] = None
+    ) -> None:
+        """Initialize with the failing operation.
+
+        Args:
+            message: The error message
+            file_path: Optional file path of the patched document
+            op_index: Index of the failing operation in the patch
+        """
+        self.op_index = op_index
+        super().__init__(message, file_path)
+
+
+class GitError(JSONCliError):
+    """Raised when the changed-file list cannot be read from git."""
+
+    pass
@@ -0,0 +1,121 @@
+"""Opt-in ``format`` checking with precompiled, memoized checkers.
+
+``FORMAT_CHECKER`` is built once per process and covers ``email``,
+``date-time``, ``ipv4``, ``ipv6``, ``uuid`` and ``uri``; other format
+names stay annotations, as they are when checking is off. Each checker
+is a precompiled regex (plus a calendar check for ``date-time`` and the
+standard library parser for ``ipv6``) behind an LRU cache, so values
+that repeat across a corpus (hosts, enum-like strings, timestamps at
+second resolution) are checked once. Non-string instances always pass,
+as the specification requires.
+"""
+
+import ipaddress
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+import jsonschema
+
+# Distinct values remembered per format
+CACHE_SIZE = 65536
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)*")
+_DATE_TIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?"
+    r"(?:[Zz]|([+-])(\d{2}):(\d{2}))",
+    re.ASCII,
+)
+_IPV4 = re.compile(r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)", re.ASCII)
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+# Absolute URI (RFC 3986): a scheme, then only characters a URI may contain,
+# with "%" always starting an escape
+_URI = re.compile(
+    r"[A-Za-z][A-Za-z0-9+.\-]*:(?:[A-Za-z0-9\-._~!$&'()*+,;=:@/?#\[\]]|%[0-9A-Fa-f]{2})*"
+)
+
+
+def _email(value: str) -> bool:
+    return _EMAIL.fullmatch(value) is not None
+
+
+def _date_time(value: str) -> bool:
+    match = _DATE_TIME.fullmatch(value)
+    if match is None:
+        return False
+    year, month, day, hour, minute, second, sign, off_h, off_m = match.groups()
+    try:
+        offset = timedelta(hours=int(off_h or 0), minutes=int(off_m or 0))
+        if offset >= timedelta(days=1) or int(off_m or 0) > 59:
+            return False
+        # A leap second is checked as the second before it
+        stamp = datetime(
+            int(year), int(month), int(day), int(hour), int(minute), min(int(second), 59),
+            tzinfo=timezone(-offset if sign == "-" else offset),
+        )
+    except ValueError:
+        return False
+    if int(second) == 60:
+        # Leap seconds only ever occur at 23:59:60 UTC
+        utc = stamp.astimezone(timezone.utc)
+        return (utc.hour, utc.minute) == (23, 59)
+    return True
+
+
+def _ipv4(value: str) -> bool:
+    return _IPV4.fullmatch(value) is not None
+
+
+def _ipv6(value: str) -> bool:
+    if "%" in value:
+        return False
+    try:
+        ipaddress.IPv6Address(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _uuid(value: str) -> bool:
+    return _UUID.fullmatch(value) is not None
+
+
+def _uri(value: str) -> bool:
+    return _URI.fullmatch(value) is not None
+
+
+CHECKS: Dict[str, Callable[[str], bool]] = {
+    "email": _email,
+    "date-time": _date_time,
+    "ipv4": _ipv4,
+    "ipv6": _ipv6,
+    "uuid": _uuid,
+    "uri": _uri,
+}
+
+
+def _memoized(check: Callable[[str], bool]) -> Callable[[Any], bool]:
+    cached = lru_cache(maxsize=CACHE_SIZE)(check)
+
+    def conforms(instance: Any) -> bool:
+        return not isinstance(instance, str) or cached(instance)
+
+    conforms.cache_info = cached.cache_info  # type: ignore[attr-defined]
+    conforms.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    return conforms
+
+
+def _build_checker() -> jsonschema.FormatChecker:
+    checker = jsonschema.FormatChecker(formats=())
+    for name, check in CHECKS.items():
+        checker.checks(name)(_memoized(check))
+    return checker
+
+
+FORMAT_CHECKER = _build_checker()
+
+
+def format_cache_info() -> Dict[str, Any]:
+    """Return ``functools`` cache statistics for each format."""
+    return {name: FORMAT_CHECKER.checkers[name][0].cache_info() for name in CHECKS}
@@ -0,0 +1,539 @@
+"""Schema-driven synthetic data for load and soak testing.
+
+Instances are generated in fixed-size blocks; block ``k`` always uses a
+random stream seeded from ``(seed, k)``, so a corpus is reproducible and
+byte-identical no matter how many worker processes produce it. Blocks are
+written in order with a bounded number in flight, so memory stays constant
+whatever the corpus size.
+
+Every emitted instance is checked with ``jsonschema`` under the schema's
+own draft: conforming ones must validate, mutated ones must not. Checking conforming instances can
+be turned off for throughput once a schema is known to generate cleanly.
+"""
+
+import json
+import math
+import random
+import string
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from re import _constants as sre_constants, _parser as sre_parse  # type: ignore
+
+from .dispatch import dispatching_validator, draft_for
+from .exceptions import SchemaError
+
+BLOCK_SIZE = 1000
+MAX_ATTEMPTS = 50
+MAX_MUTATIONS = 10
+DEFAULT_MAX_DEPTH = 6
+
+_SIMPLE_TYPES = ("null", "boolean", "integer", "number", "string")
+_ALL_TYPES = _SIMPLE_TYPES + ("array", "object")
+_WORD = string.ascii_letters + string.digits + "_"
+_TEXT = string.ascii_letters + string.digits + " -_."
+_FORMATS = {
+    "date-time": lambda r: "%04d-%02d-%02dT%02d:%02d:%02dZ"
+    % (r.randint(1970, 2037), r.randint(1, 12), r.randint(1, 28),
+       r.randint(0, 23), r.randint(0, 59), r.randint(0, 59)),
+    "date": lambda r: "%04d-%02d-%02d"
+    % (r.randint(1970, 2037), r.randint(1, 12), r.randint(1, 28)),
+    "time": lambda r: "%02d:%02d:%02dZ"
+    % (r.randint(0, 23), r.randint(0, 59), r.randint(0, 59)),
+    "email": lambda r: f"{_word(r, 3, 10).lower()}@example.com",
+    "hostname": lambda r: f"{_word(r, 3, 10).lower()}.example.com",
+    "ipv4": lambda r: ".".join(str(r.randint(0, 255)) for _ in range(4)),
+    "ipv6": lambda r: ":".join("%x" % r.randint(0, 0xFFFF) for _ in range(8)),
+    "uri": lambda r: f"https://example.com/{_word(r, 1, 12).lower()}",
+    "uuid": lambda r: str(uuid.UUID(int=r.getrandbits(128), version=4)),
+}
+
+
+class CorpusStats(NamedTuple):
+    """Totals for a written corpus."""
+
+    count: int
+    invalid: int
+    bytes: int
+
+
+def _word(rng: random.Random, lo: int, hi: int) -> str:
+    return "".join(rng.choices(_WORD, k=rng.randint(lo, hi)))
+
+
+class InstanceGenerator:
+    """Produces random instances of one schema (Draft 4 to 2020-12)."""
+
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        mutation_rate: float = 0.0,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        verify: bool = True,
+    ) -> None:
+        """Prepare a generator for a schema.
+
+        Args:
+            schema: Parsed JSON schema
+            mutation_rate: Fraction of instances made deliberately invalid
+            max_depth: Nesting depth beyond which only required
+                properties and minimum-length arrays are generated
+            verify: Whether to check conforming instances against the schema
+        """
+        self.schema = schema
+        self.mutation_rate = mutation_rate
+        self.max_depth = max_depth
+        self.verify = verify
+        self.type_checker = draft_for(schema).TYPE_CHECKER
+        self.validator = dispatching_validator(schema)
+
+    def instance(self, rng: random.Random) -> Tuple[Any, bool]:
+        """Return one instance and whether it conforms to the schema.
+
+        Raises:
+            SchemaError: If no conforming instance could be produced
+        """
+        for _ in range(MAX_ATTEMPTS):
+            value = self._value(self.schema, rng, 0)
+            if not self.verify or self.validator.is_valid(value):
+                break
+        else:
+            raise SchemaError(
+                f"Could not generate a conforming instance in {MAX_ATTEMPTS} "
+                "attempts; the schema may use unsupported keywords"
+            )
+        if self.mutation_rate and rng.random() < self.mutation_rate:
+            for _ in range(MAX_MUTATIONS):
+                mutated = _mutate(value, rng, self.type_checker)
+                if not self.validator.is_valid(mutated):
+                    return mutated, False
+        return value, True
+
+    def _resolve(self, schema: Any) -> Any:
+        seen = 0
+        while isinstance(schema, dict) and "$ref" in schema and seen < 32:
+            ref = schema["$ref"]
+            if not ref.startswith("#"):
+                raise SchemaError(f"Cannot generate data for remote reference '{ref}'")
+            schema = self.schema
+            for part in ref[1:].split("/")[1:]:
+                part = part.replace("~1", "/").replace("~0", "~")
+                schema = schema[int(part)] if isinstance(schema, list) else schema[part]
+            seen += 1
+        return schema
+
+    def _value(self, schema: Any, rng: random.Random, depth: int) -> Any:
+        schema = self._resolve(schema)
+        if schema is True or schema == {}:
+            return self._value({"type": rng.choice(_SIMPLE_TYPES)}, rng, depth)
+        if schema is False:
+            return None
+        if "const" in schema:
+            return schema["const"]
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+        if "allOf" in schema:
+            merged = {k: v for k, v in schema.items() if k != "allOf"}
+            for sub in schema["allOf"]:
+                merged = _merge(merged, self._resolve(sub))
+            return self._value(merged, rng, depth)
+        for keyword in ("oneOf", "anyOf"):
+            if keyword in schema:
+                rest = {k: v for k, v in schema.items() if k != keyword}
+                branch = self._resolve(rng.choice(schema[keyword]))
+                return self._value(_merge(rest, branch), rng, depth)
+
+        kind = self._pick_type(schema, rng)
+        if kind == "null":
+            return None
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind in ("integer", "number"):
+            return _number(schema, rng, kind == "integer")
+        if kind == "string":
+            return _string(schema, rng)
+        if kind == "array":
+            return self._array(schema, rng, depth)
+        return self._object(schema, rng, depth)
+
+    def _pick_type(self, schema: Dict[str, Any], rng: random.Random) -> str:
+        kind = schema.get("type")
+        if isinstance(kind, list):
+            return rng.choice(kind) if kind else "null"
+        if kind:
+            return kind
+        if {"properties", "required", "additionalProperties"} & schema.keys():
+            return "object"
+        if {"items", "minItems", "maxItems", "uniqueItems"} & schema.keys():
+            return "array"
+        if {"pattern", "minLength", "maxLength", "format"} & schema.keys():
+            return "string"
+        if {"minimum", "maximum", "multipleOf"} & schema.keys():
+            return "number"
+        return rng.choice(_SIMPLE_TYPES)
+
+    def _array(self, schema: Dict[str, Any], rng: random.Random, depth: int) -> List[Any]:
+        items = schema.get("items", {})
+        lo = schema.get("minItems", 0)
+        hi = schema.get("maxItems", lo + (0 if depth >= self.max_depth else 5))
+        if isinstance(items, list):
+            count = max(lo, min(hi, len(items)))
+            extra = schema.get("additionalItems", {})
+            return [
+                self._value(items[i] if i < len(items) else extra, rng, depth + 1)
+                for i in range(count)
+            ]
+
+        count = rng.randint(lo, max(lo, hi))
+        if not schema.get("uniqueItems"):
+            return [self._value(items, rng, depth + 1) for _ in range(count)]
+        result, seen = [], set()
+        for _ in range(count * MAX_ATTEMPTS):
+            if len(result) == count:
+                break
+            value = self._value(items, rng, depth + 1)
+            key = json.dumps(value, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                result.append(value)
+        return result
+
+    def _object(self, schema: Dict[str, Any], rng: random.Random, depth: int) -> Dict[str, Any]:
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        shallow = depth >= self.max_depth
+        result: Dict[str, Any] = {}
+        for name, sub in properties.items():
+            if name in required or (not shallow and rng.random() < 0.5):
+                result[name] = self._value(sub, rng, depth + 1)
+        for name in required:
+            if name not in result:
+                result[name] = self._value({}, rng, depth + 1)
+        for name in _dependents(schema, result):
+            result[name] = self._value(properties.get(name, {}), rng, depth + 1)
+
+        additional = schema.get("additionalProperties", True)
+        wanted = schema.get("minProperties", 0)
+        while len(result) < wanted and additional is not False:
+            name = _word(rng, 4, 10)
+            if name not in properties:
+                sub = additional if isinstance(additional, dict) else {}
+                result[name] = self._value(sub, rng, depth + 1)
+        return result
+
+
+def _dependents(schema: Dict[str, Any], present: Dict[str, Any]) -> List[str]:
+    """Names ``dependentRequired`` (or array ``dependencies``) adds to ``present``."""
+    rules = dict(schema.get("dependentRequired", {}))
+    for name, rule in schema.get("dependencies", {}).items():
+        if isinstance(rule, list):
+            rules[name] = rule
+    added: List[str] = []
+    queue = [name for name in present if name in rules]
+    while queue:
+        for name in rules[queue.pop()]:
+            if name not in present and name not in added:
+                added.append(name)
+                if name in rules:
+                    queue.append(name)
+    return added
+
+
+def _merge(base: Dict[str, Any], extra: Any) -> Dict[str, Any]:
+    """Combine two schemas for generation (not a general intersection)."""
+    if not isinstance(extra, dict):
+        return base
+    merged = dict(base)
+    for key, value in extra.items():
+        if key == "properties" and key in merged:
+            merged[key] = {**merged[key], **value}
+        elif key == "required" and key in merged:
+            merged[key] = list(dict.fromkeys(merged[key] + value))
+        else:
+            merged[key] = value
+    return merged
+
+
+def _number(schema: Dict[str, Any], rng: random.Random, integer: bool) -> Any:
+    lo, hi = schema.get("minimum"), schema.get("maximum")
+    if lo is None:
+        lo = -1000 if hi is None else hi - 1000
+    if hi is None:
+        hi = lo + 2000
+    nudge = 1 if integer else 1e-6
+    if isinstance(schema.get("exclusiveMinimum"), (int, float)):
+        lo = max(lo, schema["exclusiveMinimum"] + nudge)
+    if isinstance(schema.get("exclusiveMaximum"), (int, float)):
+        hi = min(hi, schema["exclusiveMaximum"] - nudge)
+    step = schema.get("multipleOf")
+    if step:
+        k = rng.randint(math.ceil(lo / step), max(math.ceil(lo / step), math.floor(hi / step)))
+        value = k * step
+        return int(value) if integer or float(value).is_integer() else value
+    if integer:
+        return rng.randint(math.ceil(lo), max(math.ceil(lo), math.floor(hi)))
+    return round(rng.uniform(lo, hi), 6)
+
+
+def _string(schema: Dict[str, Any], rng: random.Random) -> str:
+    if "pattern" in schema:
+        return _from_pattern(schema["pattern"], rng)
+    fmt = _FORMATS.get(schema.get("format", ""))
+    if fmt is not None:
+        return fmt(rng)
+    lo = schema.get("minLength", 0)
+    hi = schema.get("maxLength", lo + 16)
+    return "".join(rng.choices(_TEXT, k=rng.randint(lo, max(lo, hi))))
+
+
+def _from_pattern(pattern: str, rng: random.Random) -> str:
+    """Produce a string the regex matches (anchors and lookarounds ignored)."""
+    out: List[str] = []
+    _emit(sre_parse.parse(pattern), rng, out)
+    return "".join(out)
+
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_WORD: _WORD,
+    sre_constants.CATEGORY_SPACE: " ",
+    sre_constants.CATEGORY_NOT_DIGIT: string.ascii_letters,
+    sre_constants.CATEGORY_NOT_WORD: "-.",
+    sre_constants.CATEGORY_NOT_SPACE: _WORD,
+}
+
+
+def _emit(parsed: Any, rng: random.Random, out: List[str]) -> None:
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            out.append(chr(av))
+        elif op is sre_constants.ANY:
+            out.append(rng.choice(_WORD))
+        elif op is sre_constants.IN:
+            out.append(_pick_in(av, rng))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            lo, hi, sub = av
+            hi = lo + 4 if hi == sre_constants.MAXREPEAT else hi
+            for _ in range(rng.randint(lo, hi)):
+                _emit(sub, rng, out)
+        elif op is sre_constants.SUBPATTERN:
+            _emit(av[-1], rng, out)
+        elif op is sre_constants.BRANCH:
+            _emit(rng.choice(av[1]), rng, out)
+        elif op is sre_constants.CATEGORY:
+            out.append(rng.choice(_CATEGORIES.get(av, _WORD)))
+        # AT (anchors), ASSERT, GROUPREF etc. produce no text
+
+
+def _pick_in(items: Any, rng: random.Random) -> str:
+    choices: List[str] = []
+    negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            choices.append(chr(av))
+        elif op is sre_constants.RANGE:
+            choices.extend(chr(c) for c in range(av[0], min(av[1], av[0] + 255) + 1))
+        elif op is sre_constants.CATEGORY:
+            choices.extend(_CATEGORIES.get(av, _WORD))
+    if negate:
+        excluded = set(choices)
+        choices = [c for c in _WORD if c not in excluded]
+    return rng.choice(choices or _WORD)
+
+
+def _mutate(value: Any, rng: random.Random, type_checker: Any) -> Any:
+    """Return a copy of ``value`` with one random structural change."""
+    value = json.loads(json.dumps(value))
+    nodes: List[Tuple[Any, Any]] = [(None, None)]
+    stack = [value]
+    while stack and len(nodes) < 256:
+        node = stack.pop()
+        children = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, child in children:
+            nodes.append((node, key))
+            stack.append(child)
+
+    parent, key = rng.choice(nodes)
+    current = value if parent is None else parent[key]
+    choice = rng.random()
+    if isinstance(current, dict) and current and choice < 0.4:
+        del current[rng.choice(list(current))]
+        return value
+    if isinstance(current, dict) and choice < 0.6:
+        current["__unexpected__"] = None
+        return value
+    replacement = _wrong_type(current, rng, type_checker)
+    if parent is None:
+        return replacement
+    parent[key] = replacement
+    return value
+
+
+def _wrong_type(current: Any, rng: random.Random, type_checker: Any) -> Any:
+    candidates = {
+        "null": None,
+        "boolean": True,
+        "integer": rng.randint(-10**6, 10**6),
+        "number": rng.random() * 1e6,
+        "string": _word(rng, 0, 12),
+        "array": [],
+        "object": {},
+    }
+    kinds = [k for k in _ALL_TYPES if not type_checker.is_type(current, k)]
+    return candidates[rng.choice(kinds)]
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    schema: Dict[str, Any], seed: int, mutation_rate: float, verify: bool
+) -> None:
+    _worker_state.update(
+        generator=InstanceGenerator(schema, mutation_rate, verify=verify), seed=seed
+    )
+
+
+def _block_rng(seed: int, block: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + block)
+
+
+def _generate_block(block: int, size: int) -> List[Tuple[bytes, bool]]:
+    """Generate block ``block`` as (encoded instance, conforms) pairs."""
+    generator: InstanceGenerator = _worker_state["generator"]
+    rng = _block_rng(_worker_state["seed"], block)
+    encoded = []
+    for _ in range(size):
+        value, ok = generator.instance(rng)
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        encoded.append((text.encode(), ok))
+    return encoded
+
+
+def generate_instances(
+    schema: Dict[str, Any],
+    count: int,
+    seed: int = 0,
+    mutation_rate: float = 0.0,
+) -> Iterator[Tuple[Any, bool]]:
+    """Yield ``(instance, conforms)`` pairs in-process.
+
+    Produces the same instances, in the same order, as ``write_corpus``
+    with the same seed.
+
+    Args:
+        schema: Parsed JSON schema
+        count: Number of instances
+        seed: Random seed
+        mutation_rate: Fraction of instances made deliberately invalid
+
+    Yields:
+        Each instance with whether it validates against the schema
+    """
+    generator = InstanceGenerator(schema, mutation_rate)
+    for block in range(0, (count + BLOCK_SIZE - 1) // BLOCK_SIZE):
+        rng = _block_rng(seed, block)
+        for _ in range(min(BLOCK_SIZE, count - block * BLOCK_SIZE)):
+            yield generator.instance(rng)
+
+
+def write_corpus(
+    schema: Dict[str, Any],
+    out: IO[bytes],
+    count: Optional[int] = None,
+    seed: int = 0,
+    mutation_rate: float = 0.0,
+    jobs: int = 1,
+    fmt: str = "ndjson",
+    max_bytes: Optional[int] = None,
+    verify: bool = True,
+) -> CorpusStats:
+    """Stream a generated corpus to a binary file.
+
+    Args:
+        schema: Parsed JSON schema
+        out: Destination opened for binary writing
+        count: Number of instances (None to stop on ``max_bytes`` only)
+        seed: Random seed; output is identical for any ``jobs``
+        mutation_rate: Fraction of instances made deliberately invalid
+        jobs: Worker processes (1 generates in-process)
+        fmt: "ndjson" (one instance per line) or "array" (one JSON array)
+        max_bytes: Stop after the first instance that reaches this size
+        verify: Whether to check conforming instances against the schema
+
+    Returns:
+        Totals for what was written
+
+    Raises:
+        ValueError: If neither ``count`` nor ``max_bytes`` is given
+        SchemaError: If the schema cannot be generated from
+    """
+    if count is None and max_bytes is None:
+        raise ValueError("either count or max_bytes is required")
+    # Surface unsupported schemas here rather than from inside a worker
+    InstanceGenerator(schema, mutation_rate).instance(_block_rng(seed, 0))
+
+    def sizes() -> Iterator[int]:
+        remaining = count
+        while remaining is None or remaining > 0:
+            size = BLOCK_SIZE if remaining is None else min(BLOCK_SIZE, remaining)
+            yield size
+            if remaining is not None:
+                remaining -= size
+
+    written = invalid = total = 0
+    if fmt == "array":
+        total += out.write(b"[\n")
+    for block in _blocks(schema, seed, mutation_rate, verify, jobs, sizes()):
+        for doc, ok in block:
+            if max_bytes is not None and total >= max_bytes:
+                break
+            if fmt == "array":
+                total += out.write(b",\n" + doc if written else doc)
+            else:
+                total += out.write(doc + b"\n")
+            written += 1
+            invalid += not ok
+        else:
+            continue
+        break
+    if fmt == "array":
+        total += out.write(b"\n]\n")
+    return CorpusStats(written, invalid, total)
+
+
+def _blocks(
+    schema: Dict[str, Any],
+    seed: int,
+    mutation_rate: float,
+    verify: bool,
+    jobs: int,
+    sizes: Iterator[int],
+) -> Iterator[List[Tuple[bytes, bool]]]:
+    """Yield generated blocks in order, keeping at most 2 * jobs in flight."""
+    if jobs <= 1:
+        _init_worker(schema, seed, mutation_rate, verify)
+        for block, size in enumerate(sizes):
+            yield _generate_block(block, size)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(schema, seed, mutation_rate, verify),
+    ) as executor:
+        pending: Deque[Future] = deque()
+        try:
+            for block, size in enumerate(sizes):
+                pending.append(executor.submit(_generate_block, block, size))
+                if len(pending) >= 2 * jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,615 @@
+"""Incremental re-validation of a document after an RFC 6902 JSON Patch.
+
+The document is assumed to have been valid before the patch, so every
+new error must involve a changed location. The patch is applied with
+path copying (only containers on a patched path are copied), and the
+paths it touched are collected into a trie in final-document coordinates,
+with array indices rewritten as later operations insert or remove
+elements.
+
+Validation then walks only the trie:
+
+* a replaced or added value is validated in full against every schema
+  that applies at its location;
+* at each ancestor, only keywords whose result can change are checked,
+  and only for the changed members: ``required`` for removed keys,
+  ``additionalProperties`` and ``propertyNames`` for added keys,
+  ``dependencies`` (``dependentRequired``) for triggers involving changed
+  keys, size limits, ``uniqueItems`` for changed elements, and positional
+  ``items`` (``prefixItems``) for elements shifted by an insertion or
+  removal;
+* keywords whose result depends on the whole node (``anyOf``, ``oneOf``,
+  ``not``, ``if``, ``enum``, ``const``, ``contains`` and schema-form
+  ``dependencies`` or ``dependentSchemas``) re-check that node as a whole,
+  and a schema with ``unevaluatedItems`` or ``unevaluatedProperties``
+  re-checks the node against that entire schema.
+
+Keywords are read by the rules of the schema's draft. Schemas using
+``$recursiveRef`` or ``$dynamicRef`` are validated in full.
+
+Each check runs a one-keyword schema through ``jsonschema`` so messages
+match a full validation. Cost is proportional to the patch plus the size
+of any node that needs a whole-node check.
+"""
+
+import copy
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+
+from .dispatch import (
+    _REF_ALONE_DRAFTS,
+    _canonical,
+    _walk,
+    dispatching_validator,
+    draft_for,
+    parse_pointer,
+)
+from .exceptions import JSONValidationError, PatchError
+from .validator import _format_validation_error
+
+Token = Any  # str for object keys, int for array indices
+Path = List[Token]
+
+_WHOLE_NODE_KEYWORDS = (
+    "anyOf", "oneOf", "not", "enum", "const", "contains", "minContains", "maxContains",
+)
+# Depend on what every adjacent keyword evaluated
+_UNEVALUATED_KEYWORDS = ("unevaluatedItems", "unevaluatedProperties")
+_DYNAMIC_REFS = ("$recursiveRef", "$dynamicRef")
+
+
+# -- patch application -----------------------------------------------------
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality: 1 == 1.0, but true != 1 and key order is ignored."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return False
+    return a == b
+
+
+class _Patcher:
+    """Applies operations and records touched paths in final coordinates."""
+
+    def __init__(self, document: Any, in_place: bool) -> None:
+        self.root = document
+        self.in_place = in_place
+        self._copied: Set[int] = set()
+        # ("set", path) | ("remove", path) | ("shift", array path, index)
+        self.touches: List[Tuple[Any, ...]] = []
+
+    def apply(self, index: int, op: Any) -> None:
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise PatchError(f"Patch operation {index} needs 'op' and 'path'", op_index=index)
+        kind = op["op"]
+        try:
+            path = parse_pointer(op["path"])
+            if kind == "add":
+                self._add(path, self._value(op))
+            elif kind == "remove":
+                self._remove(path)
+            elif kind == "replace":
+                self._resolve(path)
+                self._replace(path, self._value(op))
+            elif kind in ("move", "copy"):
+                source = parse_pointer(op["from"])
+                value = self._resolve(source)
+                if kind == "move":
+                    if path[: len(source)] == source and len(path) > len(source):
+                        raise ValueError("cannot move a value into one of its children")
+                    self._remove(source)
+                else:
+                    value = copy.deepcopy(value)
+                self._add(path, value)
+            elif kind == "test":
+                if not _json_equal(self._resolve(path), self._value(op)):
+                    raise ValueError(f"test failed at '{op['path']}'")
+            else:
+                raise ValueError(f"unknown operation '{kind}'")
+        except KeyError as e:
+            raise PatchError(
+                f"Patch operation {index} ({kind}) is missing {e}", op_index=index
+            )
+        except (ValueError, IndexError, TypeError) as e:
+            raise PatchError(f"Patch operation {index} ({kind}) failed: {e}", op_index=index)
+
+    @staticmethod
+    def _value(op: Dict[str, Any]) -> Any:
+        if "value" not in op:
+            raise KeyError("'value'")
+        return copy.deepcopy(op["value"])
+
+    def _resolve(self, tokens: Sequence[str]) -> Any:
+        node = self.root
+        for depth, token in enumerate(tokens):
+            node = self._child(node, token, tokens[:depth])
+        return node
+
+    def _child(self, node: Any, token: str, where: Sequence[str]) -> Any:
+        if isinstance(node, dict):
+            if token not in node:
+                raise ValueError(f"path '{_pointer(list(where) + [token])}' does not exist")
+            return node[token]
+        if isinstance(node, list):
+            return node[self._index(node, token, where)]
+        raise ValueError(f"path '{_pointer(list(where) + [token])}' does not exist")
+
+    @staticmethod
+    def _index(node: List[Any], token: str, where: Sequence[str], end: bool = False) -> int:
+        if token == "-" and end:
+            return len(node)
+        if not token.isdigit() or (token != "0" and token.startswith("0")):
+            raise ValueError(f"'{token}' is not an array index at '{_pointer(where)}'")
+        index = int(token)
+        if index > len(node) or (index == len(node) and not end):
+            raise IndexError(f"index {index} is out of range at '{_pointer(where)}'")
+        return index
+
+    def _container(self, tokens: Sequence[str]) -> Tuple[Any, Path]:
+        """Return the (copied) parent container and its path with real indices."""
+        if not self.in_place and id(self.root) not in self._copied:
+            self.root = self._copy(self.root)
+        node, path = self.root, []
+        for depth, token in enumerate(tokens):
+            if isinstance(node, list):
+                token = self._index(node, token, tokens[:depth])
+            elif not isinstance(node, dict) or token not in node:
+                raise ValueError(f"path '{_pointer(tokens[: depth + 1])}' does not exist")
+            child = node[token]
+            if not self.in_place and isinstance(child, (dict, list)):
+                if id(child) not in self._copied:
+                    child = node[token] = self._copy(child)
+            node = child
+            path.append(token)
+        if not isinstance(node, (dict, list)):
+            raise ValueError(f"path '{_pointer(tokens)}' is not a container")
+        return node, path
+
+    def _copy(self, value: Any) -> Any:
+        value = dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        self._copied.add(id(value))
+        return value
+
+    def _add(self, tokens: List[str], value: Any) -> None:
+        if not tokens:
+            self._set_root(value)
+            return
+        parent, path = self._container(tokens[:-1])
+        if isinstance(parent, list):
+            index = self._index(parent, tokens[-1], tokens[:-1], end=True)
+            parent.insert(index, value)
+            self._shift(path, index, +1)
+            self._set(path + [index])
+            self.touches.append(("shift", path, index))
+        else:
+            parent[tokens[-1]] = value
+            self._set(path + [tokens[-1]])
+
+    def _replace(self, tokens: List[str], value: Any) -> None:
+        if not tokens:
+            self._set_root(value)
+            return
+        parent, path = self._container(tokens[:-1])
+        key: Token = tokens[-1]
+        if isinstance(parent, list):
+            key = self._index(parent, key, tokens[:-1])
+        parent[key] = value
+        self._set(path + [key])
+
+    def _remove(self, tokens: List[str]) -> None:
+        if not tokens:
+            raise ValueError("cannot remove the whole document")
+        parent, path = self._container(tokens[:-1])
+        if isinstance(parent, list):
+            index = self._index(parent, tokens[-1], tokens[:-1])
+            del parent[index]
+            self._shift(path, index, -1)
+            self.touches.append(("shift", path, index))
+        else:
+            key = tokens[-1]
+            if key not in parent:
+                raise ValueError(f"path '{_pointer(tokens)}' does not exist")
+            del parent[key]
+            self._drop_under(path + [key])
+            self.touches.append(("remove", path + [key]))
+
+    def _set_root(self, value: Any) -> None:
+        self.root = value
+        self.touches = [("set", [])]
+
+    def _set(self, path: Path) -> None:
+        self._drop_under(path)
+        self.touches.append(("set", path))
+
+    def _drop_under(self, prefix: Path) -> None:
+        n = len(prefix)
+        self.touches = [
+            t for t in self.touches
+            if not (t[0] != "shift" and len(t[1]) >= n and t[1][:n] == prefix)
+        ]
+
+    def _shift(self, array: Path, index: int, delta: int) -> None:
+        """Rewrite recorded paths through ``array`` after an insert or removal."""
+        n = len(array)
+        kept = []
+        for touch in self.touches:
+            path = touch[1]
+            if len(path) > n and path[:n] == array and isinstance(path[n], int):
+                if delta < 0 and path[n] == index:
+                    continue
+                if path[n] >= index:
+                    path = path[:n] + [path[n] + delta] + path[n + 1 :]
+                    touch = (touch[0], path) + touch[2:]
+            kept.append(touch)
+        self.touches = kept
+
+
+def _pointer(tokens: Iterable[Any]) -> str:
+    return "".join(
+        "/" + str(t).replace("~", "~0").replace("/", "~1") for t in tokens
+    )
+
+
+def apply_patch(document: Any, patch: Sequence[Dict[str, Any]], in_place: bool = False) -> Any:
+    """Apply an RFC 6902 JSON Patch.
+
+    Args:
+        document: Parsed JSON document
+        patch: List of patch operations
+        in_place: Modify ``document`` itself instead of copying the
+            containers along each patched path
+
+    Returns:
+        The patched document (``document`` itself only when ``in_place``)
+
+    Raises:
+        PatchError: If the patch is malformed or an operation fails
+    """
+    return _apply(document, patch, in_place).root
+
+
+def _apply(document: Any, patch: Sequence[Dict[str, Any]], in_place: bool) -> _Patcher:
+    if not isinstance(patch, list):
+        raise PatchError("A JSON Patch must be an array of operations")
+    patcher = _Patcher(document, in_place)
+    for index, op in enumerate(patch):
+        patcher.apply(index, op)
+    return patcher
+
+
+# -- incremental validation ------------------------------------------------
+
+
+class _Node:
+    """Trie of changed locations."""
+
+    __slots__ = ("children", "full", "changed", "shift")
+
+    def __init__(self) -> None:
+        self.children: Dict[Token, "_Node"] = {}
+        self.full = False
+        # Direct members added, replaced or removed
+        self.changed: Set[Token] = set()
+        # Lowest array index from which elements moved
+        self.shift: Optional[int] = None
+
+    def at(self, path: Sequence[Token]) -> "_Node":
+        node = self
+        for token in path:
+            node = node.children.setdefault(token, _Node())
+        return node
+
+
+def _build_trie(touches: Iterable[Tuple[Any, ...]]) -> _Node:
+    root = _Node()
+    for touch in touches:
+        kind, path = touch[0], touch[1]
+        if kind == "shift":
+            node = root.at(path)
+            index = touch[2]
+            node.shift = index if node.shift is None else min(node.shift, index)
+            continue
+        if path:
+            root.at(path[:-1]).changed.add(path[-1])
+        if kind == "set":
+            root.at(path).full = True
+    return root
+
+
+class _IncrementalValidator:
+    def __init__(self, schema: Any) -> None:
+        self.root_schema = schema
+        self.validator = dispatching_validator(schema)
+        self.keywords = frozenset(self.validator.VALIDATORS)
+        self.ref_alone = draft_for(schema) in _REF_ALONE_DRAFTS
+        self.errors: List[ValidationError] = []
+
+    def check(self, schema: Any, instance: Any, path: Path) -> None:
+        """Validate ``instance`` fully against ``schema``, collecting errors."""
+        for error in self.validator.evolve(schema=schema).iter_errors(instance):
+            error.path.extendleft(reversed(path))
+            self.errors.append(error)
+
+    def walk(self, value: Any, path: Path, node: _Node, schemas: List[Any]) -> None:
+        if node.full:
+            for schema in schemas:
+                self.check(schema, value, path)
+            return
+
+        flat = self._expand(schemas, value, path, node)
+        if isinstance(value, dict):
+            self._object(value, path, node, flat)
+        elif isinstance(value, list):
+            self._array(value, path, node, flat)
+
+    def _expand(self, schemas: List[Any], value: Any, path: Path, node: _Node) -> List[Dict[str, Any]]:
+        """Flatten $ref/allOf; whole-node keywords are checked here."""
+        flat: List[Dict[str, Any]] = []
+        stack = list(schemas)
+        seen: Set[int] = set()
+        while stack:
+            schema = stack.pop()
+            if schema is True or id(schema) in seen:
+                continue
+            seen.add(id(schema))
+            if not isinstance(schema, dict) or any(k in schema for k in _UNEVALUATED_KEYWORDS):
+                self.check(schema, value, path)
+                continue
+            if "$ref" in schema:
+                target = self._resolve(schema["$ref"])
+                if target is None:
+                    self.check({"$ref": schema["$ref"]}, value, path)
+                else:
+                    stack.append(target)
+                if self.ref_alone:
+                    continue
+            stack.extend(schema.get("allOf", ()))
+            whole = {k: schema[k] for k in _WHOLE_NODE_KEYWORDS if k in schema}
+            if "if" in schema:
+                whole.update(
+                    {k: schema[k] for k in ("if", "then", "else") if k in schema}
+                )
+            if whole:
+                self.check(whole, value, path)
+            flat.append(schema)
+        return flat
+
+    def _resolve(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            return None
+        target = self.root_schema
+        try:
+            for token in parse_pointer(ref[1:]):
+                target = target[int(token)] if isinstance(target, list) else target[token]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+        return target
+
+    def _object(self, value: Dict[str, Any], path: Path, node: _Node, schemas: List[Dict[str, Any]]) -> None:
+        changed = node.changed
+        present = [k for k in changed if k in value]
+        removed = [k for k in changed if k not in value]
+        for schema in schemas:
+            keywords: Dict[str, Any] = {}
+            if removed and "required" in schema:
+                missing = [k for k in schema["required"] if k in removed]
+                if missing:
+                    keywords["required"] = missing
+            if changed:
+                for name in ("minProperties", "maxProperties"):
+                    if name in schema:
+                        keywords[name] = schema[name]
+            if keywords:
+                self.check(keywords, value, path)
+
+            if present and "propertyNames" in schema:
+                self.check(
+                    {"propertyNames": schema["propertyNames"]},
+                    {k: None for k in present},
+                    path,
+                )
+            if present and schema.get("additionalProperties") is False:
+                # Only added keys can be unexpected; values are checked below
+                extra = [k for k in present if not _declares(schema, k)]
+                if extra:
+                    # patternProperties only shapes the message: no extra key matches
+                    rules = {"additionalProperties": False}
+                    if "patternProperties" in schema:
+                        rules["patternProperties"] = schema["patternProperties"]
+                    self.check(rules, {k: None for k in extra}, path)
+            self._dependencies(schema, value, path, node, present, removed)
+
+        for token, child in node.children.items():
+            if token in value:
+                self.walk(value[token], path + [token], child, _property_schemas(schemas, token))
+
+    def _dependencies(
+        self,
+        schema: Dict[str, Any],
+        value: Dict[str, Any],
+        path: Path,
+        node: _Node,
+        present: List[str],
+        removed: List[str],
+    ) -> None:
+        for keyword in ("dependencies", "dependentRequired", "dependentSchemas"):
+            dependencies = schema.get(keyword)
+            if not dependencies or keyword not in self.keywords:
+                continue
+            relevant = {}
+            for trigger, dependency in dependencies.items():
+                if trigger not in value:
+                    continue
+                if isinstance(dependency, list):
+                    if trigger in present or any(k in dependency for k in removed):
+                        relevant[trigger] = dependency
+                else:
+                    # A schema dependency looks at the whole object
+                    relevant[trigger] = dependency
+            if relevant:
+                self.check({keyword: relevant}, value, path)
+
+    def _array(self, value: List[Any], path: Path, node: _Node, schemas: List[Dict[str, Any]]) -> None:
+        resized = node.shift is not None
+        touched = [i for i in node.children if isinstance(i, int) and i < len(value)]
+        for schema in schemas:
+            keywords = {}
+            if resized:
+                keywords.update({k: schema[k] for k in ("minItems", "maxItems") if k in schema})
+            if keywords:
+                self.check(keywords, value, path)
+            if schema.get("uniqueItems") and touched and _has_duplicates(value, touched):
+                self.check({"uniqueItems": True}, value, path)
+
+            positional = _positional(schema, "prefixItems" in self.keywords)
+            if positional is None:
+                continue
+            keyword, items, rest_keyword, additional = positional
+            if additional is False and len(value) > len(items):
+                self.check({keyword: [True] * len(items), rest_keyword: False}, value, path)
+            if resized:
+                # Elements after the shift now sit under different positional schemas
+                for index in range(node.shift, len(value)):
+                    if index in node.children:
+                        continue
+                    sub = items[index] if index < len(items) else additional
+                    if sub is not False:
+                        self.check(sub, value[index], path + [index])
+
+        prefix_items = "prefixItems" in self.keywords
+        for index in touched:
+            self.walk(
+                value[index],
+                path + [index],
+                node.children[index],
+                _item_schemas(schemas, index, prefix_items),
+            )
+
+
+def _property_schemas(schemas: List[Dict[str, Any]], key: str) -> List[Any]:
+    result = []
+    for schema in schemas:
+        matched = False
+        if key in schema.get("properties", {}):
+            result.append(schema["properties"][key])
+            matched = True
+        for pattern, sub in schema.get("patternProperties", {}).items():
+            if re.search(pattern, key):
+                result.append(sub)
+                matched = True
+        # additionalProperties: false is reported by the parent, not the value
+        additional = schema.get("additionalProperties", True)
+        if not matched and additional is not False:
+            result.append(additional)
+    return result
+
+
+def _declares(schema: Dict[str, Any], key: str) -> bool:
+    return key in schema.get("properties", {}) or any(
+        re.search(pattern, key) for pattern in schema.get("patternProperties", {})
+    )
+
+
+def _positional(
+    schema: Dict[str, Any], prefix_items: bool
+) -> Optional[Tuple[str, List[Any], str, Any]]:
+    """Positional item schemas as (keyword, schemas, rest keyword, rest schema).
+
+    ``prefix_items`` selects the 2020-12 spelling (``prefixItems`` then
+    ``items``) over the older ``items`` array then ``additionalItems``.
+    """
+    if prefix_items:
+        items = schema.get("prefixItems")
+        if isinstance(items, list):
+            return "prefixItems", items, "items", schema.get("items", True)
+        return None
+    items = schema.get("items")
+    if isinstance(items, list):
+        return "items", items, "additionalItems", schema.get("additionalItems", True)
+    return None
+
+
+def _item_schemas(schemas: List[Dict[str, Any]], index: int, prefix_items: bool = False) -> List[Any]:
+    result = []
+    for schema in schemas:
+        positional = _positional(schema, prefix_items)
+        if positional is not None:
+            _, items, _, additional = positional
+            if index < len(items):
+                result.append(items[index])
+            elif additional is not False:
+                result.append(additional)
+        elif schema.get("items") is not None:
+            result.append(schema["items"])
+    return result
+
+
+def _has_duplicates(value: List[Any], touched: Sequence[int]) -> bool:
+    wanted = {_canonical(value[i]) for i in touched}
+    seen: Set[Any] = set()
+    for item in value:
+        key = _canonical(item)
+        if key in wanted:
+            if key in seen:
+                return True
+            seen.add(key)
+    return False
+
+
+def _uses_dynamic_refs(schema: Any) -> bool:
+    """Whether references resolve by evaluation path, which the walk cannot follow."""
+    return any(
+        isinstance(sub, dict) and any(k in sub for k in _DYNAMIC_REFS) for _, sub in _walk(schema)
+    )
+
+
+def validate_patch(
+    document: Any,
+    schema: Dict[str, Any],
+    patch: Sequence[Dict[str, Any]],
+    json_file_path: Optional[str] = None,
+    in_place: bool = False,
+) -> Any:
+    """Apply a JSON Patch to a valid document and re-validate only what changed.
+
+    Args:
+        document: Parsed document that is valid against ``schema``
+        schema: The JSON schema the document is validated against
+        patch: RFC 6902 operations
+        json_file_path: Optional path to the document for error reporting
+        in_place: Modify ``document`` itself instead of copying the
+            containers along each patched path
+
+    Returns:
+        The patched document
+
+    Raises:
+        PatchError: If the patch cannot be applied
+        JSONValidationError: If the patched document is invalid
+    """
+    patcher = _apply(document, patch, in_place)
+    checker = _IncrementalValidator(schema)
+    if _uses_dynamic_refs(schema):
+        checker.check(schema, patcher.root, [])
+    else:
+        checker.walk(patcher.root, [], _build_trie(patcher.touches), [schema])
+
+    errors = checker.errors
+    if errors:
+        best = best_match(errors)
+        raise JSONValidationError(
+            f"JSON validation failed: {best.message}",
+            json_file_path,
+            [_format_validation_error(error) for error in errors],
+            [tuple(error.absolute_path) for error in errors],
+        )
+    return patcher.root
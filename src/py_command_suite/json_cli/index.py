@@ -0,0 +1,418 @@
+"""Persistent sidecar index of record byte offsets for large JSON files.
+
+An index lists the byte span of every element of a top-level array, or of
+every non-blank line of an NDJSON file, so single records can be read with
+one seek and re-validated without parsing the rest of the file. It is
+stored next to the data as ``<name>.jvidx`` and rebuilt automatically
+when the file's size, modification time or sampled content fingerprint
+changes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jsonschema.exceptions import best_match
+
+from .dispatch import dispatching_validator
+from .formats import FORMAT_CHECKER
+from .exceptions import FileAccessError, JSONParseError, JSONValidationError, SchemaError
+from .parallel import is_decomposable
+from .positions import locate_in_elements, set_error_positions
+from .structural import StructureError, array_body, iter_element_spans
+from .validator import _format_error_entry, _get_json_error_suggestion
+
+INDEX_SUFFIX = ".jvidx"
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+_MAGIC = b"JVIDX1\n"
+_SAMPLE_BLOCK = 4096
+_SAMPLE_COUNT = 16
+_LINE = re.compile(rb"[^\n]*")
+_BLANK = b" \t\r"
+
+
+def file_fingerprint(path: Path) -> str:
+    """Hash the size plus evenly spaced sample blocks of a file.
+
+    Cheap enough to check on every use of a multi-GB file while still
+    catching most in-place edits that keep the size and timestamp.
+
+    Args:
+        path: File to fingerprint
+
+    Returns:
+        Hex digest
+    """
+    size = path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with path.open("rb") as f:
+        if size <= _SAMPLE_BLOCK * _SAMPLE_COUNT:
+            digest.update(f.read())
+        else:
+            step = (size - _SAMPLE_BLOCK) // (_SAMPLE_COUNT - 1)
+            for k in range(_SAMPLE_COUNT):
+                f.seek(k * step)
+                digest.update(f.read(_SAMPLE_BLOCK))
+    return digest.hexdigest()
+
+
+def index_path_for(path: Path) -> Path:
+    """Return the sidecar path for a data file."""
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def detect_kind(path: Path, buf: Any) -> str:
+    """Return "ndjson" or "array" for a data file."""
+    if path.suffix.lower() in NDJSON_SUFFIXES:
+        return "ndjson"
+    try:
+        array_body(buf)
+    except StructureError:
+        return "ndjson"
+    return "array"
+
+
+class RecordIndex:
+    """Byte spans of the records in one file."""
+
+    def __init__(
+        self,
+        path: Path,
+        kind: str,
+        size: int,
+        mtime_ns: int,
+        fingerprint: str,
+        starts: array,
+        ends: array,
+    ) -> None:
+        """Wrap index data; use ``open`` or ``build`` to create one.
+
+        Args:
+            path: Data file the index describes
+            kind: "array" or "ndjson"
+            size: File size when indexed
+            mtime_ns: File modification time when indexed
+            fingerprint: ``file_fingerprint`` when indexed
+            starts: Start offset of each record
+            ends: End offset (exclusive) of each record
+        """
+        self.path = path
+        self.kind = kind
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.fingerprint = fingerprint
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.starts)
+
+    @classmethod
+    def build(cls, path: Path, kind: str = "auto") -> "RecordIndex":
+        """Scan a file and index its records.
+
+        Args:
+            path: Data file
+            kind: "array", "ndjson" or "auto"
+
+        Returns:
+            A new (unsaved) index
+
+        Raises:
+            FileAccessError: If the file cannot be read
+            JSONParseError: If an array file is structurally broken
+        """
+        try:
+            stat = path.stat()
+            starts, ends = array("Q"), array("Q")
+            with path.open("rb") as f:
+                if stat.st_size == 0:
+                    buf: Any = b""
+                else:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    if kind == "auto":
+                        kind = detect_kind(path, buf)
+                    if kind == "array":
+                        spans: Iterable[Tuple[int, int]] = iter_element_spans(
+                            buf, *array_body(buf)
+                        )
+                    else:
+                        spans = _ndjson_spans(buf)
+                    for start, end in spans:
+                        starts.append(start)
+                        ends.append(end)
+                finally:
+                    if isinstance(buf, mmap.mmap):
+                        buf.close()
+        except StructureError as e:
+            raise JSONParseError(f"Cannot index {path}: {e}", str(path))
+        except OSError as e:
+            raise FileAccessError(f"Cannot index {path}: {e}", str(path))
+
+        return cls(
+            path, kind, stat.st_size, stat.st_mtime_ns, file_fingerprint(path), starts, ends
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["RecordIndex"]:
+        """Load the sidecar index for a file if it exists and is current.
+
+        Args:
+            path: Data file
+
+        Returns:
+            The index, or None if it is missing, unreadable or stale
+        """
+        sidecar = index_path_for(path)
+        # A truncated, foreign or old-format sidecar is rebuilt, not an error
+        try:
+            with sidecar.open("rb") as f:
+                if f.readline() != _MAGIC:
+                    return None
+                header = json.loads(f.readline())
+                starts, ends = array("Q"), array("Q")
+                starts.fromfile(f, header["count"])
+                ends.fromfile(f, header["count"])
+            if header.get("byteorder") != sys.byteorder:
+                starts.byteswap()
+                ends.byteswap()
+            if header["kind"] not in ("array", "ndjson"):
+                return None
+            index = cls(
+                path,
+                header["kind"],
+                header["size"],
+                header["mtime_ns"],
+                header["fingerprint"],
+                starts,
+                ends,
+            )
+            return index if index.is_current() else None
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def open(cls, path: Path, kind: str = "auto") -> "RecordIndex":
+        """Return a current index for a file, rebuilding the sidecar if needed.
+
+        Args:
+            path: Data file
+            kind: "array", "ndjson" or "auto" (used only when rebuilding)
+
+        Returns:
+            An index matching the file's current contents
+        """
+        index = cls.load(path)
+        if index is None or kind not in ("auto", index.kind):
+            index = cls.build(path, kind)
+            index.save()
+        return index
+
+    def is_current(self) -> bool:
+        """Return True if the data file is unchanged since indexing."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        if stat.st_size != self.size or stat.st_mtime_ns != self.mtime_ns:
+            return False
+        # Catches rewrites that preserved the timestamp (copies, restores)
+        return file_fingerprint(self.path) == self.fingerprint
+
+    def save(self) -> Path:
+        """Write the sidecar atomically and return its path."""
+        sidecar = index_path_for(self.path)
+        header = {
+            "kind": self.kind,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "fingerprint": self.fingerprint,
+            "count": len(self),
+            "byteorder": sys.byteorder,
+        }
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        try:
+            with tmp.open("wb") as f:
+                f.write(_MAGIC)
+                f.write(json.dumps(header).encode() + b"\n")
+                self.starts.tofile(f)
+                self.ends.tofile(f)
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            raise FileAccessError(
+                f"Cannot write index {sidecar}: {e}",
+                str(sidecar),
+                "Check that the data file's directory is writable",
+            )
+        return sidecar
+
+    def read(self, n: int) -> bytes:
+        """Return the raw bytes of record ``n``."""
+        return next(self._read_many([n]))[1]
+
+    def record(self, n: int) -> Any:
+        """Return record ``n`` parsed."""
+        return next(self.iter_records([n]))[1]
+
+    def iter_records(self, indices: Iterable[int]) -> Iterator[Tuple[int, Any]]:
+        """Parse selected records with one seek each.
+
+        Args:
+            indices: Record numbers to read
+
+        Yields:
+            (record number, parsed value)
+
+        Raises:
+            JSONParseError: If a record is not valid JSON
+        """
+        for n, raw in self._read_many(indices):
+            try:
+                yield n, json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                message = getattr(e, "msg", str(e))
+                raise JSONParseError(
+                    f"Invalid JSON in record {n} of {self.path}: {message}\n"
+                    f"Suggestion: {_get_json_error_suggestion(message)}",
+                    str(self.path),
+                )
+
+    def _read_many(self, indices: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+        count = len(self)
+        with self.path.open("rb") as f:
+            for n in indices:
+                if not 0 <= n < count:
+                    raise IndexError(f"record {n} out of range (0-{count - 1})")
+                start = self.starts[n]
+                f.seek(start)
+                yield n, f.read(self.ends[n] - start)
+
+
+def _ndjson_spans(buf: Any) -> Iterator[Tuple[int, int]]:
+    for match in _LINE.finditer(buf):
+        start, end = match.span()
+        while start < end and buf[start] in _BLANK:
+            start += 1
+        while end > start and buf[end - 1] in _BLANK:
+            end -= 1
+        if start < end:
+            yield start, end
+
+
+def parse_ranges(spec: str, count: int) -> List[int]:
+    """Expand a selection such as ``"3,10-12,40-"`` into sorted record numbers.
+
+    Args:
+        spec: Comma-separated numbers and inclusive ranges; an open end
+            means "to the last record"
+        count: Number of records available
+
+    Returns:
+        Sorted, de-duplicated record numbers
+
+    Raises:
+        ValueError: If the spec is malformed or out of range
+    """
+    selected = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        lo = int(first)
+        hi = (int(last) if last else count - 1) if dash else lo
+        if lo < 0 or hi >= count or lo > hi:
+            raise ValueError(f"record range '{part}' outside 0-{count - 1}")
+        selected.update(range(lo, hi + 1))
+    return sorted(selected)
+
+
+def validate_records(
+    index: RecordIndex,
+    schema: Optional[Dict[str, Any]],
+    indices: Iterable[int],
+    check_formats: bool = False,
+) -> int:
+    """Re-validate selected records only.
+
+    Array elements are checked against the ``items`` schema; NDJSON lines
+    against the whole schema.
+
+    Args:
+        index: Current index of the data file
+        schema: Root schema, or None for a syntax-only check
+        indices: Record numbers to validate
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        Number of records validated
+
+    Raises:
+        SchemaError: If an array schema constrains the array as a whole
+        JSONParseError: If a record is not valid JSON
+        JSONValidationError: If any selected record is invalid
+    """
+    validator = None
+    if schema is not None:
+        root = dispatching_validator(schema, FORMAT_CHECKER if check_formats else None)
+        if index.kind == "array":
+            if not is_decomposable(schema):
+                raise SchemaError(
+                    "Schema constrains the array as a whole; selected records "
+                    "cannot be validated independently",
+                    str(index.path),
+                )
+            validator = root.evolve(schema=schema.get("items", {}))
+        else:
+            validator = root
+
+    checked = 0
+    errors: List[Any] = []
+    for n, record in index.iter_records(indices):
+        checked += 1
+        if validator is None:
+            continue
+        for error in validator.iter_errors(record):
+            error.path.appendleft(n)
+            errors.append(error)
+
+    if errors:
+        best = best_match(errors)
+        paths = [tuple(e.absolute_path) for e in errors]
+        error = JSONValidationError(
+            f"JSON validation failed: {best.message}",
+            str(index.path),
+            [_format_error_entry(path, e.message) for path, e in zip(paths, errors)],
+            paths,
+        )
+        _attach_record_positions(error, index)
+        raise error
+    return checked
+
+
+def _attach_record_positions(error: JSONValidationError, index: RecordIndex) -> None:
+    subpaths: Dict[int, List[Tuple[Any, ...]]] = {}
+    for path in error.error_paths:
+        subpaths.setdefault(path[0], []).append(path[1:])
+    order = sorted(subpaths)
+    try:
+        with index.path.open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                located = locate_in_elements(
+                    buf, [(index.starts[n], index.ends[n], subpaths[n]) for n in order]
+                )
+    except (OSError, ValueError):
+        return
+    by_record = dict(zip(order, located))
+    set_error_positions(
+        error, [by_record[p[0]].get(p[1:]) for p in error.error_paths]
+    )
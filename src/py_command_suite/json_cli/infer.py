@@ -0,0 +1,338 @@
+"""Schema inference from sample documents.
+
+Documents are folded into a ``Summary``: a tree with one node per
+distinct path (object members by name, array elements together) that
+counts the JSON types seen there, how often each member is present, the
+smallest and largest numbers and string lengths, and the distinct scalar
+values while there are few of them. Memory therefore grows with the
+number of distinct paths, not the number of records. Summaries merge, so
+partial summaries built in worker processes combine into the same result
+as a sequential pass.
+
+``Summary.to_schema`` turns the tree into a Draft 7 schema that accepts
+every sampled document.
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .dispatch import _canonical
+from .exceptions import JSONParseError
+from .validator import load_json_file
+
+DRAFT7 = "http://json-schema.org/draft-07/schema#"
+
+# Distinct values tracked per path before it stops being an enum candidate
+MAX_ENUM = 10
+# Each enum value must have been seen this many times on average
+ENUM_MIN_REPEAT = 2
+# Members tracked per object path; the rest share one "additional" node
+MAX_PROPERTIES = 1000
+# NDJSON byte ranges per worker
+RANGES_PER_WORKER = 4
+
+_ENUM_TYPES = frozenset({"string", "integer", "null", "boolean"})
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+class _Node:
+    """Statistics for the values found at one path."""
+
+    __slots__ = (
+        "count", "types", "values", "minimum", "maximum", "min_length",
+        "max_length", "items", "objects", "properties", "additional",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        # canonical value -> (value, count); None once there are too many
+        self.values: Optional[Dict[Any, List[Any]]] = {}
+        self.minimum: Any = None
+        self.maximum: Any = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.items: Optional[_Node] = None
+        self.objects = 0
+        self.properties: Dict[str, _Node] = {}
+        self.additional: Optional[_Node] = None
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        kind = _json_type(value)
+        self.types[kind] = self.types.get(kind, 0) + 1
+
+        if self.values is not None:
+            if kind in _ENUM_TYPES:
+                key = _canonical(value)
+                entry = self.values.get(key)
+                if entry is not None:
+                    entry[1] += 1
+                elif len(self.values) < MAX_ENUM:
+                    self.values[key] = [value, 1]
+                else:
+                    self.values = None
+            else:
+                self.values = None
+
+        if kind == "integer" or kind == "number":
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+        elif kind == "string":
+            length = len(value)
+            if self.min_length is None or length < self.min_length:
+                self.min_length = length
+            if self.max_length is None or length > self.max_length:
+                self.max_length = length
+        elif kind == "array":
+            if self.items is None:
+                self.items = _Node()
+            for item in value:
+                self.items.add(item)
+        elif kind == "object":
+            self.objects += 1
+            for name, member in value.items():
+                self._member(name).add(member)
+
+    def _member(self, name: str) -> "_Node":
+        node = self.properties.get(name)
+        if node is not None:
+            return node
+        if len(self.properties) < MAX_PROPERTIES:
+            node = self.properties[name] = _Node()
+            return node
+        if self.additional is None:
+            self.additional = _Node()
+        return self.additional
+
+    def merge(self, other: "_Node") -> None:
+        self.count += other.count
+        for kind, n in other.types.items():
+            self.types[kind] = self.types.get(kind, 0) + n
+
+        if self.values is not None and other.values is not None:
+            for key, (value, n) in other.values.items():
+                entry = self.values.get(key)
+                if entry is not None:
+                    entry[1] += n
+                elif len(self.values) < MAX_ENUM:
+                    self.values[key] = [value, n]
+                else:
+                    self.values = None
+                    break
+        else:
+            self.values = None
+
+        self.minimum = _pick(min, self.minimum, other.minimum)
+        self.maximum = _pick(max, self.maximum, other.maximum)
+        self.min_length = _pick(min, self.min_length, other.min_length)
+        self.max_length = _pick(max, self.max_length, other.max_length)
+
+        if other.items is not None:
+            if self.items is None:
+                self.items = _Node()
+            self.items.merge(other.items)
+        self.objects += other.objects
+        for name, node in other.properties.items():
+            self._member(name).merge(node)
+        if other.additional is not None:
+            if self.additional is None:
+                self.additional = _Node()
+            self.additional.merge(other.additional)
+
+    def to_schema(self, required_threshold: float) -> Any:
+        if not self.count:
+            return {}
+        types = set(self.types)
+        if "number" in types:
+            types.discard("integer")
+        schema: Dict[str, Any] = {"type": types.pop() if len(types) == 1 else sorted(types)}
+
+        values = self.values
+        if (
+            values
+            and set(self.types) - {"null", "boolean"}
+            and self.count >= ENUM_MIN_REPEAT * len(values)
+        ):
+            schema["enum"] = sorted(
+                (value for value, _ in values.values()), key=lambda v: json.dumps(v)
+            )
+            return schema
+
+        if self.minimum is not None:
+            schema["minimum"] = self.minimum
+            schema["maximum"] = self.maximum
+        if self.min_length is not None:
+            schema["minLength"] = self.min_length
+            schema["maxLength"] = self.max_length
+        if self.items is not None and self.items.count:
+            schema["items"] = self.items.to_schema(required_threshold)
+        if self.objects:
+            schema["properties"] = {
+                name: node.to_schema(required_threshold)
+                for name, node in self.properties.items()
+            }
+            required = [
+                name
+                for name, node in self.properties.items()
+                if node.count >= required_threshold * self.objects
+            ]
+            if required:
+                schema["required"] = required
+            if self.additional is not None:
+                schema["additionalProperties"] = self.additional.to_schema(
+                    required_threshold
+                )
+        return schema
+
+
+def _pick(choose: Any, a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return choose(a, b)
+
+
+class Summary:
+    """Mergeable statistical summary of a set of JSON documents."""
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self.root = _Node()
+
+    @property
+    def count(self) -> int:
+        """Number of documents summarized."""
+        return self.root.count
+
+    def add(self, document: Any) -> None:
+        """Fold one parsed document into the summary."""
+        self.root.add(document)
+
+    def merge(self, other: "Summary") -> "Summary":
+        """Fold another summary into this one and return this one."""
+        self.root.merge(other.root)
+        return self
+
+    def to_schema(self, required_threshold: float = 1.0) -> Dict[str, Any]:
+        """Build a Draft 7 schema describing the summarized documents.
+
+        Args:
+            required_threshold: Fraction of objects a member must appear in
+                to be listed in ``required`` (1.0 keeps every sampled
+                document valid)
+
+        Returns:
+            The schema, with ``$schema`` set to Draft 7
+        """
+        schema = self.root.to_schema(required_threshold)
+        return {"$schema": DRAFT7, **schema}
+
+
+def summarize(documents: Iterable[Any]) -> Summary:
+    """Summarize parsed documents sequentially."""
+    summary = Summary()
+    for document in documents:
+        summary.add(document)
+    return summary
+
+
+def _ndjson_records(path: Path, start: int, end: int) -> Iterator[Any]:
+    """Parse the NDJSON lines that start within ``[start, end)``."""
+    with path.open("rb") as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    reason = e.msg if isinstance(e, json.JSONDecodeError) else e.reason
+                    raise JSONParseError(
+                        f"Invalid JSON in file {path}: {reason} in the record at byte {offset}",
+                        str(path),
+                    ) from None
+            offset += len(line)
+
+
+def _ndjson_ranges(path: Path, parts: int) -> List[Tuple[int, int]]:
+    """Cut a file into about ``parts`` byte ranges at line boundaries."""
+    size = path.stat().st_size
+    cuts = [0]
+    with path.open("rb") as f:
+        for k in range(1, parts):
+            f.seek(max(size * k // parts - 1, cuts[-1]))
+            f.readline()
+            cut = f.tell()
+            if cuts[-1] < cut < size:
+                cuts.append(cut)
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _summarize_task(path: str, start: int, end: Optional[int]) -> Summary:
+    """Summarize an NDJSON byte range, or a whole JSON document when ``end`` is None."""
+    if end is None:
+        return summarize([load_json_file(Path(path), validate_size=False)])
+    return summarize(_ndjson_records(Path(path), start, end))
+
+
+def infer_summary(
+    paths: Sequence[Path], ndjson: bool = False, workers: int = 1
+) -> Summary:
+    """Summarize JSON documents or NDJSON files, optionally across processes.
+
+    Args:
+        paths: Files to read; each is one document, or with ``ndjson`` one
+            record per line
+        ndjson: Whether the files are NDJSON
+        workers: Worker processes; NDJSON files are split into line-aligned
+            byte ranges so one large file also parallelizes
+
+    Returns:
+        The merged summary (the same whatever the number of workers)
+
+    Raises:
+        JSONParseError: If a document or record is not valid JSON
+        FileAccessError: If a file cannot be read
+    """
+    tasks: List[Tuple[str, int, Optional[int]]] = []
+    for path in paths:
+        if not ndjson:
+            tasks.append((str(path), 0, None))
+            continue
+        parts = workers * RANGES_PER_WORKER if workers > 1 else 1
+        tasks.extend((str(path), start, end) for start, end in _ndjson_ranges(path, parts))
+
+    summary = Summary()
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            summary.merge(_summarize_task(*task))
+        return summary
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks) or 1)) as executor:
+        for partial in executor.map(_summarize_task, *zip(*tasks)):
+            summary.merge(partial)
+    return summary
@@ -1,8 +1,11 @@
 """Main CLI module for JSON validation tool."""
 
+import json
+import os
 import sys
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 import click
 
@@ -13,8 +16,24 @@ from .exceptions import (
     SchemaError,
     FileAccessError,
     FileSizeError,
+    GitError,
 )
-from .validator import validate_json_file
+from .analyzer import analyze_schema, check_equivalence, optimize_schema
+from .batch import SchemaStore, validate_one
+from .changes import changed_jobs
+from .crawler import crawl, load_config
+from .generator import write_corpus
+from .infer import infer_summary
+from .metrics import disable_metrics, enable_metrics, serve_metrics
+from .multi import validate_json_file_against_schemas
+from .index import RecordIndex, parse_ranges, validate_records
+from .parallel import validate_json_file_parallel
+from .query import query_file
+from .reformat import reformat_file
+from .report import FORMATS, Reporter, create_reporter
+from .scheduler import EXECUTORS, benchmark_executors, gil_disabled, schedule
+from .unique import find_duplicate_records
+from .validator import load_schema_file, validate_json_file
 
 
 @click.command()
@@ -24,29 +43,212 @@ from .validator import validate_json_file
 @click.option(
     "--schema",
     "-s",
+    "schemas",
     type=click.Path(exists=True, path_type=Path),
-    help="JSON schema file to validate against",
+    multiple=True,
+    help="JSON schema file to validate against; repeat to check one file "
+    "against several schemas with a single parse",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Schema mapping config for directory mode (default: .json-validate.json)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes for a large top-level array or for the files of a "
+    "directory, or threads for several schemas (0 = one per CPU)",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(EXECUTORS),
+    default="auto",
+    help="Directory mode: run --jobs as threads or processes; auto picks "
+    "threads only when the GIL is disabled (default: auto)",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Directory mode: stop at the first failing file, cancelling the rest",
+)
+@click.option(
+    "--memory-budget",
+    metavar="SIZE",
+    help="Directory mode: estimated parse memory allowed in flight across "
+    "workers (e.g. 4G; default: half of RAM)",
+)
+@click.option(
+    "--changed-since",
+    "since",
+    metavar="REF",
+    help="Directory mode: only files changed since this git revision, plus "
+    "the documents of any changed schema",
+)
+@click.option(
+    "--staged",
+    is_flag=True,
+    help="Directory mode: only files with staged changes, plus the documents "
+    "of any changed schema. The working-tree copies are validated, not the "
+    "staged content",
+)
+@click.option(
+    "--records",
+    metavar="SPEC",
+    help="Re-validate only these records (e.g. 3,10-20) via the sidecar index",
+)
+@click.option(
+    "--dedupe-check",
+    is_flag=True,
+    help="Treat JSON_FILE as NDJSON and report records equal to an earlier "
+    "one (memory stays bounded; large files spill to temp files)",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["text", *FORMATS]),
+    default="text",
+    help="Result format: human text, NDJSON records streamed per file, "
+    "SARIF or JUnit XML (default: text)",
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write --output-format results here (required for sarif and junit; "
+    "ndjson defaults to stdout)",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write OpenMetrics counters and latencies here when the run ends",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(0, 65535),
+    help="Serve OpenMetrics at http://127.0.0.1:PORT/metrics while running",
+)
+@click.option(
+    "--check-formats",
+    is_flag=True,
+    help="Enforce 'format' for email, date-time, ipv4, ipv6, uuid and uri "
+    "(otherwise an annotation)",
 )
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed validation errors")
 @click.option("--max-size", type=int, default=100, help="Maximum file size in MB (default: 100)")
 @click.option("--no-size-check", is_flag=True, help="Skip file size validation")
 @click.version_option(version="0.1.0", prog_name="json-validate")
 def validate_json(
-    json_file: Path, schema: Optional[Path] = None, verbose: bool = False, max_size: int = 100, no_size_check: bool = False
+    json_file: Path, schemas: Tuple[Path, ...] = (), config: Optional[Path] = None, jobs: int = 1, executor: str = "auto", fail_fast: bool = False, memory_budget: Optional[str] = None, since: Optional[str] = None, staged: bool = False, records: Optional[str] = None, dedupe_check: bool = False, output_format: str = "text", output_file: Optional[Path] = None, metrics_file: Optional[Path] = None, metrics_port: Optional[int] = None, check_formats: bool = False, verbose: bool = False, max_size: int = 100, no_size_check: bool = False
 ) -> None:
     """Validate JSON files against optional schemas.
 
     This tool validates JSON files for syntax correctness and optionally
     validates them against a JSON schema for structure and content validation.
+    When JSON_FILE is a directory, every JSON file below it is validated
+    against the schema its path maps to in the config file.
 
     Examples:
         json-validate data.json
         json-validate data.json --schema schema.json
         json-validate data.json -s schema.json --verbose
+        json-validate data.json -s schema.json --check-formats
+        json-validate data.json -s v1.json -s v2.json
+        json-validate repo/ --config schemas.json
+        json-validate . --staged
+        json-validate . --changed-since origin/main --jobs 0
+        json-validate corpus/ -s schema.json --jobs 0 --fail-fast
+        json-validate corpus/ -s schema.json --jobs 8 --executor threads
+        json-validate huge.json -s schema.json --jobs 0 --no-size-check
+        json-validate huge.json -s schema.json --records 17,40-45
+        json-validate feed.ndjson --dedupe-check
+        json-validate repo/ --metrics-file run.prom
+        json-validate repo/ --output-format ndjson | jq .
+        json-validate repo/ --output-format sarif --output-file results.sarif
     """
+    if metrics_file is not None or metrics_port is not None:
+        _start_metrics(metrics_file, metrics_port)
+
+    schema = schemas[0] if schemas else None
+    if (since is not None or staged) and not json_file.is_dir():
+        raise click.UsageError("--changed-since and --staged need a directory JSON_FILE")
+    if dedupe_check and (
+        schemas or records is not None or output_format != "text" or json_file.is_dir()
+    ):
+        raise click.UsageError(
+            "--dedupe-check needs a single NDJSON JSON_FILE without --schema, "
+            "--records or --output-format"
+        )
+    if output_format != "text":
+        if len(schemas) > 1 or records is not None:
+            raise click.UsageError(
+                "--output-format needs a single --schema and no --records"
+            )
+        if output_format != "ndjson" and output_file is None:
+            raise click.UsageError(f"--output-format {output_format} needs --output-file")
+    if len(schemas) > 1:
+        if json_file.is_dir() or records is not None:
+            raise click.UsageError(
+                "Several --schema options need a single JSON_FILE without --records"
+            )
+        _validate_against_schemas(
+            json_file, schemas, verbose, max_size, no_size_check, jobs, check_formats
+        )
+        return
+
+    reporter_context = (
+        _open_reporter(output_format, output_file) if output_format != "text" else nullcontext()
+    )
+    with reporter_context as reporter:
+        if json_file.is_dir():
+            budget = _parse_size(memory_budget, "--memory-budget") if memory_budget else None
+            _validate_directory(
+                json_file,
+                schema,
+                config,
+                verbose,
+                max_size,
+                no_size_check,
+                jobs or os.cpu_count() or 1,
+                fail_fast,
+                budget,
+                since,
+                staged,
+                reporter,
+                check_formats,
+                executor,
+            )
+            return
+        if reporter is not None:
+            result = validate_one(
+                json_file, schema, SchemaStore(), not no_size_check, max_size, check_formats
+            )
+            reporter.add(result)
+            if not result.ok:
+                sys.exit(1)
+            return
+
     try:
+        if dedupe_check:
+            _check_duplicates(json_file, verbose)
+            return
+        if records is not None:
+            _validate_selected_records(json_file, schema, records, check_formats)
+            return
+
         # Perform validation
-        validate_json_file(json_file, schema)
+        if jobs == 1:
+            validate_json_file(json_file, schema, check_formats)
+        else:
+            validate_json_file_parallel(
+                json_file,
+                schema,
+                jobs,
+                not no_size_check,
+                max_size,
+                check_formats=check_formats,
+            )
 
         # Success message
         if schema:
@@ -96,6 +298,9 @@ def validate_json(
         click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
         sys.exit(1)
 
+    except click.ClickException:
+        raise
+
     except Exception as e:
         click.echo(click.style("✗ Unexpected Error: ", fg="red") + str(e), err=True)
         if verbose:
@@ -106,6 +311,221 @@ def validate_json(
         sys.exit(1)
 
 
+# Duplicate records listed without --verbose
+DUPLICATES_SHOWN = 20
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def _parse_size(value: str, param_hint: Optional[str] = None) -> int:
+    """Parse a byte size such as ``500M`` or ``100G``."""
+    text = value.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    try:
+        size = float(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit]
+    except ValueError:
+        raise click.BadParameter(
+            f"'{value}' is not a size like 500M or 100G", param_hint=param_hint
+        )
+    return int(size)
+
+
+def _start_metrics(metrics_file: Optional[Path], metrics_port: Optional[int]) -> None:
+    """Enable metrics for this invocation; export them when it ends."""
+    registry = enable_metrics()
+    ctx = click.get_current_context()
+    if metrics_port is not None:
+        server = serve_metrics(registry, metrics_port)
+        # Callbacks run last-registered first: stop serving, then close
+        ctx.call_on_close(server.server_close)
+        ctx.call_on_close(server.shutdown)
+    if metrics_file is not None:
+        ctx.call_on_close(lambda: registry.write(metrics_file))
+    ctx.call_on_close(disable_metrics)
+
+
+def _validate_selected_records(
+    json_file: Path, schema: Optional[Path], records: str, check_formats: bool = False
+) -> None:
+    """Validate a subset of records located through the sidecar index."""
+    index = RecordIndex.open(json_file)
+    try:
+        indices = parse_ranges(records, len(index))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--records")
+    schema_data = load_schema_file(schema) if schema else None
+    checked = validate_records(index, schema_data, indices, check_formats)
+    target = f"according to schema '{schema}'" if schema else "syntax"
+    click.echo(
+        click.style("✓ ", fg="green")
+        + f"{checked} selected record(s) in '{json_file}' are valid ({target})"
+    )
+
+
+def _check_duplicates(json_file: Path, verbose: bool) -> None:
+    """Report the records of an NDJSON file that repeat an earlier record."""
+    found = 0
+    for duplicate in find_duplicate_records(json_file):
+        found += 1
+        if verbose or found <= DUPLICATES_SHOWN:
+            click.echo(f"  line {duplicate.line} repeats line {duplicate.first_line}", err=True)
+    if found:
+        if found > DUPLICATES_SHOWN and not verbose:
+            click.echo(
+                f"  ... and {found - DUPLICATES_SHOWN} more (use --verbose to list all)",
+                err=True,
+            )
+        click.echo(
+            click.style("✗ Duplicate Records: ", fg="red")
+            + f"{found} record(s) in '{json_file}' repeat an earlier record",
+            err=True,
+        )
+        sys.exit(1)
+    click.echo(click.style("✓ ", fg="green") + f"NDJSON file '{json_file}' has no duplicate records")
+
+
+def _validate_against_schemas(
+    json_file: Path,
+    schemas: Tuple[Path, ...],
+    verbose: bool,
+    max_size: int,
+    no_size_check: bool,
+    jobs: int,
+    check_formats: bool = False,
+) -> None:
+    """Validate one file against several schemas and print a verdict per schema."""
+    try:
+        verdicts = validate_json_file_against_schemas(
+            json_file, schemas, jobs or None, not no_size_check, max_size, check_formats
+        )
+    except JSONCliError as e:
+        click.echo(click.style(f"✗ {type(e).__name__}: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+    failed = 0
+    for verdict in verdicts:
+        if verdict.ok:
+            click.echo(click.style("✓ ", fg="green") + f"valid according to '{verdict.schema}'")
+            continue
+        failed += 1
+        click.echo(
+            click.style(f"✗ {verdict.error_type}: ", fg="red")
+            + f"'{verdict.schema}': {verdict.message}",
+            err=True,
+        )
+        if verbose:
+            for i, error in enumerate(verdict.validation_errors, 1):
+                click.echo(f"  {i}. {error}", err=True)
+
+    summary = (
+        f"JSON file '{json_file}' is valid against "
+        f"{len(verdicts) - failed}/{len(verdicts)} schemas"
+    )
+    if failed:
+        click.echo(click.style("✗ ", fg="red") + summary, err=True)
+        sys.exit(1)
+    click.echo(click.style("✓ ", fg="green") + summary)
+
+
+def _validate_directory(
+    root: Path,
+    schema: Optional[Path],
+    config: Optional[Path],
+    verbose: bool,
+    max_size: int,
+    no_size_check: bool,
+    workers: int = 1,
+    fail_fast: bool = False,
+    memory_budget: Optional[int] = None,
+    since: Optional[str] = None,
+    staged: bool = False,
+    reporter: Optional[Reporter] = None,
+    check_formats: bool = False,
+    executor: str = "auto",
+) -> None:
+    """Validate every selected file below a directory and print a summary.
+
+    With ``since`` or ``staged`` only the files affected by the git diff
+    are validated. With a reporter, per-file results go to it instead of
+    the terminal and the summary goes to stderr.
+    """
+    try:
+        schema_config = load_config(root, config, schema)
+    except JSONCliError as e:
+        click.echo(click.style("✗ Config Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+    changed_only = since is not None or staged
+    if changed_only:
+        try:
+            # Listed up front so a git failure is reported before any output
+            jobs = list(changed_jobs(root, schema_config, since, staged))
+        except GitError as e:
+            click.echo(click.style("✗ Git Error: ", fg="red") + str(e), err=True)
+            sys.exit(1)
+    else:
+        jobs = crawl(root, schema_config)
+
+    total = failed = 0
+    for result in schedule(
+        jobs,
+        workers,
+        not no_size_check,
+        max_size,
+        memory_budget,
+        fail_fast,
+        check_formats,
+        executor,
+    ):
+        total += 1
+        if reporter is not None:
+            reporter.add(result)
+            failed += not result.ok
+            continue
+        if result.ok:
+            if verbose:
+                click.echo(click.style("✓ ", fg="green") + result.path)
+            continue
+        failed += 1
+        click.echo(
+            click.style(f"✗ {result.error_type}: ", fg="red") + str(result.message),
+            err=True,
+        )
+        if verbose:
+            for i, error in enumerate(result.validation_errors, 1):
+                click.echo(f"  {i}. {error}", err=True)
+
+    described = "changed files" if changed_only else "files"
+    summary = f"{total - failed}/{total} {described} valid under '{root}'"
+    if failed and fail_fast:
+        summary += " (stopped at first failure)"
+    if failed:
+        click.echo(click.style("✗ ", fg="red") + summary, err=True)
+        sys.exit(1)
+    click.echo(click.style("✓ ", fg="green") + summary, err=reporter is not None)
+
+
+@contextmanager
+def _open_reporter(output_format: str, output_file: Optional[Path]) -> Iterator[Reporter]:
+    """Start a reporter on the output file (or stdout) and finish it on exit.
+
+    The report is completed even when the run exits early with a failure,
+    so the totals always match what was written.
+    """
+    out_context = (
+        output_file.open("w", encoding="utf-8", newline="")
+        if output_file
+        else nullcontext(sys.stdout)
+    )
+    with out_context as out:
+        reporter = create_reporter(output_format, out)
+        reporter.start()
+        try:
+            yield reporter
+        finally:
+            reporter.finish()
+
+
 @click.group()
 def cli() -> None:
     """JSON CLI tools for validation and processing."""
@@ -116,5 +536,475 @@ def cli() -> None:
 cli.add_command(validate_json, name="validate")
 
 
+@cli.command("index")
+@click.argument(
+    "json_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--kind",
+    type=click.Choice(["auto", "array", "ndjson"]),
+    default="auto",
+    help="Record layout (default: detect)",
+)
+def index_command(json_file: Path, kind: str) -> None:
+    """Build or refresh the sidecar record index for JSON_FILE."""
+    try:
+        index = RecordIndex.open(json_file, kind)
+    except JSONCliError as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    click.echo(
+        click.style("✓ ", fg="green")
+        + f"Indexed {len(index)} {index.kind} record(s) in '{json_file}'"
+    )
+
+
+@cli.command("show")
+@click.argument(
+    "json_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.argument("record", type=click.IntRange(min=0))
+@click.option("--pretty", is_flag=True, help="Pretty-print the record")
+def show_command(json_file: Path, record: int, pretty: bool) -> None:
+    """Print record number RECORD of JSON_FILE using the sidecar index."""
+    try:
+        index = RecordIndex.open(json_file)
+        if record >= len(index):
+            raise click.BadParameter(
+                f"{record} is out of range (file has {len(index)} records)",
+                param_hint="RECORD",
+            )
+        if pretty:
+            click.echo(json.dumps(index.record(record), indent=2, ensure_ascii=False))
+        else:
+            click.echo(index.read(record).decode("utf-8", errors="replace"))
+    except JSONCliError as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+
+def _reformat_command(
+    json_file: Path, output: Optional[Path], indent: Optional[int], ndjson: bool
+) -> None:
+    """Shared body of ``format`` and ``minify``."""
+    if output is not None and output.resolve() == json_file.resolve():
+        raise click.BadParameter("must differ from the input file", param_hint="--output")
+    try:
+        reformat_file(
+            json_file,
+            output,
+            indent,
+            ndjson,
+            None if output else sys.stdout,
+        )
+    except JSONParseError as e:
+        click.echo(click.style("✗ JSON Parse Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    except (JSONCliError, OSError) as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    if output:
+        click.echo(click.style("✓ ", fg="green") + f"Wrote '{output}'", err=True)
+
+
+@cli.command("format")
+@click.argument(
+    "json_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write to this file instead of stdout (replaced only on success)",
+)
+@click.option(
+    "--indent",
+    type=click.IntRange(min=0),
+    default=2,
+    help="Spaces per nesting level (default: 2)",
+)
+@click.option("--ndjson", is_flag=True, help="Input is a sequence of values; write one per line")
+def format_command(json_file: Path, output: Optional[Path], indent: int, ndjson: bool) -> None:
+    """Pretty-print JSON_FILE in constant memory.
+
+    Strings and numbers are copied verbatim; only whitespace changes.
+    """
+    _reformat_command(json_file, output, indent, ndjson)
+
+
+@cli.command("minify")
+@click.argument(
+    "json_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write to this file instead of stdout (replaced only on success)",
+)
+@click.option("--ndjson", is_flag=True, help="Input is a sequence of values; write one per line")
+def minify_command(json_file: Path, output: Optional[Path], ndjson: bool) -> None:
+    """Strip insignificant whitespace from JSON_FILE in constant memory."""
+    _reformat_command(json_file, output, None, ndjson)
+
+
+@cli.command("query")
+@click.argument(
+    "json_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.argument("expressions", nargs=-1, required=True, metavar="EXPRESSION...")
+@click.option("--ndjson", is_flag=True, help="Query each line of an NDJSON file")
+@click.option("--limit", type=click.IntRange(min=1), help="Stop after this many matches")
+@click.option("--paths", is_flag=True, help="Prefix each match with its JSON Pointer")
+@click.option("--pretty", is_flag=True, help="Pretty-print matched values")
+def query_command(
+    json_file: Path,
+    expressions: Tuple[str, ...],
+    ndjson: bool,
+    limit: Optional[int],
+    paths: bool,
+    pretty: bool,
+) -> None:
+    """Print the values at EXPRESSION... in JSON_FILE, one per line.
+
+    Expressions are JSON Pointers (/items/0/id) or simple JSONPath
+    ($.items[*].id). Unrelated subtrees are skipped while streaming, and
+    reading stops once every wildcard-free expression has matched.
+    Exits with status 1 if nothing matched.
+
+    Examples:
+        cli query huge.json /items/1234
+        cli query huge.json '$.items[*].id' --limit 10
+        cli query records.ndjson '$.user.email' --ndjson --paths
+    """
+    matched = 0
+    try:
+        for match in query_file(json_file, expressions, ndjson, limit):
+            matched += 1
+            text = json.dumps(match.value, indent=2 if pretty else None, ensure_ascii=False)
+            if paths:
+                where = f"{match.record}:{match.pointer}" if ndjson else match.pointer
+                text = f"{where}\t{text}"
+            click.echo(text)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="EXPRESSION")
+    except JSONParseError as e:
+        click.echo(click.style("✗ JSON Parse Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    except (JSONCliError, OSError) as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    if not matched:
+        click.echo(click.style("✗ ", fg="red") + "No matches", err=True)
+        sys.exit(1)
+
+
+@cli.command("infer")
+@click.argument(
+    "json_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option("--ndjson", is_flag=True, help="Each line of each file is one sample")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write the schema to this file instead of stdout",
+)
+@click.option(
+    "--required-threshold",
+    type=click.FloatRange(0.0, 1.0, min_open=True),
+    default=1.0,
+    help="Fraction of samples a key must appear in to be required (default: 1.0)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes (0 = one per CPU)",
+)
+def infer_command(
+    json_files: Tuple[Path, ...],
+    ndjson: bool,
+    output: Optional[Path],
+    required_threshold: float,
+    jobs: int,
+) -> None:
+    """Infer a Draft 7 schema from sample JSON_FILES.
+
+    Each file is one sample, or with --ndjson each line is. Memory grows
+    with the number of distinct paths, not the number of samples, and the
+    result does not depend on --jobs.
+
+    Examples:
+        cli infer samples/*.json -o schema.json
+        cli infer feed.ndjson --ndjson -j 0
+    """
+    try:
+        summary = infer_summary(list(json_files), ndjson, jobs or os.cpu_count() or 1)
+        text = json.dumps(summary.to_schema(required_threshold), indent=2, ensure_ascii=False)
+        if output:
+            output.write_text(text + "\n", encoding="utf-8")
+        else:
+            click.echo(text)
+    except JSONParseError as e:
+        click.echo(click.style("✗ JSON Parse Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    except (JSONCliError, OSError) as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+    click.echo(
+        click.style("✓ ", fg="green") + f"Inferred a schema from {summary.count} sample(s)",
+        err=True,
+    )
+
+
+@cli.command("generate")
+@click.argument(
+    "schema_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write to this file instead of stdout",
+)
+@click.option("--count", "-n", type=click.IntRange(min=0), help="Number of instances")
+@click.option(
+    "--until-bytes",
+    "until_bytes",
+    metavar="SIZE",
+    help="Stop once the output reaches this size (e.g. 500M, 100G)",
+)
+@click.option("--seed", type=int, default=0, help="Random seed (default: 0)")
+@click.option(
+    "--mutation-rate",
+    type=click.FloatRange(0.0, 1.0),
+    default=0.0,
+    help="Fraction of instances made deliberately invalid (default: 0)",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["ndjson", "array"]),
+    default="ndjson",
+    help="One instance per line, or a single JSON array (default: ndjson)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes (0 = one per CPU)",
+)
+@click.option(
+    "--no-verify",
+    is_flag=True,
+    help="Skip checking conforming instances against the schema (faster)",
+)
+def generate_command(
+    schema_file: Path,
+    output: Optional[Path],
+    count: Optional[int],
+    until_bytes: Optional[str],
+    seed: int,
+    mutation_rate: float,
+    fmt: str,
+    jobs: int,
+    no_verify: bool,
+) -> None:
+    """Generate synthetic instances of SCHEMA_FILE for load testing.
+
+    Output is identical for the same seed regardless of --jobs.
+    """
+    max_bytes = _parse_size(until_bytes, "--until-bytes") if until_bytes else None
+    if count is None and max_bytes is None:
+        raise click.UsageError("Give --count, --until-bytes, or both")
+
+    try:
+        schema = load_schema_file(schema_file)
+        out_context = (
+            output.open("wb") if output else nullcontext(click.get_binary_stream("stdout"))
+        )
+        with out_context as out:
+            stats = write_corpus(
+                schema,
+                out,
+                count,
+                seed,
+                mutation_rate,
+                jobs or os.cpu_count() or 1,
+                fmt,
+                max_bytes,
+                not no_verify,
+            )
+    except (JSONCliError, OSError) as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+    target = f"'{output}'" if output else "stdout"
+    click.echo(
+        click.style("✓ ", fg="green")
+        + f"Wrote {stats.count} instance(s), {stats.invalid} invalid, "
+        f"{stats.bytes} bytes to {target}",
+        err=True,
+    )
+
+
+@cli.command("bench")
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "--schema",
+    "-s",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Schema for every file (default: the directory's config mapping)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Schema mapping config (default: .json-validate.json)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Workers for each executor (default: 0 = one per CPU)",
+)
+@click.option(
+    "--rounds",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Runs per executor; the fastest counts (default: 3)",
+)
+@click.option("--check-formats", is_flag=True, help="Enforce 'format' as validate does")
+def bench_command(
+    directory: Path,
+    schema: Optional[Path],
+    config: Optional[Path],
+    jobs: int,
+    rounds: int,
+    check_formats: bool,
+) -> None:
+    """Compare thread and process executors on the files below DIRECTORY.
+
+    Both executors validate the same crawled file list with the same
+    number of workers. Threads only run in parallel when the GIL is
+    disabled (a free-threaded build such as python3.13t).
+
+    Examples:
+        cli bench corpus/ -s schema.json -j 8
+    """
+    try:
+        files = list(crawl(directory, load_config(directory, config, schema)))
+        if not files:
+            raise JSONCliError(f"No JSON files found below '{directory}'")
+        workers = jobs or os.cpu_count() or 1
+        timings = benchmark_executors(files, workers, rounds=rounds, check_formats=check_formats)
+    except JSONCliError as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+    gil = "disabled" if gil_disabled() else "enabled"
+    click.echo(f"{len(files)} file(s), {workers} worker(s), best of {rounds}; GIL {gil}")
+    for timing in timings:
+        click.echo(
+            f"  {timing.executor:<10} {timing.seconds:8.3f}s  "
+            f"{timing.files_per_second:10.1f} files/s  ({timing.failed} failed)"
+        )
+    fastest = min(timings, key=lambda timing: timing.seconds)
+    click.echo(click.style("✓ ", fg="green") + f"Fastest: {fastest.executor}")
+
+
+@cli.group("schema")
+def schema_group() -> None:
+    """Inspect and optimize schemas."""
+    pass
+
+
+@schema_group.command("analyze")
+@click.argument(
+    "schema_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write the optimized schema to this file",
+)
+@click.option(
+    "--samples",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Generated instances for the equivalence check (default: 1000)",
+)
+@click.option("--seed", type=int, default=0, help="Random seed (default: 0)")
+@click.option(
+    "--top",
+    type=click.IntRange(min=0),
+    default=10,
+    help="Most expensive keywords to list (default: 10)",
+)
+def analyze_command(
+    schema_file: Path, output: Optional[Path], samples: int, seed: int, top: int
+) -> None:
+    """Estimate validation cost of SCHEMA_FILE and suggest an optimized schema.
+
+    The optimized schema is only written when it gives the same verdict as
+    the original on every sampled instance.
+    """
+    try:
+        schema = load_schema_file(schema_file)
+        analysis = analyze_schema(schema)
+        optimized, changes = optimize_schema(schema)
+        equivalence = check_equivalence(schema, optimized, samples, seed)
+    except JSONCliError as e:
+        click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+        sys.exit(1)
+
+    click.echo(f"Estimated cost: {analysis.total:.1f} keyword evaluations per instance")
+    if analysis.hot_spots:
+        click.echo("Hot spots:")
+        for spot in analysis.hot_spots:
+            click.echo(f"  {spot.pointer} {spot.keyword} ({spot.cost:.1f}): {spot.reason}")
+    if top and analysis.costs:
+        click.echo("Keyword costs:")
+        for entry in analysis.costs[:top]:
+            click.echo(f"  {entry.cost:>10.1f}  {entry.pointer} {entry.keyword}")
+
+    if changes:
+        optimized_cost = analyze_schema(optimized).total
+        click.echo(f"Rewrites (cost {analysis.total:.1f} -> {optimized_cost:.1f}):")
+        for change in changes:
+            click.echo(f"  {change}")
+    else:
+        click.echo("Rewrites: none")
+
+    if not equivalence.ok:
+        click.echo(
+            click.style("✗ Error: ", fg="red")
+            + f"Optimized schema disagrees on {len(equivalence.mismatches)} of "
+            f"{equivalence.samples} instance(s), e.g. "
+            + json.dumps(equivalence.mismatches[0])[:200],
+            err=True,
+        )
+        sys.exit(1)
+    click.echo(f"Equivalence: same verdict on all {equivalence.samples} instance(s)")
+
+    if output:
+        try:
+            output.write_text(json.dumps(optimized, indent=2) + "\n", encoding="utf-8")
+        except OSError as e:
+            click.echo(click.style("✗ Error: ", fg="red") + str(e), err=True)
+            sys.exit(1)
+        click.echo(click.style("✓ ", fg="green") + f"Wrote optimized schema to '{output}'")
+
+
 if __name__ == "__main__":
     validate_json()
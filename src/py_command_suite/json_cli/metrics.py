@@ -0,0 +1,466 @@
+"""OpenMetrics instrumentation for the validation pipeline.
+
+Metrics are off unless ``enable_metrics`` is called. While disabled, every
+hook (``phase``, ``track_file``, ``record_schema_cache``) is one global
+lookup that returns a shared no-op, so instrumented code pays nothing
+measurable. When enabled, the registry can be rendered as OpenMetrics text,
+written to a file at the end of a run, or served over HTTP for
+long-running processes.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+from .exceptions import JSONValidationError
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+# Families a worker process sends home; the parent counts files and bytes
+_WORKER_FAMILIES = ("phase_seconds", "schema_cache")
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Metric:
+    """A metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, labels: Labels) -> str:
+        if not labels:
+            return ""
+        pairs = ",".join(
+            f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)
+        )
+        return "{" + pairs + "}"
+
+    def render(self) -> List[str]:
+        """Return the family's exposition lines."""
+        return [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing total per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        """Add ``amount`` to the total for ``labels``."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current total for ``labels``."""
+        return self._values.get(labels, 0)
+
+    def take(self) -> Dict[Labels, float]:
+        """Return the totals so far as plain data and start afresh."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Labels, float]) -> None:
+        """Add totals returned by ``take`` on another counter."""
+        with self._lock:
+            for labels, amount in values.items():
+                self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}_total{self._labels(labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally computed on render."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Any] = None,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the value for ``labels``."""
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        if self._collect is not None:
+            for labels, value in self._collect():
+                self.set(value, labels)
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{self._labels(labels)} {_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation."""
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Return the number of observations for ``labels``."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def take(self) -> Dict[Labels, List[Any]]:
+        """Return the observations so far as plain data and start afresh."""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series: Dict[Labels, List[Any]]) -> None:
+        """Add observations returned by ``take`` on another histogram."""
+        with self._lock:
+            for labels, (counts, total) in series.items():
+                mine = self._series.get(labels)
+                if mine is None:
+                    mine = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                mine[0] = [a + b for a, b in zip(mine[0], counts)]
+                mine[1] += total
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{self._bucket_labels(labels, bound)} {cumulative}"
+                )
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_number(total)}")
+        return lines
+
+    def _bucket_labels(self, labels: Labels, bound: str) -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)]
+        pairs.append(f'le="{bound}"')
+        return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _peak_rss() -> List[Tuple[Labels, float]]:
+    if resource is None:
+        return []
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return [
+        (("self",), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale),
+        (("children",), resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale),
+    ]
+
+
+class MetricsRegistry:
+    """The pipeline's metric families."""
+
+    def __init__(self) -> None:
+        """Create the standard families with no observations."""
+        self.files = Counter(
+            "json_validate_files", "Files processed by outcome", ["result"]
+        )
+        self.bytes = Counter("json_validate_bytes", "Bytes of documents processed")
+        self.errors = Counter(
+            "json_validate_errors", "Failed files by exception class", ["type"]
+        )
+        self.phase_seconds = Histogram(
+            "json_validate_phase_seconds", "Latency of each pipeline phase", ["phase"]
+        )
+        self.schema_cache = Counter(
+            "json_validate_schema_cache_requests", "Schema cache lookups", ["result"]
+        )
+        self.schema_cache_ratio = Gauge(
+            "json_validate_schema_cache_hit_ratio",
+            "Fraction of schema lookups served from the cache",
+            collect=self._hit_ratio,
+        )
+        self.peak_rss = Gauge(
+            "json_validate_peak_rss_bytes",
+            "Peak resident set size",
+            ["process"],
+            collect=_peak_rss,
+        )
+        self.families: List[_Metric] = [
+            self.files,
+            self.bytes,
+            self.errors,
+            self.phase_seconds,
+            self.schema_cache,
+            self.schema_cache_ratio,
+            self.peak_rss,
+        ]
+
+    def _hit_ratio(self) -> List[Tuple[Labels, float]]:
+        hits = self.schema_cache.value(("hit",))
+        lookups = hits + self.schema_cache.value(("miss",))
+        return [((), hits / lookups)] if lookups else []
+
+    def render(self) -> str:
+        """Return the OpenMetrics text exposition."""
+        lines: List[str] = []
+        for family in self.families:
+            lines.extend(family.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Write the exposition to ``path`` atomically."""
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class _NullContext:
+    """Shared no-op used by every hook while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL = _NullContext()
+_active: Optional[MetricsRegistry] = None
+
+
+class _PhaseTimer:
+    __slots__ = ("registry", "labels", "start")
+
+    def __init__(self, registry: MetricsRegistry, name: str) -> None:
+        self.registry = registry
+        self.labels = (name,)
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.registry.phase_seconds.observe(time.perf_counter() - self.start, self.labels)
+
+
+class _FileTracker:
+    __slots__ = ("registry", "path")
+
+    def __init__(self, registry: MetricsRegistry, path: Path) -> None:
+        self.registry = registry
+        self.path = path
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        try:
+            size: Optional[int] = self.path.stat().st_size
+        except OSError:
+            size = None
+        _count_file(self.registry, size, exc_type.__name__ if exc_type else None)
+
+
+def _count_file(registry: MetricsRegistry, size: Optional[int], error_type: Optional[str]) -> None:
+    if size is not None:
+        registry.bytes.inc(size)
+    if error_type is None:
+        registry.files.inc(labels=("valid",))
+        return
+    outcome = "invalid" if error_type == JSONValidationError.__name__ else "error"
+    registry.files.inc(labels=(outcome,))
+    registry.errors.inc(labels=(error_type,))
+
+
+def enable_metrics() -> MetricsRegistry:
+    """Start collecting into a fresh registry and return it."""
+    global _active
+    _active = MetricsRegistry()
+    return _active
+
+
+def disable_metrics() -> None:
+    """Stop collecting; hooks become no-ops again."""
+    global _active
+    _active = None
+
+
+def active_metrics() -> Optional[MetricsRegistry]:
+    """Return the registry being collected into, if any."""
+    return _active
+
+
+def phase(name: str) -> Any:
+    """Context manager timing one pipeline phase (parse, schema, validate, locate)."""
+    registry = _active
+    if registry is None:
+        return _NULL
+    return _PhaseTimer(registry, name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of ``phase`` for functions that are a whole phase."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            registry = _active
+            if registry is None:
+                return func(*args, **kwargs)
+            with _PhaseTimer(registry, name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def track_file(path: Path) -> Any:
+    """Context manager counting a document's bytes and outcome.
+
+    An exception leaving the block marks the file invalid (for
+    ``JSONValidationError``) or errored, and is counted by class.
+    """
+    registry = _active
+    if registry is None:
+        return _NULL
+    return _FileTracker(registry, path)
+
+
+def take_worker_metrics() -> Optional[Dict[str, Any]]:
+    """Return and reset the phase timings and schema cache counts of this process.
+
+    Worker processes attach these to each result so the parent can merge
+    them (see ``record_file_result``); None while metrics are disabled,
+    and only the families with new observations are included.
+    """
+    registry = _active
+    if registry is None:
+        return None
+    taken = {name: getattr(registry, name).take() for name in _WORKER_FAMILIES}
+    return {name: data for name, data in taken.items() if data}
+
+
+def record_file_result(result: Any, size: Optional[int]) -> None:
+    """Count a file validated elsewhere (e.g. in a worker process).
+
+    Args:
+        result: ``batch.FileResult`` for the file, with the worker's
+            metrics if it collected any
+        size: Its size in bytes, if known
+    """
+    registry = _active
+    if registry is not None:
+        _count_file(registry, size, None if result.ok else result.error_type)
+        for name, data in (result.worker_metrics or {}).items():
+            getattr(registry, name).merge(data)
+
+
+def record_schema_cache(hit: bool) -> None:
+    """Count one schema cache lookup."""
+    registry = _active
+    if registry is not None:
+        registry.schema_cache.inc(labels=("hit" if hit else "miss",))
+
+
+def serve_metrics(
+    registry: MetricsRegistry, port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serve the registry at ``http://host:port/metrics`` from a daemon thread.
+
+    Args:
+        registry: Registry to expose
+        port: TCP port (0 picks a free one; see ``server.server_port``)
+        host: Interface to bind
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
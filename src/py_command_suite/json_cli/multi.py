@@ -0,0 +1,161 @@
+"""Validation of one document against several schemas.
+
+The document is parsed once and the parsed value is shared by every
+validation, so parse cost does not grow with the number of schemas. The
+validations run concurrently on a thread pool; they only read the
+document. Schemas with regexes that need a time budget (see ``patterns``)
+are validated on the calling thread, where one can be armed. When
+several schemas reject the document, source positions for all of their
+errors are found in a single re-scan.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .exceptions import JSONCliError, JSONValidationError
+from .metrics import track_file
+from .patterns import needs_main_thread
+from .positions import locate_paths, set_error_positions
+from .validator import load_json_file, load_schema_file, validate_json_against_schema
+
+
+class SchemaVerdict(NamedTuple):
+    """Outcome of validating the document against one schema."""
+
+    schema: str
+    ok: bool
+    error_type: Optional[str] = None
+    message: Optional[str] = None
+    validation_errors: Tuple[str, ...] = ()
+
+
+def validate_against_schemas(
+    json_data: Any,
+    schemas: Sequence[Tuple[str, Dict[str, Any]]],
+    json_file_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    check_formats: bool = False,
+) -> List[SchemaVerdict]:
+    """Validate parsed JSON against each of several schemas.
+
+    Args:
+        json_data: The parsed document
+        schemas: ``(name, schema)`` pairs; names label the verdicts
+        json_file_path: Optional path to the JSON file for error reporting
+        workers: Threads to use (default: one per schema, up to the CPU count)
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        One verdict per schema, in the order given
+    """
+    errors = _run(
+        json_data, [schema for _, schema in schemas], json_file_path, workers, check_formats
+    )
+    return [_verdict(name, error) for (name, _), error in zip(schemas, errors)]
+
+
+def validate_json_file_against_schemas(
+    json_file_path: Path,
+    schema_file_paths: Sequence[Path],
+    workers: Optional[int] = None,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+    check_formats: bool = False,
+) -> List[SchemaVerdict]:
+    """Parse a JSON file once and validate it against each schema file.
+
+    A schema that cannot be loaded gets a failed verdict rather than
+    aborting the others.
+
+    Args:
+        json_file_path: Path to the JSON file
+        schema_file_paths: Schema files to validate against
+        workers: Threads to use (default: one per schema, up to the CPU count)
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        One verdict per schema file, in the order given
+
+    Raises:
+        FileAccessError, FileSizeError, JSONParseError: If the document
+            itself cannot be read or parsed
+    """
+    with track_file(json_file_path):
+        json_data = load_json_file(json_file_path, validate_size, max_size_mb)
+
+        loaded: List[Optional[Dict[str, Any]]] = []
+        errors: List[Optional[JSONCliError]] = []
+        for schema_path in schema_file_paths:
+            try:
+                loaded.append(load_schema_file(schema_path))
+                errors.append(None)
+            except JSONCliError as e:
+                loaded.append(None)
+                errors.append(e)
+
+        pending = [i for i, schema in enumerate(loaded) if schema is not None]
+        results = _run(
+            json_data,
+            [loaded[i] for i in pending],
+            str(json_file_path),
+            workers,
+            check_formats,
+        )
+        for i, error in zip(pending, results):
+            errors[i] = error
+        _attach_positions(
+            [e for e in errors if isinstance(e, JSONValidationError)], json_file_path
+        )
+
+    return [_verdict(str(path), error) for path, error in zip(schema_file_paths, errors)]
+
+
+def _run(
+    json_data: Any,
+    schemas: Sequence[Dict[str, Any]],
+    json_file_path: Optional[str],
+    workers: Optional[int],
+    check_formats: bool = False,
+) -> List[Optional[JSONCliError]]:
+    """Validate against each schema, returning the error raised (or None) per schema."""
+
+    def check(schema: Dict[str, Any]) -> Optional[JSONCliError]:
+        try:
+            validate_json_against_schema(json_data, schema, json_file_path, check_formats)
+        except JSONCliError as e:
+            return e
+        return None
+
+    workers = min(workers or os.cpu_count() or 1, len(schemas))
+    if workers <= 1:
+        return [check(schema) for schema in schemas]
+    with ThreadPoolExecutor(workers) as executor:
+        futures = [
+            None if needs_main_thread(schema) else executor.submit(check, schema)
+            for schema in schemas
+        ]
+        return [
+            check(schema) if future is None else future.result()
+            for schema, future in zip(schemas, futures)
+        ]
+
+
+def _attach_positions(errors: List[JSONValidationError], source: Path) -> None:
+    """Locate the errors of every failing schema in one scan of the document."""
+    errors = [e for e in errors if e.error_paths and not e.error_positions]
+    if not errors:
+        return
+    positions = locate_paths(source, [p for e in errors for p in e.error_paths])
+    for error in errors:
+        set_error_positions(error, [positions.get(tuple(p)) for p in error.error_paths])
+
+
+def _verdict(name: str, error: Optional[JSONCliError]) -> SchemaVerdict:
+    if error is None:
+        return SchemaVerdict(name, True)
+    details = error.validation_errors if isinstance(error, JSONValidationError) else ()
+    return SchemaVerdict(name, False, type(error).__name__, str(error), tuple(details))
@@ -0,0 +1,284 @@
+"""Parallel validation of a single large top-level JSON array.
+
+The array is cut into byte ranges at element separators (see
+``structural.split_points``), and each range is parsed and validated
+against the ``items`` schema in a worker process. Errors come back with
+chunk-local indices and element spans and are merged into the same
+messages the sequential path produces; line and column are then resolved
+by re-scanning only the failing elements.
+"""
+
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from jsonschema.exceptions import STRONG_MATCHES, WEAK_MATCHES, best_match, relevance
+
+from .columnar import compile_record_plan
+from .dispatch import dispatching_validator
+from .exceptions import JSONValidationError
+from .formats import FORMAT_CHECKER
+from .metrics import phase, track_file
+from .positions import (
+    attach_source_positions,
+    locate_in_elements,
+    set_error_positions,
+)
+from .structural import StructureError, array_body, iter_element_spans, split_points
+from .validator import (
+    _format_error_entry,
+    load_json_file,
+    load_schema_file,
+    validate_file_size,
+    validate_json_against_schema,
+)
+
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+_ANNOTATIONS = frozenset({"title", "description", "$comment", "$id", "$schema"})
+_DECOMPOSABLE_KEYWORDS = frozenset({"type", "items", "definitions", "$defs"})
+
+
+class ChunkResult(NamedTuple):
+    """What a worker reports for one chunk."""
+
+    count: int
+    # (local index, instance path, message, element start, element end),
+    # offsets relative to the chunk
+    errors: List[Tuple[int, List[Any], str, int, int]]
+    # ``_relevance_key`` of the chunk's best error, and that error's message
+    best: Optional[Tuple[tuple, str]] = None
+    parsed: bool = True
+
+
+def is_decomposable(schema: Optional[Dict[str, Any]]) -> bool:
+    """Return True if a schema can be checked one array element at a time.
+
+    Only ``items`` (as a single schema) may constrain the array;
+    keywords that look at the array as a whole, such as ``minItems`` or
+    ``uniqueItems``, need the sequential path.
+
+    Args:
+        schema: Root schema, or None for syntax-only validation
+
+    Returns:
+        Whether per-element validation is equivalent
+    """
+    if schema is None:
+        return True
+    if not isinstance(schema, dict):
+        return False
+    if not set(schema) <= _DECOMPOSABLE_KEYWORDS | _ANNOTATIONS:
+        return False
+    if schema.get("type", "array") != "array":
+        return False
+    return isinstance(schema.get("items", {}), (dict, bool))
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(schema: Optional[Dict[str, Any]], check_formats: bool = False) -> None:
+    """Compile the item validator once per worker process."""
+    _worker_state.clear()
+    if schema is None:
+        return
+    _worker_state["plan"] = compile_record_plan(schema)
+    root = dispatching_validator(schema, FORMAT_CHECKER if check_formats else None)
+    _worker_state["items"] = root.evolve(schema=schema.get("items", {}))
+
+
+def _validate_chunk(path: str, start: int, end: int) -> ChunkResult:
+    """Parse and validate the elements in ``path[start:end]``."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    try:
+        items = json.loads(b"[" + data + b"]")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return ChunkResult(0, [], parsed=False)
+
+    plan = _worker_state.get("plan")
+    item_validator = _worker_state.get("items")
+    if plan is not None:
+        errors = list(plan.iter_errors(items))
+    elif item_validator is not None:
+        errors = []
+        for index, item in enumerate(items):
+            for error in item_validator.iter_errors(item):
+                error.path.appendleft(index)
+                errors.append(error)
+    else:
+        errors = []
+
+    if not errors:
+        return ChunkResult(len(items), [])
+
+    top = max(errors, key=relevance)
+    best = _relevance_key(top), best_match([top]).message
+
+    spans = list(iter_element_spans(data, 0, len(data)))
+    entries = []
+    for error in errors:
+        local_index = error.path[0]
+        entries.append((local_index, list(error.path), error.message, *spans[local_index]))
+    return ChunkResult(len(items), entries, best)
+
+
+def _relevance_key(error: Any) -> Tuple[int, List[Any], bool, bool]:
+    """Rank errors from different chunks like ``relevance`` does.
+
+    Built from public fields only, as the layout of ``relevance``'s own
+    key differs between jsonschema releases.
+    """
+    return (
+        -len(error.path),
+        list(error.path),
+        error.validator not in WEAK_MATCHES,
+        error.validator in STRONG_MATCHES,
+    )
+
+
+def _validate_array_parallel(
+    json_file_path: Path,
+    schema: Optional[Dict[str, Any]],
+    workers: int,
+    min_bytes: int,
+    check_formats: bool = False,
+) -> bool:
+    """Validate a top-level array across worker processes.
+
+    Returns:
+        False if the parallel path does not apply (not an array, too small,
+        non-decomposable schema, or a chunk failed to parse) and the caller
+        should validate sequentially; True if validation succeeded
+
+    Raises:
+        JSONValidationError: If any element fails validation
+    """
+    if workers < 2 or not is_decomposable(schema):
+        return False
+    with json_file_path.open("rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return False
+    with buf:
+        if len(buf) < min_bytes:
+            return False
+        try:
+            start, end = array_body(buf)
+        except StructureError:
+            return False
+        chunks = split_points(buf, start, end, workers * CHUNKS_PER_WORKER)
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(schema, check_formats)
+        ) as executor:
+            results = list(
+                executor.map(
+                    _validate_chunk,
+                    repeat(str(json_file_path)),
+                    [c[0] for c in chunks],
+                    [c[1] for c in chunks],
+                )
+            )
+
+        if not all(r.parsed for r in results):
+            return False
+        if not any(r.errors for r in results):
+            return True
+
+        messages: List[str] = []
+        paths: List[Tuple[Any, ...]] = []
+        # element index -> (start, end, paths relative to the element)
+        elements: Dict[int, Tuple[int, int, List[Tuple[Any, ...]]]] = {}
+        best: Optional[Tuple[tuple, str]] = None
+        first_index = 0
+        for (chunk_start, _), result in zip(chunks, results):
+            for local_index, path, message, rel_start, rel_end in result.errors:
+                index = path[0] = first_index + local_index
+                messages.append(_format_error_entry(path, message))
+                paths.append(tuple(path))
+                element = elements.setdefault(
+                    index, (chunk_start + rel_start, chunk_start + rel_end, [])
+                )
+                element[2].append(tuple(path[1:]))
+            if result.best is not None:
+                key, message = result.best
+                key[1][0] += first_index
+                if best is None or key > best[0]:
+                    best = (key, message)
+            first_index += result.count
+
+        order = sorted(elements)
+        located = dict(
+            zip(order, locate_in_elements(buf, [elements[i] for i in order]))
+        )
+
+    assert best is not None
+    error = JSONValidationError(
+        f"JSON validation failed: {best[1]}", str(json_file_path), messages, paths
+    )
+    set_error_positions(error, [located[p[0]].get(p[1:]) for p in paths])
+    raise error
+
+
+def validate_json_file_parallel(
+    json_file_path: Path,
+    schema_file_path: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+    min_bytes: int = PARALLEL_MIN_BYTES,
+    check_formats: bool = False,
+) -> bool:
+    """Validate a JSON file, splitting a large top-level array across processes.
+
+    Falls back to ``load_json_file`` plus ``validate_json_against_schema``
+    whenever the parallel path does not apply, including on any parse
+    failure, so syntax errors are reported exactly as in sequential mode.
+
+    Args:
+        json_file_path: Path to the JSON file to validate
+        schema_file_path: Optional path to the JSON schema file
+        jobs: Worker processes (None or 0 for one per CPU)
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
+        min_bytes: Files smaller than this are validated sequentially
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        True if validation succeeds
+
+    Raises:
+        Various exceptions for different failure modes
+    """
+    with track_file(json_file_path):
+        if validate_size:
+            validate_file_size(json_file_path, max_size_mb)
+        schema = load_schema_file(schema_file_path) if schema_file_path else None
+
+        workers = jobs or os.cpu_count() or 1
+        with phase("validate"):
+            done = _validate_array_parallel(
+                json_file_path, schema, workers, min_bytes, check_formats
+            )
+        if done:
+            return True
+
+        json_data = load_json_file(json_file_path, validate_size=False)
+        if schema is not None:
+            try:
+                validate_json_against_schema(
+                    json_data, schema, str(json_file_path), check_formats
+                )
+            except JSONValidationError as e:
+                attach_source_positions(e, json_file_path)
+                raise
+    return True
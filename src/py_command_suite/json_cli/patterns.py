@@ -0,0 +1,430 @@
+"""Precompiled, backtracking-safe evaluation of ``pattern`` keywords.
+
+Every regex in a schema is compiled once into a shared cache when the
+schema is loaded, and checked for ambiguous nested quantifiers such as
+``(a+)+`` or ``(\\w+\\s?)*``, which make a backtracking engine take
+exponential time on near-miss input. The check is a heuristic over the
+parsed pattern: a variable-length repeat inside an outer repeat (unbounded,
+or bounded above one such as ``{1,40}``) is only considered safe when the
+next character it could run into is one it cannot consume, and an
+alternation inside such a repeat is ambiguous when its branches can start
+with the same character.
+
+Ambiguous patterns run under ``google-re2`` (linear time) when it is
+installed and supports the pattern. Otherwise they run under a time
+budget enforced with ``SIGALRM``, which ``re`` honours while matching;
+running out of budget is reported as a validation error. Signals only
+reach the main thread, so elsewhere an ambiguous pattern without RE2
+raises ``SchemaError`` instead of risking a hang. Other patterns use
+``re`` unguarded.
+"""
+
+import re
+import signal
+import string
+import threading
+from functools import lru_cache
+from re import _constants as sre_constants, _parser as sre_parse  # type: ignore
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from jsonschema import ValidationError
+
+from .exceptions import SchemaError
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - exercised when google-re2 is absent
+    re2 = None
+
+MATCH_BUDGET = 1.0  # seconds per guarded match
+MAX_PATTERNS = 4096
+
+# Characters used to approximate what a character class can match
+_SAMPLE = frozenset(string.printable + " éß٣中")
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: str.isdecimal,
+    sre_constants.CATEGORY_NOT_DIGIT: lambda c: not c.isdecimal(),
+    sre_constants.CATEGORY_SPACE: str.isspace,
+    sre_constants.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_constants.CATEGORY_WORD: lambda c: c.isalnum() or c == "_",
+    sre_constants.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == "_"),
+}
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+Chars = Optional[FrozenSet[str]]  # None: unknown, may be anything
+
+
+class CompiledPattern(NamedTuple):
+    """A compiled regex and how it is evaluated."""
+
+    source: str
+    regex: Any
+    ambiguity: Optional[str]
+    linear: bool
+
+    @property
+    def guarded(self) -> bool:
+        """Whether matches need a time budget."""
+        return self.ambiguity is not None and not self.linear
+
+
+class _Expired(Exception):
+    pass
+
+
+@lru_cache(maxsize=MAX_PATTERNS)
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Compile a schema regex, choosing a safe engine for ambiguous ones.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression
+    """
+    regex = re.compile(pattern)
+    ambiguity = find_ambiguity(pattern)
+    if ambiguity is not None and re2 is not None:
+        try:
+            return CompiledPattern(pattern, re2.compile(pattern), ambiguity, True)
+        except Exception:  # RE2 lacks backreferences and lookaround
+            pass
+    return CompiledPattern(pattern, regex, ambiguity, False)
+
+
+_matchers: Dict[str, Callable[[str], Any]] = {}
+_matchers_lock = threading.Lock()
+
+
+def matcher(pattern: str) -> Callable[[str], Any]:
+    """Return a ``search`` callable for a pattern, guarded if it needs to be.
+
+    The callable returns a match object or None, like ``re.Pattern.search``.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression
+    """
+    found = _matchers.get(pattern)
+    if found is not None:
+        return found
+    compiled = compile_pattern(pattern)
+    if compiled.guarded:
+        def found(text: str) -> Any:
+            with _budget(compiled):
+                return compiled.regex.search(text)
+    else:
+        found = compiled.regex.search
+    with _matchers_lock:
+        if len(_matchers) >= MAX_PATTERNS:
+            _matchers.clear()
+        _matchers[pattern] = found
+    return found
+
+
+def search(pattern: str, text: str) -> bool:
+    """Return whether ``pattern`` matches anywhere in ``text``.
+
+    Raises:
+        SchemaError: If the pattern needs a time budget off the main thread
+        _Expired: If a guarded match runs out of time
+    """
+    return matcher(pattern)(text) is not None
+
+
+class _budget:
+    """Arm SIGALRM around one match, restoring any previous timer."""
+
+    def __init__(self, compiled: CompiledPattern) -> None:
+        if threading.current_thread() is not threading.main_thread() or not hasattr(
+            signal, "setitimer"
+        ):
+            raise SchemaError(
+                f"Pattern {compiled.source!r} can backtrack catastrophically "
+                f"({compiled.ambiguity}); install google-re2 or validate on the "
+                "main thread"
+            )
+
+    def __enter__(self) -> None:
+        self._handler = signal.signal(signal.SIGALRM, _expire)
+        self._timer = signal.setitimer(signal.ITIMER_REAL, MATCH_BUDGET)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        signal.setitimer(signal.ITIMER_REAL, *self._timer)
+        signal.signal(signal.SIGALRM, self._handler)
+
+
+def _expire(signum: int, frame: Any) -> None:
+    raise _Expired()
+
+
+def check_patterns(schema: Any) -> List[Tuple[str, str, str]]:
+    """Compile every regex in a schema into the shared cache.
+
+    Args:
+        schema: Parsed JSON schema
+
+    Returns:
+        ``(keyword, pattern, reason)`` for each ambiguous pattern
+
+    Raises:
+        SchemaError: If a pattern is not a valid regular expression
+    """
+    ambiguous = []
+    for keyword, pattern in _schema_patterns(schema):
+        try:
+            compiled = compile_pattern(pattern)
+        except re.error as e:
+            raise SchemaError(f"Invalid regular expression {pattern!r} in {keyword}: {e}")
+        if compiled.ambiguity is not None:
+            ambiguous.append((keyword, pattern, compiled.ambiguity))
+    return ambiguous
+
+
+def needs_main_thread(schema: Any) -> bool:
+    """Whether a schema has a pattern that only the main thread can match safely.
+
+    Raises:
+        SchemaError: If a pattern is not a valid regular expression
+    """
+    return any(compile_pattern(pattern).guarded for _, pattern, _ in check_patterns(schema))
+
+
+def _schema_patterns(schema: Any) -> Iterator[Tuple[str, str]]:
+    if isinstance(schema, dict):
+        if isinstance(schema.get("pattern"), str):
+            yield "pattern", schema["pattern"]
+        if isinstance(schema.get("patternProperties"), dict):
+            for pattern in schema["patternProperties"]:
+                yield "patternProperties", pattern
+        for key, value in schema.items():
+            if key not in ("enum", "const", "default", "examples"):
+                yield from _schema_patterns(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            yield from _schema_patterns(value)
+
+
+# -- ambiguity detection ---------------------------------------------------
+
+
+def find_ambiguity(pattern: str) -> Optional[str]:
+    """Describe why a pattern may backtrack catastrophically, or None."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    return _scan(list(parsed), False, frozenset())
+
+
+def _scan(items: List[Any], in_loop: bool, follow: Chars) -> Optional[str]:
+    """Look for ambiguity in a sequence; ``follow`` is what may come next."""
+    for index, (op, av) in enumerate(items):
+        after = _next_chars(items, index + 1, follow)
+        if op in _REPEATS:
+            low, high, body = av
+            if in_loop and high > low:
+                chars = _single_chars(body)
+                if chars is None or after is None or chars & after:
+                    return "nested quantifiers can match the same text in many ways"
+            # A bounded repeat like {1,40} backtracks as badly as an unbounded one
+            if high > 1:
+                loop_follow = _join(_first(list(body)), after)
+                reason = _scan(list(body), True, loop_follow)
+            else:
+                reason = _scan(list(body), in_loop, after)
+        elif op is sre_constants.BRANCH:
+            alternatives = [list(alt) for alt in av[1]]
+            starts = [
+                _join(_first(alt), after) if all(_nullable(o, a) for o, a in alt) else _first(alt)
+                for alt in alternatives
+            ]
+            if in_loop and _overlap(starts):
+                return "alternatives inside a repeat can start with the same character"
+            reason = next(
+                (r for r in (_scan(alt, in_loop, after) for alt in alternatives) if r), None
+            )
+        elif op is sre_constants.SUBPATTERN:
+            reason = _scan(list(av[3]), in_loop, after)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            reason = _scan(list(av[1]), False, None)
+        else:
+            # Atomic groups and possessive repeats never backtrack into themselves
+            reason = None
+        if reason:
+            return reason
+    return None
+
+
+def _join(a: Chars, b: Chars) -> Chars:
+    return None if a is None or b is None else a | b
+
+
+def _overlap(sets: List[Chars]) -> bool:
+    seen: FrozenSet[str] = frozenset()
+    for chars in sets:
+        if chars is None or chars & seen:
+            return True
+        seen |= chars
+    return False
+
+
+def _next_chars(items: List[Any], start: int, follow: Chars) -> Chars:
+    """First characters of what follows ``items[:start]``."""
+    for op, av in items[start:]:
+        if op is sre_constants.AT:
+            continue
+        if _nullable(op, av):
+            return None
+        return _first([(op, av)])
+    return follow
+
+
+def _nullable(op: Any, av: Any) -> bool:
+    if op in _REPEATS or op in (sre_constants.POSSESSIVE_REPEAT,):
+        return av[0] == 0
+    if op is sre_constants.SUBPATTERN:
+        return all(_nullable(o, a) for o, a in av[3])
+    if op is sre_constants.BRANCH:
+        return any(all(_nullable(o, a) for o, a in alt) for alt in av[1])
+    return op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+
+def _first(items: List[Any]) -> Chars:
+    """Characters a sequence can start with."""
+    result: FrozenSet[str] = frozenset()
+    for op, av in items:
+        if op is sre_constants.AT or op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+        if op in _REPEATS or op in (sre_constants.POSSESSIVE_REPEAT,):
+            chars = _first(list(av[2]))
+        elif op is sre_constants.SUBPATTERN:
+            chars = _first(list(av[3]))
+        elif op is sre_constants.ATOMIC_GROUP:
+            chars = _first(list(av))
+        elif op is sre_constants.BRANCH:
+            sets = [_first(list(alt)) for alt in av[1]]
+            chars = None if None in sets else frozenset().union(*sets)
+        else:
+            chars = _single_chars([(op, av)])
+        if chars is None:
+            return None
+        result |= chars
+        if not _nullable(op, av):
+            break
+    return result
+
+
+def _single_chars(body: Any) -> Chars:
+    """Characters a one-character element matches, or None."""
+    items = list(body)
+    if len(items) != 1:
+        return None
+    op, av = items[0]
+    if op is sre_constants.LITERAL:
+        return frozenset(chr(av))
+    if op is sre_constants.NOT_LITERAL:
+        return _SAMPLE - {chr(av)}
+    if op is sre_constants.ANY:
+        return _SAMPLE
+    if op is sre_constants.IN:
+        return _class_chars(av)
+    if op is sre_constants.SUBPATTERN:
+        return _single_chars(av[3])
+    return None
+
+
+def _class_chars(items: List[Any]) -> Chars:
+    negate = False
+    tests = []
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            tests.append(lambda c, v=chr(av): c == v)
+        elif op is sre_constants.RANGE:
+            tests.append(lambda c, lo=av[0], hi=av[1]: lo <= ord(c) <= hi)
+        elif op is sre_constants.CATEGORY and av in _CATEGORIES:
+            tests.append(_CATEGORIES[av])
+        else:
+            return None
+    return frozenset(c for c in _SAMPLE if any(t(c) for t in tests) != negate)
+
+
+# -- jsonschema keywords ---------------------------------------------------
+
+
+def _expired_error(pattern: str) -> ValidationError:
+    return ValidationError(
+        f"matching {pattern!r} exceeded the {MATCH_BUDGET:g}s regex time budget"
+    )
+
+
+def pattern_keyword(validator: Any, pattern: str, instance: Any, schema: Any) -> Iterator[ValidationError]:
+    """``pattern`` using the shared cache and time budget."""
+    if not validator.is_type(instance, "string"):
+        return
+    try:
+        if not matcher(pattern)(instance):
+            yield ValidationError(f"{instance!r} does not match {pattern!r}")
+    except _Expired:
+        yield _expired_error(pattern)
+
+
+def pattern_properties_keyword(
+    validator: Any, patterns: Dict[str, Any], instance: Any, schema: Any
+) -> Iterator[ValidationError]:
+    """``patternProperties`` using the shared cache and time budget."""
+    if not validator.is_type(instance, "object"):
+        return
+    for pattern, subschema in patterns.items():
+        match = matcher(pattern)
+        for key, value in instance.items():
+            try:
+                matched = match(key)
+            except _Expired:
+                yield _expired_error(pattern)
+                break
+            if matched:
+                yield from validator.descend(value, subschema, path=key, schema_path=pattern)
+
+
+def additional_properties_keyword(
+    validator: Any, additional: Any, instance: Any, schema: Any
+) -> Iterator[ValidationError]:
+    """``additionalProperties`` with property names matched like above."""
+    if not validator.is_type(instance, "object"):
+        return
+    properties = schema.get("properties", {})
+    patterns = list(schema.get("patternProperties", {}))
+    # One alternation for all patterns, as jsonschema does
+    match = matcher("|".join(patterns)) if patterns else None
+    extras = []
+    for key in instance:
+        if key in properties:
+            continue
+        try:
+            if match is not None and match(key):
+                continue
+        except _Expired:
+            yield _expired_error("|".join(patterns))
+            return
+        extras.append(key)
+
+    if validator.is_type(additional, "object"):
+        for extra in extras:
+            yield from validator.descend(instance[extra], additional, path=extra)
+    elif not additional and extras:
+        # Same wording as jsonschema
+        if patterns:
+            verb = "does" if len(extras) == 1 else "do"
+            joined = ", ".join(repr(each) for each in sorted(extras))
+            listed = ", ".join(repr(each) for each in sorted(patterns))
+            yield ValidationError(f"{joined} {verb} not match any of the regexes: {listed}")
+        else:
+            verb = "was" if len(extras) == 1 else "were"
+            joined = ", ".join(repr(extra) for extra in sorted(extras, key=str))
+            yield ValidationError(f"Additional properties are not allowed ({joined} {verb} unexpected)")
+
+
+PATTERN_KEYWORDS = {
+    "pattern": pattern_keyword,
+    "patternProperties": pattern_properties_keyword,
+    "additionalProperties": additional_properties_keyword,
+}
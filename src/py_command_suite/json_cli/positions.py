@@ -0,0 +1,181 @@
+"""Map instance paths of validation errors to source line and column.
+
+Only runs after validation has failed: the document is re-scanned once,
+subtrees that contain no failing path are skipped without tokenizing, and
+the scan stops as soon as every requested path has been located.
+"""
+
+import io
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .exceptions import JSONValidationError
+from .metrics import timed
+from .stream import JSONEventParser, StreamSyntaxError
+from .structural import Buffer, count_lines
+
+Position = Tuple[int, int]
+
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+_BLOCK = 1 << 24
+
+
+class _Node:
+    """Trie of wanted paths."""
+
+    __slots__ = ("children", "target")
+
+    def __init__(self) -> None:
+        self.children: Dict[Any, "_Node"] = {}
+        self.target: Optional[Tuple[Any, ...]] = None
+
+
+def locate_paths(
+    source: Union[Path, IO[str], str], paths: Iterable[Sequence[Any]]
+) -> Dict[Tuple[Any, ...], Position]:
+    """Find the (line, column) where the value at each path starts.
+
+    Args:
+        source: JSON file path, open text stream, or document text
+        paths: Instance paths as sequences of keys and array indices
+
+    Returns:
+        Mapping of path tuple to 1-based (line, column); paths that do not
+        exist in the document are omitted
+    """
+    root = _Node()
+    remaining = 0
+    for path in paths:
+        node = root
+        for part in path:
+            node = node.children.setdefault(part, _Node())
+        if node.target is None:
+            node.target = tuple(path)
+            remaining += 1
+    if not remaining:
+        return {}
+
+    if isinstance(source, Path):
+        with source.open("r", encoding="utf-8") as fp:
+            return _walk(fp, root, remaining)
+    if isinstance(source, str):
+        return _walk(io.StringIO(source), root, remaining)
+    return _walk(source, root, remaining)
+
+
+def _walk(fp: IO[str], root: _Node, remaining: int) -> Dict[Tuple[Any, ...], Position]:
+    found: Dict[Tuple[Any, ...], Position] = {}
+    parser = JSONEventParser(fp)
+    path = parser.path
+    stack: List[Optional[_Node]] = []
+    try:
+        for event in parser:
+            kind = event.kind
+            if kind == "key":
+                continue
+            if kind == "end_map" or kind == "end_array":
+                stack.pop()
+                continue
+
+            if stack:
+                parent = stack[-1]
+                node = parent.children.get(path[-1]) if parent is not None else None
+            else:
+                node = root
+            is_container = kind == "start_map" or kind == "start_array"
+
+            if node is not None and node.target is not None:
+                found[node.target] = parser.line_col(event.pos)
+                remaining -= 1
+                if not remaining:
+                    break
+            if is_container:
+                if node is None or not node.children:
+                    parser.skip()
+                else:
+                    stack.append(node)
+    except StreamSyntaxError:
+        pass
+    return found
+
+
+def locate_in_elements(
+    buf: Buffer, elements: Sequence[Tuple[int, int, Sequence[Sequence[Any]]]]
+) -> List[Dict[Tuple[Any, ...], Position]]:
+    """Locate paths inside byte spans of a larger UTF-8 buffer.
+
+    Each span is decoded and scanned on its own; line and column are then
+    offset by where the span starts in ``buf``, so the rest of the buffer
+    is only scanned for newlines.
+
+    Args:
+        buf: UTF-8 buffer (bytes or mmap)
+        elements: (start, end, paths) per span, sorted by start; paths are
+            relative to the span's value
+
+    Returns:
+        Per span, mapping of relative path tuple to absolute (line, column)
+    """
+    results: List[Dict[Tuple[Any, ...], Position]] = []
+    line, offset = 1, 0
+    column, column_offset = 1, 0
+    for start, end, paths in elements:
+        newlines = count_lines(buf, offset, start)
+        if newlines:
+            line += newlines
+            column, column_offset = 1, buf.rfind(b"\n", offset, start) + 1
+        column += _char_count(buf, column_offset, start)
+        offset = column_offset = start
+
+        local = locate_paths(buf[start:end].decode("utf-8", "replace"), paths)
+        results.append(
+            {
+                path: (line + l - 1, column + c - 1 if l == 1 else c)
+                for path, (l, c) in local.items()
+            }
+        )
+    return results
+
+
+def _char_count(buf: Buffer, start: int, end: int) -> int:
+    """Count UTF-8 characters in ``buf[start:end]``."""
+    total = 0
+    for block in range(start, end, _BLOCK):
+        chunk = buf[block : min(end, block + _BLOCK)]
+        total += len(chunk.translate(None, _CONTINUATION_BYTES))
+    return total
+
+
+@timed("locate")
+def attach_source_positions(
+    error: JSONValidationError, source: Union[Path, IO[str], str]
+) -> None:
+    """Add line and column to each entry of a validation error.
+
+    Sets ``error.error_positions`` and appends ``(line L, column C)`` to
+    the matching ``validation_errors`` entries.
+
+    Args:
+        error: Error raised by ``validate_json_against_schema``
+        source: The document the error refers to
+    """
+    if not error.error_paths or error.error_positions:
+        return
+    positions = locate_paths(source, error.error_paths)
+    set_error_positions(error, [positions.get(tuple(p)) for p in error.error_paths])
+
+
+def set_error_positions(
+    error: JSONValidationError, positions: Sequence[Optional[Position]]
+) -> None:
+    """Record one position per error path and suffix the matching entries.
+
+    Args:
+        error: Validation error whose ``error_paths`` are set
+        positions: (line, column) per path, or None where unknown
+    """
+    error.error_positions = list(positions)
+    error.validation_errors = [
+        f"{entry} (line {pos[0]}, column {pos[1]})" if pos else entry
+        for entry, pos in zip(error.validation_errors, error.error_positions)
+    ]
@@ -0,0 +1,219 @@
+"""Streaming extraction of subtrees by JSON Pointer or simple JSONPath.
+
+Expressions are compiled to a list of steps and matched against the
+event parser's path as the document streams past (see ``stream``). A
+container that no expression can reach into is skipped without being
+tokenized, and only matching values are built. When every expression is
+definite (no wildcards) a document can hold at most one match per
+expression, so reading stops as soon as all of them have been found.
+
+Supported JSONPath is the subset that streams: ``$``, ``.name``,
+``['name']``, ``[N]``, ``[*]`` and ``.*``. Recursive descent (``..``),
+filters and slices are rejected.
+"""
+
+import re
+from pathlib import Path
+from typing import IO, Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .dispatch import parse_pointer
+from .reformat import stream_error_context
+from .stream import DEFAULT_CHUNK_SIZE, JSONEventParser, StreamSyntaxError, build_value
+from .validator import _json_parse_error
+
+# A step is a key (str), an array index (int) or ANY
+Step = Union[str, int, None]
+ANY: Step = None
+
+_PATH_STEP = re.compile(
+    r"""\.(?P<name>[A-Za-z_$][\w$-]*)
+      | \.\*
+      | \[\s*(?:
+            (?P<index>\d+)
+          | '(?P<single>(?:[^'\\]|\\.)*)'
+          | "(?P<double>(?:[^"\\]|\\.)*)"
+          | \*
+        )\s*\]""",
+    re.VERBOSE,
+)
+_ESCAPE = re.compile(r"\\(.)")
+
+
+class Match(NamedTuple):
+    """A value found by a query."""
+
+    record: int
+    path: Tuple[Any, ...]
+    value: Any
+
+    @property
+    def pointer(self) -> str:
+        """The value's location as a JSON Pointer."""
+        return _pointer(self.path)
+
+
+def parse_query(expression: str) -> Tuple[Step, ...]:
+    """Compile a JSON Pointer or simple JSONPath expression into steps.
+
+    A JSON Pointer token selects an object member of that name or, on an
+    array, the element whose index it spells.
+
+    Raises:
+        ValueError: If the expression is neither, or uses JSONPath
+            features that cannot be evaluated while streaming
+    """
+    if not expression.startswith("$"):
+        return tuple(parse_pointer(expression))
+    steps: List[Step] = []
+    pos = 1
+    while pos < len(expression):
+        match = _PATH_STEP.match(expression, pos)
+        if match is None:
+            rest = expression[pos:]
+            if rest.startswith(".."):
+                raise ValueError(f"recursive descent is not supported: '{expression}'")
+            raise ValueError(f"cannot parse JSONPath '{expression}' at '{rest}'")
+        if match.group("name") is not None:
+            steps.append(match.group("name"))
+        elif match.group("index") is not None:
+            steps.append(int(match.group("index")))
+        elif match.group("single") is not None:
+            steps.append(_ESCAPE.sub(r"\1", match.group("single")))
+        elif match.group("double") is not None:
+            steps.append(_ESCAPE.sub(r"\1", match.group("double")))
+        else:
+            steps.append(ANY)
+        pos = match.end()
+    return tuple(steps)
+
+
+def _step_matches(step: Step, part: Any) -> bool:
+    if step is ANY:
+        return True
+    if isinstance(part, int):
+        return step == part if isinstance(step, int) else step == str(part)
+    return step == part
+
+
+def iter_matches(
+    fp: IO[str],
+    queries: Sequence[Tuple[Step, ...]],
+    multiple_values: bool = False,
+    limit: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Match]:
+    """Yield the values matched by any query, in document order.
+
+    Args:
+        fp: Stream opened in text mode
+        queries: Compiled expressions from ``parse_query``
+        multiple_values: Input is NDJSON (or concatenated JSON); each
+            value is queried separately and numbered in ``Match.record``
+        limit: Stop after this many matches
+        chunk_size: Characters read per refill
+
+    Yields:
+        One match per value, even if several queries select it
+
+    Raises:
+        StreamSyntaxError: If the input read so far is not valid JSON
+    """
+    if limit is not None and limit <= 0:
+        return
+    parser = JSONEventParser(fp, chunk_size, multiple_values)
+    path = parser.path
+    definite = not multiple_values and all(ANY not in query for query in queries)
+    remaining = set(queries)
+    # Queries still compatible with each open container's path
+    frames: List[Sequence[Tuple[Step, ...]]] = [queries]
+    found = 0
+    record = -1
+    for event in parser:
+        kind = event.kind
+        if kind == "key":
+            continue
+        if kind == "end_map" or kind == "end_array":
+            frames.pop()
+            continue
+        depth = len(path)
+        if depth:
+            part = path[-1]
+            candidates = [q for q in frames[-1] if _step_matches(q[depth - 1], part)]
+        else:
+            record += 1
+            candidates = queries
+        hits = [q for q in candidates if len(q) == depth]
+        deeper = [q for q in candidates if len(q) > depth]
+        if hits:
+            where = tuple(path)
+            value = build_value(parser, event)
+            # Queries that continue below a match are answered from the built value
+            tails = [()] + [query[depth:] for query in deeper]
+            hits.extend(deeper)
+            for rest, found_value in _select(value, tails):
+                yield Match(record, where + rest, found_value)
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+            if definite:
+                remaining.difference_update(hits)
+                if not remaining:
+                    return
+        elif kind == "start_map" or kind == "start_array":
+            if deeper:
+                frames.append(deeper)
+            else:
+                parser.skip()
+
+
+def _select(
+    value: Any, queries: Sequence[Tuple[Step, ...]]
+) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+    """Yield ``(relative path, value)`` for each match of any query in a built value.
+
+    Values are visited once, in document order, so a value selected by
+    several queries is yielded once.
+    """
+    if any(not steps for steps in queries):
+        yield (), value
+    if isinstance(value, dict):
+        children: Iterator[Tuple[Any, Any]] = iter(value.items())
+    elif isinstance(value, list):
+        children = enumerate(value)
+    else:
+        return
+    queries = [steps for steps in queries if steps]
+    if not queries:
+        return
+    for part, child in children:
+        tails = [steps[1:] for steps in queries if _step_matches(steps[0], part)]
+        if tails:
+            for rest, found in _select(child, tails):
+                yield (part,) + rest, found
+
+
+def query_file(
+    json_file_path: Path,
+    expressions: Sequence[str],
+    multiple_values: bool = False,
+    limit: Optional[int] = None,
+) -> Iterator[Match]:
+    """Stream the matches of several expressions from a JSON or NDJSON file.
+
+    Raises:
+        ValueError: If an expression cannot be parsed
+        JSONParseError: If the file is not valid JSON up to the last match
+    """
+    queries = [parse_query(expression) for expression in expressions]
+    with json_file_path.open("r", encoding="utf-8") as fp:
+        try:
+            yield from iter_matches(fp, queries, multiple_values, limit)
+        except StreamSyntaxError as e:
+            context = stream_error_context(json_file_path, e.lineno, e.colno)
+            raise _json_parse_error(
+                e, f"file {json_file_path}", context, str(json_file_path)
+            ) from None
+
+
+def _pointer(tokens: Sequence[Any]) -> str:
+    return "".join("/" + str(t).replace("~", "~0").replace("/", "~1") for t in tokens)
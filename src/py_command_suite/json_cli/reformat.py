@@ -0,0 +1,311 @@
+"""Streaming pretty-printing and minification.
+
+Input is tokenized a chunk at a time and each token is copied to the
+output with only the whitespace around it changed: strings, keys and
+numbers are written verbatim, never decoded and re-encoded. The grammar
+is checked on the way, and memory is bounded by the chunk size and the
+output batch, whatever the input size.
+
+Syntax errors surface as ``JSONParseError`` with the same message,
+context and suggestion as ``load_json_file``: the input is re-read with
+the event parser (see ``stream``) for the exact location, and context is
+clipped around the error column so a multi-gigabyte single-line file
+does not have to fit in memory.
+"""
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import IO, Dict, List, Optional
+
+from .stream import DEFAULT_CHUNK_SIZE, JSONEventParser, StreamSyntaxError
+from .validator import _json_parse_error
+
+# Pieces collected before each write to the output
+WRITE_BATCH = 8192
+# Characters of each context line shown for a syntax error
+CONTEXT_WIDTH = 120
+
+# Whitespace and one token per match. The alternatives anchored at \Z
+# catch a string, number or literal cut off by the end of the buffer, so
+# only the last match of a chunk can be incomplete; anything else that is
+# not a token is matched one character at a time and rejected.
+_TOKEN = re.compile(
+    r"""([ \t\n\r]*)(
+        [{}\[\]:,]
+      | "[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"
+      | "(?:[^"\\]|\\.)*\\?\Z
+      | [-0-9][-+.eE0-9]*\Z
+      | -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?
+      | true | false | null | NaN | -?Infinity
+      | -?[a-zA-Z]+\Z
+      | [^ \t\n\r]
+    )""",
+    re.VERBOSE,
+)
+_COMPLETE = re.compile(
+    r"""[{}\[\]:,]
+      | "[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"
+      | -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?
+      | true | false | null | NaN | -?Infinity""",
+    re.VERBOSE,
+)
+_SCALAR_STARTS = frozenset('"-0123456789tfnNI')
+_DIGITS = frozenset("0123456789")
+_WS = " \t\n\r"
+
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+
+class _Invalid(Exception):
+    """The fast path found a syntax error; the event parser describes it."""
+
+
+def reformat(
+    fp: IO[str],
+    out: IO[str],
+    indent: Optional[int] = 2,
+    multiple_values: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Re-emit a JSON document with new whitespace.
+
+    Args:
+        fp: Input stream opened in text mode; must be seekable so a
+            syntax error can be re-read for its exact location
+        out: Output text stream
+        indent: Spaces per nesting level, or None to minify
+        multiple_values: Accept a sequence of top-level values (NDJSON or
+            concatenated JSON); each is written on its own line
+        chunk_size: Characters read per refill
+
+    Returns:
+        Number of top-level values written
+
+    Raises:
+        StreamSyntaxError: If the input is not valid JSON (output written
+            before the error is left in place)
+    """
+    try:
+        return _reformat(fp, out, indent, multiple_values, chunk_size)
+    except _Invalid:
+        pass
+    # Same messages and positions as every other parse in the package
+    fp.seek(0)
+    for _ in JSONEventParser(fp, chunk_size, multiple_values):
+        pass
+    raise StreamSyntaxError("Expecting value", 0, 1, 1)  # pragma: no cover
+
+
+def _reformat(
+    fp: IO[str],
+    out: IO[str],
+    indent: Optional[int],
+    multiple_values: bool,
+    chunk_size: int,
+) -> int:
+    """Tokenize a chunk at a time, checking the grammar while writing."""
+    newline, colon = ("", ":") if indent is None else ("\n", ": ")
+    pads = [newline]
+    stack: List[str] = []
+    pieces: List[str] = []
+    append = pieces.append
+    state = _VALUE
+    values = 0
+    carry = ""
+    eof = False
+    while not eof:
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf = carry + chunk
+        tokens = _TOKEN.findall(buf)
+        carry = ""
+        if tokens and not eof:
+            # The last token may continue in the next chunk
+            tok = tokens.pop()[1]
+            end = len(buf) if buf.endswith(tok) else len(buf.rstrip(_WS))
+            carry = buf[end - len(tok) :]
+        elif tokens and not _COMPLETE.fullmatch(tokens[-1][1]):
+            raise _Invalid
+
+        for _, tok in tokens:
+            c = tok[0]
+            if state == _COMMA_OR_END:
+                if c == ",":
+                    state = _KEY if stack[-1] == "{" else _VALUE
+                    append("," + pads[len(stack)])
+                    continue
+                if c != ("}" if stack[-1] == "{" else "]"):
+                    raise _Invalid
+                stack.pop()
+                append(pads[len(stack)] + c)
+            elif state == _KEY or state == _KEY_OR_END:
+                if c == '"' and len(tok) > 1:
+                    if state == _KEY_OR_END:
+                        append(pads[len(stack)])
+                    append(tok)
+                    append(colon)
+                    state = _COLON
+                    continue
+                if c != "}" or state == _KEY:
+                    raise _Invalid
+                stack.pop()
+                append(c)
+            elif state == _COLON:
+                if c != ":":
+                    raise _Invalid
+                state = _VALUE
+                continue
+            else:
+                if state == _DONE:
+                    if not multiple_values:
+                        raise _Invalid
+                    state = _VALUE
+                if c == "]" and state == _VALUE_OR_END:
+                    stack.pop()
+                    append(c)
+                else:
+                    if state == _VALUE_OR_END:
+                        append(pads[len(stack)])
+                    if c == "{" or c == "[":
+                        append(c)
+                        stack.append(c)
+                        if len(pads) <= len(stack):
+                            pads.append(pads[-1] + " " * (indent or 0))
+                        state = _KEY_OR_END if c == "{" else _VALUE_OR_END
+                        continue
+                    if c not in _SCALAR_STARTS or (len(tok) == 1 and c not in _DIGITS):
+                        raise _Invalid
+                    append(tok)
+            if stack:
+                state = _COMMA_OR_END
+            else:
+                state = _DONE
+                append("\n")
+                values += 1
+        if len(pieces) >= WRITE_BATCH:
+            out.write("".join(pieces))
+            pieces.clear()
+
+    if stack or not (state == _DONE or (multiple_values and state == _VALUE)):
+        raise _Invalid
+    out.write("".join(pieces))
+    return values
+
+
+def reformat_file(
+    input_path: Path,
+    output_path: Optional[Path] = None,
+    indent: Optional[int] = 2,
+    multiple_values: bool = False,
+    out: Optional[IO[str]] = None,
+) -> int:
+    """Reformat a JSON file into another file or an open stream.
+
+    A file target is written to a temporary file beside it and moved into
+    place only once the whole input has parsed, so a syntax error never
+    leaves a truncated result.
+
+    Args:
+        input_path: JSON file to read
+        output_path: File to write; must differ from the input
+        indent: Spaces per nesting level, or None to minify
+        multiple_values: Accept NDJSON or concatenated JSON
+        out: Stream to write to instead of ``output_path``
+
+    Returns:
+        Number of top-level values written
+
+    Raises:
+        JSONParseError: If the input is not valid JSON
+        OSError: If a file cannot be read or written
+    """
+    with input_path.open("r", encoding="utf-8") as fp:
+        if output_path is None:
+            return _reformat_reporting(fp, out, input_path, indent, multiple_values)
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{output_path.name}.", dir=output_path.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="", buffering=1 << 20) as tmp:
+                values = _reformat_reporting(fp, tmp, input_path, indent, multiple_values)
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    return values
+
+
+def _reformat_reporting(
+    fp: IO[str],
+    out: Optional[IO[str]],
+    input_path: Path,
+    indent: Optional[int],
+    multiple_values: bool,
+) -> int:
+    try:
+        return reformat(fp, out, indent, multiple_values)
+    except StreamSyntaxError as e:
+        context = stream_error_context(input_path, e.lineno, e.colno)
+        raise _json_parse_error(e, f"file {input_path}", context, str(input_path)) from None
+
+
+def stream_error_context(
+    file_path: Path, line_no: int, col_no: int, context_lines: int = 2
+) -> str:
+    """Number the lines around an error, reading only as far as needed.
+
+    Lines are clipped to ``CONTEXT_WIDTH`` characters (centred on the
+    error column for the failing line), so memory stays bounded however
+    long the lines are.
+
+    Args:
+        file_path: File the error was found in
+        line_no: 1-based line of the error
+        col_no: 1-based column of the error
+        context_lines: Lines to show before and after
+
+    Returns:
+        Formatted context, or "" if the file cannot be read
+    """
+    first, last = max(1, line_no - context_lines), line_no + context_lines
+    lo = max(0, col_no - 1 - CONTEXT_WIDTH // 2)
+    kept: Dict[int, str] = {}
+    lengths: Dict[int, int] = {}
+    line, col = 1, 0
+    try:
+        with file_path.open("r", encoding="utf-8", errors="replace") as f:
+            while line <= last:
+                chunk = f.read(DEFAULT_CHUNK_SIZE)
+                if not chunk:
+                    # A final newline does not start another line
+                    if col == 0:
+                        kept.pop(line, None)
+                    break
+                for i, part in enumerate(chunk.split("\n")):
+                    if i:
+                        line, col = line + 1, 0
+                    if first <= line <= last:
+                        start = lo if line == line_no else 0
+                        a, b = max(start, col), min(start + CONTEXT_WIDTH, col + len(part))
+                        text = part[a - col : b - col] if a < b else ""
+                        kept[line] = kept.get(line, "") + text
+                        lengths[line] = col + len(part)
+                    col += len(part)
+    except OSError:
+        return ""
+
+    context = []
+    for number in range(first, min(last, line) + 1):
+        if number not in kept:
+            continue
+        text = kept[number].rstrip()
+        start = lo if number == line_no else 0
+        if start:
+            text = "..." + text
+        if lengths[number] > start + CONTEXT_WIDTH:
+            text += "..."
+        marker = ">>>" if number == line_no else "   "
+        context.append(f"{marker} {number:3d}: {text}")
+    return "\n".join(context)
@@ -0,0 +1,229 @@
+"""Machine-readable result output, written as results arrive.
+
+Each reporter writes a file's result the moment it is handed over and
+keeps only running counts, so memory does not grow with the number of
+files. NDJSON emits one record per file and a closing summary record.
+SARIF lists failures in ``runs[0].results`` and puts the totals after
+them. JUnit needs the totals on the opening ``<testsuite>`` tag, so room
+for them is reserved as whitespace inside the tag and filled in by
+seeking back once the run is over; JUnit output must therefore go to a
+regular file.
+"""
+
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from .batch import FileResult
+
+FORMATS = ("ndjson", "sarif", "junit")
+TOOL_NAME = "json-validate"
+TOOL_VERSION = "0.1.0"
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+# Error classes described as SARIF rules; anything else reports as JSONCliError
+SARIF_RULES = {
+    "JSONParseError": "The file is not valid JSON",
+    "JSONValidationError": "The document does not match its schema",
+    "SchemaError": "The schema mapped to the file is invalid",
+    "FileAccessError": "The file could not be read",
+    "FileSizeError": "The file exceeds the size limit",
+    "JSONCliError": "The file could not be validated",
+}
+# Space reserved in the <testsuite> start tag for the totals
+JUNIT_TOTALS_WIDTH = 96
+
+_POSITION = re.compile(r"line (\d+), column (\d+)")
+
+
+class Reporter(ABC):
+    """Base class: counts results; subclasses write them."""
+
+    def __init__(self, out: IO[str]) -> None:
+        """Write to ``out`` (opened in text mode)."""
+        self.out = out
+        self.total = 0
+        self.failed = 0
+        self.errors = 0
+        self._started = time.monotonic()
+
+    def start(self) -> None:
+        """Write whatever precedes the first result."""
+
+    def add(self, result: FileResult) -> None:
+        """Count and write one file's result."""
+        self.total += 1
+        if not result.ok:
+            self.failed += 1
+            if result.error_type != "JSONValidationError":
+                self.errors += 1
+        self._write(result)
+
+    def finish(self) -> None:
+        """Write the totals and close the document."""
+
+    @abstractmethod
+    def _write(self, result: FileResult) -> None:
+        """Write one file's result."""
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the reporter was created."""
+        return time.monotonic() - self._started
+
+
+class NDJSONReporter(Reporter):
+    """One JSON object per line, flushed per file."""
+
+    def _write(self, result: FileResult) -> None:
+        record = {
+            "type": "result",
+            "path": result.path,
+            "schema": result.schema,
+            "ok": result.ok,
+            "error_type": result.error_type,
+            "message": result.message,
+            "errors": list(result.validation_errors),
+        }
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+    def finish(self) -> None:
+        summary = {
+            "type": "summary",
+            "total": self.total,
+            "valid": self.total - self.failed,
+            "failed": self.failed,
+            "seconds": round(self.elapsed, 3),
+        }
+        self.out.write(json.dumps(summary) + "\n")
+        self.out.flush()
+
+
+class SARIFReporter(Reporter):
+    """SARIF 2.1.0 log with one result per error."""
+
+    def __init__(self, out: IO[str]) -> None:
+        """Write to ``out`` (opened in text mode)."""
+        super().__init__(out)
+        self._first = True
+
+    def start(self) -> None:
+        driver = {
+            "name": TOOL_NAME,
+            "version": TOOL_VERSION,
+            "rules": [
+                {"id": rule, "shortDescription": {"text": text}}
+                for rule, text in SARIF_RULES.items()
+            ],
+        }
+        head = json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0"})[:-1]
+        self.out.write(f'{head}, "runs": [{{"tool": {json.dumps({"driver": driver})}, "results": [')
+
+    def _write(self, result: FileResult) -> None:
+        if result.ok:
+            return
+        rule = result.error_type if result.error_type in SARIF_RULES else "JSONCliError"
+        if result.validation_errors:
+            entries = [(entry, _position(entry)) for entry in result.validation_errors]
+        else:
+            message = result.message or ""
+            entries = [(message, _position(message.partition("\n")[0]))]
+        for text, position in entries:
+            location: Dict[str, Any] = {"artifactLocation": {"uri": _uri(result.path)}}
+            if position is not None:
+                location["region"] = {"startLine": position[0], "startColumn": position[1]}
+            sarif_result = {
+                "ruleId": rule,
+                "level": "error",
+                "message": {"text": text},
+                "locations": [{"physicalLocation": location}],
+            }
+            self.out.write(("" if self._first else ",") + "\n" + json.dumps(sarif_result))
+            self._first = False
+
+    def finish(self) -> None:
+        invocation = {
+            "executionSuccessful": True,
+            "properties": {
+                "files": self.total,
+                "valid": self.total - self.failed,
+                "failed": self.failed,
+            },
+        }
+        self.out.write(f'\n], "invocations": [{json.dumps(invocation)}]}}]}}\n')
+        self.out.flush()
+
+
+class JUnitReporter(Reporter):
+    """JUnit XML with one test case per file."""
+
+    def __init__(self, out: IO[str]) -> None:
+        """Write to ``out``, a seekable file opened in text mode."""
+        super().__init__(out)
+        self._totals_at = 0
+
+    def start(self) -> None:
+        self.out.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        self.out.write(f"<testsuite name={quoteattr(TOOL_NAME)}")
+        self._totals_at = self.out.tell()
+        self.out.write(" " * JUNIT_TOTALS_WIDTH + ">\n")
+
+    def _write(self, result: FileResult) -> None:
+        case = f"  <testcase classname={quoteattr(TOOL_NAME)} name={quoteattr(result.path)}"
+        if result.ok:
+            self.out.write(case + "/>\n")
+            return
+        tag = "failure" if result.error_type == "JSONValidationError" else "error"
+        message = (result.message or "").partition("\n")[0]
+        body = "\n".join(result.validation_errors) or result.message or ""
+        self.out.write(
+            f"{case}>\n    <{tag} type={quoteattr(result.error_type or '')} "
+            f"message={quoteattr(message)}>{escape(body)}</{tag}>\n  </testcase>\n"
+        )
+
+    def finish(self) -> None:
+        self.out.write("</testsuite>\n</testsuites>\n")
+        end = self.out.tell()
+        totals = (
+            f' tests="{self.total}" failures="{self.failed - self.errors}"'
+            f' errors="{self.errors}" time="{self.elapsed:.3f}"'
+        )
+        self.out.seek(self._totals_at)
+        self.out.write(totals.ljust(JUNIT_TOTALS_WIDTH))
+        self.out.seek(end)
+        self.out.flush()
+
+
+_REPORTERS = {"ndjson": NDJSONReporter, "sarif": SARIFReporter, "junit": JUnitReporter}
+
+
+def create_reporter(output_format: str, out: IO[str]) -> Reporter:
+    """Create the reporter for a format name in ``FORMATS``.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        return _REPORTERS[output_format](out)
+    except KeyError:
+        raise ValueError(f"unknown output format '{output_format}'") from None
+
+
+def _position(text: str) -> Optional[Tuple[int, int]]:
+    """Line and column mentioned in an error message, if any."""
+    found: List[str] = _POSITION.findall(text)
+    if not found:
+        return None
+    line, column = found[-1]
+    return int(line), int(column)
+
+
+def _uri(path: str) -> str:
+    """SARIF artifact URI: relative paths stay relative, absolute ones become file URIs."""
+    candidate = Path(path)
+    return candidate.as_uri() if candidate.is_absolute() else candidate.as_posix()
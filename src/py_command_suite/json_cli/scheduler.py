@@ -0,0 +1,377 @@
+"""Size-aware scheduling of multi-file validation across workers.
+
+Every file is sized up front with ``validate_file_size`` (which also
+enforces the size limit), and the queue is ordered largest-first so the
+biggest files start early instead of straggling at the end. Idle workers
+pull from the shared queue, which balances load the way work stealing
+does without pinning files to workers. A file is only started when its
+estimated parse footprint fits in what is left of the memory budget;
+while a big file waits, smaller ones that fit run in the gaps. A file
+larger than the whole budget runs once nothing else is running.
+
+Workers are processes, or threads sharing one ``SchemaStore`` (no
+pickling, one copy of each schema and compiled validator). Threads only
+validate in parallel when the GIL is disabled, as on a free-threaded
+build, so ``"auto"`` picks them only then. Files whose schema has a
+pattern that needs the main thread's time budget are validated on the
+calling thread in thread mode.
+"""
+
+import os
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .batch import FileResult, SchemaStore, failed_result, validate_one
+from .exceptions import FileAccessError, FileSizeError, SchemaError
+from .metrics import (
+    active_metrics,
+    disable_metrics,
+    enable_metrics,
+    record_file_result,
+    take_worker_metrics,
+)
+from .patterns import needs_main_thread
+from .validator import validate_file_size
+
+# Parsed JSON typically takes several times its text size in memory
+MEMORY_FACTOR = 6
+DEFAULT_BUDGET_FRACTION = 0.5
+EXECUTORS = ("auto", "threads", "processes")
+
+Job = Tuple[Path, Optional[Path]]
+
+
+def default_memory_budget() -> Optional[int]:
+    """Return half of physical memory in bytes, or None if unknown."""
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+    return int(total * DEFAULT_BUDGET_FRACTION) if total > 0 else None
+
+
+def estimate_memory(size: int) -> int:
+    """Estimate peak memory for validating a file of ``size`` bytes."""
+    return size * MEMORY_FACTOR
+
+
+def gil_disabled() -> bool:
+    """Return whether this interpreter is running without the GIL."""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)  # Python 3.13+
+    return is_enabled is not None and not is_enabled()
+
+
+def resolve_executor(executor: str) -> str:
+    """Map an executor name in ``EXECUTORS`` to "threads" or "processes".
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"unknown executor '{executor}'")
+    if executor == "auto":
+        return "threads" if gil_disabled() else "processes"
+    return executor
+
+
+_worker_schemas: Optional[SchemaStore] = None
+_worker_check_formats = False
+
+
+def _init_worker(check_formats: bool = False, collect_metrics: bool = False) -> None:
+    global _worker_schemas, _worker_check_formats
+    _worker_schemas = SchemaStore()
+    _worker_check_formats = check_formats
+    # A fresh registry, not one inherited from the parent by fork
+    if collect_metrics:
+        enable_metrics()
+    else:
+        disable_metrics()
+
+
+def _run(json_path: Path, schema_path: Optional[Path]) -> FileResult:
+    assert _worker_schemas is not None
+    # Size was checked when the job was queued
+    result = validate_one(
+        json_path, schema_path, _worker_schemas, False, check_formats=_worker_check_formats
+    )
+    # Worker metrics go home with the result; the parent counts the file itself
+    collected = take_worker_metrics()
+    return result._replace(worker_metrics=collected) if collected else result
+
+
+def _run_shared(
+    schemas: SchemaStore, check_formats: bool, json_path: Path, schema_path: Optional[Path]
+) -> FileResult:
+    return validate_one(json_path, schema_path, schemas, False, check_formats=check_formats)
+
+
+def schedule(
+    jobs: Iterable[Job],
+    workers: int,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+    memory_budget: Optional[int] = None,
+    fail_fast: bool = False,
+    check_formats: bool = False,
+    executor: str = "auto",
+) -> Iterator[FileResult]:
+    """Validate many files across workers, largest first.
+
+    Args:
+        jobs: Pairs of document path and optional schema path
+        workers: Workers (1 validates in-process, in input order)
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
+        memory_budget: Bytes of estimated parse memory allowed in flight
+            (None for ``default_memory_budget``)
+        fail_fast: Stop at the first failed file, cancelling queued work
+            and terminating files still running
+        check_formats: Whether to enforce ``format``
+        executor: "threads", "processes" or "auto" (see ``resolve_executor``)
+
+    Yields:
+        One result per file, in completion order
+
+    Raises:
+        ValueError: If the executor name is unknown
+    """
+    kind = resolve_executor(executor)
+    if workers <= 1:
+        yield from _schedule_inline(jobs, validate_size, max_size_mb, fail_fast, check_formats)
+        return
+
+    pending: List[Tuple[int, Job]] = []
+    for json_path, schema_path in jobs:
+        try:
+            if validate_size:
+                size = validate_file_size(json_path, max_size_mb)
+            else:
+                size = json_path.stat().st_size
+        except (FileSizeError, FileAccessError, OSError) as e:
+            result = failed_result(json_path, schema_path, e)
+            record_file_result(result, None)
+            yield result
+            if fail_fast:
+                return
+            continue
+        pending.append((size, (json_path, schema_path)))
+    # Ascending, so the largest job is popped from the end
+    pending.sort(key=lambda job: job[0])
+
+    if not pending:
+        return
+
+    budget = memory_budget if memory_budget is not None else default_memory_budget()
+    running: Dict[Future, Tuple[int, Job]] = {}
+    in_flight = 0
+    # Files validated in this process are already counted by validate_one
+    counted_here = kind == "threads"
+    pool: Executor
+    run: Callable[[Path, Optional[Path]], FileResult]
+    on_caller: Callable[[Optional[Path]], bool]
+    if kind == "threads":
+        schemas = SchemaStore()
+        pool = ThreadPoolExecutor(
+            max_workers=min(workers, len(pending)), thread_name_prefix="json-validate"
+        )
+        run = partial(_run_shared, schemas, check_formats)
+        on_caller = partial(_needs_main_thread, schemas, {})
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            initializer=_init_worker,
+            initargs=(check_formats, active_metrics() is not None),
+        )
+        run = _run
+        on_caller = _never
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                index = _next_admissible(pending, budget, in_flight, not running)
+                if index is None:
+                    break
+                size, job = pending.pop(index)
+                if on_caller(job[1]):
+                    result = run(*job)
+                    yield result
+                    if fail_fast and not result.ok:
+                        return
+                    continue
+                try:
+                    future = pool.submit(run, *job)
+                except BrokenProcessPool as e:
+                    # A worker died earlier; nothing not yet started can run
+                    for size, (json_path, schema_path) in [(size, job)] + pending[::-1]:
+                        result = failed_result(json_path, schema_path, e)
+                        record_file_result(result, size)
+                        yield result
+                        if fail_fast:
+                            return
+                    pending.clear()
+                    break
+                running[future] = (size, job)
+                in_flight += estimate_memory(size)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                size, (json_path, schema_path) = running.pop(future)
+                in_flight -= estimate_memory(size)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed for memory); report, not hang
+                    result = failed_result(json_path, schema_path, e)
+                if not counted_here:
+                    record_file_result(result, size)
+                yield result
+                if fail_fast and not result.ok:
+                    return
+    finally:
+        _shutdown(pool, bool(running))
+
+
+def _never(schema_path: Optional[Path]) -> bool:
+    return False
+
+
+def _needs_main_thread(
+    schemas: SchemaStore, seen: Dict[Path, bool], schema_path: Optional[Path]
+) -> bool:
+    """Whether a job must run on the calling thread, remembered per schema."""
+    if schema_path is None:
+        return False
+    found = seen.get(schema_path)
+    if found is None:
+        try:
+            found = needs_main_thread(schemas.get(schema_path))
+        except SchemaError:
+            # Reported by the worker like any other schema failure
+            found = False
+        seen[schema_path] = found
+    return found
+
+
+def _shutdown(executor: Executor, cancel: bool) -> None:
+    """Shut the pool down, killing files still running when cancelling.
+
+    Threads cannot be stopped; a file they are validating is left to
+    finish in the background.
+    """
+    if not cancel:
+        executor.shutdown()
+        return
+    if isinstance(executor, ThreadPoolExecutor):
+        executor.shutdown(wait=False, cancel_futures=True)
+        return
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+def _next_admissible(
+    pending: List[Tuple[int, Job]],
+    budget: Optional[int],
+    in_flight: int,
+    idle: bool,
+) -> Optional[int]:
+    """Index of the largest pending job that fits the remaining budget."""
+    if budget is None or idle:
+        # Nothing running: always make progress, even past the budget
+        return len(pending) - 1
+    room = (budget - in_flight) // MEMORY_FACTOR
+    index = bisect_right(pending, room, key=lambda job: job[0])
+    return index - 1 if index else None
+
+
+def _schedule_inline(
+    jobs: Iterable[Job],
+    validate_size: bool,
+    max_size_mb: int,
+    fail_fast: bool,
+    check_formats: bool,
+) -> Iterator[FileResult]:
+    schemas = SchemaStore()
+    for json_path, schema_path in jobs:
+        result = validate_one(
+            json_path, schema_path, schemas, validate_size, max_size_mb, check_formats
+        )
+        yield result
+        if fail_fast and not result.ok:
+            return
+
+
+class ExecutorTiming(NamedTuple):
+    """Fastest of several runs of one executor over a corpus."""
+
+    executor: str
+    files: int
+    failed: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        """Throughput of the fastest run."""
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+def benchmark_executors(
+    jobs: Sequence[Job],
+    workers: int,
+    executors: Sequence[str] = ("threads", "processes"),
+    rounds: int = 3,
+    check_formats: bool = False,
+) -> List[ExecutorTiming]:
+    """Time ``schedule`` over the same jobs with each executor.
+
+    Each executor validates every job ``rounds`` times and keeps its
+    fastest run, so a cold page cache in the first run favours neither.
+    Pool start-up is part of each run, as it is for a real one.
+
+    Args:
+        jobs: Pairs of document path and optional schema path
+        workers: Workers per run
+        executors: Names from ``EXECUTORS``
+        rounds: Runs per executor
+        check_formats: Whether to enforce ``format``
+
+    Returns:
+        One timing per executor, in the order given
+
+    Raises:
+        ValueError: If an executor name is unknown
+    """
+    timings = []
+    for executor in executors:
+        kind = resolve_executor(executor)
+        best = float("inf")
+        results: List[FileResult] = []
+        for _ in range(max(rounds, 1)):
+            started = time.perf_counter()
+            results = list(
+                schedule(jobs, workers, False, check_formats=check_formats, executor=kind)
+            )
+            best = min(best, time.perf_counter() - started)
+        failed = sum(not result.ok for result in results)
+        timings.append(ExecutorTiming(kind, len(results), failed, best))
+    return timings
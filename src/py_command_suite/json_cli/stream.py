@@ -0,0 +1,480 @@
+"""Incremental JSON tokenizer and event parser.
+
+Reads a text stream in fixed-size chunks and yields parse events
+(``start_map``, ``key``, ``string``, ``number`` ...) carrying the raw token
+text and its character offset, so documents of any size can be walked in
+constant memory. Scalars are left undecoded until a consumer asks for them
+with ``decode_scalar``, and whole subtrees can be skipped without
+tokenizing their contents.
+
+Syntax errors raise ``StreamSyntaxError`` with the same messages, line
+and column numbers as ``json.JSONDecodeError``.
+"""
+
+import json
+import re
+from typing import IO, Any, Iterator, List, NamedTuple, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_TOKEN = re.compile(
+    r"""[ \t\n\r]*
+    (
+        [{}\[\]:,]
+      | "[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"
+      | -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?
+      | true | false | null | NaN | -?Infinity
+    )""",
+    re.VERBOSE,
+)
+# Strings (possibly cut off by the end of the buffer) and brackets only;
+# used to skip over subtrees.
+_SKIP = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(?:"|\\?\Z)|[\[\]{}]', re.DOTALL)
+_NON_WS = re.compile(r"[^ \t\n\r]")
+_ESCAPES = frozenset('"\\/bfnrtu')
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+# Longest prefix of a number or literal we will wait on before calling it junk.
+_MAX_PARTIAL_TOKEN = 64
+
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+_SCALAR_KINDS = {'"': "string", "t": "boolean", "f": "boolean", "n": "null"}
+
+
+class StreamSyntaxError(ValueError):
+    """Raised when streamed input is not valid JSON.
+
+    Mirrors the ``msg``/``pos``/``lineno``/``colno`` attributes of
+    ``json.JSONDecodeError``.
+    """
+
+    def __init__(self, msg: str, pos: int, lineno: int, colno: int) -> None:
+        """Initialize with the error location.
+
+        Args:
+            msg: Error message without location
+            pos: Character offset of the error
+            lineno: 1-based line of the error
+            colno: 1-based column of the error
+        """
+        self.msg = msg
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+        super().__init__(f"{msg}: line {lineno} column {colno} (char {pos})")
+
+
+class Event(NamedTuple):
+    """A parse event.
+
+    ``kind`` is one of ``start_map``, ``end_map``, ``start_array``,
+    ``end_array``, ``key``, ``string``, ``number``, ``boolean`` or
+    ``null``; ``raw`` is the token text (quotes and escapes included for
+    strings and keys) and ``pos`` its character offset in the stream.
+    """
+
+    kind: str
+    raw: str
+    pos: int
+
+
+class JSONLexer:
+    """Chunked tokenizer over a text stream."""
+
+    def __init__(self, fp: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Wrap a readable text stream.
+
+        Args:
+            fp: Stream opened in text mode
+            chunk_size: Characters read per refill
+        """
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._base = 0  # absolute offset of _buf[0]
+        self._pos = 0  # next unread index into _buf
+        self._keep = 0  # earliest index still needed for positions
+        self._eof = False
+        self._line = 1
+        self._line_start = 0
+        self._counted = 0
+
+    @property
+    def offset(self) -> int:
+        """Absolute offset of the next unread character."""
+        return self._base + self._pos
+
+    def _fill(self) -> bool:
+        """Read more input, discarding what is no longer needed."""
+        if self._eof:
+            return False
+        keep = min(self._keep, self._pos)
+        if keep:
+            self._advance_lines(self._base + keep)
+            self._buf = self._buf[keep:]
+            self._base += keep
+            self._pos -= keep
+            self._keep -= keep
+        # Grow geometrically so a single huge token is not rescanned O(n) times
+        chunk = self._fp.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def next_token(self) -> Optional[Tuple[str, int]]:
+        """Return the next token text and its absolute offset, or None at EOF.
+
+        Raises:
+            StreamSyntaxError: If the input cannot start a token
+        """
+        while True:
+            match = _TOKEN.match(self._buf, self._pos)
+            # A number may continue with up to two chars that do not match
+            # on their own yet ("1." or "1e+"), so keep a small lookahead
+            if match is not None and (match.end() + 2 < len(self._buf) or self._eof):
+                start = match.start(1)
+                self._keep = start
+                self._pos = match.end()
+                return match.group(1), self._base + start
+            if match is None and not self._eof and not self._needs_more():
+                break
+            if not self._fill() and match is None:
+                break
+        junk = _NON_WS.search(self._buf, self._pos)
+        if junk is None:
+            self._pos = len(self._buf)
+            self._keep = self._pos
+            return None
+        self._keep = junk.start()
+        self._pos = junk.start()
+        return "", self._base + junk.start()
+
+    def _needs_more(self) -> bool:
+        """Return True if the unmatched tail could be a truncated token."""
+        junk = _NON_WS.search(self._buf, self._pos)
+        if junk is None:
+            return True
+        if self._buf[junk.start()] == '"':
+            return _SKIP.match(self._buf, junk.start()).end() == len(self._buf)
+        return len(self._buf) - junk.start() < _MAX_PARTIAL_TOKEN
+
+    def skip_container(self) -> int:
+        """Consume input up to and including the closer of the open container.
+
+        Must be called right after an opening bracket was returned.
+
+        Returns:
+            Absolute offset of the closing bracket
+
+        Raises:
+            StreamSyntaxError: If input ends before the container closes
+        """
+        depth = 1
+        while True:
+            match = _SKIP.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                self._keep = self._pos
+                if not self._fill():
+                    raise self.error("Expecting value", self.offset)
+                continue
+            text = match.group()
+            if text[0] == '"' and match.end() == len(self._buf) and not self._eof:
+                # String may continue past the buffer; rescan it after a refill
+                self._pos = self._keep = match.start()
+                self._fill()
+                continue
+            self._pos = match.end()
+            self._keep = match.start()
+            if text in "[{":
+                depth += 1
+            elif text in "]}":
+                depth -= 1
+                if depth == 0:
+                    return self._base + match.start()
+
+    def _advance_lines(self, pos: int) -> None:
+        if pos <= self._counted:
+            return
+        a, b = self._counted - self._base, pos - self._base
+        newlines = self._buf.count("\n", a, b)
+        if newlines:
+            self._line += newlines
+            self._line_start = self._base + self._buf.rfind("\n", a, b) + 1
+        self._counted = pos
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        """Return the 1-based (line, column) of an absolute offset.
+
+        Valid for offsets of the most recent token and anything after it.
+        """
+        if pos >= self._counted:
+            self._advance_lines(pos)
+            return self._line, pos - self._line_start + 1
+        # Looking back within the retained buffer
+        rel = pos - self._base
+        newlines = self._buf.count("\n", rel, self._counted - self._base)
+        if not newlines:
+            return self._line, pos - self._line_start + 1
+        line_start = self._base + self._buf.rfind("\n", 0, rel) + 1
+        return self._line - newlines, pos - line_start + 1
+
+    def char_at(self, pos: int) -> str:
+        """Return the retained character at an absolute offset."""
+        return self._buf[pos - self._base]
+
+    def error(self, msg: str, pos: int) -> StreamSyntaxError:
+        """Build a syntax error located at an absolute offset."""
+        line, col = self.line_col(pos)
+        return StreamSyntaxError(msg, pos, line, col)
+
+    def string_error(self, pos: int) -> StreamSyntaxError:
+        """Explain why the string starting at ``pos`` did not tokenize."""
+        buf, i = self._buf, pos - self._base + 1
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                break
+            if ch == "\\":
+                escape = buf[i + 1 : i + 2]
+                if escape == "u":
+                    if len(buf) >= i + 6 and set(buf[i + 2 : i + 6]) <= _HEX:
+                        i += 6
+                        continue
+                    return self.error("Invalid \\uXXXX escape", self._base + i + 1)
+                if escape and escape in _ESCAPES:
+                    i += 2
+                    continue
+                return self.error("Invalid \\escape", self._base + i)
+            if ord(ch) < 0x20:
+                return self.error("Invalid control character at", self._base + i)
+            i += 1
+        return self.error("Unterminated string starting at", pos)
+
+
+class JSONEventParser:
+    """Pull parser producing ``Event`` tuples from a text stream.
+
+    ``path`` always holds the location of the most recent value or key
+    event as a list of object keys and array indices, matching
+    ``jsonschema``'s ``absolute_path``.
+    """
+
+    def __init__(
+        self,
+        fp: IO[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        multiple_values: bool = False,
+    ) -> None:
+        """Create a parser.
+
+        Args:
+            fp: Stream opened in text mode
+            chunk_size: Characters read per refill
+            multiple_values: Accept a sequence of top-level values (NDJSON
+                or concatenated JSON) instead of exactly one
+        """
+        self.lexer = JSONLexer(fp, chunk_size)
+        self.path: List[Any] = []
+        self.multiple_values = multiple_values
+        self._stack: List[str] = []
+        self._state = _VALUE
+        self._push: Optional[str] = None
+        self._seen_value = False
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return self."""
+        return self
+
+    @property
+    def depth(self) -> int:
+        """Number of containers currently open."""
+        return len(self._stack) + (self._push is not None)
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        """Return the 1-based (line, column) of an event offset."""
+        return self.lexer.line_col(pos)
+
+    def skip(self) -> None:
+        """Skip the container whose start event was just returned.
+
+        No events are produced for its contents or its end.
+        """
+        if self._push is None:
+            raise RuntimeError("skip() must directly follow a start event")
+        self._push = None
+        self.lexer.skip_container()
+        self._after_value()
+
+    def __next__(self) -> Event:
+        """Return the next event.
+
+        Raises:
+            StreamSyntaxError: If the input is not valid JSON
+        """
+        if self._push is not None:
+            self._stack.append(self._push)
+            self.path.append(-1 if self._push == "[" else None)
+            self._push = None
+
+        lexer = self.lexer
+        while True:
+            token = lexer.next_token()
+            state = self._state
+            if token is None:
+                if state == _DONE or (
+                    self.multiple_values and state == _VALUE and not self._stack
+                ):
+                    raise StopIteration
+                expected = {
+                    _KEY: "Expecting property name enclosed in double quotes",
+                    _KEY_OR_END: "Expecting property name enclosed in double quotes",
+                    _COLON: "Expecting ':' delimiter",
+                    _COMMA_OR_END: "Expecting ',' delimiter",
+                }.get(state, "Expecting value")
+                raise lexer.error(expected, lexer.offset)
+
+            text, pos = token
+            c = text[:1]
+            if state == _DONE:
+                if not self.multiple_values:
+                    raise lexer.error("Extra data", pos)
+                state = _VALUE
+
+            if state == _VALUE or state == _VALUE_OR_END:
+                if c == "]" and state == _VALUE_OR_END:
+                    return self._close(c, pos)
+                return self._value(c, text, pos)
+
+            if state == _KEY or state == _KEY_OR_END:
+                if c == '"':
+                    self._state = _COLON
+                    self.path[-1] = _decode_string(text)
+                    return Event("key", text, pos)
+                if c == "}" and state == _KEY_OR_END:
+                    return self._close(c, pos)
+                if c == "" and lexer.char_at(pos) == '"':
+                    raise lexer.string_error(pos)
+                raise lexer.error(
+                    "Expecting property name enclosed in double quotes", pos
+                )
+
+            if state == _COLON:
+                if c == ":":
+                    self._state = _VALUE
+                    continue
+                raise lexer.error("Expecting ':' delimiter", pos)
+
+            # _COMMA_OR_END
+            top = self._stack[-1]
+            if c == ",":
+                self._state = _KEY if top == "{" else _VALUE
+                continue
+            if (c == "}" and top == "{") or (c == "]" and top == "["):
+                return self._close(c, pos)
+            raise lexer.error("Expecting ',' delimiter", pos)
+
+    def _value(self, c: str, text: str, pos: int) -> Event:
+        if self._stack and self._stack[-1] == "[":
+            self.path[-1] += 1
+        elif not self._stack:
+            self._seen_value = True
+        if c == "{":
+            self._push = "{"
+            self._state = _KEY_OR_END
+            return Event("start_map", text, pos)
+        if c == "[":
+            self._push = "["
+            self._state = _VALUE_OR_END
+            return Event("start_array", text, pos)
+        kind = _SCALAR_KINDS.get(c)
+        if kind is None:
+            if c == "" or c in "}]:,":
+                if c == "" and self.lexer.char_at(pos) == '"':
+                    raise self.lexer.string_error(pos)
+                raise self.lexer.error("Expecting value", pos)
+            kind = "number"
+        self._after_value()
+        return Event(kind, text, pos)
+
+    def _close(self, c: str, pos: int) -> Event:
+        if self._push is not None:
+            self._push = None
+        else:
+            self._stack.pop()
+            self.path.pop()
+        self._after_value()
+        return Event("end_map" if c == "}" else "end_array", c, pos)
+
+    def _after_value(self) -> None:
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+
+def _decode_string(raw: str) -> str:
+    return raw[1:-1] if "\\" not in raw else json.loads(raw)
+
+
+def decode_scalar(event: Event) -> Any:
+    """Convert a scalar or key event to its Python value."""
+    kind, raw = event.kind, event.raw
+    if kind == "string" or kind == "key":
+        return _decode_string(raw)
+    if kind == "number":
+        if raw.isdigit() or (raw[:1] == "-" and raw[1:].isdigit()):
+            return int(raw)
+        return json.loads(raw)
+    if kind == "boolean":
+        return raw == "true"
+    if kind == "null":
+        return None
+    raise ValueError(f"{kind} is not a scalar event")
+
+
+def build_value(parser: JSONEventParser, event: Event) -> Any:
+    """Materialize the value that starts with ``event``.
+
+    Consumes the parser up to the end of that value.
+
+    Args:
+        parser: Parser that just produced ``event``
+        event: A scalar or start event
+
+    Returns:
+        The decoded Python value
+    """
+    if event.kind == "start_map":
+        root: Any = {}
+    elif event.kind == "start_array":
+        root = []
+    else:
+        return decode_scalar(event)
+
+    stack: List[Any] = [root]
+    key: Any = None
+    for ev in parser:
+        kind = ev.kind
+        if kind == "key":
+            key = _decode_string(ev.raw)
+            continue
+        if kind == "end_map" or kind == "end_array":
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        if kind == "start_map":
+            value: Any = {}
+        elif kind == "start_array":
+            value = []
+        else:
+            value = decode_scalar(ev)
+        container = stack[-1]
+        if type(container) is dict:
+            container[key] = value
+        else:
+            container.append(value)
+        if kind == "start_map" or kind == "start_array":
+            stack.append(value)
+    raise parser.lexer.error("Expecting value", parser.lexer.offset)
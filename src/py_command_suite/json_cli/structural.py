@@ -0,0 +1,169 @@
+"""Structural scanning of top-level JSON arrays.
+
+Finds where the elements of a top-level array start and end without
+building Python objects for them, so large files can be split into
+independently parseable chunks or indexed for random access.
+"""
+
+import mmap
+import re
+from typing import Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+# One match per string literal or structural character; string contents
+# (including escaped quotes) are skipped inside the regex engine.
+_STRUCTURAL = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+# A depth-1 separator between two container elements, e.g. "}, {".
+_CONTAINER_SEPARATOR = re.compile(rb"[}\]]\s*,\s*[{\[]")
+_ANY_SEPARATOR = re.compile(rb",\s*")
+_NON_WS = re.compile(rb"[^ \t\r\n]")
+_WS = b" \t\r\n"
+
+_QUOTE = ord('"')
+_OPENERS = frozenset(b"[{")
+_CLOSERS = frozenset(b"]}")
+
+_LINE_BLOCK = 1 << 24
+
+
+class StructureError(ValueError):
+    """Raised when a buffer is not shaped like a JSON array."""
+
+
+def array_body(buf: Buffer) -> Tuple[int, int]:
+    """Locate the contents of a top-level array.
+
+    Args:
+        buf: Whole-document buffer
+
+    Returns:
+        (start, end) offsets of the bytes between the outer brackets
+
+    Raises:
+        StructureError: If the document is not a top-level array
+    """
+    first = _NON_WS.search(buf)
+    if first is None or buf[first.start()] != ord("["):
+        raise StructureError("document is not a top-level array")
+    end = len(buf)
+    while end > first.start() and buf[end - 1] in _WS:
+        end -= 1
+    if end - 1 <= first.start() or buf[end - 1] != ord("]"):
+        raise StructureError("top-level array is not terminated")
+    return first.start() + 1, end - 1
+
+
+def iter_element_spans(
+    buf: Buffer, start: int, end: int
+) -> Iterator[Tuple[int, int]]:
+    """Yield the exact byte span of each element in an array body.
+
+    This is the sequential "stage 1" scan: every string and structural
+    character between ``start`` and ``end`` is visited once.
+
+    Args:
+        buf: Buffer holding the array
+        start: Offset just after the opening bracket (or a chunk start)
+        end: Offset of the closing bracket (or a chunk end)
+
+    Yields:
+        (start, end) offsets of each element, whitespace trimmed
+
+    Raises:
+        StructureError: If brackets are unbalanced within the span
+    """
+    depth = 0
+    element_start = start
+    for match in _STRUCTURAL.finditer(buf, start, end):
+        c = buf[match.start()]
+        if c == _QUOTE:
+            continue
+        if c in _OPENERS:
+            depth += 1
+        elif c in _CLOSERS:
+            depth -= 1
+            if depth < 0:
+                raise StructureError(f"unbalanced '{chr(c)}' at byte {match.start()}")
+        elif depth == 0:
+            yield _trim(buf, element_start, match.start())
+            element_start = match.end()
+    if depth != 0:
+        raise StructureError("unbalanced brackets in array body")
+    span = _trim(buf, element_start, end)
+    if span[0] < span[1]:
+        yield span
+
+
+def _trim(buf: Buffer, start: int, end: int) -> Tuple[int, int]:
+    while start < end and buf[start] in _WS:
+        start += 1
+    while end > start and buf[end - 1] in _WS:
+        end -= 1
+    return start, end
+
+
+def split_points(buf: Buffer, start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Pick chunk boundaries at likely element separators.
+
+    Seeks to evenly spaced byte offsets and takes the next separator
+    found there. This is speculative: a separator inside a string or a
+    nested container is possible, but any chunk cut at such a point
+    fails to parse, so callers must treat a parse failure as "verify
+    sequentially" rather than as proof of a syntax error.
+
+    Args:
+        buf: Buffer holding the array
+        start: Offset just after the opening bracket
+        end: Offset of the closing bracket
+        parts: Desired number of chunks
+
+    Returns:
+        (start, end) byte spans of consecutive chunks covering the body;
+        each span holds one or more complete elements
+    """
+    chunks: List[Tuple[int, int]] = []
+    chunk_start = start
+    step = max(1, (end - start) // max(1, parts))
+    for k in range(1, parts):
+        target = max(start + k * step, chunk_start)
+        if target >= end:
+            break
+        window = min(end, target + step)
+        match = _CONTAINER_SEPARATOR.search(buf, target, window)
+        if match is not None:
+            cut, next_start = match.start() + 1, match.end() - 1
+        else:
+            match = _ANY_SEPARATOR.search(buf, target, window)
+            if match is None:
+                break
+            cut, next_start = match.start(), match.end()
+        if cut <= chunk_start:
+            continue
+        chunks.append((chunk_start, cut))
+        chunk_start = next_start
+    chunks.append((chunk_start, end))
+    return chunks
+
+
+def count_lines(buf: Buffer, start: int, end: int) -> int:
+    """Count newlines in ``buf[start:end]`` in bounded-size blocks."""
+    total = 0
+    for block in range(start, end, _LINE_BLOCK):
+        total += buf[block : min(end, block + _LINE_BLOCK)].count(b"\n")
+    return total
+
+
+def line_number(buf: Buffer, offset: int, hint: Optional[Tuple[int, int]] = None) -> int:
+    """Return the 1-based line of a byte offset.
+
+    Args:
+        buf: Buffer to inspect
+        offset: Byte offset
+        hint: Optional known (offset, line) at or before ``offset``
+
+    Returns:
+        Line number
+    """
+    base_offset, base_line = hint if hint is not None else (0, 1)
+    return base_line + count_lines(buf, base_offset, offset)
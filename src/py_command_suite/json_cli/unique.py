@@ -0,0 +1,209 @@
+"""Hash-based duplicate detection under JSON equality.
+
+jsonschema checks ``uniqueItems`` by comparing items pairwise once they
+cannot be sorted, which is quadratic for arrays of objects. Here every
+item is reduced to its canonical form (``1`` and ``1.0`` equal, object
+key order irrelevant, ``true`` distinct from ``1``) and looked up in a
+dict, so an array is checked in one pass and each duplicate is reported
+with the index of the item it repeats.
+
+``find_duplicate_records`` applies the same keys to a whole NDJSON file
+with bounded memory: it keeps only (hash, line, offset) entries, sorts
+them in runs spilled to temporary files, and merges the runs so equal
+hashes meet. Records sharing a hash are re-read and compared by their
+canonical forms, so a hash collision is never reported as a duplicate.
+"""
+
+import heapq
+import json
+import reprlib
+import struct
+import tempfile
+from itertools import chain, groupby
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from jsonschema import ValidationError
+
+from .exceptions import FileAccessError, JSONParseError
+
+# Entries sorted in memory before a run is spilled to disk (about 70 MB)
+SPILL_ENTRIES = 500_000
+
+# (hash, line, byte offset) of a record; (line, first line) of a duplicate
+_ENTRY = struct.Struct("<qQQ")
+_PAIR = struct.Struct("<QQ")
+# Entries read back from a run at a time
+_READ_ENTRIES = 4096
+
+_repr = reprlib.Repr()
+_repr.maxlist = _repr.maxdict = 10
+_repr.maxstring = _repr.maxother = 80
+
+
+def _canonical(value: Any) -> Any:
+    """Hashable form under JSON equality."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return (type(value).__name__, value)
+    if isinstance(value, (int, float)):
+        return ("number", value)
+    if isinstance(value, list):
+        return ("array", tuple(_canonical(v) for v in value))
+    return ("object", frozenset((k, _canonical(v)) for k, v in value.items()))
+
+
+def duplicate_indices(items: Sequence[Any]) -> List[Tuple[int, int]]:
+    """Find the items of an array equal to an earlier item.
+
+    Args:
+        items: Array elements
+
+    Returns:
+        ``(index, first index)`` for each repeat, in index order
+    """
+    first: Dict[Any, int] = {}
+    repeats = []
+    for index, item in enumerate(items):
+        seen = first.setdefault(_canonical(item), index)
+        if seen != index:
+            repeats.append((index, seen))
+    return repeats
+
+
+def unique_items(validator: Any, unique: Any, instance: Any, schema: Any) -> Iterator[ValidationError]:
+    """``uniqueItems`` keyword: one error naming the first repeat."""
+    if not unique or not validator.is_type(instance, "array"):
+        return
+    repeats = duplicate_indices(instance)
+    if repeats:
+        index, first = repeats[0]
+        more = f"; {len(repeats)} repeats in total" if len(repeats) > 1 else ""
+        yield ValidationError(
+            f"{_repr.repr(instance)} has non-unique elements "
+            f"(item {index} repeats item {first}{more})"
+        )
+
+
+class Duplicate(NamedTuple):
+    """An NDJSON record equal to an earlier one (1-based line numbers)."""
+
+    line: int
+    first_line: int
+
+
+class _SpillingSorter:
+    """Sort fixed-width integer tuples, spilling sorted runs beyond a limit."""
+
+    def __init__(self, layout: struct.Struct, limit: int, directory: Optional[Path]) -> None:
+        self._layout = layout
+        self._limit = max(limit, 1)
+        self._directory = directory
+        self._buffer: List[Tuple[int, ...]] = []
+        self._runs: List[IO[bytes]] = []
+
+    def add(self, entry: Tuple[int, ...]) -> None:
+        self._buffer.append(entry)
+        if len(self._buffer) >= self._limit:
+            self._spill()
+
+    def _spill(self) -> None:
+        self._buffer.sort()
+        run = tempfile.TemporaryFile(dir=self._directory)
+        pack = self._layout.pack
+        run.writelines(pack(*entry) for entry in self._buffer)
+        run.seek(0)
+        self._runs.append(run)
+        self._buffer = []
+
+    def _read(self, run: IO[bytes]) -> Iterator[Tuple[int, ...]]:
+        while True:
+            chunk = run.read(self._layout.size * _READ_ENTRIES)
+            if not chunk:
+                return
+            yield from self._layout.iter_unpack(chunk)
+
+    def sorted(self) -> Iterator[Tuple[int, ...]]:
+        """Yield every entry added, in order."""
+        if not self._runs:
+            self._buffer.sort()
+            yield from self._buffer
+            return
+        if self._buffer:
+            self._spill()
+        yield from heapq.merge(*(self._read(run) for run in self._runs))
+
+    def close(self) -> None:
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._buffer = []
+
+
+def _parse_line(path: Path, line: bytes, line_no: int) -> Any:
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        reason = e.msg if isinstance(e, json.JSONDecodeError) else e.reason
+        raise JSONParseError(
+            f"Invalid JSON in file {path}: {reason} on line {line_no}", str(path)
+        ) from None
+
+
+def _collect_repeats(
+    path: Path, f: IO[bytes], group: Iterable[Tuple[int, ...]], repeats: _SpillingSorter
+) -> None:
+    """Re-read records sharing a hash and record the true repeats."""
+    firsts: Dict[Any, int] = {}
+    for _, line_no, offset in group:
+        f.seek(offset)
+        key = _canonical(_parse_line(path, f.readline(), line_no))
+        first = firsts.setdefault(key, line_no)
+        if first != line_no:
+            repeats.add((line_no, first))
+
+
+def find_duplicate_records(
+    path: Path,
+    spill_entries: int = SPILL_ENTRIES,
+    spill_dir: Optional[Path] = None,
+) -> Iterator[Duplicate]:
+    """Find the records of an NDJSON file equal to an earlier record.
+
+    Memory is bounded by ``spill_entries``, not by the size of the file;
+    blank lines are skipped.
+
+    Args:
+        path: NDJSON file
+        spill_entries: Entries kept in memory before a sorted run is written
+        spill_dir: Directory for the runs (default: the system temp dir)
+
+    Yields:
+        Duplicates in line order
+
+    Raises:
+        JSONParseError: If a line is not valid JSON
+        FileAccessError: If the file cannot be read
+    """
+    entries = _SpillingSorter(_ENTRY, spill_entries, spill_dir)
+    repeats = _SpillingSorter(_PAIR, spill_entries, spill_dir)
+    try:
+        with path.open("rb") as f:
+            offset = 0
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    key = hash(_canonical(_parse_line(path, line, line_no)))
+                    entries.add((key, line_no, offset))
+                offset += len(line)
+
+            for _, group in groupby(entries.sorted(), key=lambda entry: entry[0]):
+                first = next(group)
+                second = next(group, None)
+                if second is not None:
+                    _collect_repeats(path, f, chain((first, second), group), repeats)
+
+        yield from (Duplicate(*pair) for pair in repeats.sorted())
+    except OSError as e:
+        raise FileAccessError(f"Cannot check {path} for duplicates: {e}", str(path))
+    finally:
+        entries.close()
+        repeats.close()
@@ -1,51 +1,77 @@
 """JSON validation module using jsonschema."""
 
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
 
-import jsonschema
-from jsonschema import validate, ValidationError, SchemaError as JsonSchemaError
+from jsonschema import ValidationError, SchemaError as JsonSchemaError
+from jsonschema.exceptions import best_match
+
+from .columnar import compile_record_plan
+from .dispatch import dispatching_validator, draft_for, index_unions
 
 from .exceptions import (
+    JSONCliError,
     JSONParseError,
     JSONValidationError,
     SchemaError,
     FileAccessError,
     FileSizeError,
 )
+from .formats import FORMAT_CHECKER
+from .metrics import phase, timed, track_file
+from .patterns import check_patterns, needs_main_thread
+from .positions import attach_source_positions
+
+
+Payload = Union[str, bytes, bytearray, memoryview]
 
 
-def validate_file_size(file_path: Path, max_size_mb: int = 100) -> None:
+def validate_file_size(file_path: Path, max_size_mb: int = 100) -> int:
     """Validate file size before processing.
     
     Args:
         file_path: Path to check
         max_size_mb: Maximum file size in MB
+
+    Returns:
+        File size in bytes
         
     Raises:
         FileSizeError: If file exceeds size limit
     """
     try:
         file_size = file_path.stat().st_size
-        max_bytes = max_size_mb * 1024 * 1024
-        
-        if file_size > max_bytes:
-            raise FileSizeError(
-                f"File size ({file_size / 1024 / 1024:.1f}MB) exceeds limit ({max_size_mb}MB)",
-                str(file_path),
-                file_size,
-                max_bytes
-            )
     except FileNotFoundError:
         raise FileAccessError(f"File not found: {file_path}", str(file_path))
+    _check_size(file_size, max_size_mb, str(file_path))
+    return file_size
+
+
+def _check_size(size: int, max_size_mb: int, file_path: Optional[str]) -> None:
+    """Raise FileSizeError if ``size`` bytes exceeds ``max_size_mb``."""
+    max_bytes = max_size_mb * 1024 * 1024
+    if size > max_bytes:
+        raise FileSizeError(
+            f"File size ({size / 1024 / 1024:.1f}MB) exceeds limit ({max_size_mb}MB)",
+            file_path,
+            size,
+            max_bytes
+        )
 
 
-def load_json_file(file_path: Path, validate_size: bool = True) -> Dict[str, Any]:
+def load_json_file(
+    file_path: Path, validate_size: bool = True, max_size_mb: int = 100
+) -> Dict[str, Any]:
     """Load and parse a JSON file.
 
     Args:
         file_path: Path to the JSON file
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum file size in MB
 
     Returns:
         Parsed JSON data as dictionary
@@ -56,10 +82,10 @@ def load_json_file(file_path: Path, validate_size: bool = True) -> Dict[str, Any
     """
     # Validate file size if requested
     if validate_size:
-        validate_file_size(file_path)
+        validate_file_size(file_path, max_size_mb)
     
     try:
-        with file_path.open("r", encoding="utf-8") as f:
+        with file_path.open("r", encoding="utf-8") as f, phase("parse"):
             return json.load(f)
     except FileNotFoundError:
         suggestion = "Check that the file path is correct and the file exists"
@@ -72,13 +98,7 @@ def load_json_file(file_path: Path, validate_size: bool = True) -> Dict[str, Any
     except json.JSONDecodeError as e:
         # Provide helpful context and suggestions
         context_lines = _get_error_context(file_path, e.lineno)
-        suggestion = _get_json_error_suggestion(e.msg)
-        error_msg = f"Invalid JSON in file {file_path}: {e.msg} at line {e.lineno}, column {e.colno}"
-        if context_lines:
-            error_msg += f"\nContext:\n{context_lines}"
-        if suggestion:
-            error_msg += f"\nSuggestion: {suggestion}"
-        raise JSONParseError(error_msg, str(file_path))
+        raise _json_parse_error(e, f"file {file_path}", context_lines, str(file_path))
     except Exception as e:
         raise FileAccessError(
             f"Unexpected error reading file {file_path}: {e}", str(file_path)
@@ -88,6 +108,9 @@ def load_json_file(file_path: Path, validate_size: bool = True) -> Dict[str, Any
 def load_schema_file(schema_path: Path) -> Dict[str, Any]:
     """Load and validate a JSON schema file.
 
+    The schema is checked against the metaschema of the draft its
+    ``$schema`` names (Draft 7 if none).
+
     Args:
         schema_path: Path to the JSON schema file
 
@@ -100,7 +123,10 @@ def load_schema_file(schema_path: Path) -> Dict[str, Any]:
     try:
         schema_data = load_json_file(schema_path)
         # Validate that the schema itself is valid
-        jsonschema.Draft7Validator.check_schema(schema_data)
+        with phase("schema"):
+            draft_for(schema_data).check_schema(schema_data)
+            check_patterns(schema_data)
+            index_unions(schema_data)
         return schema_data
     except (JSONParseError, FileAccessError) as e:
         raise SchemaError(f"Failed to load schema: {e}", str(schema_path))
@@ -108,62 +134,419 @@ def load_schema_file(schema_path: Path) -> Dict[str, Any]:
         raise SchemaError(
             f"Invalid JSON schema in {schema_path}: {e.message}", str(schema_path)
         )
+    except SchemaError as e:
+        raise SchemaError(f"Invalid JSON schema in {schema_path}: {e}", str(schema_path))
+
+
+class FileVerdict(NamedTuple):
+    """Outcome of validating one file in ``Validator.validate_many``."""
+
+    path: Path
+    error: Optional[JSONCliError] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file is valid."""
+        return self.error is None
+
+
+class Validator:
+    """A schema compiled once for repeated validation.
+
+    The constructor does all the per-schema work (checking the schema,
+    indexing tagged unions, building the columnar plan and the
+    ``jsonschema`` validator for the schema's draft); the methods keep no
+    per-call state, so one instance can be shared by any number of
+    threads.
+
+    The compiled form is not refreshed if the schema dict is changed in
+    place afterwards; build a new ``Validator`` for the changed schema.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        validate_size: bool = True,
+        max_size_mb: int = 100,
+        check_schema: bool = True,
+        check_formats: bool = False,
+    ) -> None:
+        """Compile a schema.
+
+        Args:
+            schema: The JSON schema, or None to check syntax only
+            validate_size: Whether to enforce the size limit on files and payloads
+            max_size_mb: Maximum document size in MB
+            check_schema: Whether to check the schema itself first (skip
+                for schemas that came from ``load_schema_file``)
+            check_formats: Whether to enforce ``format`` (see ``formats``)
+                instead of treating it as an annotation
+
+        Raises:
+            SchemaError: If the schema is invalid
+        """
+        self.schema = schema
+        self.validate_size = validate_size
+        self.max_size_mb = max_size_mb
+        self.check_formats = check_formats
+        self._plan = None
+        self._validator = None
+        if schema is None:
+            return
+        if check_schema:
+            try:
+                draft_for(schema).check_schema(schema)
+            except JsonSchemaError as e:
+                raise SchemaError(f"Invalid JSON schema: {e.message}")
+            check_patterns(schema)
+        self._plan = compile_record_plan(schema)
+        self._validator = dispatching_validator(
+            schema, FORMAT_CHECKER if check_formats else None
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        schema_path: Path,
+        validate_size: bool = True,
+        max_size_mb: int = 100,
+        check_formats: bool = False,
+    ) -> "Validator":
+        """Load a schema file and compile it.
+
+        Raises:
+            SchemaError: If the schema is invalid or cannot be loaded
+        """
+        schema = load_schema_file(schema_path)
+        return cls(schema, validate_size, max_size_mb, False, check_formats)
+
+    def iter_errors(self, json_data: Any) -> Iterator[ValidationError]:
+        """Yield every ``jsonschema`` error for parsed JSON data.
+
+        Arrays of flat records whose schema only uses simple constraints are
+        checked column-wise (see ``columnar``); everything else goes through
+        ``jsonschema``, with tagged unions dispatched on their discriminator
+        (see ``dispatch``).
+        """
+        if self._validator is None:
+            return
+        if self._plan is not None and isinstance(json_data, list):
+            yield from self._plan.iter_errors(json_data)
+        else:
+            yield from self._validator.iter_errors(json_data)
+
+    @timed("validate")
+    def validate_obj(self, json_data: Any, source: Optional[str] = None) -> bool:
+        """Validate parsed JSON data.
+
+        Args:
+            json_data: The parsed document
+            source: Optional name for the document in error messages
+
+        Returns:
+            True if validation succeeds
+
+        Raises:
+            JSONValidationError: If validation fails, with every error
+        """
+        # One pass collects every error; the headline is the best match
+        all_errors = list(self.iter_errors(json_data))
+        if all_errors:
+            best = best_match(all_errors)
+            raise JSONValidationError(
+                f"JSON validation failed: {best.message}",
+                source,
+                [_format_validation_error(error) for error in all_errors],
+                [tuple(error.absolute_path) for error in all_errors],
+            )
+        return True
+
+    def validate_file(self, json_file_path: Path) -> bool:
+        """Validate a JSON file, locating any failures in its source.
+
+        Returns:
+            True if validation succeeds
+
+        Raises:
+            FileSizeError, FileAccessError: If the file cannot be read
+            JSONParseError: If the file is not valid JSON
+            JSONValidationError: If it does not match the schema
+        """
+        with track_file(json_file_path):
+            json_data = load_json_file(json_file_path, self.validate_size, self.max_size_mb)
+            self._validate_located(json_data, json_file_path, str(json_file_path))
+        return True
+
+    def validate_bytes(self, payload: Payload, source: Optional[str] = None) -> bool:
+        """Validate an in-memory document, as ``validate_bytes`` does."""
+        if self.validate_size:
+            size = len(payload) if isinstance(payload, str) else memoryview(payload).nbytes
+            _check_size(size, self.max_size_mb, source)
+        self._validate_payload(payload, source)
+        return True
+
+    def validate_many(
+        self, json_file_paths: Iterable[Path], workers: int = 1
+    ) -> Iterator[FileVerdict]:
+        """Validate many files, capturing failures instead of raising.
+
+        Args:
+            json_file_paths: Files to validate
+            workers: Threads to validate on; schemas with regexes that need
+                a time budget (see ``patterns``) always run on the calling
+                thread, where one can be armed
+
+        Yields:
+            One verdict per file, in the order given
+        """
+        if workers <= 1 or self._needs_main_thread():
+            for path in json_file_paths:
+                yield self._verdict(path)
+            return
+        with ThreadPoolExecutor(workers) as executor:
+            yield from executor.map(self._verdict, json_file_paths)
+
+    def _verdict(self, json_file_path: Path) -> FileVerdict:
+        try:
+            self.validate_file(json_file_path)
+        except JSONCliError as e:
+            return FileVerdict(json_file_path, e)
+        return FileVerdict(json_file_path)
+
+    def _needs_main_thread(self) -> bool:
+        return self.schema is not None and needs_main_thread(self.schema)
+
+    def _validate_payload(self, payload: Payload, source: Optional[str]) -> None:
+        text = _decode_payload(payload, source)
+        self._validate_located(_loads_payload(text, source), text, source)
+
+    def _validate_located(
+        self, json_data: Any, source: Union[Path, str], name: Optional[str]
+    ) -> None:
+        """Validate, attaching positions in ``source`` (a file or the text) on failure."""
+        if self._validator is None:
+            return
+        try:
+            self.validate_obj(json_data, name)
+        except JSONValidationError as e:
+            attach_source_positions(e, source)
+            raise
+
+
+_SYNTAX_ONLY = Validator()
+
+# Validators compiled by the module-level functions, keyed by schema id;
+# holding the schema keeps its id from being reused
+MAX_COMPILED = 64
+_compiled_lock = threading.Lock()
+_compiled: "OrderedDict[Tuple[int, bool], Tuple[Any, Validator]]" = OrderedDict()
+
+
+def compiled_validator(schema: Dict[str, Any], check_formats: bool = False) -> Validator:
+    """Return a shared ``Validator`` for a schema, compiling it on first use.
+
+    The schema is checked on first use. It is cached by identity and
+    assumed not to change once it has been validated against: a schema
+    changed in place keeps its stale compiled form, so pass a new dict
+    instead, or build a ``Validator`` directly to control its lifetime.
+
+    Raises:
+        SchemaError: If the schema is invalid
+    """
+    key = (id(schema), check_formats)
+    with _compiled_lock:
+        entry = _compiled.get(key)
+        if entry is not None and entry[0] is schema:
+            _compiled.move_to_end(key)
+            return entry[1]
+    validator = Validator(schema, check_formats=check_formats)
+    with _compiled_lock:
+        _compiled[key] = (schema, validator)
+        if len(_compiled) > MAX_COMPILED:
+            _compiled.popitem(last=False)
+    return validator
 
 
 def validate_json_against_schema(
     json_data: Dict[str, Any],
     schema: Dict[str, Any],
     json_file_path: Optional[str] = None,
+    check_formats: bool = False,
 ) -> None:
     """Validate JSON data against a schema.
 
+    Shorthand for ``compiled_validator(schema, check_formats).validate_obj``.
+
     Args:
         json_data: The JSON data to validate
         schema: The JSON schema to validate against
         json_file_path: Optional path to the JSON file for error reporting
+        check_formats: Whether to enforce ``format``
 
     Raises:
         JSONValidationError: If validation fails
     """
-    try:
-        validate(instance=json_data, schema=schema)
-    except ValidationError as e:
-        # Collect all validation errors
-        validator = jsonschema.Draft7Validator(schema)
-        errors = []
-        for error in validator.iter_errors(json_data):
-            # Format the error path
-            path = (
-                " -> ".join(str(p) for p in error.absolute_path)
-                if error.absolute_path
-                else "root"
-            )
-            errors.append(f"At '{path}': {error.message}")
+    compiled_validator(schema, check_formats).validate_obj(json_data, json_file_path)
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Format a jsonschema error as "At 'path': message"."""
+    return _format_error_entry(error.absolute_path, error.message)
+
+
+def _format_error_entry(path: Sequence[Any], message: str) -> str:
+    """Format an instance path and message as "At 'path': message"."""
+    joined = " -> ".join(str(p) for p in path) if path else "root"
+    return f"At '{joined}': {message}"
+
+
+def validate_bytes(
+    payload: Payload,
+    schema: Optional[Dict[str, Any]] = None,
+    source: Optional[str] = None,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+) -> bool:
+    """Validate an in-memory JSON document, such as a request body.
+
+    Bytes-like payloads are decoded straight from their buffer (UTF-8/16/32,
+    detected as ``json.loads`` does) without an intermediate copy.
+
+    Args:
+        payload: JSON text, or its encoded bytes
+        schema: Optional schema to validate against
+        source: Optional name for the payload in error messages
+        validate_size: Whether to enforce the size limit
+        max_size_mb: Maximum payload size in MB (characters, for ``str``)
+
+    Returns:
+        True if validation succeeds
+
+    Raises:
+        FileSizeError: If the payload exceeds the size limit
+        JSONParseError: If the payload is not valid JSON, with line context
+        JSONValidationError: If it does not match the schema, with line
+            and column of each error
+    """
+    if validate_size:
+        size = len(payload) if isinstance(payload, str) else memoryview(payload).nbytes
+        _check_size(size, max_size_mb, source)
+    _validate_payload(payload, schema, source)
+    return True
+
+
+def validate_buffer(
+    buffer: Any,
+    schema: Optional[Dict[str, Any]] = None,
+    source: Optional[str] = None,
+    validate_size: bool = True,
+    max_size_mb: int = 100,
+) -> bool:
+    """Validate a JSON document held in any object exporting the buffer protocol.
 
-        raise JSONValidationError(
-            f"JSON validation failed: {e.message}", json_file_path, errors
+    Accepts what ``validate_bytes`` does plus ``mmap`` objects, ``array``
+    instances and other contiguous buffers, which are viewed as raw bytes
+    without copying.
+
+    Raises:
+        TypeError: If ``buffer`` does not export a contiguous buffer
+        FileSizeError, JSONParseError, JSONValidationError: As for
+            ``validate_bytes``
+    """
+    if not isinstance(buffer, str):
+        buffer = memoryview(buffer).cast("B")
+    return validate_bytes(buffer, schema, source, validate_size, max_size_mb)
+
+
+def _decode_payload(payload: Payload, source: Optional[str] = None) -> str:
+    """Decode a bytes-like payload as ``json.loads`` would, reading its buffer in place.
+
+    Raises:
+        JSONParseError: If the bytes are not valid in the detected encoding
+    """
+    if isinstance(payload, str):
+        return payload
+    view = memoryview(payload)
+    try:
+        return str(view, json.detect_encoding(bytes(view[:4])), "surrogatepass")
+    except UnicodeDecodeError as e:
+        raise JSONParseError(
+            f"Invalid JSON in {source or 'payload'}: not valid UTF-8 "
+            f"({e.reason} at byte {e.start})",
+            source,
         )
 
 
+def _loads_payload(payload: Payload, source: Optional[str] = None) -> Any:
+    """Parse an in-memory document, raising JSONParseError like ``load_json_file``.
+
+    Args:
+        payload: JSON text, or bytes in UTF-8/16/32
+        source: Optional name for the payload in messages
+
+    Raises:
+        JSONParseError: If the payload is not valid JSON
+    """
+    where = source or "payload"
+    text = _decode_payload(payload, source)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        context_lines = _format_error_context(e.doc.splitlines(), e.lineno)
+        raise _json_parse_error(e, where, context_lines, source)
+    except RecursionError:
+        raise JSONParseError(f"Invalid JSON in {where}: nested too deeply to parse", source)
+
+
+def _validate_payload(
+    payload: Payload, schema: Optional[Dict[str, Any]], source: Optional[str] = None
+) -> None:
+    """Parse and validate an in-memory document, locating any failures.
+
+    Raises:
+        JSONParseError: If the payload is not valid JSON
+        JSONValidationError: If it does not match the schema
+    """
+    validator = _SYNTAX_ONLY if schema is None else compiled_validator(schema)
+    validator._validate_payload(payload, source)
+
+
+def _json_parse_error(
+    e: json.JSONDecodeError, where: str, context_lines: str, file_path: Optional[str]
+) -> JSONParseError:
+    """Build the JSONParseError for a decode failure, with context and suggestion."""
+    suggestion = _get_json_error_suggestion(e.msg)
+    error_msg = f"Invalid JSON in {where}: {e.msg} at line {e.lineno}, column {e.colno}"
+    if context_lines:
+        error_msg += f"\nContext:\n{context_lines}"
+    if suggestion:
+        error_msg += f"\nSuggestion: {suggestion}"
+    return JSONParseError(error_msg, file_path)
+
+
 def _get_error_context(file_path: Path, line_no: int, context_lines: int = 2) -> str:
     """Get context lines around an error for better debugging."""
     try:
         with file_path.open("r", encoding="utf-8") as f:
             lines = f.readlines()
-        
-        start = max(0, line_no - context_lines - 1)
-        end = min(len(lines), line_no + context_lines)
-        
-        context = []
-        for i in range(start, end):
-            marker = ">>>" if i + 1 == line_no else "   "
-            context.append(f"{marker} {i + 1:3d}: {lines[i].rstrip()}")
-        
-        return "\n".join(context)
+        return _format_error_context(lines, line_no, context_lines)
     except Exception:
         return ""
 
 
+def _format_error_context(lines: Sequence[str], line_no: int, context_lines: int = 2) -> str:
+    """Number the lines around ``line_no`` and mark the failing one."""
+    start = max(0, line_no - context_lines - 1)
+    end = min(len(lines), line_no + context_lines)
+
+    context = []
+    for i in range(start, end):
+        marker = ">>>" if i + 1 == line_no else "   "
+        context.append(f"{marker} {i + 1:3d}: {lines[i].rstrip()}")
+
+    return "\n".join(context)
+
+
 def _get_json_error_suggestion(error_msg: str) -> str:
     """Provide helpful suggestions based on JSON error message."""
     suggestions = {
@@ -182,13 +565,14 @@ def _get_json_error_suggestion(error_msg: str) -> str:
 
 
 def validate_json_file(
-    json_file_path: Path, schema_file_path: Optional[Path] = None
+    json_file_path: Path, schema_file_path: Optional[Path] = None, check_formats: bool = False
 ) -> bool:
     """Validate a JSON file against an optional schema.
 
     Args:
         json_file_path: Path to the JSON file to validate
         schema_file_path: Optional path to the JSON schema file
+        check_formats: Whether to enforce ``format``
 
     Returns:
         True if validation succeeds
@@ -196,17 +580,16 @@ def validate_json_file(
     Raises:
         Various exceptions for different failure modes
     """
-    # Load the JSON file
-    json_data = load_json_file(json_file_path)
-
-    # If no schema provided, just check if it's valid JSON (already done)
-    if schema_file_path is None:
-        return True
+    with track_file(json_file_path):
+        # Load the JSON file
+        json_data = load_json_file(json_file_path)
 
-    # Load and validate the schema
-    schema = load_schema_file(schema_file_path)
+        # If no schema provided, just check if it's valid JSON (already done)
+        if schema_file_path is None:
+            return True
 
-    # Validate JSON against schema
-    validate_json_against_schema(json_data, schema, str(json_file_path))
+        # Load and compile the schema, then validate
+        validator = Validator.from_file(schema_file_path, check_formats=check_formats)
+        validator._validate_located(json_data, json_file_path, str(json_file_path))
 
     return True
@@ -0,0 +1,241 @@
+"""Tests for the schema cost analyzer and optimizer."""
+
+import json
+
+import jsonschema
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli import main as main_module
+from py_command_suite.json_cli.analyzer import (
+    analyze_schema,
+    check_equivalence,
+    discriminator,
+    optimize_schema,
+)
+from py_command_suite.json_cli.main import cli
+
+
+ADDRESS = {
+    "type": "object",
+    "properties": {"street": {"type": "string"}, "city": {"type": "string"}},
+    "required": ["street"],
+}
+
+EVENTS = [
+    {
+        "type": "object",
+        "required": ["kind", "n"],
+        "properties": {"kind": {"const": f"e{i}"}, "n": {"type": "integer", "minimum": i}},
+    }
+    for i in range(10)
+]
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "home": ADDRESS,
+        "work": dict(ADDRESS),
+        "event": {"oneOf": EVENTS},
+        "note": {"anyOf": [{"type": "string"}, True]},
+        "count": {"allOf": [{}, {"type": "integer"}]},
+        "meta": {
+            "type": "object",
+            "patternProperties": {"^a": {"type": "string"}, "^b": {}, "^c": {"type": "integer"}},
+        },
+    },
+}
+
+
+class TestAnalyzeSchema:
+    """Test cost estimation and hot spots."""
+
+    def test_hot_spots(self):
+        """Test that fan-out, pattern and duplication hot spots are found."""
+        analysis = analyze_schema(SCHEMA)
+        spots = {(spot.pointer, spot.keyword): spot.reason for spot in analysis.hot_spots}
+
+        assert "10-way oneOf tries every branch" in spots[("#/properties/event", "oneOf")]
+        assert "tagged by 'kind'" in spots[("#/properties/event", "oneOf")]
+        assert "3 patterns" in spots[("#/properties/meta", "patternProperties")]
+        assert spots[("#/properties/home", "(subschema)")] == (
+            "repeated inline at #/properties/work"
+        )
+
+    def test_costs_ranked_and_inclusive(self):
+        """Test that costs are sorted and include subschemas."""
+        analysis = analyze_schema(SCHEMA)
+        costs = [entry.cost for entry in analysis.costs]
+
+        assert costs == sorted(costs, reverse=True)
+        assert analysis.costs[0].pointer == "#"
+        assert analysis.total == pytest.approx(sum(
+            entry.cost for entry in analysis.costs if entry.pointer == "#"
+        ))
+
+    def test_recursive_ref(self):
+        """Test that recursive references terminate."""
+        schema = {"type": "object", "properties": {"child": {"$ref": "#"}}}
+        assert analyze_schema(schema).total > 0
+
+
+class TestDiscriminator:
+    """Test tagged union detection."""
+
+    def test_found_through_refs(self):
+        """Test that branches may be references."""
+        root = {"definitions": {"a": EVENTS[0], "b": EVENTS[1]}}
+        branches = [{"$ref": "#/definitions/a"}, {"$ref": "#/definitions/b"}]
+
+        assert discriminator(branches, root) == ("kind", [["e0"], ["e1"]])
+
+    @pytest.mark.parametrize(
+        "branches, object_only",
+        [
+            # Same tag value in two branches
+            ([EVENTS[0], EVENTS[0]], False),
+            # Branches also accept non-objects
+            ([{**EVENTS[0], "type": "string"}, EVENTS[1]], False),
+            ([{k: v for k, v in EVENTS[0].items() if k != "type"}, EVENTS[1]], False),
+            # Tag not required
+            ([{**EVENTS[0], "required": ["n"]}, EVENTS[1]], True),
+        ],
+    )
+    def test_not_a_tagged_union(self, branches, object_only):
+        """Test unions that cannot be dispatched."""
+        assert discriminator(branches, {}, object_only) is None
+
+
+class TestOptimizeSchema:
+    """Test equivalence-preserving rewrites."""
+
+    def test_rewrites(self):
+        """Test dispatch, constant collapsing and sharing."""
+        optimized, changes = optimize_schema(SCHEMA)
+        properties = optimized["properties"]
+
+        assert "oneOf" not in properties["event"]
+        assert len(properties["event"]["allOf"]) == 11
+        assert properties["note"] == {}
+        assert properties["count"] == {"type": "integer"}
+        assert properties["home"] == properties["work"] == {"$ref": "#/definitions/home"}
+        assert optimized["definitions"]["home"] == ADDRESS
+        assert len(changes) == 4
+        jsonschema.Draft7Validator.check_schema(optimized)
+
+    def test_original_untouched(self):
+        """Test that the input schema is not modified."""
+        before = json.dumps(SCHEMA, sort_keys=True)
+        optimize_schema(SCHEMA)
+        assert json.dumps(SCHEMA, sort_keys=True) == before
+
+    def test_dispatch_keeps_verdicts(self):
+        """Test that dispatch accepts and rejects the same instances."""
+        optimized, _ = optimize_schema({"oneOf": EVENTS})
+        before = jsonschema.Draft7Validator({"oneOf": EVENTS})
+        after = jsonschema.Draft7Validator(optimized)
+
+        for instance in [
+            {"kind": "e3", "n": 3}, {"kind": "e3", "n": 2}, {"kind": "x", "n": 9},
+            {"n": 1}, "e3", None, {},
+        ]:
+            assert before.is_valid(instance) == after.is_valid(instance)
+
+    def test_referenced_locations_kept(self):
+        """Test that nothing is moved out from under a $ref into it."""
+        schema = {
+            "properties": {
+                "a": {"oneOf": EVENTS[:2]},
+                "b": {"$ref": "#/properties/a/oneOf/1"},
+            }
+        }
+        optimized, _ = optimize_schema(schema)
+
+        assert optimized["properties"]["a"] == schema["properties"]["a"]
+
+    def test_constant_schemas(self):
+        """Test schemas that collapse to false."""
+        assert optimize_schema({"not": {}})[0] is False
+        assert optimize_schema({"oneOf": [False, False]})[0] is False
+        assert optimize_schema({"if": True, "then": {"type": "string"}})[0] == {
+            "type": "string"
+        }
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {"$schema": "http://json-schema.org/draft-06/schema#", "oneOf": EVENTS},
+            {"$schema": "http://json-schema.org/draft-06/schema#", "if": True, "then": {"type": "string"}},
+            {"$schema": "http://json-schema.org/draft-04/schema#", "enum": ["a"]},
+        ],
+    )
+    def test_keywords_missing_from_draft_not_introduced(self, schema):
+        """Test that if/then and const are not written for drafts without them."""
+        optimized, changes = optimize_schema(schema)
+
+        assert optimized == schema
+        assert changes == []
+
+
+class TestCheckEquivalence:
+    """Test verdict comparison."""
+
+    def test_equivalent(self):
+        """Test the optimizer output on a generated corpus."""
+        optimized, _ = optimize_schema(SCHEMA)
+        result = check_equivalence(SCHEMA, optimized, samples=300)
+
+        assert result.ok
+        assert result.samples > 300
+
+    def test_difference_reported(self):
+        """Test that a changed schema is caught."""
+        changed = {**SCHEMA, "required": ["home"]}
+        result = check_equivalence(SCHEMA, changed, samples=100)
+
+        assert not result.ok
+        assert all("home" not in value for value in result.mismatches)
+
+    def test_uses_original_draft(self):
+        """Test that an if/then rewrite of a Draft 6 union is caught."""
+        original = {"$schema": "http://json-schema.org/draft-06/schema#", "oneOf": EVENTS}
+        rewritten = {**optimize_schema({"oneOf": EVENTS})[0], "$schema": original["$schema"]}
+
+        assert not check_equivalence(original, rewritten, samples=100).ok
+
+
+class TestAnalyzeCommand:
+    """Test the schema analyze command."""
+
+    def test_writes_optimized_schema(self, tmp_path):
+        """Test the report and the written schema."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(SCHEMA))
+        output = tmp_path / "optimized.json"
+
+        result = CliRunner().invoke(
+            cli, ["schema", "analyze", str(schema_file), "-o", str(output), "--samples", "100"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Hot spots:" in result.output
+        assert "oneOf of 10 branches dispatched on 'kind'" in result.output
+        assert "same verdict on all 107 instance(s)" in result.output
+        assert json.loads(output.read_text()) == optimize_schema(SCHEMA)[0]
+
+    def test_refuses_inequivalent_rewrite(self, tmp_path, monkeypatch):
+        """Test that a rewrite failing the check is not written."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(SCHEMA))
+        output = tmp_path / "optimized.json"
+        monkeypatch.setattr(
+            main_module, "optimize_schema", lambda schema: ({"type": "string"}, ["broken"])
+        )
+
+        result = CliRunner().invoke(
+            cli, ["schema", "analyze", str(schema_file), "-o", str(output), "--samples", "50"]
+        )
+
+        assert result.exit_code == 1
+        assert "Optimized schema disagrees" in result.output
+        assert not output.exists()
@@ -0,0 +1,129 @@
+"""Tests for the validation result cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from py_command_suite.json_cli import cache as cache_module
+from py_command_suite.json_cli.cache import ENTRY_OVERHEAD, ValidationCache
+from py_command_suite.json_cli.exceptions import JSONParseError, JSONValidationError
+
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": "integer"}}}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Count real validations behind the cache."""
+    counter = {"n": 0}
+    real = cache_module._validate_payload
+
+    def counting(*args, **kwargs):
+        counter["n"] += 1
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(cache_module, "_validate_payload", counting)
+    return counter
+
+
+class TestValidationCache:
+    """Test caching behaviour."""
+
+    def test_repeated_payload_validated_once(self, calls):
+        """Test that str and bytes forms of a payload share an entry."""
+        cache = ValidationCache()
+
+        assert cache.validate(b'{"id": 1}', SCHEMA)
+        assert cache.validate('{"id": 1}', SCHEMA)
+        assert cache.validate(memoryview(b'{"id": 1}'), SCHEMA)
+
+        assert calls["n"] == 1
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_cached_failures_are_fresh_copies(self, calls):
+        """Test that failures are replayed without sharing state."""
+        cache = ValidationCache()
+        payload = '{\n  "id": "x"\n}'
+
+        with pytest.raises(JSONValidationError) as first:
+            cache.validate(payload, SCHEMA)
+        with pytest.raises(JSONValidationError) as second:
+            cache.validate(payload, SCHEMA)
+
+        assert calls["n"] == 1
+        assert second.value is not first.value
+        assert second.value.validation_errors == first.value.validation_errors
+        assert second.value.validation_errors == [
+            "At 'id': 'x' is not of type 'integer' (line 2, column 9)"
+        ]
+        second.value.validation_errors.clear()
+        with pytest.raises(JSONValidationError) as third:
+            cache.validate(payload, SCHEMA)
+        assert len(third.value.validation_errors) == 1
+
+    def test_parse_errors_cached(self, calls):
+        """Test that syntax errors keep their context and suggestion."""
+        cache = ValidationCache()
+        for _ in range(2):
+            with pytest.raises(JSONParseError) as exc_info:
+                cache.validate(b'{"id": 1,}', source="request body")
+        message = str(exc_info.value)
+        assert message.startswith("Invalid JSON in request body: Expecting property name")
+        assert ">>>   1: {\"id\": 1,}" in message
+        assert "Suggestion:" in message
+        assert calls["n"] == 1
+
+    def test_schema_identity_is_part_of_key(self, calls):
+        """Test that equal schemas share entries and different ones do not."""
+        cache = ValidationCache()
+        cache.validate('{"id": 1}', SCHEMA)
+        cache.validate('{"id": 1}', dict(SCHEMA))
+        with pytest.raises(JSONValidationError):
+            cache.validate('{"id": 1}', {"type": "array"})
+        cache.validate('{"id": 1}', None)
+
+        assert calls["n"] == 3
+
+    def test_ttl_expiry(self, calls):
+        """Test that entries expire after the TTL."""
+        now = [100.0]
+        cache = ValidationCache(ttl=5, clock=lambda: now[0])
+
+        cache.validate("[]")
+        now[0] += 4.9
+        cache.validate("[]")
+        now[0] += 0.2
+        cache.validate("[]")
+
+        assert calls["n"] == 2
+        assert cache.stats().expirations == 1
+
+    def test_byte_budget_evicts_least_recent(self, calls):
+        """Test LRU eviction by bytes."""
+        cache = ValidationCache(max_bytes=3 * ENTRY_OVERHEAD)
+        for payload in ("1", "2", "3"):
+            cache.validate(payload)
+        cache.validate("1")  # refresh
+        cache.validate("4")  # evicts "2"
+
+        stats = cache.stats()
+        assert (stats.entries, stats.evictions, stats.bytes) == (3, 1, 3 * ENTRY_OVERHEAD)
+        cache.validate("1")
+        cache.validate("2")
+        assert calls["n"] == 5
+
+    def test_thread_safety(self):
+        """Test concurrent use keeps counters and budget consistent."""
+        cache = ValidationCache(max_bytes=50 * ENTRY_OVERHEAD)
+        payloads = [f'{{"id": {i % 40}}}' for i in range(4000)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(lambda p: cache.validate(p, SCHEMA), payloads))
+
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 4000
+        assert stats.entries == 40
+        assert stats.misses < 400
+        assert stats.bytes == stats.entries * ENTRY_OVERHEAD
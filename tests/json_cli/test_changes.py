@@ -0,0 +1,140 @@
+"""Tests for git-aware changed-file selection."""
+
+import json
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.changes import changed_jobs, git_changes
+from py_command_suite.json_cli.crawler import load_config
+from py_command_suite.json_cli.exceptions import GitError
+from py_command_suite.json_cli.main import validate_json
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A committed repository with two schemas and a few documents."""
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "schemas" / "user.json").write_text(json.dumps({"required": ["name"]}))
+    (tmp_path / "schemas" / "item.json").write_text(json.dumps({"required": ["sku"]}))
+    (tmp_path / ".json-validate.json").write_text(
+        json.dumps(
+            {
+                "schemas": {"users/*.json": "schemas/user.json", "items/*.json": "schemas/item.json"},
+                "include": ["users/*.json", "items/*.json"],
+            }
+        )
+    )
+    for folder, key in (("users", "name"), ("items", "sku")):
+        (tmp_path / folder).mkdir()
+        for i in range(3):
+            (tmp_path / folder / f"{i}.json").write_text(json.dumps({key: i}))
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def _selected(repo, **kwargs):
+    jobs = changed_jobs(repo, load_config(repo), **kwargs)
+    return sorted((p.relative_to(repo).as_posix(), s.name if s else None) for p, s in jobs)
+
+
+class TestChangedJobs:
+    """Test mapping a diff to the documents to validate."""
+
+    def test_staged_rename_and_edit(self, repo):
+        """Test that only staged documents are selected, renames by their new path."""
+        _git(repo, "mv", "users/0.json", "users/renamed.json")
+        (repo / "items" / "1.json").write_text('{"sku": "x"}')
+        _git(repo, "add", "items/1.json")
+        (repo / "items" / "2.json").write_text('{"sku": "unstaged"}')
+
+        changes = git_changes(repo, staged=True)
+
+        assert {(c.status, c.path.name) for c in changes} == {("R", "renamed.json"), ("M", "1.json")}
+        assert _selected(repo, staged=True) == [
+            ("items/1.json", "item.json"),
+            ("users/renamed.json", "user.json"),
+        ]
+
+    def test_changed_schema_brings_dependents(self, repo):
+        """Test that a schema change re-validates every document mapped to it."""
+        (repo / "schemas" / "user.json").write_text(json.dumps({"required": ["name", "id"]}))
+        _git(repo, "commit", "-q", "-am", "tighten")
+
+        assert _selected(repo, since="HEAD~1") == [
+            (f"users/{i}.json", "user.json") for i in range(3)
+        ]
+
+    def test_deleted_and_ignored_skipped(self, repo):
+        """Test that deletions and files outside the include rules are not selected."""
+        (repo / "users" / "1.json").unlink()
+        (repo / "notes.json").write_text("{}")
+        _git(repo, "add", "-A")
+
+        assert _selected(repo, staged=True) == []
+
+    def test_config_change_selects_everything(self, repo):
+        """Test that a changed mapping re-validates the whole tree."""
+        config = repo / ".json-validate.json"
+        config.write_text(config.read_text().replace("user.json", "item.json"))
+
+        selected = _selected(repo, since="HEAD")
+
+        assert len(selected) == 6
+        assert {schema for _, schema in selected} == {"item.json"}
+
+    def test_changed_schema_not_a_document(self, repo):
+        """Test that a changed schema is not itself selected by a broad include."""
+        config = repo / ".json-validate.json"
+        config.write_text(json.dumps({"schemas": {"items/*.json": "schemas/item.json"}}))
+        _git(repo, "commit", "-q", "-am", "include everything")
+        (repo / "schemas" / "item.json").write_text(json.dumps({"required": ["id"]}))
+
+        assert _selected(repo, since="HEAD") == [
+            (f"items/{i}.json", "item.json") for i in range(3)
+        ]
+
+    def test_not_a_repository(self, tmp_path):
+        """Test the error outside a repository."""
+        with pytest.raises(GitError, match="failed"):
+            git_changes(tmp_path, since="HEAD")
+
+
+class TestChangedCommand:
+    """Test the --staged and --changed-since options."""
+
+    def test_staged_failure_reported(self, repo):
+        """Test that the changed set goes through the batch pipeline."""
+        (repo / "users" / "2.json").write_text('{"nom": 2}')
+        _git(repo, "add", "users/2.json")
+
+        result = CliRunner().invoke(validate_json, [str(repo), "--staged"])
+
+        assert result.exit_code == 1
+        assert "'name' is a required property" in result.output
+        assert "0/1 changed files valid" in result.output
+
+    def test_unknown_revision(self, repo):
+        """Test that git failures are reported as errors."""
+        result = CliRunner().invoke(validate_json, [str(repo), "--changed-since", "nope"])
+
+        assert result.exit_code == 1
+        assert "Git Error" in result.output
+
+    def test_needs_directory(self, repo):
+        """Test that a single file is rejected."""
+        result = CliRunner().invoke(validate_json, [str(repo / "users" / "0.json"), "--staged"])
+
+        assert result.exit_code == 2
@@ -0,0 +1,155 @@
+"""Tests for the columnar record validation fast path."""
+
+import random
+
+import jsonschema
+import pytest
+
+from py_command_suite.json_cli import columnar
+from py_command_suite.json_cli.columnar import compile_record_plan
+from py_command_suite.json_cli.exceptions import JSONValidationError
+from py_command_suite.json_cli.validator import validate_json_against_schema
+
+
+RECORD_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer", "minimum": 0},
+            "name": {"type": "string", "maxLength": 5},
+            "status": {"enum": ["new", "done", 1]},
+            "score": {"type": ["number", "null"], "minimum": 0, "maximum": 1.5},
+        },
+        "required": ["id", "name"],
+    },
+}
+
+
+def _expected_errors(schema, data):
+    validator = jsonschema.Draft7Validator(schema)
+    return sorted(
+        (tuple(e.absolute_path), e.message) for e in validator.iter_errors(data)
+    )
+
+
+def _random_records(count, seed):
+    rng = random.Random(seed)
+    values = {
+        "id": [0, 5, -1, 2.0, 2.5, "7", True, 2**70],
+        "name": ["ab", "abcde", "abcdef", 3, None],
+        "status": ["new", "done", "bad", 1, 1.0, True, [1]],
+        "score": [0, 0.5, 1.5, 2, -0.1, None, "x", False],
+    }
+    records = []
+    for _ in range(count):
+        record = {
+            key: rng.choice(options)
+            for key, options in values.items()
+            if rng.random() > 0.1
+        }
+        records.append(record)
+    records.append("not an object")
+    return records
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+class TestCompileRecordPlan:
+    """Test detection of schemas eligible for the fast path."""
+
+    def test_simple_record_schema_detected(self):
+        """Test that a flat record schema compiles."""
+        assert compile_record_plan(RECORD_SCHEMA) is not None
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {"type": "object"},
+            {"type": "array", "items": {"type": "string"}},
+            {"type": "array", "minItems": 1, "items": {"type": "object"}},
+            {
+                "type": "array",
+                "items": {"properties": {"a": {"type": "string", "pattern": "x"}}},
+            },
+            {
+                "type": "array",
+                "items": {"properties": {"a": {"$ref": "#/definitions/a"}}},
+            },
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "type": "array",
+                "items": {"type": "object"},
+            },
+        ],
+    )
+    def test_unsupported_schemas_rejected(self, schema):
+        """Test that anything beyond the simple keywords falls back."""
+        assert compile_record_plan(schema) is None
+
+
+class TestRecordPlan:
+    """Test that the fast path reports the same errors as jsonschema."""
+
+    def test_valid_records(self, backend):
+        """Test that valid records produce no errors."""
+        records = [{"id": i, "name": "n", "status": "new", "score": 0.5} for i in range(50)]
+        plan = compile_record_plan(RECORD_SCHEMA, batch_size=7)
+        assert list(plan.iter_errors(records)) == []
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_errors_match_jsonschema(self, backend, seed):
+        """Test error paths and messages against the generic validator."""
+        records = _random_records(200, seed)
+        plan = compile_record_plan(RECORD_SCHEMA, batch_size=64)
+
+        actual = sorted(
+            (tuple(e.absolute_path), e.message) for e in plan.iter_errors(records)
+        )
+
+        assert actual == _expected_errors(RECORD_SCHEMA, records)
+
+    def test_validate_json_against_schema_uses_fast_path(self, backend):
+        """Test that failing rows surface as formatted validation errors."""
+        records = [{"id": 1, "name": "ok"}, {"id": -3, "name": "ok"}, {"name": "x"}]
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema(records, RECORD_SCHEMA, "records.json")
+
+        assert exc_info.value.validation_errors == [
+            "At '1 -> id': -3 is less than the minimum of 0",
+            "At '2': 'id' is a required property",
+        ]
+
+    @pytest.mark.parametrize(
+        "maximum, values",
+        [
+            (2**53, [2**53 + 1, 0.5]),
+            (2**53 + 3, [float(2**53 + 4), 0.5]),
+            (2**53 - 1, [2**53, 2**53 + 1]),
+            (2**53, [2**53 + 1, 2**63]),
+            (2**53, [2**53 + 1, 2**64 + 1]),
+        ],
+    )
+    def test_large_integers_compared_exactly(self, backend, maximum, values):
+        """Test bounds near 2**53 against mixed and wide numeric columns."""
+        schema = {
+            "type": "array",
+            "items": {"type": "object", "properties": {"n": {"maximum": maximum}}},
+        }
+        records = [{"n": value} for value in values]
+        plan = compile_record_plan(schema)
+
+        actual = sorted(
+            (tuple(e.absolute_path), e.message) for e in plan.iter_errors(records)
+        )
+
+        assert actual == _expected_errors(schema, records)
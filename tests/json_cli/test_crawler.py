@@ -0,0 +1,158 @@
+"""Tests for directory crawling and schema mapping."""
+
+import json
+import pytest
+from pathlib import Path
+
+from py_command_suite.json_cli.crawler import (
+    PatternMatcher,
+    SchemaConfig,
+    crawl,
+    glob_to_regex,
+    load_config,
+)
+from py_command_suite.json_cli.exceptions import ConfigError
+
+
+class TestPatternMatcher:
+    """Test the combined glob matcher."""
+
+    def test_suffix_pattern_matches_any_depth(self):
+        """Test that '*.json' matches basenames in nested directories."""
+        matcher = PatternMatcher(["*.json"])
+        assert matcher.match("a.json") == 0
+        assert matcher.match("deep/dir/b.json") == 0
+        assert matcher.match("deep/dir/b.yaml") is None
+
+    def test_first_pattern_wins(self):
+        """Test that the lowest-indexed matching pattern is returned."""
+        matcher = PatternMatcher(["config/**/*.json", "*.json", "config/app.json"])
+        assert matcher.match("config/app.json") == 0
+        assert matcher.match("config/nested/x.json") == 0
+        assert matcher.match("other/x.json") == 1
+
+    def test_literal_and_regex_priority(self):
+        """Test that a literal listed first beats a later glob."""
+        matcher = PatternMatcher(["data/special.json", "data/*.json"])
+        assert matcher.match("data/special.json") == 0
+        assert matcher.match("data/plain.json") == 1
+
+    def test_star_does_not_cross_directories(self):
+        """Test that a single star stays within one path segment."""
+        matcher = PatternMatcher(["data/*.json"])
+        assert matcher.match("data/a.json") == 0
+        assert matcher.match("data/sub/a.json") is None
+
+    def test_glob_to_regex_character_class(self):
+        """Test translation of negated character classes."""
+        assert glob_to_regex("v[!0].json").endswith("v[^0]\\.json")
+
+
+class TestSchemaConfig:
+    """Test loading schema mapping configuration."""
+
+    def test_from_file_resolves_schema_paths(self, tmp_path):
+        """Test that schema paths are relative to the config file."""
+        config_file = tmp_path / "cfg.json"
+        config_file.write_text(json.dumps({"schemas": {"*.json": "s/schema.json"}}))
+
+        config = SchemaConfig.from_file(config_file)
+
+        assert config.schema_for("x.json") == (tmp_path / "s/schema.json").resolve()
+
+    def test_default_schema_for_unmapped_files(self, tmp_path):
+        """Test fallback to the default schema."""
+        default = tmp_path / "default.json"
+        config = SchemaConfig({"a/*.json": "a.schema.json"}, default_schema=default)
+        assert config.schema_for("b/x.json") == default
+
+    def test_invalid_config_structure(self, tmp_path):
+        """Test handling of a malformed config."""
+        config_file = tmp_path / "cfg.json"
+        config_file.write_text(json.dumps({"ignore": "node_modules"}))
+
+        with pytest.raises(ConfigError) as exc_info:
+            SchemaConfig.from_file(config_file)
+
+        assert "'ignore'" in str(exc_info.value)
+
+    def test_config_syntax_error(self, tmp_path):
+        """Test handling of a config with invalid JSON."""
+        config_file = tmp_path / "cfg.json"
+        config_file.write_text("{")
+
+        with pytest.raises(ConfigError):
+            SchemaConfig.from_file(config_file)
+
+    def test_load_config_discovers_default_file(self, tmp_path):
+        """Test that the root's default config file is picked up."""
+        (tmp_path / ".json-validate.json").write_text(
+            json.dumps({"schemas": {"*.json": "schema.json"}})
+        )
+        config = load_config(tmp_path)
+        assert config.schema_for("a.json") == (tmp_path / "schema.json").resolve()
+
+
+class TestCrawl:
+    """Test recursive directory crawling."""
+
+    def test_crawl_prunes_ignored_directories(self, tmp_path, monkeypatch):
+        """Test that ignored subtrees are never opened."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.json").write_text("{}")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "b.json").write_text("{}")
+
+        import os
+
+        opened = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            opened.append(Path(path).name)
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", tracking_scandir)
+
+        found = [p.name for p, _ in crawl(tmp_path, SchemaConfig())]
+
+        assert found == ["a.json"]
+        assert "node_modules" not in opened
+        assert "pkg" not in opened
+
+    def test_crawl_maps_schemas_and_filters(self, tmp_path):
+        """Test schema mapping, include filtering and directory-only ignores."""
+        (tmp_path / "config").mkdir()
+        (tmp_path / "config" / "app.json").write_text("{}")
+        (tmp_path / "notes.txt").write_text("text")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "out.json").write_text("{}")
+        (tmp_path / "top.json").write_text("{}")
+
+        config = SchemaConfig(
+            {"config/*.json": "cfg.schema.json"},
+            ignore=["build/"],
+            base_dir=tmp_path,
+        )
+        found = {p.relative_to(tmp_path).as_posix(): s for p, s in crawl(tmp_path, config)}
+
+        assert found == {
+            "config/app.json": (tmp_path / "cfg.schema.json").resolve(),
+            "top.json": None,
+        }
+
+    def test_crawl_skips_config_and_schemas(self, tmp_path):
+        """Test the config file and the schemas it uses are not validated."""
+        (tmp_path / "schemas").mkdir()
+        (tmp_path / "schemas" / "item.json").write_text('{"type": "object"}')
+        (tmp_path / "schemas" / "cfg.json").write_text('{"type": "object"}')
+        (tmp_path / "items").mkdir()
+        (tmp_path / "items" / "a.json").write_text("{}")
+        (tmp_path / ".json-validate.json").write_text(
+            json.dumps({"schemas": {"items/cfg.json": "schemas/cfg.json"}})
+        )
+
+        config = load_config(tmp_path, default_schema=tmp_path / "schemas" / "item.json")
+        found = [p.relative_to(tmp_path).as_posix() for p, _ in crawl(tmp_path, config)]
+
+        assert found == ["items/a.json"]
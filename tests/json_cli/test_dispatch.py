@@ -0,0 +1,228 @@
+"""Tests for discriminator-indexed union dispatch."""
+
+import jsonschema
+import pytest
+
+from py_command_suite.json_cli.dispatch import (
+    DispatchValidator,
+    dispatching_validator,
+    draft_for,
+    index_unions,
+    tagged_union,
+)
+from py_command_suite.json_cli.exceptions import JSONValidationError
+from py_command_suite.json_cli.generator import generate_instances
+from py_command_suite.json_cli.validator import validate_json_against_schema
+
+
+def make_schema(kinds=20):
+    """Event schema with one branch per kind, half of them behind $ref."""
+    branches = [
+        {
+            "type": "object",
+            "required": ["kind", "n"],
+            "properties": {
+                "kind": {"const": f"e{i}"} if i % 3 else {"enum": [f"e{i}", f"alias{i}"]},
+                "n": {"type": "integer", "minimum": i},
+            },
+        }
+        for i in range(kinds)
+    ]
+    definitions = {f"e{i}": branch for i, branch in enumerate(branches) if i % 2}
+    return {
+        "type": "object",
+        "properties": {
+            "event": {
+                "oneOf": [
+                    {"$ref": f"#/definitions/e{i}"} if i % 2 else branch
+                    for i, branch in enumerate(branches)
+                ]
+            },
+            "events": {"type": "array", "items": {"anyOf": branches}},
+        },
+        "definitions": definitions,
+    }
+
+
+class TestIndexUnions:
+    """Test tagged union detection at load time."""
+
+    def test_finds_unions(self):
+        """Test that oneOf and anyOf unions are indexed once."""
+        schema = make_schema()
+
+        assert index_unions(schema) == 2
+        assert index_unions(schema) == 2
+        union = tagged_union(schema["properties"]["event"]["oneOf"])
+        assert union.name == "kind"
+        assert len(union.table) == 20 + 7
+
+    def test_untagged_union_ignored(self):
+        """Test that unions without a shared pinned property are left alone."""
+        schema = {"oneOf": [{"type": "string"}, {"type": "integer"}]}
+
+        assert index_unions(schema) == 0
+        assert tagged_union(schema["oneOf"]) is None
+
+    def test_equal_copy_not_indexed(self):
+        """Test that lookups are by identity, not by value."""
+        schema = make_schema(3)
+        index_unions(schema)
+
+        assert tagged_union(list(schema["properties"]["event"]["oneOf"])) is None
+
+
+class TestDispatchValidator:
+    """Test validation through the lookup table."""
+
+    def test_same_verdicts(self):
+        """Test dispatch against plain Draft 7 on generated instances."""
+        schema = make_schema()
+        plain = jsonschema.Draft7Validator(schema)
+        dispatching = dispatching_validator(schema)
+        instances = [value for value, _ in generate_instances(schema, 400, mutation_rate=0.5)]
+        instances += [{"event": value} for value in ({}, {"kind": "x"}, "e1", None, {"kind": 1})]
+
+        for instance in instances:
+            assert dispatching.is_valid(instance) == plain.is_valid(instance)
+
+    def test_one_branch_evaluated(self, monkeypatch):
+        """Test that only the tagged branch is descended into."""
+        schema = make_schema()
+        validator = dispatching_validator(schema)
+        seen = []
+        descend = DispatchValidator.descend
+
+        def spy(self, instance, schema, path=None, schema_path=None, **kwargs):
+            if isinstance(schema_path, int):
+                seen.append(schema_path)
+            return descend(self, instance, schema, path, schema_path, **kwargs)
+
+        monkeypatch.setattr(DispatchValidator, "descend", spy)
+        assert validator.is_valid({"event": {"kind": "e7", "n": 7}})
+
+        assert seen == [7]
+
+    @pytest.mark.parametrize(
+        "event, expected",
+        [
+            ({"kind": "e4", "n": 1}, "At 'event -> n': 1 is less than the minimum of 4"),
+            ({"kind": "alias3", "n": 3.5}, "At 'event -> n': 3.5 is not of type 'integer'"),
+            (
+                {"kind": "zz", "n": 1},
+                "At 'event -> kind': unknown kind 'zz'; expected one of 'e0', 'alias0', "
+                "'e1', 'e2', 'e3', 'alias3', 'e4', 'e5', 'e6', 'alias6', ... (27 in total)",
+            ),
+            ({"n": 1}, "At 'event': 'kind' is a required property"),
+        ],
+    )
+    def test_messages(self, event, expected):
+        """Test that failures name the branch's error or the tag."""
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema({"event": event}, make_schema())
+
+        assert exc_info.value.validation_errors == [expected]
+
+    def test_non_objects_use_standard_check(self):
+        """Test that a non-object falls back to trying every branch."""
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema({"event": "e1"}, make_schema(3))
+
+        assert exc_info.value.validation_errors == [
+            "At 'event': 'e1' is not valid under any of the given schemas"
+        ]
+
+
+class TestDrafts:
+    """Test validator selection from ``$schema``."""
+
+    @pytest.mark.parametrize(
+        "uri, expected",
+        [
+            ("http://json-schema.org/draft-04/schema#", jsonschema.Draft4Validator),
+            ("http://json-schema.org/draft-06/schema#", jsonschema.Draft6Validator),
+            ("http://json-schema.org/draft-07/schema#", jsonschema.Draft7Validator),
+            ("https://json-schema.org/draft/2019-09/schema", jsonschema.Draft201909Validator),
+            ("https://json-schema.org/draft/2020-12/schema", jsonschema.Draft202012Validator),
+            ("http://json-schema.org/draft-03/schema#", jsonschema.Draft7Validator),
+            (None, jsonschema.Draft7Validator),
+        ],
+    )
+    def test_draft_for(self, uri, expected):
+        """Test that known drafts are honoured and others fall back to Draft 7."""
+        schema = {"type": "object"} if uri is None else {"$schema": uri}
+
+        assert draft_for(schema) is expected
+
+    def test_draft4_exclusive_maximum(self):
+        """Test Draft 4's boolean exclusiveMaximum."""
+        schema = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "maximum": 5,
+            "exclusiveMaximum": True,
+        }
+
+        assert dispatching_validator(schema).is_valid(4)
+        assert not dispatching_validator(schema).is_valid(5)
+
+    def test_2020_12_prefix_items(self):
+        """Test prefixItems and unions nested below it."""
+        union = {
+            "oneOf": [
+                {"required": ["kind"], "properties": {"kind": {"const": f"e{i}"}, "n": {"minimum": i}}}
+                for i in range(3)
+            ]
+        }
+        schema = {
+            "$schema": "https://json-schema.org/draft/2020-12/schema",
+            "prefixItems": [{"type": "string"}, union],
+            "items": False,
+        }
+        validator = dispatching_validator(schema)
+
+        assert validator.is_valid(["a", {"kind": "e1", "n": 1}])
+        assert not validator.is_valid(["a", {"kind": "e2", "n": 1}])
+        assert not validator.is_valid([1, {"kind": "e1", "n": 1}])
+        assert not validator.is_valid(["a", {"kind": "e1", "n": 1}, "extra"])
+        assert tagged_union(union["oneOf"]) is not None
+
+    def test_draft4_const_is_not_a_tag(self):
+        """Test that Draft 4, which has no const, does not dispatch on it."""
+        schema = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "oneOf": [
+                {"type": "object", "required": ["kind"], "properties": {"kind": {"const": tag}}}
+                for tag in ("a", "b")
+            ],
+        }
+
+        assert index_unions(schema) == 0
+        assert not dispatching_validator(schema).is_valid({"kind": "a"})
+        assert not jsonschema.Draft4Validator(schema).is_valid({"kind": "a"})
+
+    @pytest.mark.parametrize(
+        "uri, indexed",
+        [
+            ("http://json-schema.org/draft-07/schema#", 0),
+            ("https://json-schema.org/draft/2020-12/schema", 1),
+        ],
+    )
+    def test_ref_siblings_pin_only_from_2019(self, uri, indexed):
+        """Test that a tag beside "$ref" only counts where the draft applies it."""
+        schema = {
+            "$schema": uri,
+            "definitions": {"t": {}},
+            "anyOf": [
+                {
+                    "properties": {"k": {"$ref": "#/definitions/t", "const": "a"}},
+                    "required": ["k"],
+                    "type": "object",
+                },
+                {"properties": {"k": {"const": "b"}}, "required": ["k"], "type": "object"},
+            ],
+        }
+        plain = jsonschema.validators.validator_for(schema)(schema)
+
+        assert index_unions(schema) == indexed
+        for instance in ({"k": "a"}, {"k": "b"}, {"k": "c"}):
+            assert dispatching_validator(schema).is_valid(instance) == plain.is_valid(instance)
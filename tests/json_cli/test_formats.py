@@ -0,0 +1,85 @@
+"""Tests for opt-in format checking."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.exceptions import JSONValidationError
+from py_command_suite.json_cli.formats import FORMAT_CHECKER, format_cache_info
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.validator import validate_json_against_schema
+
+
+@pytest.mark.parametrize(
+    "name, valid, invalid",
+    [
+        ("email", ["a@example.com", "first.last@sub.example.org"], ["a@", "a b@c.d", "a@@b.c"]),
+        (
+            "date-time",
+            ["2024-02-29T12:00:00Z", "2024-01-01t00:00:00.5+05:30", "2016-12-31T23:59:60Z"],
+            [
+                "2023-02-29T12:00:00Z",
+                "2024-01-01T25:00:00Z",
+                "2024-01-01T12:00:00",
+                "2024-01-01T12:00:60Z",
+                "٢٠٢٠-01-01T00:00:00Z",
+            ],
+        ),
+        ("ipv4", ["127.0.0.1", "255.255.255.255"], ["256.0.0.1", "1.2.3", "01.2.3.4", "١.2.3.4"]),
+        ("ipv6", ["::1", "2001:db8::8a2e:370:7334"], ["::g", "fe80::1%eth0", "1.2.3.4"]),
+        ("uuid", ["123e4567-e89b-12d3-a456-426614174000"], ["123e4567e89b12d3a456426614174000"]),
+        ("uri", ["https://example.com/a?b=c#d", "urn:isbn:0451450523"], ["example.com", "http://a b", "x:%zz"]),
+    ],
+)
+def test_checks(name, valid, invalid):
+    """Test each checker on conforming and non-conforming strings."""
+    for value in valid:
+        assert FORMAT_CHECKER.conforms(value, name), value
+    for value in invalid:
+        assert not FORMAT_CHECKER.conforms(value, name), value
+
+
+def test_non_strings_pass():
+    """Test that formats only constrain strings."""
+    assert FORMAT_CHECKER.conforms(42, "email")
+    assert FORMAT_CHECKER.conforms(None, "date-time")
+
+
+def test_results_memoized():
+    """Test that a repeated value is checked once."""
+    before = format_cache_info()["uuid"]
+
+    for _ in range(3):
+        FORMAT_CHECKER.conforms("00000000-0000-0000-0000-0000000000ab", "uuid")
+
+    after = format_cache_info()["uuid"]
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 2
+
+
+def test_opt_in():
+    """Test that format is an annotation unless checking is enabled."""
+    schema = {"properties": {"ip": {"format": "ipv4"}, "day": {"format": "date"}}}
+    document = {"ip": "999.0.0.1", "day": "not a date"}
+
+    validate_json_against_schema(document, schema)
+    with pytest.raises(JSONValidationError) as exc_info:
+        validate_json_against_schema(document, schema, check_formats=True)
+
+    assert exc_info.value.validation_errors == ["At 'ip': '999.0.0.1' is not a 'ipv4'"]
+
+
+def test_command_flag(tmp_path):
+    """Test --check-formats on the validate command."""
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"properties": {"id": {"format": "uuid"}}}))
+    document = tmp_path / "doc.json"
+    document.write_text(json.dumps({"id": "nope"}))
+
+    assert CliRunner().invoke(validate_json, [str(document), "-s", str(schema)]).exit_code == 0
+    result = CliRunner().invoke(
+        validate_json, [str(document), "-s", str(schema), "--check-formats"]
+    )
+    assert result.exit_code == 1
+    assert "is not a 'uuid'" in result.output
@@ -0,0 +1,164 @@
+"""Tests for the synthetic data generator."""
+
+import io
+import json
+import jsonschema
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.exceptions import SchemaError
+from py_command_suite.json_cli.generator import generate_instances, write_corpus
+from py_command_suite.json_cli.main import cli
+
+
+SCHEMA = {
+    "type": "object",
+    "definitions": {"tag": {"type": "string", "pattern": "^[a-z]{2,5}-\\d{3}$"}},
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "email": {"type": "string", "format": "email"},
+        "tags": {
+            "type": "array",
+            "items": {"$ref": "#/definitions/tag"},
+            "uniqueItems": True,
+            "minItems": 1,
+        },
+        "kind": {"enum": ["a", "b"]},
+        "score": {"type": "number", "minimum": 0, "exclusiveMaximum": 1},
+        "child": {"$ref": "#"},
+        "v": {
+            "oneOf": [
+                {"type": "string", "maxLength": 3},
+                {"type": "integer", "multipleOf": 5},
+            ]
+        },
+    },
+    "required": ["id", "tags", "kind"],
+    "additionalProperties": False,
+}
+
+
+class TestGenerateInstances:
+    """Test instance generation."""
+
+    def test_instances_conform(self):
+        """Test that generated instances validate."""
+        validator = jsonschema.Draft7Validator(SCHEMA)
+        instances = list(generate_instances(SCHEMA, 300, seed=1))
+
+        assert len(instances) == 300
+        assert all(ok and validator.is_valid(value) for value, ok in instances)
+
+    def test_mutations_are_invalid(self):
+        """Test that mutated instances fail and are labelled."""
+        validator = jsonschema.Draft7Validator(SCHEMA)
+        instances = list(generate_instances(SCHEMA, 500, mutation_rate=0.3))
+
+        invalid = [value for value, ok in instances if not ok]
+        assert 100 < len(invalid) < 200
+        for value, ok in instances:
+            assert validator.is_valid(value) == ok
+
+    def test_schema_draft_used(self):
+        """Test that instances are checked under the schema's own draft."""
+        schema = {
+            "$schema": "https://json-schema.org/draft/2020-12/schema",
+            "type": "object",
+            "properties": {"a": {"type": "integer"}, "b": {"type": "integer"}},
+            "dependentRequired": {"a": ["b"]},
+            "additionalProperties": False,
+        }
+        validator = jsonschema.Draft202012Validator(schema)
+        instances = list(generate_instances(schema, 100, mutation_rate=0.3, seed=3))
+
+        assert any(ok and "a" in value for value, ok in instances)
+        for value, ok in instances:
+            assert validator.is_valid(value) == ok
+
+    def test_unsupported_schema(self):
+        """Test that an unsatisfiable schema is reported."""
+        schema = {"type": "string", "minLength": 5, "maxLength": 2}
+        with pytest.raises(SchemaError):
+            next(generate_instances(schema, 1))
+
+
+class TestWriteCorpus:
+    """Test streaming corpora to a file."""
+
+    def test_same_output_for_any_job_count(self):
+        """Test that a seed reproduces the corpus across worker counts."""
+        outputs = []
+        for jobs in (1, 3):
+            out = io.BytesIO()
+            stats = write_corpus(
+                SCHEMA, out, count=1200, seed=9, mutation_rate=0.1, jobs=jobs
+            )
+            outputs.append(out.getvalue())
+        assert outputs[0] == outputs[1]
+        assert stats.count == 1200
+        assert stats.bytes == len(outputs[0])
+
+        lines = outputs[0].splitlines()
+        expected = [
+            json.dumps(v, ensure_ascii=False, separators=(",", ":")).encode()
+            for v, _ in generate_instances(SCHEMA, 1200, seed=9, mutation_rate=0.1)
+        ]
+        assert lines == expected
+
+    def test_array_until_bytes(self):
+        """Test that array output is one document capped by size."""
+        out = io.BytesIO()
+        stats = write_corpus(SCHEMA, out, fmt="array", max_bytes=20_000)
+
+        data = json.loads(out.getvalue())
+        assert len(data) == stats.count
+        assert 20_000 <= stats.bytes < 25_000
+
+    def test_count_or_size_required(self):
+        """Test that an unbounded corpus is rejected."""
+        with pytest.raises(ValueError):
+            write_corpus(SCHEMA, io.BytesIO())
+
+
+class TestGenerateCommand:
+    """Test the generate subcommand."""
+
+    def test_writes_file(self, tmp_path):
+        """Test that instances are written as NDJSON with a summary."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(SCHEMA))
+        output = tmp_path / "out.ndjson"
+
+        result = CliRunner().invoke(
+            cli,
+            ["generate", str(schema_file), "-n", "50", "-o", str(output),
+             "--mutation-rate", "0.5", "--seed", "3"],
+        )
+
+        assert result.exit_code == 0
+        lines = output.read_text().splitlines()
+        assert len(lines) == 50
+        invalid = int(result.output.split(", ")[1].split()[0])
+        validator = jsonschema.Draft7Validator(SCHEMA)
+        assert sum(not validator.is_valid(json.loads(l)) for l in lines) == invalid
+
+    def test_requires_a_bound(self, tmp_path):
+        """Test that --count or --until-bytes is needed."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(SCHEMA))
+
+        result = CliRunner().invoke(cli, ["generate", str(schema_file)])
+
+        assert result.exit_code == 2
+        assert "--until-bytes" in result.output
+
+    def test_bad_size(self, tmp_path):
+        """Test that malformed sizes are rejected."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(SCHEMA))
+
+        result = CliRunner().invoke(
+            cli, ["generate", str(schema_file), "--until-bytes", "lots"]
+        )
+
+        assert result.exit_code == 2
@@ -0,0 +1,301 @@
+"""Tests for incremental re-validation after a JSON Patch."""
+
+import copy
+import random
+
+import pytest
+
+from py_command_suite.json_cli import incremental
+from py_command_suite.json_cli.exceptions import JSONValidationError, PatchError
+from py_command_suite.json_cli.incremental import apply_patch, validate_patch
+from py_command_suite.json_cli.validator import validate_json_against_schema
+
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id", "tags"],
+    "additionalProperties": False,
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "tags": {
+            "type": "array",
+            "uniqueItems": True,
+            "maxItems": 4,
+            "items": {"type": "string"},
+        },
+        "items": {"type": "array", "items": {"$ref": "#/definitions/item"}},
+    },
+    "dependencies": {"email": ["name"]},
+    "definitions": {
+        "item": {
+            "type": "object",
+            "required": ["sku"],
+            "properties": {"sku": {"type": "string"}, "qty": {"type": "integer", "minimum": 1}},
+        }
+    },
+}
+
+DOCUMENT = {
+    "id": 1,
+    "name": "Ada",
+    "tags": ["a", "b"],
+    "items": [{"sku": "x", "qty": 1}, {"sku": "y", "qty": 2}],
+}
+
+
+class TestApplyPatch:
+    """Test RFC 6902 operations."""
+
+    def test_operations(self):
+        """Test each operation against a copy of the document."""
+        doc = {"a": {"b": [1, 2]}, "c": "x", "~/": 0}
+        patched = apply_patch(
+            doc,
+            [
+                {"op": "add", "path": "/a/b/1", "value": 9},
+                {"op": "add", "path": "/a/b/-", "value": 3},
+                {"op": "remove", "path": "/a/b/0"},
+                {"op": "replace", "path": "/c", "value": "y"},
+                {"op": "copy", "from": "/a/b", "path": "/d"},
+                {"op": "move", "from": "/~0~1", "path": "/e"},
+                {"op": "test", "path": "/a/b", "value": [9.0, 2, 3]},
+            ],
+        )
+
+        assert patched == {"a": {"b": [9, 2, 3]}, "c": "y", "d": [9, 2, 3], "e": 0}
+        assert patched["d"] is not patched["a"]["b"]
+
+    def test_input_untouched_by_default(self):
+        """Test that only containers on patched paths are copied."""
+        doc = {"a": {"b": 1}, "other": {"big": [1, 2, 3]}}
+        original = copy.deepcopy(doc)
+
+        patched = apply_patch(doc, [{"op": "replace", "path": "/a/b", "value": 2}])
+
+        assert doc == original
+        assert patched["other"] is doc["other"]
+
+    def test_in_place(self):
+        """Test that in_place modifies the given document."""
+        doc = {"a": [1]}
+        assert apply_patch(doc, [{"op": "add", "path": "/a/-", "value": 2}], in_place=True) is doc
+        assert doc == {"a": [1, 2]}
+
+    @pytest.mark.parametrize(
+        "patch, fragment",
+        [
+            ([{"op": "remove", "path": "/missing"}], "does not exist"),
+            ([{"op": "add", "path": "/a/01", "value": 1}], "not an array index"),
+            ([{"op": "replace", "path": "/a/5", "value": 1}], "out of range"),
+            ([{"op": "test", "path": "/a/0", "value": True}], "test failed"),
+            ([{"op": "add", "path": "/b"}], "'value'"),
+            ([{"op": "move", "from": "/a", "path": "/a/0"}], "its children"),
+            ([{"op": "frobnicate", "path": "/a"}], "unknown operation"),
+            ([{"path": "/a"}], "needs 'op' and 'path'"),
+        ],
+    )
+    def test_errors(self, patch, fragment):
+        """Test that failing operations raise PatchError with the index."""
+        with pytest.raises(PatchError) as exc_info:
+            apply_patch({"a": [1]}, [{"op": "test", "path": "", "value": {"a": [1]}}] + patch)
+
+        assert fragment in str(exc_info.value)
+        assert exc_info.value.op_index == 1
+
+
+class TestValidatePatch:
+    """Test incremental validation."""
+
+    def test_valid_patch(self):
+        """Test that a valid patch returns the patched document."""
+        patched = validate_patch(
+            DOCUMENT, SCHEMA, [{"op": "add", "path": "/items/0/qty", "value": 5}]
+        )
+        assert patched["items"][0]["qty"] == 5
+        assert DOCUMENT["items"][0]["qty"] == 1
+
+    @pytest.mark.parametrize(
+        "patch, expected",
+        [
+            ([{"op": "remove", "path": "/id"}], "At 'root': 'id' is a required property"),
+            (
+                [{"op": "add", "path": "/extra", "value": 1}],
+                "At 'root': Additional properties are not allowed ('extra' was unexpected)",
+            ),
+            (
+                [{"op": "add", "path": "/tags/-", "value": "a"}],
+                "At 'tags': ['a', 'b', 'a'] has non-unique elements (item 2 repeats item 0)",
+            ),
+            (
+                [{"op": "remove", "path": "/name"}, {"op": "add", "path": "/email", "value": "x"}],
+                "At 'root': 'name' is a dependency of 'email'",
+            ),
+            (
+                [{"op": "remove", "path": "/items/0/sku"}],
+                "At 'items -> 0': 'sku' is a required property",
+            ),
+        ],
+    )
+    def test_ancestor_keywords(self, patch, expected):
+        """Test keywords on ancestors of the changed location."""
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_patch(DOCUMENT, SCHEMA, patch)
+
+        assert exc_info.value.validation_errors == [expected]
+
+    def test_indices_follow_insertions(self):
+        """Test that a changed element is reported at its final index."""
+        patch = [
+            {"op": "replace", "path": "/items/1/qty", "value": 0},
+            {"op": "add", "path": "/items/0", "value": {"sku": "z"}},
+        ]
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_patch(DOCUMENT, SCHEMA, patch)
+
+        assert exc_info.value.error_paths == [("items", 2, "qty")]
+
+    def test_positional_items_after_shift(self):
+        """Test that shifted elements are checked against their new position."""
+        schema = {"type": "array", "items": [{"type": "integer"}, {"type": "string"}]}
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_patch([1, "a"], schema, [{"op": "remove", "path": "/0"}])
+
+        assert exc_info.value.validation_errors == ["At '0': 'a' is not of type 'integer'"]
+
+    def test_untouched_subtrees_not_visited(self, monkeypatch):
+        """Test that validation cost follows the patch, not the document."""
+        doc = {"id": 1, "tags": [], "items": [{"sku": str(i)} for i in range(5000)]}
+        checked = []
+        real = incremental._IncrementalValidator.check
+
+        def counting(self, schema, instance, path):
+            checked.append(path)
+            return real(self, schema, instance, path)
+
+        monkeypatch.setattr(incremental._IncrementalValidator, "check", counting)
+        validate_patch(doc, SCHEMA, [{"op": "replace", "path": "/items/4000/sku", "value": "q"}])
+
+        assert checked == [["items", 4000, "sku"]]
+
+    def test_matches_full_validation(self):
+        """Test random patches against validating the whole result."""
+        rng = random.Random(7)
+        values = [0, -1, "a", "b", None, True, [], ["a"], {"sku": "s"}, {"qty": 0}]
+        for _ in range(300):
+            doc = copy.deepcopy(DOCUMENT)
+            patch = []
+            for _ in range(rng.randint(1, 3)):
+                key = rng.choice(["id", "name", "email", "tags", "items", "extra"])
+                if key in ("tags", "items") and rng.random() < 0.7:
+                    index = rng.randint(0, 2)
+                    op = rng.choice(["add", "remove", "replace"])
+                    path = f"/{key}/{index}"
+                    if key == "items" and op == "replace" and rng.random() < 0.5:
+                        path += rng.choice(["/sku", "/qty"])
+                else:
+                    op = rng.choice(["add", "remove", "replace"])
+                    path = f"/{key}"
+                patch.append({"op": op, "path": path, "value": rng.choice(values)})
+                if op == "remove":
+                    del patch[-1]["value"]
+
+            try:
+                expected = apply_patch(doc, patch)
+            except PatchError:
+                continue
+            try:
+                validate_json_against_schema(expected, SCHEMA)
+                full = None
+            except JSONValidationError as e:
+                full = sorted(e.validation_errors)
+            try:
+                validate_patch(doc, SCHEMA, patch)
+                partial = None
+            except JSONValidationError as e:
+                partial = sorted(e.validation_errors)
+
+            assert partial == full, patch
+
+
+DRAFT_2019 = "https://json-schema.org/draft/2019-09/schema"
+DRAFT_2020 = "https://json-schema.org/draft/2020-12/schema"
+
+
+class TestDraftKeywords:
+    """Test that the walk follows the schema's own draft."""
+
+    @pytest.mark.parametrize(
+        "schema, document, patch",
+        [
+            (
+                {"$schema": DRAFT_2020, "properties": {"t": {"prefixItems": [{"type": "string"}], "items": {"type": "integer"}}}},
+                {"t": ["a", 1]},
+                [{"op": "replace", "path": "/t/0", "value": "b"}],
+            ),
+            (
+                {"$schema": DRAFT_2020, "properties": {"t": {"prefixItems": [{"type": "string"}], "items": {"type": "integer"}}}},
+                {"t": ["a", 1]},
+                [{"op": "add", "path": "/t/1", "value": "b"}],
+            ),
+            (
+                {"$schema": DRAFT_2020, "prefixItems": [{"type": "string"}, {"type": "integer"}], "items": False},
+                ["a", 1],
+                [{"op": "remove", "path": "/0"}],
+            ),
+            (
+                {"$schema": DRAFT_2020, "properties": {"a": {}}, "unevaluatedProperties": False},
+                {"a": 1},
+                [{"op": "add", "path": "/zz", "value": 1}],
+            ),
+            (
+                {"$schema": DRAFT_2019, "allOf": [{"properties": {"a": {}}}], "unevaluatedProperties": False},
+                {"a": 1},
+                [{"op": "replace", "path": "/a", "value": 2}],
+            ),
+            (
+                {"$schema": DRAFT_2019, "dependentRequired": {"a": ["b"]}},
+                {"c": 1},
+                [{"op": "add", "path": "/a", "value": 1}],
+            ),
+            (
+                {"$schema": DRAFT_2019, "dependentSchemas": {"a": {"required": ["b"]}}},
+                {"a": 1, "b": 2},
+                [{"op": "remove", "path": "/b"}],
+            ),
+            (
+                {"$schema": DRAFT_2019, "$defs": {"o": {"type": "object"}}, "$ref": "#/$defs/o", "required": ["b"]},
+                {"b": 1},
+                [{"op": "remove", "path": "/b"}],
+            ),
+            (
+                {"$schema": DRAFT_2020, "$dynamicAnchor": "n", "properties": {"c": {"$dynamicRef": "#n"}}, "required": ["k"]},
+                {"k": 1, "c": {"k": 2}},
+                [{"op": "remove", "path": "/c/k"}],
+            ),
+        ],
+    )
+    def test_matches_full_validation(self, schema, document, patch):
+        """Test verdicts against validating the whole patched document."""
+        try:
+            validate_json_against_schema(apply_patch(document, patch), schema)
+            full = None
+        except JSONValidationError as e:
+            full = sorted(e.validation_errors)
+        try:
+            validate_patch(document, schema, patch)
+            partial = None
+        except JSONValidationError as e:
+            partial = sorted(e.validation_errors)
+
+        assert partial == full
+
+    def test_draft7_ignores_newer_keywords(self):
+        """Test that prefixItems means nothing under Draft 7."""
+        schema = {"items": {"type": "integer"}, "prefixItems": [{"type": "string"}]}
+
+        with pytest.raises(JSONValidationError):
+            validate_patch([1], schema, [{"op": "replace", "path": "/0", "value": "b"}])
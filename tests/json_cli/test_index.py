@@ -0,0 +1,184 @@
+"""Tests for the sidecar record index."""
+
+import json
+import os
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.exceptions import JSONValidationError, SchemaError
+from py_command_suite.json_cli.index import (
+    RecordIndex,
+    index_path_for,
+    parse_ranges,
+    validate_records,
+)
+from py_command_suite.json_cli.main import cli
+
+
+ITEM_SCHEMA = {
+    "type": "array",
+    "items": {"type": "object", "required": ["id"]},
+}
+
+
+@pytest.fixture
+def array_file(tmp_path):
+    """A pretty-printed top-level array of records."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([{"id": i, "s": "a, b]"} for i in range(10)], indent=2))
+    return path
+
+
+class TestRecordIndex:
+    """Test building, loading and invalidating indexes."""
+
+    def test_array_records_by_seek(self, array_file):
+        """Test that each record reads back from its offset."""
+        index = RecordIndex.open(array_file)
+
+        assert index.kind == "array"
+        assert len(index) == 10
+        assert index.record(7) == {"id": 7, "s": "a, b]"}
+        assert index_path_for(array_file).exists()
+
+    def test_ndjson_records(self, tmp_path):
+        """Test that NDJSON lines are indexed, skipping blank lines."""
+        path = tmp_path / "data.ndjson"
+        path.write_text('{"id": 0}\n\n{"id": 1}\r\n  {"id": 2}')
+
+        index = RecordIndex.open(path)
+
+        assert index.kind == "ndjson"
+        assert [r for _, r in index.iter_records(range(3))] == [
+            {"id": 0},
+            {"id": 1},
+            {"id": 2},
+        ]
+
+    def test_sidecar_reused(self, array_file, monkeypatch):
+        """Test that a current sidecar is loaded instead of rebuilt."""
+        RecordIndex.open(array_file)
+
+        def fail_build(*args, **kwargs):
+            raise AssertionError("index was rebuilt")
+
+        monkeypatch.setattr(RecordIndex, "build", fail_build)
+        assert len(RecordIndex.open(array_file)) == 10
+
+    def test_sidecar_invalidated_on_change(self, array_file):
+        """Test that editing the file forces a rebuild."""
+        RecordIndex.open(array_file)
+        array_file.write_text(json.dumps([{"id": "x"}, {"id": 1}]))
+
+        assert RecordIndex.load(array_file) is None
+        index = RecordIndex.open(array_file)
+        assert len(index) == 2
+        assert index.record(0) == {"id": "x"}
+
+    def test_same_size_rewrite_with_preserved_mtime(self, array_file):
+        """Test that the content fingerprint catches timestamp-preserving copies."""
+        RecordIndex.open(array_file)
+        stat = array_file.stat()
+        text = array_file.read_text().replace('"id": 1,', '"id": 9,')
+        array_file.write_text(text)
+        os.utime(array_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert RecordIndex.load(array_file) is None
+
+
+    @pytest.mark.parametrize(
+        "header",
+        [b"[1, 2]", b'{"count": 10}', b'{"count": "ten"}', b"{not json", b""],
+    )
+    def test_corrupted_header_rebuilt(self, array_file, header):
+        """Test that a foreign or truncated sidecar is rebuilt, not a crash."""
+        RecordIndex.open(array_file)
+        sidecar = index_path_for(array_file)
+        magic = sidecar.read_bytes().split(b"\n", 1)[0]
+        sidecar.write_bytes(magic + b"\n" + header + b"\n")
+
+        assert RecordIndex.load(array_file) is None
+        assert RecordIndex.open(array_file).record(3) == {"id": 3, "s": "a, b]"}
+
+
+class TestParseRanges:
+    """Test record selection parsing."""
+
+    def test_numbers_and_ranges(self):
+        """Test mixed selections, including open-ended ranges."""
+        assert parse_ranges("3, 1-2,8-", 10) == [1, 2, 3, 8, 9]
+
+    def test_out_of_range(self):
+        """Test that selections beyond the file are rejected."""
+        with pytest.raises(ValueError):
+            parse_ranges("5-12", 10)
+
+
+class TestValidateRecords:
+    """Test selective re-validation."""
+
+    def test_only_selected_records_checked(self, tmp_path):
+        """Test that invalid records outside the selection are ignored."""
+        path = tmp_path / "data.json"
+        path.write_text(json.dumps([{"id": 0}, {}, {"id": 2}, {}]))
+        index = RecordIndex.open(path)
+
+        assert validate_records(index, ITEM_SCHEMA, [0, 2]) == 2
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_records(index, ITEM_SCHEMA, [2, 3])
+
+        assert exc_info.value.validation_errors == [
+            "At '3': 'id' is a required property (line 1, column 28)"
+        ]
+
+    def test_whole_array_schema_rejected(self, array_file):
+        """Test that array-level keywords cannot be checked per record."""
+        index = RecordIndex.open(array_file)
+        with pytest.raises(SchemaError):
+            validate_records(index, {"type": "array", "minItems": 1}, [0])
+
+
+class TestIndexCLI:
+    """Test the index-backed CLI commands."""
+
+    def test_show_record(self, array_file):
+        """Test printing a single record."""
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["show", str(array_file), "4", "--pretty"])
+
+        assert result.exit_code == 0
+        assert json.loads(result.output) == {"id": 4, "s": "a, b]"}
+
+    def test_show_out_of_range(self, array_file):
+        """Test that an out-of-range record is a usage error."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["show", str(array_file), "40"])
+        assert result.exit_code == 2
+
+    def test_validate_selected_records(self, tmp_path):
+        """Test --records on the validate command."""
+        runner = CliRunner()
+        path = tmp_path / "data.json"
+        path.write_text(json.dumps([{"id": 0}, {}, {"id": 2}]))
+        schema = tmp_path / "schema.json"
+        schema.write_text(json.dumps(ITEM_SCHEMA))
+
+        ok = runner.invoke(
+            cli, ["validate", str(path), "-s", str(schema), "--records", "0,2"]
+        )
+        bad = runner.invoke(
+            cli, ["validate", str(path), "-s", str(schema), "--records", "0-2"]
+        )
+
+        assert ok.exit_code == 0
+        assert "2 selected record(s)" in ok.output
+        assert bad.exit_code == 1
+        assert "Validation Error" in bad.output
+
+    def test_validate_bad_record_spec(self, array_file):
+        """Test that a malformed --records value is a usage error."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["validate", str(array_file), "--records", "x"])
+        assert result.exit_code == 2
+        assert "--records" in result.output
@@ -0,0 +1,106 @@
+"""Tests for schema inference."""
+
+import json
+
+import jsonschema
+from click.testing import CliRunner
+
+from py_command_suite.json_cli import infer
+from py_command_suite.json_cli.infer import DRAFT7, Summary, infer_summary, summarize
+from py_command_suite.json_cli.main import cli
+from py_command_suite.json_cli.validator import load_schema_file, validate_json_file
+
+RECORDS = [
+    {"id": i, "status": ["open", "closed"][i % 2], "score": i / 4, "name": "n" * (i % 13 + 1),
+     "tags": ["a"] * (i % 3), "meta": {"k": i} if i % 2 else None}
+    for i in range(40)
+] + [{"id": 40, "status": "open", "score": 2, "name": "x", "tags": [], "meta": None, "extra": True}]
+
+
+class TestSummary:
+    """Test summaries and the schemas built from them."""
+
+    def test_schema_accepts_every_sample(self):
+        """Test types, ranges, enums and required keys."""
+        schema = summarize(RECORDS).to_schema()
+
+        assert schema["$schema"] == DRAFT7
+        props = schema["properties"]
+        assert props["id"] == {"type": "integer", "minimum": 0, "maximum": 40}
+        assert props["status"] == {"type": "string", "enum": ["closed", "open"]}
+        assert props["score"]["type"] == "number"
+        assert (props["name"]["minLength"], props["name"]["maxLength"]) == (1, 13)
+        assert props["tags"] == {"type": "array", "items": {"type": "string", "enum": ["a"]}}
+        assert props["meta"]["type"] == ["null", "object"]
+        assert props["meta"]["required"] == ["k"]
+        assert schema["required"] == ["id", "status", "score", "name", "tags", "meta"]
+        for record in RECORDS:
+            jsonschema.Draft7Validator(schema).validate(record)
+
+    def test_required_threshold(self):
+        """Test that optional keys become required above the threshold."""
+        schema = summarize([{"a": 1, "b": 1}] * 9 + [{"a": 1}]).to_schema(0.9)
+
+        assert schema["required"] == ["a", "b"]
+
+    def test_merge_matches_sequential(self):
+        """Test that merged partial summaries give the sequential result."""
+        merged = Summary()
+        for start in range(0, len(RECORDS), 7):
+            merged.merge(summarize(RECORDS[start : start + 7]))
+
+        assert merged.count == len(RECORDS)
+        assert merged.to_schema() == summarize(RECORDS).to_schema()
+
+    def test_memory_bounded_by_paths(self, monkeypatch):
+        """Test that high-cardinality values and keys are not all kept."""
+        monkeypatch.setattr(infer, "MAX_PROPERTIES", 3)
+        summary = summarize({"v": f"s{i}", f"k{i}": i} for i in range(1000))
+
+        root = summary.root
+        assert root.properties["v"].values is None
+        assert len(root.properties) == 3
+        assert root.additional.count == 998
+        schema = summary.to_schema()
+        assert schema["additionalProperties"] == {"type": "integer", "minimum": 2, "maximum": 999}
+
+
+class TestInferFiles:
+    """Test reading samples from files and workers."""
+
+    def test_parallel_ndjson_matches_sequential(self, tmp_path):
+        """Test that split byte ranges in worker processes give the same schema."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text("\n".join(json.dumps(r) for r in RECORDS) + "\n\n")
+
+        sequential = infer_summary([path], ndjson=True)
+        parallel = infer_summary([path], ndjson=True, workers=3)
+
+        assert parallel.count == sequential.count == len(RECORDS)
+        assert parallel.to_schema() == sequential.to_schema() == summarize(RECORDS).to_schema()
+
+    def test_cli_writes_loadable_schema(self, tmp_path):
+        """Test that the inferred schema loads and validates the samples."""
+        samples = []
+        for i, record in enumerate(RECORDS[:5]):
+            samples.append(tmp_path / f"{i}.json")
+            samples[-1].write_text(json.dumps(record))
+        output = tmp_path / "schema.json"
+
+        result = CliRunner().invoke(cli, ["infer", *map(str, samples), "-o", str(output)])
+
+        assert result.exit_code == 0, result.output
+        assert "from 5 sample(s)" in result.output
+        assert load_schema_file(output)["$schema"] == DRAFT7
+        for sample in samples:
+            assert validate_json_file(sample, output)
+
+    def test_cli_bad_record(self, tmp_path):
+        """Test the error for an invalid NDJSON line."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text('{"a": 1}\n{"a": \n')
+
+        result = CliRunner().invoke(cli, ["infer", str(path), "--ndjson"])
+
+        assert result.exit_code == 1
+        assert "record at byte 9" in result.output
@@ -338,4 +338,48 @@ class TestCLIIntegration:
         result = runner.invoke(validate_json, [str(json_file)])
         
         assert result.exit_code == 0
-        assert "valid syntax" in result.output
\ No newline at end of file
+        assert "valid syntax" in result.output
+
+class TestDirectoryMode:
+    """Tests for validating a directory tree."""
+
+    def test_directory_with_config(self, tmp_path):
+        """Test that each file is validated against its mapped schema."""
+        runner = CliRunner()
+
+        schema = {"type": "object", "required": ["name"]}
+        (tmp_path / "schemas").mkdir()
+        (tmp_path / "schemas" / "person.json").write_text(json.dumps(schema))
+        (tmp_path / "people").mkdir()
+        (tmp_path / "people" / "ok.json").write_text(json.dumps({"name": "a"}))
+        (tmp_path / "people" / "bad.json").write_text(json.dumps({"age": 1}))
+        config = tmp_path / "cfg.json"
+        config.write_text(
+            json.dumps(
+                {
+                    "schemas": {"people/*.json": "schemas/person.json"},
+                    "include": ["people/*.json"],
+                }
+            )
+        )
+
+        result = runner.invoke(
+            validate_json, [str(tmp_path), "--config", str(config), "--verbose"]
+        )
+
+        assert result.exit_code == 1
+        assert "JSONValidationError" in result.output
+        assert "1/2 files valid" in result.output
+
+    def test_directory_all_valid(self, tmp_path):
+        """Test a directory where every file has valid syntax."""
+        runner = CliRunner()
+
+        (tmp_path / "a.json").write_text("{}")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.json").write_text("[]")
+
+        result = runner.invoke(validate_json, [str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "2/2 files valid" in result.output
@@ -0,0 +1,180 @@
+"""Tests for OpenMetrics instrumentation."""
+
+import json
+import urllib.request
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli import metrics
+from py_command_suite.json_cli.exceptions import JSONValidationError
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.metrics import (
+    CONTENT_TYPE,
+    Histogram,
+    MetricsRegistry,
+    disable_metrics,
+    enable_metrics,
+    serve_metrics,
+)
+from py_command_suite.json_cli.scheduler import schedule
+from py_command_suite.json_cli.validator import validate_json_file
+
+
+@pytest.fixture
+def registry():
+    """Metrics enabled for one test."""
+    yield enable_metrics()
+    disable_metrics()
+
+
+def _samples(text):
+    """Parse exposition lines into {"name{labels}": value}."""
+    assert text.endswith("# EOF\n")
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestRegistry:
+    """Test metric families and the text format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, count and sum lines."""
+        histogram = Histogram("h", "help", ["phase"], buckets=[0.1, 1])
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, ("parse",))
+
+        lines = histogram.render()
+
+        assert lines[:2] == ["# TYPE h histogram", "# HELP h help"]
+        assert lines[2:] == [
+            'h_bucket{phase="parse",le="0.1"} 2',
+            'h_bucket{phase="parse",le="1"} 3',
+            'h_bucket{phase="parse",le="+Inf"} 4',
+            'h_count{phase="parse"} 4',
+            'h_sum{phase="parse"} 3.65',
+        ]
+
+    def test_render_includes_hit_ratio_and_rss(self):
+        """Test computed gauges."""
+        registry = MetricsRegistry()
+        registry.schema_cache.inc(3, ("hit",))
+        registry.schema_cache.inc(1, ("miss",))
+
+        samples = _samples(registry.render())
+
+        assert samples["json_validate_schema_cache_hit_ratio"] == 0.75
+        assert samples['json_validate_peak_rss_bytes{process="self"}'] > 0
+
+    def test_disabled_hooks_are_shared_no_ops(self):
+        """Test that nothing is recorded while disabled."""
+        assert metrics.active_metrics() is None
+        assert metrics.phase("parse") is metrics.track_file(None)
+        metrics.record_schema_cache(True)
+
+
+class TestPipelineMetrics:
+    """Test that validation feeds the registry."""
+
+    def test_single_file(self, registry, tmp_path):
+        """Test phases, bytes and outcome for one invalid file."""
+        json_file = tmp_path / "data.json"
+        json_file.write_text('{"a": "x"}')
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps({"properties": {"a": {"type": "number"}}}))
+
+        with pytest.raises(JSONValidationError):
+            validate_json_file(json_file, schema_file)
+
+        assert registry.files.value(("invalid",)) == 1
+        assert registry.bytes.value() == 10
+        assert registry.errors.value(("JSONValidationError",)) == 1
+        for name in ("parse", "schema", "validate", "locate"):
+            assert registry.phase_seconds.count((name,)) >= 1
+
+    @pytest.mark.parametrize("executor", ["threads", "processes"])
+    def test_scheduled_files_counted_once(self, registry, tmp_path, executor):
+        """Test each scheduled file is counted once whatever the executor."""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"ok{i}.json"
+            path.write_text('{"a": 1}')
+            paths.append(path)
+
+        results = list(schedule([(p, None) for p in paths], 2, executor=executor))
+
+        assert all(r.ok for r in results)
+        assert registry.files.value(("valid",)) == 4
+        assert registry.bytes.value() == 4 * 8
+
+    def test_worker_metrics_merged(self, registry, tmp_path):
+        """Test timings and cache counts from worker processes reach the parent."""
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps({"type": "object"}))
+        jobs = []
+        for i in range(4):
+            path = tmp_path / f"ok{i}.json"
+            path.write_text('{"a": 1}')
+            jobs.append((path, schema_file))
+        # Workers forked now must not send this back a second time
+        registry.phase_seconds.observe(0.1, ("locate",))
+
+        results = list(schedule(jobs, 2, executor="processes"))
+
+        assert all(r.ok for r in results)
+        assert registry.phase_seconds.count(("validate",)) == 4
+        assert registry.phase_seconds.count(("parse",)) >= 4
+        assert registry.phase_seconds.count(("schema",)) >= 1
+        assert registry.phase_seconds.count(("locate",)) == 1
+        lookups = registry.schema_cache.value(("hit",)) + registry.schema_cache.value(("miss",))
+        assert lookups == 4
+        assert registry.schema_cache.value(("miss",)) >= 1
+
+    def test_directory_run_writes_file(self, tmp_path):
+        """Test the end-of-run metrics file for a batch."""
+        root = tmp_path / "data"
+        root.mkdir()
+        for i in range(3):
+            (root / f"ok{i}.json").write_text('{"a": 1}')
+        (root / "bad.json").write_text("{oops}")
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps({"type": "object"}))
+        metrics_file = tmp_path / "run.prom"
+
+        result = CliRunner().invoke(
+            validate_json,
+            [str(root), "-s", str(schema_file), "--metrics-file", str(metrics_file)],
+        )
+
+        assert result.exit_code == 1
+        samples = _samples(metrics_file.read_text())
+        assert samples['json_validate_files_total{result="valid"}'] == 3
+        assert samples['json_validate_files_total{result="error"}'] == 1
+        assert samples['json_validate_errors_total{type="JSONParseError"}'] == 1
+        assert samples['json_validate_schema_cache_requests_total{result="hit"}'] == 2
+        assert samples["json_validate_schema_cache_hit_ratio"] == pytest.approx(2 / 3)
+        assert metrics.active_metrics() is None
+
+
+class TestServeMetrics:
+    """Test the HTTP endpoint."""
+
+    def test_scrape(self):
+        """Test that /metrics serves the current exposition."""
+        registry = MetricsRegistry()
+        registry.files.inc(labels=("valid",))
+        server = serve_metrics(registry, 0)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert content_type == CONTENT_TYPE
+        assert _samples(body)['json_validate_files_total{result="valid"}'] == 1
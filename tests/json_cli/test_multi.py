@@ -0,0 +1,110 @@
+"""Tests for validating one document against several schemas."""
+
+import json
+import threading
+
+from click.testing import CliRunner
+
+from py_command_suite.json_cli import multi, validator
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.multi import (
+    validate_against_schemas,
+    validate_json_file_against_schemas,
+)
+
+V1 = {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}}
+V2 = {"type": "object", "required": ["id"], "properties": {"id": {"type": "string"}}}
+
+
+def write_files(tmp_path, document, *schemas):
+    json_file = tmp_path / "doc.json"
+    json_file.write_text(json.dumps(document, indent=2))
+    paths = []
+    for i, schema in enumerate(schemas):
+        path = tmp_path / f"schema{i}.json"
+        path.write_text(json.dumps(schema) if isinstance(schema, dict) else schema)
+        paths.append(path)
+    return json_file, paths
+
+
+class TestValidateAgainstSchemas:
+    """Test the library functions."""
+
+    def test_verdicts_in_order(self):
+        """Test one verdict per schema, labelled by name."""
+        verdicts = validate_against_schemas({"id": 1}, [("v1", V1), ("v2", V2), ("v1b", V1)])
+
+        assert [(v.schema, v.ok) for v in verdicts] == [("v1", True), ("v2", False), ("v1b", True)]
+        assert verdicts[1].error_type == "JSONValidationError"
+        assert verdicts[1].validation_errors == ("At 'id': 1 is not of type 'string'",)
+
+    def test_runs_concurrently(self, monkeypatch):
+        """Test that validations overlap on separate threads."""
+        barrier = threading.Barrier(2, timeout=5)
+        threads = set()
+        validate = multi.validate_json_against_schema
+
+        def spy(*args):
+            threads.add(threading.get_ident())
+            barrier.wait()
+            return validate(*args)
+
+        monkeypatch.setattr(multi, "validate_json_against_schema", spy)
+        verdicts = validate_against_schemas({"id": 1}, [("a", V1), ("b", V2)], workers=2)
+
+        assert len(threads) == 2
+        assert [v.ok for v in verdicts] == [True, False]
+
+    def test_parses_once(self, tmp_path, monkeypatch):
+        """Test that the document is parsed once however many schemas there are."""
+        json_file, schema_files = write_files(tmp_path, {"id": 1}, *([V1, V2] * 5))
+        calls = []
+        load = validator.load_json_file
+
+        def spy(path, *args, **kwargs):
+            calls.append(path)
+            return load(path, *args, **kwargs)
+
+        monkeypatch.setattr(multi, "load_json_file", spy)
+        verdicts = validate_json_file_against_schemas(json_file, schema_files)
+
+        assert calls == [json_file]
+        assert [v.ok for v in verdicts] == [True, False] * 5
+
+    def test_positions_and_bad_schema(self, tmp_path):
+        """Test that failures carry line numbers and a bad schema does not stop the rest."""
+        json_file, schema_files = write_files(tmp_path, {"id": 1}, V2, "{oops", V1)
+
+        verdicts = validate_json_file_against_schemas(json_file, schema_files)
+
+        assert verdicts[0].validation_errors == (
+            "At 'id': 1 is not of type 'string' (line 2, column 9)",
+        )
+        assert verdicts[1].error_type == "SchemaError"
+        assert verdicts[2].ok
+
+
+class TestMultipleSchemaOption:
+    """Test repeated --schema on the command line."""
+
+    def test_reports_each_schema(self, tmp_path):
+        """Test one line per schema and a failing exit code."""
+        json_file, (v1, v2) = write_files(tmp_path, {"id": 1}, V1, V2)
+
+        result = CliRunner().invoke(
+            validate_json, [str(json_file), "-s", str(v1), "-s", str(v2), "-j", "0"]
+        )
+
+        assert result.exit_code == 1
+        assert f"valid according to '{v1}'" in result.output
+        assert f"✗ JSONValidationError: '{v2}'" in result.output
+        assert "is valid against 1/2 schemas" in result.output
+
+    def test_directory_rejected(self, tmp_path):
+        """Test that several schemas need a single file."""
+        _, (v1, v2) = write_files(tmp_path, {}, V1, V2)
+
+        result = CliRunner().invoke(validate_json, [str(tmp_path), "-s", str(v1), "-s", str(v2)])
+
+        assert result.exit_code == 2
+        assert "need a single JSON_FILE" in result.output
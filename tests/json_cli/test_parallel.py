@@ -0,0 +1,193 @@
+"""Tests for structural scanning and parallel array validation."""
+
+import json
+import pytest
+from jsonschema.exceptions import STRONG_MATCHES, WEAK_MATCHES
+
+from py_command_suite.json_cli import parallel
+from py_command_suite.json_cli.exceptions import JSONParseError, JSONValidationError
+from py_command_suite.json_cli.parallel import (
+    is_decomposable,
+    validate_json_file_parallel,
+)
+from py_command_suite.json_cli.structural import (
+    StructureError,
+    array_body,
+    iter_element_spans,
+    split_points,
+)
+from py_command_suite.json_cli.validator import (
+    validate_json_against_schema,
+    validate_json_file,
+)
+
+
+ITEM_SCHEMA = {
+    "type": "array",
+    "definitions": {"id": {"type": "integer", "minimum": 0}},
+    "items": {
+        "type": "object",
+        "properties": {"id": {"$ref": "#/definitions/id"}, "tags": {"type": "array"}},
+        "required": ["id"],
+    },
+}
+
+
+def _write(tmp_path, name, data, indent=None):
+    path = tmp_path / name
+    path.write_text(json.dumps(data, indent=indent))
+    return path
+
+
+def _write_schema(tmp_path, schema):
+    return _write(tmp_path, "schema.json", schema)
+
+
+class TestStructuralScan:
+    """Test the exact and speculative array scanners."""
+
+    def test_element_spans(self):
+        """Test that spans cover each element, skipping strings and nesting."""
+        buf = b' [ {"a": "x, ]"}, [1, [2]] , "s\\"", 3 ] '
+        start, end = array_body(buf)
+        spans = [buf[s:e] for s, e in iter_element_spans(buf, start, end)]
+        assert spans == [b'{"a": "x, ]"}', b"[1, [2]]", b'"s\\""', b"3"]
+
+    def test_empty_array(self):
+        """Test that an empty array has no elements."""
+        buf = b"[ ]"
+        assert list(iter_element_spans(buf, *array_body(buf))) == []
+
+    def test_not_an_array(self):
+        """Test that objects are rejected."""
+        with pytest.raises(StructureError):
+            array_body(b'{"a": 1}')
+
+    def test_split_points_cover_body(self):
+        """Test that chunks are contiguous element ranges."""
+        data = [{"id": i, "text": "x" * (i % 7)} for i in range(200)]
+        buf = json.dumps(data).encode()
+        start, end = array_body(buf)
+
+        chunks = split_points(buf, start, end, 8)
+
+        parsed = []
+        for chunk_start, chunk_end in chunks:
+            parsed.extend(json.loads(b"[" + buf[chunk_start:chunk_end] + b"]"))
+        assert len(chunks) == 8
+        assert parsed == data
+
+
+class TestIsDecomposable:
+    """Test detection of per-element schemas."""
+
+    def test_items_schema(self):
+        """Test that an items-only array schema qualifies."""
+        assert is_decomposable(ITEM_SCHEMA)
+        assert is_decomposable(None)
+
+    def test_whole_array_keywords(self):
+        """Test that keywords over the whole array disqualify."""
+        assert not is_decomposable({"type": "array", "minItems": 1})
+        assert not is_decomposable({"type": "array", "items": [{"type": "string"}]})
+        assert not is_decomposable({"type": "object"})
+
+
+class TestValidateJsonFileParallel:
+    """Test parallel validation against the sequential result."""
+
+    def test_valid_array(self, tmp_path):
+        """Test that a valid array passes."""
+        data = [{"id": i, "tags": []} for i in range(500)]
+        json_file = _write(tmp_path, "data.json", data)
+        schema_file = _write_schema(tmp_path, ITEM_SCHEMA)
+
+        assert validate_json_file_parallel(json_file, schema_file, jobs=2, min_bytes=0)
+
+    def test_errors_match_sequential(self, tmp_path):
+        """Test that merged indices, messages and positions match."""
+        data = [{"id": i, "tags": []} for i in range(300)]
+        data[7]["id"] = -1
+        data[150] = {"tags": "x"}
+        data[299]["id"] = "z"
+        json_file = _write(tmp_path, "data.json", data, indent=2)
+        schema_file = _write_schema(tmp_path, ITEM_SCHEMA)
+
+        with pytest.raises(JSONValidationError) as parallel_exc:
+            validate_json_file_parallel(json_file, schema_file, jobs=3, min_bytes=0)
+        with pytest.raises(JSONValidationError) as sequential_exc:
+            validate_json_against_schema(data, ITEM_SCHEMA, str(json_file))
+
+        lines = json_file.read_text().splitlines()
+        parallel_errors = parallel_exc.value.validation_errors
+        stripped = [e.rsplit(" (line ", 1)[0] for e in parallel_errors]
+        assert stripped == sequential_exc.value.validation_errors
+        assert str(parallel_exc.value) == str(sequential_exc.value)
+        with pytest.raises(JSONValidationError) as located_exc:
+            validate_json_file(json_file, schema_file)
+        assert parallel_errors == located_exc.value.validation_errors
+
+        positions = parallel_exc.value.error_positions
+        expected = ['-1', '"x"', "{", '"z"']
+        for error, index, (line, column), text in zip(
+            parallel_errors, [7, 150, 150, 299], positions, expected
+        ):
+            assert error.endswith(f"(line {line}, column {column})")
+            assert f"At '{index}" in error
+            assert lines[line - 1][column - 1 :].startswith(text)
+
+    def test_best_error_without_relevance_layout(self, tmp_path, monkeypatch):
+        """Test that chunks are ranked without relying on ``relevance``'s key layout."""
+
+        def old_relevance(error):
+            # jsonschema releases before the path joined the key
+            return (
+                -len(error.path),
+                error.validator not in WEAK_MATCHES,
+                error.validator in STRONG_MATCHES,
+            )
+
+        monkeypatch.setattr(parallel, "relevance", old_relevance)
+        data = [{"id": i, "tags": []} for i in range(300)]
+        data[20] = {"tags": "x"}
+        data[250]["id"] = -1
+        json_file = _write(tmp_path, "data.json", data)
+        schema_file = _write_schema(tmp_path, ITEM_SCHEMA)
+
+        with pytest.raises(JSONValidationError) as parallel_exc:
+            validate_json_file_parallel(json_file, schema_file, jobs=3, min_bytes=0)
+        with pytest.raises(JSONValidationError) as sequential_exc:
+            validate_json_against_schema(data, ITEM_SCHEMA, str(json_file))
+
+        assert str(parallel_exc.value) == str(sequential_exc.value)
+
+    def test_misleading_separators_in_strings(self, tmp_path):
+        """Test that separators inside strings never hide results."""
+        data = [{"id": i, "note": "}, {" * 50} for i in range(400)]
+        data[399]["id"] = -5
+        json_file = _write(tmp_path, "data.json", data)
+        schema_file = _write_schema(tmp_path, ITEM_SCHEMA)
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_file_parallel(json_file, schema_file, jobs=4, min_bytes=0)
+
+        assert len(exc_info.value.validation_errors) == 1
+        assert "At '399 -> id'" in exc_info.value.validation_errors[0]
+
+    def test_syntax_error_reported_sequentially(self, tmp_path):
+        """Test that parse failures surface as JSONParseError."""
+        json_file = tmp_path / "bad.json"
+        json_file.write_text("[" + ", ".join(['{"id": 1}'] * 100) + ", {oops}]")
+
+        with pytest.raises(JSONParseError) as exc_info:
+            validate_json_file_parallel(json_file, jobs=2, min_bytes=0)
+
+        assert "Expecting property name" in str(exc_info.value)
+
+    def test_non_decomposable_schema_falls_back(self, tmp_path):
+        """Test that array-level keywords still apply."""
+        json_file = _write(tmp_path, "data.json", [{"id": 1}])
+        schema_file = _write_schema(tmp_path, {"type": "array", "minItems": 2})
+
+        with pytest.raises(JSONValidationError):
+            validate_json_file_parallel(json_file, schema_file, jobs=2, min_bytes=0)
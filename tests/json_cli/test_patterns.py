@@ -0,0 +1,144 @@
+"""Tests for precompiled, backtracking-safe regex evaluation."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from py_command_suite.json_cli import patterns
+from py_command_suite.json_cli.analyzer import analyze_schema
+from py_command_suite.json_cli.exceptions import JSONValidationError, SchemaError
+from py_command_suite.json_cli.patterns import check_patterns, compile_pattern, find_ambiguity
+from py_command_suite.json_cli.validator import load_schema_file, validate_json_against_schema
+
+EVIL = "^(a+)+$"
+NEAR_MISS = "a" * 64 + "!"
+
+
+class TestFindAmbiguity:
+    """Test detection of catastrophic backtracking."""
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            EVIL,
+            "(a*)*",
+            r"(\w+\s?)+$",
+            "^(a|a)*$",
+            r"^(\d+)*$",
+            "(x+x+)+y",
+            "(a{1,3})+$",
+            r"^(\w+){1,40}$",
+            "^(.*a){12}$",
+        ],
+    )
+    def test_ambiguous(self, pattern):
+        """Test classic ReDoS shapes."""
+        assert find_ambiguity(pattern) is not None
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            "^[a-z]+$",
+            r"^([a-z0-9]+\.)+[a-z]+$",
+            r"^(\.[a-z]+)+$",
+            r"^[a-z]{2,5}-\d{3}$",
+            "^(ab)+$",
+            "^(a|ab)*$",
+            r"^(\d+,)*\d+$",
+            "(?>a+)+",
+            r"^(\d{1,3}\.){3}\d{1,3}$",
+        ],
+    )
+    def test_safe(self, pattern):
+        """Test that delimited repeats are not flagged."""
+        assert find_ambiguity(pattern) is None
+
+
+class TestPatternKeywords:
+    """Test pattern keywords during validation."""
+
+    def test_compiled_once(self):
+        """Test that patterns are compiled into the shared cache at load."""
+        schema = {"properties": {"a": {"pattern": "^x-[0-9]+$"}}, "patternProperties": {"^y": {}}}
+        compile_pattern.cache_clear()
+
+        assert check_patterns(schema) == []
+        assert compile_pattern.cache_info().currsize == 2
+        validate_json_against_schema({"a": "x-12", "y1": 0}, schema)
+        assert compile_pattern.cache_info().misses == 2
+
+    def test_messages_unchanged(self):
+        """Test that messages match jsonschema's."""
+        schema = {
+            "properties": {"a": {"pattern": "^x"}},
+            "patternProperties": {"^b": {"type": "integer"}},
+            "additionalProperties": False,
+        }
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema({"a": "y", "b1": "s", "c": 1}, schema)
+
+        assert sorted(exc_info.value.validation_errors) == [
+            "At 'a': 'y' does not match '^x'",
+            "At 'b1': 's' is not of type 'integer'",
+            "At 'root': 'c' does not match any of the regexes: '^b'",
+        ]
+
+    def test_budget_turns_hang_into_error(self, monkeypatch):
+        """Test that a catastrophic match fails within the budget."""
+        monkeypatch.setattr(patterns, "MATCH_BUDGET", 0.2)
+        started = time.perf_counter()
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema({"a": NEAR_MISS}, {"properties": {"a": {"pattern": EVIL}}})
+
+        assert time.perf_counter() - started < 5
+        assert "exceeded the 0.2s regex time budget" in str(exc_info.value)
+
+    def test_guarded_pattern_matches_normally(self):
+        """Test that the budget does not change ordinary results."""
+        schema = {"patternProperties": {EVIL: {"type": "integer"}}}
+
+        validate_json_against_schema({"aaa": 1, "b": "x"}, schema)
+        with pytest.raises(JSONValidationError):
+            validate_json_against_schema({"aaa": "x"}, schema)
+
+    def test_schema_error_off_main_thread(self, monkeypatch):
+        """Test that an unguardable match raises instead of hanging."""
+        monkeypatch.setattr(patterns, "re2", None)
+        monkeypatch.setattr(patterns, "_matchers", {})
+        compile_pattern.cache_clear()
+        outcome = []
+
+        def run():
+            try:
+                validate_json_against_schema("aa", {"pattern": EVIL})
+            except SchemaError as e:
+                outcome.append(str(e))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert "can backtrack catastrophically" in outcome[0]
+
+
+class TestLoading:
+    """Test detection when schemas are loaded and analyzed."""
+
+    def test_load_and_analyze(self, tmp_path):
+        """Test that ambiguous patterns load and show up as hot spots."""
+        schema = {"properties": {"a": {"type": "string", "pattern": EVIL}}}
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps(schema))
+
+        loaded = load_schema_file(schema_file)
+        spots = analyze_schema(loaded).hot_spots
+
+        assert compile_pattern(EVIL).ambiguity is not None
+        assert any(
+            spot.keyword == "pattern" and "backtrack catastrophically" in spot.reason
+            for spot in spots
+        )
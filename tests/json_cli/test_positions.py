@@ -0,0 +1,145 @@
+"""Tests for the streaming parser and source position mapping."""
+
+import io
+import json
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.positions import locate_in_elements, locate_paths
+from py_command_suite.json_cli.stream import (
+    JSONEventParser,
+    StreamSyntaxError,
+    build_value,
+)
+from py_command_suite.json_cli.exceptions import JSONValidationError
+from py_command_suite.json_cli.validator import validate_json_file
+
+
+DOC = """{
+  "name": "x",
+  "items": [
+    {"id": 1, "tags": ["a", "b"]},
+    {"id": "two",
+     "tags": []}
+  ],
+  "é": {"deep": [null, true]}
+}"""
+
+
+def _parse(text, chunk_size):
+    parser = JSONEventParser(io.StringIO(text), chunk_size=chunk_size)
+    value = build_value(parser, next(parser))
+    assert next(parser, None) is None
+    return value
+
+
+class TestJSONEventParser:
+    """Test the incremental event parser against the json module."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 64])
+    def test_round_trip(self, chunk_size):
+        """Test that values rebuild identically at any chunk size."""
+        assert _parse(DOC, chunk_size) == json.loads(DOC)
+        text = json.dumps([-2.5e-3, "\u00e9\n\"", {"": [[], {}]}, 10, False])
+        assert _parse(text, chunk_size) == json.loads(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"a": 1,}', "[1, 2", '{"a" 1}', "[01]", '"abc', "[1] 2", "{\n  oops\n}"],
+    )
+    def test_errors_match_json(self, text):
+        """Test that syntax errors carry json's message and position."""
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(text)
+        with pytest.raises(StreamSyntaxError) as actual:
+            _parse(text, 2)
+        assert actual.value.msg == expected.value.msg
+        assert (actual.value.lineno, actual.value.colno) == (
+            expected.value.lineno,
+            expected.value.colno,
+        )
+
+    def test_skip_container(self):
+        """Test that a skipped subtree produces no events."""
+        parser = JSONEventParser(io.StringIO('[{"a": [1, "]"]}, 2]'))
+        assert next(parser).kind == "start_array"
+        assert next(parser).kind == "start_map"
+        parser.skip()
+        event = next(parser)
+        assert (event.kind, event.raw) == ("number", "2")
+
+
+class TestLocatePaths:
+    """Test mapping instance paths to line and column."""
+
+    def test_nested_paths(self):
+        """Test positions of keys, indices and non-ASCII keys."""
+        found = locate_paths(
+            DOC, [("items", 1, "id"), ("items", 0, "tags", 1), ("é", "deep", 1), ()]
+        )
+        assert found == {
+            ("items", 1, "id"): (5, 12),
+            ("items", 0, "tags", 1): (4, 29),
+            ("é", "deep", 1): (8, 24),
+            (): (1, 1),
+        }
+
+    def test_missing_paths_omitted(self):
+        """Test that paths absent from the document are skipped."""
+        assert locate_paths(DOC, [("items", 5), ("nope",)]) == {}
+
+    def test_stops_before_later_syntax_error(self):
+        """Test that the scan stops once every path is found."""
+        found = locate_paths('{"a": {"b": 1}, "c": oops', [("a", "b")])
+        assert found == {("a", "b"): (1, 13)}
+
+    def test_locate_in_elements(self):
+        """Test positions inside spans are offset to the whole buffer."""
+        buf = '[\n  {"x": 1},\n  {"ü": 2, "y": [3]}\n]'.encode()
+        start = buf.index(b'{"\xc3')
+        end = buf.index(b"}", start) + 1
+        [found] = locate_in_elements(buf, [(start, end, [("y", 0)])])
+        assert found == {("y", 0): (3, 18)}
+
+
+class TestAttachSourcePositions:
+    """Test that validation errors report where they occur."""
+
+    def test_validate_json_file_positions(self, tmp_path):
+        """Test that each entry ends with its line and column."""
+        json_file = tmp_path / "data.json"
+        json_file.write_text(DOC)
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(
+            json.dumps(
+                {
+                    "properties": {
+                        "items": {"items": {"properties": {"id": {"type": "integer"}}}}
+                    }
+                }
+            )
+        )
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_file(json_file, schema_file)
+
+        assert exc_info.value.error_paths == [("items", 1, "id")]
+        assert exc_info.value.error_positions == [(5, 12)]
+        assert exc_info.value.validation_errors == [
+            "At 'items -> 1 -> id': 'two' is not of type 'integer' (line 5, column 12)"
+        ]
+
+    def test_cli_verbose_output(self, tmp_path):
+        """Test that verbose CLI output includes positions."""
+        json_file = tmp_path / "data.json"
+        json_file.write_text('{\n  "a": 1,\n  "b": "x"\n}')
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps({"properties": {"b": {"type": "number"}}}))
+
+        result = CliRunner().invoke(
+            validate_json, [str(json_file), "--schema", str(schema_file), "--verbose"]
+        )
+
+        assert result.exit_code == 1
+        assert "At 'b': 'x' is not of type 'number' (line 3, column 8)" in result.output
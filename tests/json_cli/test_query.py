@@ -0,0 +1,157 @@
+"""Tests for streaming JSON Pointer / JSONPath queries."""
+
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.main import cli
+from py_command_suite.json_cli.query import ANY, iter_matches, parse_query
+from py_command_suite.json_cli.stream import JSONEventParser
+
+DOC = {
+    "meta": {"count": 3, "a/b": "slash"},
+    "items": [
+        {"id": 1, "tags": ["x"], "user": {"email": "a@x"}},
+        {"id": 2, "tags": [], "user": {"email": "b@x"}},
+        {"id": 3, "tags": ["y", "z"], "user": None},
+    ],
+}
+
+
+def run(expressions, text=None, **kwargs):
+    queries = [parse_query(expression) for expression in expressions]
+    stream = io.StringIO(json.dumps(DOC) if text is None else text)
+    return [(m.pointer, m.value) for m in iter_matches(stream, queries, **kwargs)]
+
+
+class TestParseQuery:
+    """Test expression compilation."""
+
+    @pytest.mark.parametrize(
+        "expression, steps",
+        [
+            ("", ()),
+            ("/items/0/id", ("items", "0", "id")),
+            ("/meta/a~1b", ("meta", "a/b")),
+            ("$", ()),
+            ("$.items[0].id", ("items", 0, "id")),
+            ("$.items[*].user.*", ("items", ANY, "user", ANY)),
+            ("$['meta'][\"a/b\"]", ("meta", "a/b")),
+        ],
+    )
+    def test_steps(self, expression, steps):
+        """Test JSON Pointer and JSONPath forms."""
+        assert parse_query(expression) == steps
+
+    @pytest.mark.parametrize("expression", ["items", "$..id", "$.items[?(@.id)]", "$.items[0:2]"])
+    def test_rejected(self, expression):
+        """Test expressions that cannot be streamed."""
+        with pytest.raises(ValueError):
+            parse_query(expression)
+
+
+class TestIterMatches:
+    """Test matching while streaming."""
+
+    def test_pointer_and_path(self):
+        """Test definite and wildcard expressions together, in document order."""
+        assert run(["/meta/a~1b", "$.items[*].id", "/items/2/tags/1"]) == [
+            ("/meta/a~1b", "slash"),
+            ("/items/0/id", 1),
+            ("/items/1/id", 2),
+            ("/items/2/id", 3),
+            ("/items/2/tags/1", "z"),
+        ]
+
+    def test_subtrees_and_root(self):
+        """Test that containers and the whole document can be extracted."""
+        assert run(["/items/1/user"]) == [("/items/1/user", {"email": "b@x"})]
+        assert run([""]) == [("", DOC)]
+
+    def test_nested_queries(self):
+        """Test a query below another query's match."""
+        assert run(["/items/2", "$.items[2].tags[*]"]) == [
+            ("/items/2", DOC["items"][2]),
+            ("/items/2/tags/0", "y"),
+            ("/items/2/tags/1", "z"),
+        ]
+
+    def test_overlapping_queries_below_a_match(self):
+        """Test values selected twice below a match appear once, in document order."""
+        assert run(["/items", "/items/0", "$.items[*]", "$.items[*].id"]) == [
+            ("/items", DOC["items"]),
+            ("/items/0", DOC["items"][0]),
+            ("/items/0/id", 1),
+            ("/items/1", DOC["items"][1]),
+            ("/items/1/id", 2),
+            ("/items/2", DOC["items"][2]),
+            ("/items/2/id", 3),
+        ]
+
+    def test_unrelated_subtrees_skipped(self, monkeypatch):
+        """Test that containers off every query's path are skipped, not walked."""
+        skipped = []
+        skip = JSONEventParser.skip
+
+        def spy(self):
+            skipped.append(tuple(self.path))
+            skip(self)
+
+        monkeypatch.setattr(JSONEventParser, "skip", spy)
+        run(["$.items[*].id"])
+
+        assert ("meta",) in skipped
+        assert ("items", 0, "tags") in skipped
+
+    def test_stops_early(self):
+        """Test that reading stops once every definite query has matched."""
+        text = json.dumps(DOC)[:-1] + ', "broken": ['
+
+        assert run(["/meta/count", "/items/0/id"], text) == [
+            ("/meta/count", 3),
+            ("/items/0/id", 1),
+        ]
+
+    def test_ndjson_and_limit(self):
+        """Test per-record matching and the match limit."""
+        text = "\n".join(json.dumps(item) for item in DOC["items"])
+        queries = [parse_query("/user/email")]
+
+        matches = list(iter_matches(io.StringIO(text), queries, multiple_values=True))
+        assert [(m.record, m.value) for m in matches] == [(0, "a@x"), (1, "b@x")]
+        assert run(["$.items[*].id"], limit=2) == [("/items/0/id", 1), ("/items/1/id", 2)]
+
+
+class TestQueryCommand:
+    """Test the query command."""
+
+    def test_output(self, tmp_path):
+        """Test one match per line with paths."""
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(DOC))
+
+        result = CliRunner().invoke(cli, ["query", str(path), "$.items[*].user", "--paths"])
+
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            '/items/0/user\t{"email": "a@x"}',
+            '/items/1/user\t{"email": "b@x"}',
+            "/items/2/user\tnull",
+        ]
+
+    def test_no_match_and_errors(self, tmp_path):
+        """Test exit status for no matches, bad expressions and bad JSON."""
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(DOC))
+        broken = tmp_path / "broken.json"
+        broken.write_text('{"a": [1, 2,, 3]}')
+
+        result = CliRunner().invoke(cli, ["query", str(path), "/missing"])
+        assert result.exit_code == 1
+        assert "No matches" in result.output
+        assert CliRunner().invoke(cli, ["query", str(path), "$..id"]).exit_code == 2
+        result = CliRunner().invoke(cli, ["query", str(broken), "/a/3"])
+        assert result.exit_code == 1
+        assert "Expecting value at line 1, column 13" in result.output
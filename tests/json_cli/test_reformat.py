@@ -0,0 +1,117 @@
+"""Tests for streaming format and minify."""
+
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.main import cli
+from py_command_suite.json_cli.reformat import reformat, stream_error_context
+from py_command_suite.json_cli.stream import StreamSyntaxError
+
+DOC = {
+    "a": [1, 2.5e3, {"x": 'é\\u00e9 " q', "y": []}, {}],
+    "b": {"c": None, "d": True, "n": -1.5e-3},
+    "e": [[]],
+}
+
+
+class TestReformat:
+    """Test the token-copying reformatter."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 65536])
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4])
+    def test_matches_json_dumps(self, chunk_size, indent):
+        """Test output against json.dumps, with tokens cut at chunk boundaries."""
+        out = io.StringIO()
+        reformat(io.StringIO(json.dumps(DOC, indent=3)), out, indent, chunk_size=chunk_size)
+
+        if indent is None:
+            expected = json.dumps(DOC, separators=(",", ":"))
+        else:
+            expected = json.dumps(DOC, indent=indent)
+        assert out.getvalue() == expected + "\n"
+
+    def test_tokens_copied_verbatim(self):
+        """Test that numbers and escapes are not re-encoded."""
+        out = io.StringIO()
+        reformat(io.StringIO('[1.0E+2, "\\u00e9", -0]'), out, None)
+
+        assert out.getvalue() == '[1.0E+2,"\\u00e9",-0]\n'
+
+    def test_multiple_values(self):
+        """Test NDJSON input, one value per output line."""
+        out = io.StringIO()
+        count = reformat(io.StringIO('{"a": 1}\n\n[1,\n 2]\n3'), out, None, True)
+
+        assert count == 3
+        assert out.getvalue() == '{"a":1}\n[1,2]\n3\n'
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "", "{", '{"a" 1}', "[1,]", "[1 2]", '{"a":1}}', "tru", "[tru]", '"abc',
+            "[1.]", "[-]", '{"a":1,}', "[01]", '"a\\x"', "[1]x", "{,}", "[}",
+        ],
+    )
+    def test_errors_match_json(self, text):
+        """Test that syntax errors have json's message and offset."""
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(text)
+        for chunk_size in (1, 65536):
+            with pytest.raises(StreamSyntaxError) as exc_info:
+                reformat(io.StringIO(text), io.StringIO(), 2, chunk_size=chunk_size)
+            assert (exc_info.value.msg, exc_info.value.pos) == (
+                expected.value.msg,
+                expected.value.pos,
+            )
+
+
+class TestErrorContext:
+    """Test bounded context for syntax errors."""
+
+    def test_long_line_clipped(self, tmp_path):
+        """Test that a long line is shown around the error column only."""
+        path = tmp_path / "min.json"
+        path.write_text("[" + "1," * 5000 + "x]\nnext\n")
+
+        context = stream_error_context(path, 1, 10002)
+
+        assert context.startswith(">>>   1: ...")
+        assert context.endswith("x]\n      2: next")
+        assert len(context.splitlines()[0]) < 140
+
+
+class TestReformatCommands:
+    """Test the format and minify commands."""
+
+    def test_format_and_minify(self, tmp_path):
+        """Test writing to a file and to stdout."""
+        source = tmp_path / "in.json"
+        source.write_text(json.dumps(DOC))
+        output = tmp_path / "out.json"
+
+        result = CliRunner().invoke(cli, ["format", str(source), "-o", str(output)])
+        assert result.exit_code == 0, result.output
+        assert output.read_text() == json.dumps(DOC, indent=2) + "\n"
+
+        result = CliRunner().invoke(cli, ["minify", str(output)])
+        assert result.exit_code == 0
+        assert result.output == json.dumps(DOC, separators=(",", ":")) + "\n"
+
+    def test_syntax_error_keeps_output(self, tmp_path):
+        """Test the parse error report and that the target is not replaced."""
+        source = tmp_path / "in.json"
+        source.write_text('{\n  "a": 1\n  "b": 2\n}\n')
+        output = tmp_path / "out.json"
+        output.write_text("previous")
+
+        result = CliRunner().invoke(cli, ["minify", str(source), "-o", str(output)])
+
+        assert result.exit_code == 1
+        assert "Expecting ',' delimiter at line 3, column 3" in result.output
+        assert '>>>   3:   "b": 2' in result.output
+        assert "Suggestion: Check for missing commas" in result.output
+        assert output.read_text() == "previous"
+        assert sorted(tmp_path.iterdir()) == sorted([source, output])
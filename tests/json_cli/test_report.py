@@ -0,0 +1,158 @@
+"""Tests for machine-readable result output."""
+
+import io
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.batch import FileResult
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.report import Reporter, create_reporter
+
+RESULTS = [
+    FileResult("a.json", "s.json", True),
+    FileResult(
+        "b.json",
+        "s.json",
+        False,
+        "JSONValidationError",
+        "JSON validation failed: 'x' is not of type 'integer'",
+        ("At 'id': 'x' is not of type 'integer' (line 2, column 9)", "At 'n': bad"),
+    ),
+    FileResult(
+        "c & <d>.json",
+        None,
+        False,
+        "JSONParseError",
+        "Invalid JSON in file c: Expecting value at line 3, column 1\nContext:\n>>> 3: ]",
+    ),
+]
+
+
+def _report(output_format, out):
+    reporter = create_reporter(output_format, out)
+    reporter.start()
+    for result in RESULTS:
+        reporter.add(result)
+    reporter.finish()
+    return reporter
+
+
+class TestReporters:
+    """Test each output format."""
+
+    def test_ndjson(self):
+        """Test one record per file and a closing summary."""
+        out = io.StringIO()
+        _report("ndjson", out)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["type"] for r in records] == ["result"] * 3 + ["summary"]
+        assert records[1]["errors"][0].startswith("At 'id'")
+        assert records[3]["total"] == 3 and records[3]["failed"] == 2
+
+    def test_sarif(self):
+        """Test one SARIF result per error, with regions where known."""
+        out = io.StringIO()
+        _report("sarif", out)
+
+        log = json.loads(out.getvalue())
+        run = log["runs"][0]
+        assert log["version"] == "2.1.0"
+        assert [r["ruleId"] for r in run["results"]] == [
+            "JSONValidationError", "JSONValidationError", "JSONParseError",
+        ]
+        first = run["results"][0]["locations"][0]["physicalLocation"]
+        assert first["region"] == {"startLine": 2, "startColumn": 9}
+        assert "region" not in run["results"][1]["locations"][0]["physicalLocation"]
+        assert run["results"][2]["locations"][0]["physicalLocation"]["region"]["startLine"] == 3
+        assert run["invocations"][0]["properties"] == {"files": 3, "valid": 1, "failed": 2}
+
+    def test_sarif_without_failures(self):
+        """Test that an all-valid run is still a complete log."""
+        out = io.StringIO()
+        reporter = create_reporter("sarif", out)
+        reporter.start()
+        reporter.add(RESULTS[0])
+        reporter.finish()
+
+        assert json.loads(out.getvalue())["runs"][0]["results"] == []
+
+    def test_junit_totals_patched_in(self, tmp_path):
+        """Test that totals written at the end land on the opening tag."""
+        path = tmp_path / "junit.xml"
+        with path.open("w", encoding="utf-8") as out:
+            _report("junit", out)
+
+        suite = ET.parse(path).getroot().find("testsuite")
+        assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("3", "1", "1")
+        cases = suite.findall("testcase")
+        assert cases[2].get("name") == "c & <d>.json"
+        assert cases[1].find("failure").get("type") == "JSONValidationError"
+        assert "At 'n': bad" in cases[1].find("failure").text
+        assert cases[2].find("error").get("message").endswith("line 3, column 1")
+
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            create_reporter("csv", io.StringIO())
+
+    def test_base_class_is_abstract(self):
+        """Test that a reporter must say how it writes results."""
+        with pytest.raises(TypeError):
+            Reporter(io.StringIO())
+
+
+class TestOutputFormatOption:
+    """Test --output-format on the validate command."""
+
+    @pytest.fixture
+    def corpus(self, tmp_path):
+        root = tmp_path / "corpus"
+        root.mkdir()
+        schema = tmp_path / "schema.json"
+        schema.write_text(json.dumps({"required": ["id"]}))
+        (root / "good.json").write_text('{"id": 1}')
+        (root / "bad.json").write_text("{}")
+        return root, schema
+
+    def test_ndjson_to_stdout(self, corpus):
+        """Test that stdout carries only records and the summary goes to stderr."""
+        root, schema = corpus
+
+        result = CliRunner().invoke(
+            validate_json, [str(root), "-s", str(schema), "--output-format", "ndjson"]
+        )
+
+        assert result.exit_code == 1
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert sorted((r["path"].rsplit("/", 1)[-1], r["ok"]) for r in records[:2]) == [
+            ("bad.json", False), ("good.json", True),
+        ]
+        assert records[2]["type"] == "summary"
+        assert "1/2 files valid" in result.stderr
+
+    def test_junit_needs_file(self, corpus):
+        """Test that JUnit output must go to a file."""
+        root, schema = corpus
+
+        result = CliRunner().invoke(validate_json, [str(root), "--output-format", "junit"])
+
+        assert result.exit_code == 2
+
+    def test_single_file_sarif(self, corpus, tmp_path):
+        """Test a report for a single document."""
+        root, schema = corpus
+        output = tmp_path / "out.sarif"
+
+        result = CliRunner().invoke(
+            validate_json,
+            [str(root / "bad.json"), "-s", str(schema), "--output-format", "sarif",
+             "--output-file", str(output)],
+        )
+
+        assert result.exit_code == 1
+        results = json.loads(output.read_text())["runs"][0]["results"]
+        assert results[0]["message"]["text"] == "At 'root': 'id' is a required property (line 1, column 1)"
@@ -0,0 +1,253 @@
+"""Tests for size-aware multi-file scheduling."""
+
+import json
+import multiprocessing
+import os
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli import batch, scheduler
+from py_command_suite.json_cli.main import cli, validate_json
+from py_command_suite.json_cli.scheduler import (
+    MEMORY_FACTOR,
+    _next_admissible,
+    benchmark_executors,
+    resolve_executor,
+    schedule,
+)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Twenty files of growing size plus a schema."""
+    root = tmp_path / "corpus"
+    root.mkdir()
+    paths = []
+    for i in range(20):
+        path = root / f"f{i:02d}.json"
+        path.write_text(json.dumps({"id": i, "pad": "x" * (i * 100)}))
+        paths.append(path)
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"required": ["id"]}))
+    return root, paths, schema
+
+
+class TestAdmission:
+    """Test picking the next job against the memory budget."""
+
+    PENDING = [(10, "a"), (40, "b"), (100, "c")]
+
+    def test_largest_first_without_budget(self):
+        """Test that the largest job goes first."""
+        assert _next_admissible(self.PENDING, None, 0, False) == 2
+
+    def test_largest_that_fits(self):
+        """Test that smaller jobs backfill while a big one waits."""
+        budget = 100 * MEMORY_FACTOR
+        in_flight = 50 * MEMORY_FACTOR
+        assert _next_admissible(self.PENDING, budget, in_flight, False) == 1
+        assert _next_admissible(self.PENDING, budget, budget - 5, False) is None
+
+    def test_oversized_job_runs_alone(self):
+        """Test that a job bigger than the budget still runs when idle."""
+        assert _next_admissible(self.PENDING, 1, 0, True) == 2
+
+
+class TestSchedule:
+    """Test validation through worker processes."""
+
+    def test_all_files_validated(self, corpus):
+        """Test that every file yields one result."""
+        _, paths, schema = corpus
+        results = list(schedule([(p, schema) for p in paths], workers=3))
+
+        assert sorted(r.path for r in results) == sorted(map(str, paths))
+        assert all(r.ok for r in results)
+
+    def test_tight_budget_still_completes(self, corpus):
+        """Test that a budget smaller than any file serialises, not stalls."""
+        _, paths, schema = corpus
+        results = list(
+            schedule([(p, schema) for p in paths], workers=4, memory_budget=1)
+        )
+        assert len(results) == 20
+
+    def test_size_limit_checked_before_running(self, corpus, tmp_path):
+        """Test that oversize files fail from their stat size."""
+        _, paths, schema = corpus
+        big = tmp_path / "big.json"
+        big.write_text("[" + "0," * 600_000 + "0]")
+
+        results = list(
+            schedule([(big, schema)] + [(p, schema) for p in paths[:3]], 2, True, 1)
+        )
+
+        assert results[0].path == str(big)
+        assert results[0].error_type == "FileSizeError"
+        assert sum(r.ok for r in results) == 3
+
+    def test_fail_fast_stops_early(self, corpus):
+        """Test that the first failure cancels outstanding work."""
+        _, paths, schema = corpus
+        paths[-1].write_text(json.dumps({"pad": "x" * 5000}))
+
+        results = list(
+            schedule([(p, schema) for p in paths], workers=2, fail_fast=True)
+        )
+
+        assert not results[-1].ok
+        assert results[-1].path == str(paths[-1])
+        assert len(results) < 20
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="workers must inherit the patched module",
+    )
+    def test_dead_worker_reported(self, corpus, monkeypatch):
+        """Test that every file is reported when a worker is killed mid-run."""
+        _, paths, schema = corpus
+        validate = scheduler.validate_one
+
+        def dying(json_path, *args, **kwargs):
+            if json_path == paths[-1]:
+                os._exit(1)
+            return validate(json_path, *args, **kwargs)
+
+        monkeypatch.setattr(scheduler, "validate_one", dying)
+        results = list(schedule([(p, schema) for p in paths], 2, executor="processes"))
+
+        assert sorted(r.path for r in results) == sorted(map(str, paths))
+        failed = {r.path: r.error_type for r in results if not r.ok}
+        assert failed[str(paths[-1])] == "BrokenProcessPool"
+
+    def test_fail_fast_inline(self, corpus):
+        """Test fail-fast with a single in-process worker."""
+        _, paths, schema = corpus
+        paths[3].write_text("{}")
+
+        results = list(
+            schedule([(p, schema) for p in paths], workers=1, fail_fast=True)
+        )
+
+        assert [r.ok for r in results] == [True, True, True, False]
+
+
+class TestExecutors:
+    """Test thread and process workers."""
+
+    @pytest.mark.parametrize("gil_enabled, expected", [(False, "threads"), (True, "processes")])
+    def test_auto_follows_gil(self, monkeypatch, gil_enabled, expected):
+        """Test that auto picks threads only without the GIL."""
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: gil_enabled, raising=False)
+
+        assert resolve_executor("auto") == expected
+        assert resolve_executor("processes") == "processes"
+
+    def test_auto_before_313(self, monkeypatch):
+        """Test that interpreters without the check use processes."""
+        monkeypatch.delattr(sys, "_is_gil_enabled", raising=False)
+
+        assert resolve_executor("auto") == "processes"
+
+    def test_unknown_executor(self):
+        """Test that an unknown name is rejected."""
+        with pytest.raises(ValueError):
+            resolve_executor("fibers")
+
+    def test_threads_match_processes(self, corpus):
+        """Test that both executors give the same verdicts."""
+        _, paths, schema = corpus
+        paths[4].write_text("{}")
+        paths[9].write_text("{oops")
+        jobs = [(p, schema) for p in paths]
+
+        verdicts = {
+            executor: sorted((r.path, r.ok, r.error_type) for r in schedule(jobs, 3, executor=executor))
+            for executor in ("threads", "processes")
+        }
+
+        assert verdicts["threads"] == verdicts["processes"]
+        assert sum(not ok for _, ok, _ in verdicts["threads"]) == 2
+
+    def test_threads_load_schema_once(self, corpus, monkeypatch):
+        """Test that threads share one schema store."""
+        _, paths, schema = corpus
+        loads = []
+        load = batch.load_schema_file
+        monkeypatch.setattr(batch, "load_schema_file", lambda path: loads.append(path) or load(path))
+
+        results = list(schedule([(p, schema) for p in paths], 4, executor="threads"))
+
+        assert all(r.ok for r in results)
+        assert loads == [schema]
+
+    def test_guarded_pattern_runs_on_caller(self, corpus, tmp_path):
+        """Test that a pattern needing the main thread's time budget still validates."""
+        _, paths, _ = corpus
+        schema = tmp_path / "guarded.json"
+        schema.write_text(json.dumps({"properties": {"pad": {"pattern": "^(x+)+$"}}}))
+
+        results = list(schedule([(p, schema) for p in paths[1:]], 3, executor="threads"))
+
+        assert len(results) == 19
+        assert all(r.ok for r in results), [r.message for r in results if not r.ok]
+
+    def test_benchmark(self, corpus):
+        """Test that each executor is timed over the whole corpus."""
+        _, paths, schema = corpus
+
+        timings = benchmark_executors([(p, schema) for p in paths], 2, rounds=1)
+
+        assert [t.executor for t in timings] == ["threads", "processes"]
+        assert all(t.files == 20 and t.failed == 0 and t.seconds > 0 for t in timings)
+
+
+class TestDirectoryJobs:
+    """Test the CLI options for directory mode."""
+
+    def test_jobs_and_fail_fast(self, corpus):
+        """Test that the summary notes an early stop."""
+        root, paths, schema = corpus
+        paths[-1].write_text("{oops")
+
+        result = CliRunner().invoke(
+            validate_json,
+            [str(root), "-s", str(schema), "-j", "2", "--fail-fast",
+             "--memory-budget", "64M"],
+        )
+
+        assert result.exit_code == 1
+        assert "(stopped at first failure)" in result.output
+
+    def test_bad_memory_budget(self, corpus):
+        """Test that malformed budgets are usage errors."""
+        root, _, schema = corpus
+        result = CliRunner().invoke(
+            validate_json, [str(root), "--memory-budget", "lots"]
+        )
+        assert result.exit_code == 2
+        assert "--memory-budget" in result.output
+
+    def test_thread_executor(self, corpus):
+        """Test --executor threads on a directory."""
+        root, paths, schema = corpus
+        paths[2].write_text("{}")
+
+        result = CliRunner().invoke(
+            validate_json, [str(root), "-s", str(schema), "-j", "4", "--executor", "threads"]
+        )
+
+        assert result.exit_code == 1
+        assert "19/20 files valid" in result.output
+
+    def test_bench_command(self, corpus):
+        """Test the executor comparison report."""
+        root, _, schema = corpus
+
+        result = CliRunner().invoke(cli, ["bench", str(root), "-s", str(schema), "-j", "2", "--rounds", "1"])
+
+        assert result.exit_code == 0, result.output
+        assert "20 file(s), 2 worker(s)" in result.output
+        assert "threads" in result.output and "processes" in result.output
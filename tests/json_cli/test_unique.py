@@ -0,0 +1,130 @@
+"""Tests for hash-based duplicate detection."""
+
+import json
+import time
+
+import jsonschema
+import pytest
+from click.testing import CliRunner
+
+from py_command_suite.json_cli.dispatch import dispatching_validator
+from py_command_suite.json_cli.exceptions import JSONParseError, JSONValidationError
+from py_command_suite.json_cli import unique
+from py_command_suite.json_cli.main import validate_json
+from py_command_suite.json_cli.unique import Duplicate, duplicate_indices, find_duplicate_records
+from py_command_suite.json_cli.validator import validate_json_against_schema
+
+
+class TestDuplicateIndices:
+    """Test array uniqueness under JSON equality."""
+
+    def test_json_equality(self):
+        """Test that numbers compare by value and objects ignore key order."""
+        items = [1, 1.0, True, {"a": 1, "b": [2]}, {"b": [2.0], "a": 1}, [1, True], [1, 1], None, 0, False]
+
+        assert duplicate_indices(items) == [(1, 0), (4, 3)]
+
+    @pytest.mark.parametrize(
+        "items",
+        [[1, 1.0], [0, False], [[1], [True]], [{"a": 1}, {"a": 1, "b": None}], ["1", 1], [], [{}, {}]],
+    )
+    def test_same_verdict_as_jsonschema(self, items):
+        """Test agreement with jsonschema's own uniqueItems."""
+        schema = {"uniqueItems": True}
+
+        assert dispatching_validator(schema).is_valid(items) == jsonschema.Draft7Validator(
+            schema
+        ).is_valid(items)
+
+    def test_message_names_indices(self):
+        """Test that the error names the first repeat and counts the rest."""
+        records = [{"id": i % 5} for i in range(8)]
+
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_json_against_schema({"rows": records}, {"properties": {"rows": {"uniqueItems": True}}})
+
+        (message,) = exc_info.value.validation_errors
+        assert message.startswith("At 'rows': [{'id': 0}, ")
+        assert message.endswith("has non-unique elements (item 5 repeats item 0; 3 repeats in total)")
+
+    def test_large_array_linear(self):
+        """Test an array of objects far beyond what pairwise checking allows."""
+        records = [{"id": i, "tags": ["x", i % 7]} for i in range(100_000)]
+        records.append({"tags": ["x", 99_999 % 7], "id": 99_999.0})
+
+        started = time.monotonic()
+        assert duplicate_indices(records) == [(100_000, 99_999)]
+        assert time.monotonic() - started < 10
+
+
+class TestDuplicateRecords:
+    """Test duplicate detection over NDJSON files."""
+
+    @pytest.fixture
+    def feed(self, tmp_path):
+        path = tmp_path / "feed.ndjson"
+        lines = [json.dumps({"n": i % 4, "k": ["a", i % 4]}) for i in range(10)]
+        lines[7] = '{"k": ["a", 3], "n": 3.0}'
+        lines.insert(2, "")
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    @pytest.mark.parametrize("spill_entries", [1, 3, 1000])
+    def test_duplicates_in_line_order(self, feed, tmp_path, spill_entries):
+        """Test the same answer whether or not runs are spilled to disk."""
+        duplicates = list(find_duplicate_records(feed, spill_entries, tmp_path))
+
+        assert duplicates == [
+            Duplicate(6, 1), Duplicate(7, 2), Duplicate(8, 4), Duplicate(9, 5), Duplicate(10, 1), Duplicate(11, 2),
+        ]
+        assert [p.name for p in tmp_path.iterdir()] == ["feed.ndjson"]
+
+    def test_hash_collision_not_reported(self, tmp_path, monkeypatch):
+        """Test that records sharing only a hash are compared by value."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text('{"a": 1}\n{"a": 2}\n{"a": 1}\n')
+        monkeypatch.setattr(unique, "hash", lambda value: 0, raising=False)
+
+        assert list(find_duplicate_records(path, 1, tmp_path)) == [Duplicate(3, 1)]
+
+    def test_invalid_line(self, tmp_path):
+        """Test that a malformed record names its line."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text('{"a": 1}\n{"a": \n')
+
+        with pytest.raises(JSONParseError, match="on line 2"):
+            list(find_duplicate_records(path))
+
+
+class TestDedupeCheckOption:
+    """Test --dedupe-check on the validate command."""
+
+    def test_reports_duplicates(self, tmp_path):
+        """Test that each repeat is listed and the run fails."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text('{"a": 1, "b": 2}\n{"a": 2}\n{"b": 2, "a": 1.0}\n')
+
+        result = CliRunner().invoke(validate_json, [str(path), "--dedupe-check"])
+
+        assert result.exit_code == 1
+        assert "line 3 repeats line 1" in result.stderr
+        assert "1 record(s)" in result.stderr
+
+    def test_unique_file(self, tmp_path):
+        """Test the success message."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text('{"a": 1}\n{"a": 2}\n')
+
+        result = CliRunner().invoke(validate_json, [str(path), "--dedupe-check"])
+
+        assert result.exit_code == 0
+        assert "has no duplicate records" in result.output
+
+    def test_rejects_schema(self, tmp_path):
+        """Test that the mode does not combine with schema validation."""
+        path = tmp_path / "feed.ndjson"
+        path.write_text("{}\n")
+
+        result = CliRunner().invoke(validate_json, [str(path), "--dedupe-check", "-s", str(path)])
+
+        assert result.exit_code == 2
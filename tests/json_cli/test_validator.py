@@ -6,8 +6,12 @@ from pathlib import Path
 from unittest.mock import patch, mock_open
 
 from py_command_suite.json_cli.validator import (
+    Validator,
+    compiled_validator,
     load_json_file,
     load_schema_file,
+    validate_buffer,
+    validate_bytes,
     validate_json_against_schema,
     validate_json_file,
 )
@@ -16,6 +20,7 @@ from py_command_suite.json_cli.exceptions import (
     JSONValidationError,
     SchemaError,
     FileAccessError,
+    FileSizeError,
 )
 
 
@@ -347,4 +352,165 @@ class TestValidateJsonFile:
         json_file.write_text('{"test": "data"}')
         
         with pytest.raises(SchemaError):
-            validate_json_file(json_file, missing_schema)
\ No newline at end of file
+            validate_json_file(json_file, missing_schema)
+
+class TestValidateBytes:
+    """Test validation of in-memory payloads."""
+
+    SCHEMA = {"type": "object", "properties": {"id": {"type": "integer"}}}
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            '{"id": 1}',
+            b'{"id": 1}',
+            bytearray(b'{"id": 1}'),
+            memoryview(b'xx{"id": 1}')[2:],
+            '{"id": 1}'.encode("utf-16"),
+        ],
+    )
+    def test_payload_types(self, payload):
+        """Test str, bytes, bytearray, memoryview and UTF-16 payloads."""
+        assert validate_bytes(payload, self.SCHEMA)
+
+    def test_parse_error_context(self):
+        """Test that parse errors carry line context from the buffer."""
+        with pytest.raises(JSONParseError) as exc_info:
+            validate_bytes(memoryview(b'{\n  "id": 1\n  "x": 2\n}'), source="request")
+
+        message = str(exc_info.value)
+        assert "Invalid JSON in request: Expecting ',' delimiter at line 3" in message
+        assert '>>>   3:   "x": 2' in message
+        assert "Suggestion: Check for missing commas" in message
+
+    def test_validation_error_positions(self):
+        """Test that schema errors are located in the payload."""
+        with pytest.raises(JSONValidationError) as exc_info:
+            validate_bytes(b'{\n  "id": "one"\n}', self.SCHEMA)
+
+        assert exc_info.value.validation_errors == [
+            "At 'id': 'one' is not of type 'integer' (line 2, column 9)"
+        ]
+
+    def test_size_limit(self):
+        """Test that the size limit applies as it does to files."""
+        payload = b'"' + b"a" * (1024 * 1024) + b'"'
+
+        with pytest.raises(FileSizeError):
+            validate_bytes(payload, max_size_mb=1)
+        assert validate_bytes(payload, max_size_mb=1, validate_size=False)
+
+    def test_too_deep(self):
+        """Test that pathological nesting is a parse error."""
+        with pytest.raises(JSONParseError, match="nested too deeply"):
+            validate_bytes("[" * 100000 + "]" * 100000)
+
+    def test_buffer_protocol(self):
+        """Test objects that only export a buffer."""
+        import array
+        import mmap
+
+        data = b'{"id": 1}' + b" " * 7
+        mapped = mmap.mmap(-1, len(data))
+        mapped.write(data)
+
+        assert validate_buffer(mapped, self.SCHEMA)
+        assert validate_buffer(array.array("H", data), self.SCHEMA)
+        with pytest.raises(TypeError):
+            validate_buffer(12, self.SCHEMA)
+
+
+class TestValidator:
+    """Test the reusable compiled validator."""
+
+    SCHEMA = {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, "tags": {"type": "array"}},
+        "required": ["id"],
+    }
+
+    def test_methods(self, tmp_path):
+        """Test objects, files, payloads and raw errors with one instance."""
+        validator = Validator(self.SCHEMA)
+        good = tmp_path / "good.json"
+        good.write_text('{"id": 1}')
+        bad = tmp_path / "bad.json"
+        bad.write_text('{\n  "id": "x",\n  "tags": 1\n}')
+
+        assert validator.validate_obj({"id": 1})
+        assert validator.validate_file(good)
+        assert validator.validate_bytes(b'{"id": 2}', source="body")
+        assert sorted(e.message for e in validator.iter_errors({"tags": 1})) == [
+            "'id' is a required property",
+            "1 is not of type 'array'",
+        ]
+        with pytest.raises(JSONValidationError) as exc_info:
+            validator.validate_file(bad)
+        assert exc_info.value.file_path == str(bad)
+        assert "At 'id': 'x' is not of type 'integer' (line 2, column 9)" in (
+            exc_info.value.validation_errors
+        )
+
+    def test_invalid_schema(self):
+        """Test that the schema is checked when compiled."""
+        with pytest.raises(SchemaError, match="Invalid JSON schema"):
+            Validator({"type": "nope"})
+
+    def test_from_file_and_syntax_only(self, tmp_path):
+        """Test loading the schema from a file, and validating without one."""
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(self.SCHEMA))
+        doc = tmp_path / "doc.json"
+        doc.write_text('{"tags": []}')
+
+        assert Validator().validate_file(doc)
+        with pytest.raises(JSONValidationError):
+            Validator.from_file(schema_path).validate_file(doc)
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_validate_many(self, tmp_path, workers):
+        """Test per-file verdicts, in order, on one or several threads."""
+        paths = []
+        for i in range(20):
+            paths.append(tmp_path / f"{i}.json")
+            paths[-1].write_text("{" if i == 3 else json.dumps({"id": i if i % 5 else "x"}))
+
+        verdicts = list(Validator(self.SCHEMA).validate_many(paths, workers))
+
+        assert [v.path for v in verdicts] == paths
+        failed = {i: type(v.error) for i, v in enumerate(verdicts) if not v.ok}
+        assert failed == {0: JSONValidationError, 3: JSONParseError, 5: JSONValidationError,
+                          10: JSONValidationError, 15: JSONValidationError}
+
+    def test_shared_across_threads(self):
+        """Test one instance used concurrently gives per-call results."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        validator = Validator(self.SCHEMA)
+
+        def check(i):
+            try:
+                validator.validate_obj({"id": i} if i % 2 else {"id": str(i)})
+            except JSONValidationError as e:
+                return e.validation_errors
+            return []
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(check, range(200)))
+
+        for i, errors in enumerate(results):
+            assert errors == ([] if i % 2 else [f"At 'id': '{i}' is not of type 'integer'"])
+
+    def test_free_functions_check_schema(self):
+        """Test that a malformed schema is reported as a schema error."""
+        with pytest.raises(SchemaError, match="Invalid JSON schema"):
+            validate_json_against_schema({"id": 1}, {"type": "objekt"})
+
+    def test_free_functions_reuse_compiled(self):
+        """Test that the module functions compile each schema once."""
+        schema = json.loads(json.dumps(self.SCHEMA))
+
+        validate_json_against_schema({"id": 1}, schema)
+
+        assert compiled_validator(schema) is compiled_validator(schema)
+        assert compiled_validator(schema).schema is schema